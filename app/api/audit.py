@@ -10,6 +10,7 @@ from fastapi.responses import HTMLResponse
 
 from app.domain.compliance.audit_filter_registry import get_audit_filter_registry
 from storage.repositories.audit_repository import (
+    AUDIT_COMPANY_STATS_MIN_TOTAL_JOBS,
     get_audit_company_compliance_stats,
     get_audit_source_compliance_stats_last_7d,
     get_audit_source_filter_values,
@@ -23,7 +24,8 @@ from storage.repositories.ats_repository import (
     deactivate_ats_integration,
 )
 from storage.repositories.audit_companies_repository import get_audit_companies_list
-from storage.db_engine import get_engine
+from storage.audit_cache import cached_audit_query, invalidate_audit_cache
+from storage.db_engine import get_engine, note_primary_write
 from app.adapters.ats.registry import get_adapter
 
 logger = logging.getLogger("openjobseu.runtime")
@@ -49,6 +51,7 @@ AUDIT_PANEL_CSS_PATH = REPO_ROOT / "audit_tool" / "offer_audit_panel.css"
 class AuditJobsResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
     total: int
+    total_is_estimate: bool = False
     limit: int
     offset: int
     items: list[dict[str, Any]]
@@ -155,6 +158,7 @@ def audit_panel_css():
 
 @audit_api_router.get("/jobs", response_model=AuditJobsResponse)
 def audit_jobs(
+    q: str | None = Query(None, description="Full-text search across title, company, department and description"),
     status: str | None = Query(None),
     source: str | None = Query(None),
     company: str | None = Query(None),
@@ -170,6 +174,7 @@ def audit_jobs(
     include_counts: bool = Query(True, description="Compute aggregate metrics"),
 ):
     return get_jobs_audit(
+        q=q,
         status=status,
         source=source,
         company=company,
@@ -213,10 +218,10 @@ def audit_filter_registry():
 
 
 @audit_api_router.get("/stats/company", response_model=AuditStatsCompanyResponse)
-def audit_company_stats(min_total_jobs: int = Query(10, ge=0, le=10000)):
+def audit_company_stats(min_total_jobs: int = Query(AUDIT_COMPANY_STATS_MIN_TOTAL_JOBS, ge=0, le=10000)):
     return {
         "min_total_jobs": int(min_total_jobs),
-        "items": get_audit_company_compliance_stats(min_total_jobs=min_total_jobs),
+        "items": cached_audit_query(get_audit_company_compliance_stats, min_total_jobs=min_total_jobs),
     }
 
 
@@ -224,23 +229,23 @@ def audit_company_stats(min_total_jobs: int = Query(10, ge=0, le=10000)):
 def audit_source_stats_7d():
     return {
         "window": "last_7_days",
-        "items": get_audit_source_compliance_stats_last_7d(),
+        "items": cached_audit_query(get_audit_source_compliance_stats_last_7d),
     }
 
 
 @audit_api_router.get("/stats/source-trend", response_model=AuditSourceTrendResponse)
 def audit_source_trend(days: int = Query(30, ge=7, le=180)):
-    return {"window_days": days, "items": get_source_compliance_trend(days=days)}
+    return {"window_days": days, "items": cached_audit_query(get_source_compliance_trend, days=days)}
 
 
 @audit_api_router.get("/stats/rejection-reasons", response_model=AuditRejectionReasonsResponse)
 def audit_rejection_reasons(days: int = Query(30, ge=7, le=180)):
-    return {"window_days": days, "items": get_rejection_reasons_by_source(days=days)}
+    return {"window_days": days, "items": cached_audit_query(get_rejection_reasons_by_source, days=days)}
 
 
 @audit_api_router.get("/ats-health", response_model=AtsHealthResponse)
 def audit_ats_health(days_threshold: int = Query(3, ge=1, le=30)):
-    results = get_failing_ats_integrations(days_threshold=days_threshold)
+    results = cached_audit_query(get_failing_ats_integrations, days_threshold=days_threshold)
     return {"days_threshold": days_threshold, "count": len(results), "items": results}
 
 
@@ -248,6 +253,8 @@ def audit_ats_health(days_threshold: int = Query(3, ge=1, le=30)):
 def api_deactivate_ats(company_ats_id: str):
     with get_engine().begin() as conn:
         deactivate_ats_integration(conn, company_ats_id)
+    note_primary_write()
+    invalidate_audit_cache()
     return {"status": "ok", "company_ats_id": company_ats_id}
 
 
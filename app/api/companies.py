@@ -2,6 +2,7 @@ from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
 from fastapi import APIRouter, Query, Response
 
+from app.api.pagination import decode_company_cursor, encode_company_cursor, next_cursor, validate_cursor_request
 from storage.repositories.companies_repository import get_companies_paginated
 
 router = APIRouter(prefix="/companies", tags=["companies"])
@@ -24,6 +25,7 @@ class PaginatedCompaniesResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 @router.get("", response_model=PaginatedCompaniesResponse)
@@ -32,12 +34,25 @@ def list_companies(
     q: str | None = Query(None, description="Fast fuzzy text search across legal and brand names"),
     limit: int = Query(40, ge=1, le=100),
     offset: int = Query(0, ge=0, le=10000, description="Pagination offset (max 10000)"),
+    cursor: str | None = Query(None, description="Opaque keyset cursor from a previous page's next_cursor"),
 ):
     response.headers["Cache-Control"] = "public, max-age=60"
-    items, total = get_companies_paginated(q=q, limit=limit, offset=offset)
+    validate_cursor_request(cursor, offset=offset, q=q)
+    items, total = get_companies_paginated(
+        q=q,
+        limit=limit,
+        offset=offset,
+        after=decode_company_cursor(cursor) if cursor else None,
+    )
+    cursor_out = None if q else next_cursor(items, limit, encode_company_cursor)
+    # Sort-key columns are only needed for the cursor; they are not part of CompanyItem.
+    for item in items:
+        item.pop("signal_score", None)
+        item.pop("created_at", None)
     return {
         "items": items,
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": cursor_out,
     }
@@ -3,7 +3,7 @@ from pydantic import BaseModel, ConfigDict
 from typing import Any
 from fastapi import APIRouter, Query
 
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.discovery_repository import (
     get_discovered_company_ats,
     get_discovery_candidates,
@@ -18,6 +18,8 @@ from app.workers.discovery.dorking import run_dorking_discovery
 from app.workers.discovery.slug_harvest import run_slug_harvest
 from app.workers.discovery.promote_discovered_slugs import run_promote_discovered_slugs
 
+get_engine = engine_getter("discovery")
+
 logger = logging.getLogger("openjobseu.runtime")
 
 discovery_ui_router = APIRouter(prefix="/discovery", tags=["internal-discovery-ui"])
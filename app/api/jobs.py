@@ -3,6 +3,7 @@ from pydantic import BaseModel, ConfigDict
 from fastapi import APIRouter, Query, Response
 from datetime import datetime, timezone
 
+from app.api.pagination import decode_job_cursor, encode_job_cursor, next_cursor, validate_cursor_request
 from storage.repositories.audit_repository import get_compliance_stats_last_7d
 from storage.repositories.jobs_repository import get_jobs, get_jobs_paginated
 
@@ -36,6 +37,8 @@ class PaginatedJobsResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class FeedMeta(BaseModel):
@@ -96,8 +99,10 @@ def list_jobs(
     remote_scope: str | None = None,
     limit: int = Query(40, ge=1, le=100),
     offset: int = Query(0, ge=0, le=10000, description="Pagination offset (max 10000)"),
+    cursor: str | None = Query(None, description="Opaque keyset cursor from a previous page's next_cursor"),
 ):
     response.headers["Cache-Control"] = "public, max-age=60"
+    validate_cursor_request(cursor, offset=offset, q=q)
     items, total = get_jobs_paginated(
         status=status,
         q=q,
@@ -107,12 +112,15 @@ def list_jobs(
         remote_scope=remote_scope,
         limit=limit,
         offset=offset,
+        after=decode_job_cursor(cursor) if cursor else None,
     )
     return {
         "items": items,
         "total": total,
+        "total_is_estimate": getattr(total, "is_estimate", False),
         "limit": limit,
         "offset": offset,
+        "next_cursor": None if q else next_cursor(items, limit, encode_job_cursor),
     }
 
 
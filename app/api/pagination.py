@@ -0,0 +1,73 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+
+# Opaque keyset cursors: base64url(JSON list of the last row's sort-key values).
+# Clients must treat them as opaque; the encoded layout may change between releases.
+
+
+def encode_cursor(*values) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else str(value) for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_values(token: str, size: int) -> list:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _parse_datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def validate_cursor_request(cursor: str | None, *, offset: int, q: str | None) -> None:
+    if cursor is None:
+        return
+    if offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+    if q:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported with q (relevance ordering)")
+
+
+def encode_job_cursor(item: dict) -> str:
+    """Cursor for the default job ordering: first_seen_at DESC, job_id DESC."""
+    return encode_cursor(item["first_seen_at"], item["job_id"])
+
+
+def decode_job_cursor(token: str) -> tuple[datetime, str]:
+    first_seen_at, job_id = _decode_values(token, 2)
+    return _parse_datetime(first_seen_at), job_id
+
+
+def encode_company_cursor(item: dict) -> str:
+    """Cursor for the default company ordering: signal_score DESC, created_at DESC, company_id DESC."""
+    return encode_cursor(item["signal_score"], item["created_at"], item["company_id"])
+
+
+def decode_company_cursor(token: str) -> tuple[int, datetime, str]:
+    signal_score, created_at, company_id = _decode_values(token, 3)
+    try:
+        return int(signal_score), _parse_datetime(created_at), str(UUID(company_id))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def next_cursor(items: list[dict], limit: int, encoder) -> str | None:
+    """A cursor is only issued when the page is full, i.e. more rows may follow."""
+    if len(items) < limit or not items:
+        return None
+    return encoder(items[-1])
@@ -23,11 +23,13 @@ from app.utils.backfill_salary import backfill_missing_salary_fields
 from app.utils.backfill_department import backfill_missing_departments
 from storage.repositories.market_repository import backfill_remote_ratio
 from storage.repositories.system_repository import get_system_metrics
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter, pool_metrics
 
 from app.domain.jobs.job_processing import process_ingested_job
 import app.workers.ingestion.employer as employer_worker
 
+get_engine = engine_getter("maintenance")
+
 logger = logging.getLogger("openjobseu.runtime")
 
 system_ops_router = APIRouter(tags=["internal-system-ops"])
@@ -44,7 +46,7 @@ class BackfillResponse(BaseModel):
 
 @system_hybrid_router.get("/metrics", response_model=dict[str, Any])
 def internal_metrics():
-    return get_system_metrics()
+    return {**get_system_metrics(), "db_pools": pool_metrics()}
 
 
 @system_ops_router.post("/backfill-compliance", response_model=BackfillResponse)
@@ -20,6 +20,7 @@ from app.workers.discovery.promote_discovered_slugs import run_promote_discovere
 from app.utils.backfill_compliance import backfill_missing_compliance_classes
 from app.utils.backfill_salary import backfill_missing_salary_fields
 from app.utils.backfill_department import backfill_missing_departments
+from app.utils.backfill_taxonomy import backfill_missing_taxonomy
 from app.workers.pipeline import run_pipeline
 import app.workers.ingestion.employer as employer_worker
 
@@ -63,6 +64,12 @@ def run_backfill_salary_task(limit: int = 5000):
     return {"status": "completed", "processed_jobs_count": result["processed"], "updated_jobs_count": result["updated"]}
 
 
+def run_backfill_taxonomy_task(limit: int = 5000):
+    result = backfill_missing_taxonomy(limit=limit)
+    logger.info("backfill_taxonomy completed", extra={"updated_jobs_count": result["updated"], "limit": limit})
+    return {"status": "completed", "processed_jobs_count": result["processed"], "updated_jobs_count": result["updated"]}
+
+
 def run_tick_task(incremental: bool = True, limit: int = 100):
     employer_worker.GLOBAL_INCREMENTAL_FETCH = incremental
     employer_worker.GLOBAL_COMPANIES_LIMIT = limit
@@ -82,6 +89,7 @@ TASK_MAP = {
     "backfill-department": backfill_missing_departments,
     "backfill-compliance": run_backfill_compliance_task,
     "backfill-salary": run_backfill_salary_task,
+    "backfill-taxonomy": run_backfill_taxonomy_task,
 }
 
 
@@ -144,7 +152,7 @@ def trigger_async_task(
 
     if task_name == "tick":
         result = func(incremental=incremental, limit=limit)
-    elif task_name in ("backfill-compliance", "backfill-salary"):
+    elif task_name in ("backfill-compliance", "backfill-salary", "backfill-taxonomy"):
         result = func(limit=limit)
     else:
         result = func()
@@ -182,7 +190,7 @@ def _enqueue_task_continuation(task_name: str, limit: int, request: Request) ->
 
 
 # Tasks that support self-chaining when they hit their per-run record cap.
-_CHAINABLE_BACKFILL_TASKS = {"backfill-compliance", "backfill-salary"}
+_CHAINABLE_BACKFILL_TASKS = {"backfill-compliance", "backfill-salary", "backfill-taxonomy"}
 
 
 @tasks_execute_router.post("/{task_name}/execute", response_model=TaskExecuteResponse)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Query
 from pydantic import BaseModel, ConfigDict
 
 from app.workers.market_types import DailyStats, SegmentItem
-from storage.db_engine import get_engine
+from storage.db_engine import get_read_engine
 from storage.repositories.market_repository import get_market_daily_stats
 from storage.repositories.market_segments_repository import get_market_segments_snapshot
 
@@ -29,7 +29,7 @@ def get_market_analytics(days: int = Query(30, ge=1, le=365)):
     Args:
         days: Number of days to return (1–365, default 30).
     """
-    with get_engine().connect() as conn:
+    with get_read_engine().connect() as conn:
         data = get_market_daily_stats(conn, days=days)
     return {"days": days, "count": len(data), "data": data}
 
@@ -37,7 +37,7 @@ def get_market_analytics(days: int = Query(30, ge=1, le=365)):
 @router.get("/segments", response_model=SegmentsAnalyticsResponse)
 def get_segment_analytics():
     """Return the most recent market snapshot broken down by segment type."""
-    with get_engine().connect() as conn:
+    with get_read_engine().connect() as conn:
         raw = get_market_segments_snapshot(conn)
     data = [
         SegmentItem(
@@ -4,6 +4,7 @@ from typing import Optional
 from fastapi import APIRouter, Query
 from pydantic import BaseModel, ConfigDict
 
+from app.api.pagination import decode_job_cursor, encode_job_cursor, next_cursor, validate_cursor_request
 from storage.repositories.paid_api_repository import get_paid_api_jobs
 
 router = APIRouter(prefix="/jobs", tags=["paid-api-v1"])
@@ -45,6 +46,8 @@ class PaginatedJobsResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 @router.get("", response_model=PaginatedJobsResponse)
@@ -67,13 +70,19 @@ def list_paid_jobs(
     first_seen_before: Optional[date] = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0, le=50_000),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from a previous page's next_cursor"),
 ):
     """Return paginated jobs with full canonical fields.
 
     Supports all filters including taxonomy (job_family, seniority, specialization),
     compliance (compliance_status, min/max compliance_score), geo/remote classification,
     and date range (first_seen_after, first_seen_before).
+
+    For full-dataset mirroring, follow `next_cursor` (keyset pagination) instead of
+    increasing `offset`; deep offsets scan and discard every preceding row.
     """
+    # q is a plain ILIKE filter here, so the default ordering (and cursor) still applies.
+    validate_cursor_request(cursor, offset=offset, q=None)
     items, total = get_paid_api_jobs(
         status=status,
         q=q,
@@ -93,5 +102,13 @@ def list_paid_jobs(
         first_seen_before=first_seen_before,
         limit=limit,
         offset=offset,
+        after=decode_job_cursor(cursor) if cursor else None,
     )
-    return {"items": items, "total": total, "limit": limit, "offset": offset}
+    return {
+        "items": items,
+        "total": total,
+        "total_is_estimate": getattr(total, "is_estimate", False),
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor(items, limit, encode_job_cursor),
+    }
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from html import unescape
 
 from app.domain.jobs.enums import GeoClass
@@ -85,7 +86,37 @@ def _extract_localization_section(description: str) -> str:
     return ""
 
 
+# remote_scope (and title) strings repeat across thousands of jobs; memoize the
+# structural parse per lowercased string. Bounded to keep worker memory flat.
+REMOTE_SCOPE_CACHE_SIZE = 8192
+
+
 def _classify_from_remote_scope(scope_l: str) -> dict | None:
+    result = _classify_from_remote_scope_cached(scope_l)
+    # Callers may return (and downstream code may mutate) the dict — hand out a copy.
+    return dict(result) if result else None
+
+
+def classify_remote_scope(remote_scope: str | None) -> dict | None:
+    """
+    Structural geo classification of a single remote_scope value
+    ({"geo_class", "reason", "eu_member_count"}), or None when it carries no signal.
+    """
+    return _classify_from_remote_scope((remote_scope or "").lower())
+
+
+def remote_scope_cache_info() -> dict:
+    info = _classify_from_remote_scope_cached.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+@lru_cache(maxsize=REMOTE_SCOPE_CACHE_SIZE)
+def _classify_from_remote_scope_cached(scope_l: str) -> dict | None:
     if not scope_l:
         return None
 
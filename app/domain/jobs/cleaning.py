@@ -172,6 +172,16 @@ def normalize_whitespace(text: str) -> str:
     return text.strip()
 
 
+_REMOTE_SCOPE_REPLACEMENTS = {
+    "remote - europe": "europe",
+    "remote europe": "europe",
+    "eu remote": "europe",
+    "remote eu": "europe",
+    "remote (eu)": "europe",
+    "remote worldwide": "worldwide",
+}
+
+
 def normalize_remote_scope(value: str | None) -> str:
     """
     Normalize remote/location strings across ATS providers.
@@ -181,16 +191,7 @@ def normalize_remote_scope(value: str | None) -> str:
 
     value = value.lower().strip()
 
-    replacements = {
-        "remote - europe": "europe",
-        "remote europe": "europe",
-        "eu remote": "europe",
-        "remote eu": "europe",
-        "remote (eu)": "europe",
-        "remote worldwide": "worldwide",
-    }
-
-    return replacements.get(value, value)
+    return _REMOTE_SCOPE_REPLACEMENTS.get(value, value)
 
 
 def clean_description(text: str, source: str) -> str:
@@ -0,0 +1,77 @@
+import hashlib
+import random
+import re
+from typing import Any
+
+from app.domain.jobs.identity import normalize
+
+# MinHash / LSH parameters. 16 bands x 4 rows puts the LSH "S-curve" inflection
+# around Jaccard ~0.5, so pairs above the default 0.8 threshold are almost always
+# bucketed together, while unrelated descriptions rarely share a band.
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 8
+MAX_TOKENS = 2000
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Deterministic permutations: signatures computed by different processes (and
+# different releases) must stay comparable, so the seed is fixed.
+_rng = random.Random(20260401)
+_PERMUTATIONS: tuple[tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)
+)
+
+
+def _shingle_hashes(text: str) -> set[int]:
+    tokens = _TOKEN_RE.findall(normalize(text))[:MAX_TOKENS]
+    if len(tokens) < SHINGLE_SIZE:
+        return set()
+
+    hashes = set()
+    for i in range(len(tokens) - SHINGLE_SIZE + 1):
+        shingle = " ".join(tokens[i : i + SHINGLE_SIZE])
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        hashes.add(int.from_bytes(digest, "big") & _MERSENNE_PRIME)
+    return hashes
+
+
+def compute_minhash_signature(description: Any, *, title: Any = "") -> list[int] | None:
+    """
+    Computes a MinHash signature over word 3-shingles of title + description.
+
+    Returns None when the text is too short for a meaningful similarity estimate
+    (such jobs are simply left out of the near-duplicate index).
+    """
+    hashes = _shingle_hashes(f"{title or ''} {description or ''}")
+    if len(hashes) < MIN_SHINGLES:
+        return None
+
+    values = list(hashes)
+    return [min((a * x + b) % _MERSENNE_PRIME for x in values) for a, b in _PERMUTATIONS]
+
+
+def compute_band_hashes(signature: list[int]) -> list[int]:
+    """
+    Collapses each LSH band (LSH_ROWS consecutive signature values) into a signed
+    64-bit hash so it fits a Postgres BIGINT column.
+    """
+    band_hashes = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS : (band + 1) * LSH_ROWS]
+        payload = b"".join(value.to_bytes(8, "big") for value in rows)
+        digest = hashlib.blake2b(payload, digest_size=8, person=band.to_bytes(2, "big")).digest()
+        band_hashes.append(int.from_bytes(digest, "big", signed=True))
+    return band_hashes
+
+
+def estimate_similarity(signature_a: list[int], signature_b: list[int]) -> float:
+    """Estimates Jaccard similarity as the fraction of matching MinHash slots."""
+    if not signature_a or not signature_b or len(signature_a) != len(signature_b):
+        return 0.0
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
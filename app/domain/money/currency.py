@@ -1,3 +1,7 @@
+import csv
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import Final
 
 # Mapping of text markers to ISO 4217 currency codes.
@@ -28,20 +32,49 @@ CURRENCY_MARKERS: Final[dict[str, str]] = {
     "bgn": "BGN",
 }
 
-EXCHANGE_RATES = {
-    "EUR": 1.0,
-    "USD": 0.92,
-    "GBP": 1.17,
-    "PLN": 0.23,
-    "CHF": 1.03,
-    "SEK": 0.09,
-    "NOK": 0.09,
-    "DKK": 0.13,
-    "CZK": 0.04,
-    "HUF": 0.0025,
-    "RON": 0.20,
-    "BGN": 0.51,
-}
+# Dated EUR conversion rates (currency, valid_from, rate_to_eur). The same file
+# seeds the `exchange_rates` table, so SQL-side re-normalization and ingestion
+# use identical rates. Add a row with a new valid_from to change a rate.
+EXCHANGE_RATES_FILE: Final[Path] = Path(__file__).with_name("exchange_rates.csv")
+
+
+@lru_cache(maxsize=4)
+def load_exchange_rate_history(path: Path = EXCHANGE_RATES_FILE) -> tuple[dict, ...]:
+    """
+    Parses the exchange-rate file into (currency, valid_from, rate_to_eur) rows.
+    Cached per path — call `clear_exchange_rate_cache()` after editing the file at runtime.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        return tuple(
+            {
+                "currency": row["currency"].strip().upper(),
+                "valid_from": date.fromisoformat(row["valid_from"].strip()),
+                "rate_to_eur": float(row["rate_to_eur"]),
+            }
+            for row in csv.DictReader(f)
+        )
+
+
+@lru_cache(maxsize=8)
+def exchange_rates_as_of(day: date) -> dict[str, float]:
+    """Latest rate per currency with valid_from <= day (in-process view of the rate table)."""
+    rates: dict[str, tuple[date, float]] = {}
+    for row in load_exchange_rate_history():
+        if row["valid_from"] > day:
+            continue
+        current = rates.get(row["currency"])
+        if current is None or row["valid_from"] > current[0]:
+            rates[row["currency"]] = (row["valid_from"], row["rate_to_eur"])
+    return {currency: rate for currency, (_, rate) in rates.items()}
+
+
+def current_exchange_rates() -> dict[str, float]:
+    return exchange_rates_as_of(datetime.now(timezone.utc).date())
+
+
+def clear_exchange_rate_cache() -> None:
+    load_exchange_rate_history.cache_clear()
+    exchange_rates_as_of.cache_clear()
 
 
 def detect_currency(text: str) -> str | None:
@@ -57,12 +90,12 @@ def detect_currency(text: str) -> str | None:
 
 def normalize_to_eur(amount: float, currency: str | None) -> float | None:
     """
-    Converts an amount to EUR using predefined exchange rates. Returns a float.
+    Converts an amount to EUR using the current exchange rates. Returns a float.
     """
     if not amount or not currency:
         return None
 
-    rate = EXCHANGE_RATES.get(currency.upper())
+    rate = current_exchange_rates().get(currency.upper())
     if not rate:
         return None
 
@@ -54,6 +54,15 @@ NEGATIVE_CONTEXT_PATTERN = re.compile(
 
 CURRENCY_CONTEXT_PATTERN = re.compile(r"[€$£]|\b(?:eur|usd|gbp|pln|zł)\b")
 
+# First-stage gate: one scan over the text for salary keywords (case-insensitive)
+# and currency markers. Only offsets found here become windows for the heavy
+# SALARY_REGEX_PATTERNS below; text without any hit is never parsed further.
+SALARY_SIGNAL_PATTERN = re.compile(r"(?i:" + SALARY_KEYWORDS_PATTERN.pattern + r")|" + CURRENCY_CONTEXT_PATTERN.pattern)
+
+# Every salary pattern needs at least one digit, so digit-free text/windows
+# can be skipped without changing results.
+_DIGIT_PATTERN = re.compile(r"\d")
+
 _CP = r"(?:[€$£]|\b(?:usd|eur|gbp|pln|zł)\b)"
 
 SALARY_REGEX_PATTERNS = [
@@ -228,24 +237,24 @@ def calculate_confidence(salary_match: SalaryMatch, text_window: str, full_text:
     return confidence
 
 
+def find_salary_signal_offsets(text: str) -> List[int]:
+    """
+    Returns sorted start offsets of salary keywords and currency markers,
+    found in a single pass over the text.
+    """
+    return [match.start() for match in SALARY_SIGNAL_PATTERN.finditer(text)]
+
+
 def find_salary_windows(text: str, window_size: int = 120) -> List[str]:
     """
     Identifies potential salary-related windows in the text based on keywords and currency symbols.
     Merges overlapping windows to avoid redundant parsing.
     """
-    found_keywords_indices = []
-
-    for match in SALARY_KEYWORDS_PATTERN.finditer(text):
-        found_keywords_indices.append(match.start())
-
-    for match in CURRENCY_CONTEXT_PATTERN.finditer(text):
-        found_keywords_indices.append(match.start())
+    found_keywords_indices = find_salary_signal_offsets(text)
 
     if not found_keywords_indices:
         return []
 
-    found_keywords_indices.sort()
-
     merged_windows = []
     current_start = -1
     current_end = -1
@@ -369,11 +378,17 @@ def extract_salary(description: str, title: Optional[str] = None) -> Dict[str, a
 
     full_text = f"{title or ''} {description or ''}".lower()
 
+    if not _DIGIT_PATTERN.search(full_text):
+        return None
+
     salary_windows = find_salary_windows(full_text)
 
     best_match: Optional[SalaryMatch] = None
 
     for window in salary_windows:
+        if not _DIGIT_PATTERN.search(window):
+            continue
+
         parsed_match = _parse_salary_match(window, full_text)
 
         if parsed_match:
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import Dict
 from .enums import JobFamily, JobRole, Seniority, Specialization
 
@@ -164,6 +165,52 @@ def _classify_seniority(title_lower: str) -> Seniority:
     return Seniority.UNKNOWN
 
 
+# Titles repeat heavily across ATS feeds ("Senior Software Engineer"), so the
+# regex work is memoized per (title, department). Bounded to keep memory flat
+# in long-running workers.
+TAXONOMY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=TAXONOMY_CACHE_SIZE)
+def _classify_cached(title_lower: str, department_lower: str) -> tuple[JobFamily, JobRole, Seniority, Specialization]:
+    family = JobFamily.UNKNOWN
+    if department_lower:
+        family = _classify_family(department_lower)
+    if family == JobFamily.UNKNOWN:
+        family = _classify_family(title_lower)
+
+    return (
+        family,
+        _classify_role(title_lower, family),
+        _classify_seniority(title_lower),
+        _classify_specialization(title_lower),
+    )
+
+
+def taxonomy_cache_info() -> dict:
+    """Hit/miss counters of the classification memo (for metrics and debugging)."""
+    info = _classify_cached.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+def clear_taxonomy_cache() -> None:
+    _classify_cached.cache_clear()
+
+
+def _coerce(enum_cls, value):
+    if value:
+        try:
+            return enum_cls(value)
+        except ValueError:
+            pass
+    return enum_cls.UNKNOWN
+
+
 # ------------------------------
 # PUBLIC API
 # ------------------------------
@@ -178,49 +225,27 @@ def classify_taxonomy(
     specialization: str | None = None,
 ) -> Dict[str, str]:
     title_lower = title.lower()
+    cached_family, cached_role, cached_seniority, cached_spec = _classify_cached(
+        title_lower, (department or "").lower()
+    )
 
-    family = JobFamily.UNKNOWN
-    if job_family:
-        try:
-            family = JobFamily(job_family)
-        except ValueError:
-            pass
-
-    if family == JobFamily.UNKNOWN and department:
-        family = _classify_family(department.lower())
-
+    family = _coerce(JobFamily, job_family)
     if family == JobFamily.UNKNOWN:
-        family = _classify_family(title_lower)
-
-    role = JobRole.UNKNOWN
-    if job_role:
-        try:
-            role = JobRole(job_role)
-        except ValueError:
-            pass
+        family = cached_family
 
+    role = _coerce(JobRole, job_role)
     if role == JobRole.UNKNOWN:
-        role = _classify_role(title_lower, family)
-
-    resolved_seniority = Seniority.UNKNOWN
-    if seniority:
-        try:
-            resolved_seniority = Seniority(seniority)
-        except ValueError:
-            pass
+        # The memoized role was derived for the classified family; an explicit
+        # family override needs its own role lookup.
+        role = cached_role if family == cached_family else _classify_role(title_lower, family)
 
+    resolved_seniority = _coerce(Seniority, seniority)
     if resolved_seniority == Seniority.UNKNOWN:
-        resolved_seniority = _classify_seniority(title_lower)
-
-    spec = Specialization.UNKNOWN
-    if specialization:
-        try:
-            spec = Specialization(specialization)
-        except ValueError:
-            pass
+        resolved_seniority = cached_seniority
 
+    spec = _coerce(Specialization, specialization)
     if spec == Specialization.UNKNOWN:
-        spec = _classify_specialization(title_lower)
+        spec = cached_spec
 
     return {
         "job_family": family.value,
@@ -3,13 +3,15 @@ from datetime import datetime, timezone
 import logging
 
 from app.domain.compliance.engine import apply_policy, ENGINE_POLICY_VERSION
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.compliance_repository import (
     get_jobs_for_compliance_backfill,
     update_job_compliance_data,
     insert_compliance_reports,
 )
 
+get_engine = engine_getter("maintenance")
+
 logger = logging.getLogger("openjobseu.backfill")
 
 # Records fetched, processed, and committed in one atomic unit.
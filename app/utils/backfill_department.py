@@ -1,7 +1,7 @@
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.ats_repository import load_active_ats_companies
 from app.domain.jobs.job_processing import process_ingested_job
 from storage.repositories.jobs_repository import update_job_department_and_taxonomy_bulk
@@ -9,6 +9,8 @@ from storage.repositories.jobs_repository import update_job_department_and_taxon
 import app.adapters.ats as ats  # noqa: F401
 from app.adapters.ats.registry import get_adapter
 
+get_engine = engine_getter("maintenance")
+
 logger = logging.getLogger("openjobseu.backfill")
 
 
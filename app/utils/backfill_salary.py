@@ -2,12 +2,14 @@ from datetime import datetime, timezone
 import logging
 
 from app.domain.money.salary_parser import extract_salary
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.salary_repository import (
     get_jobs_with_missing_salary,
     update_job_salaries_bulk,
 )
 
+get_engine = engine_getter("maintenance")
+
 logger = logging.getLogger("openjobseu.backfill")
 
 # Records fetched, processed, and committed in one atomic unit.
@@ -0,0 +1,62 @@
+import logging
+
+from app.domain.taxonomy.taxonomy import classify_taxonomy, taxonomy_cache_info
+from storage.db_engine import engine_getter
+from storage.repositories.jobs_repository import get_jobs_missing_taxonomy, update_job_taxonomy_bulk
+
+get_engine = engine_getter("maintenance")
+
+logger = logging.getLogger("openjobseu.backfill")
+
+# Records fetched, classified, and committed in one atomic unit.
+CHUNK_SIZE = 500
+
+
+def backfill_missing_taxonomy(limit: int = 5000) -> dict:
+    """
+    Persists taxonomy (job_family, job_role, seniority, specialization) for jobs
+    that have no job_family yet, so readers such as the feed exporter never
+    have to classify on the fly.
+
+    Every fetched job gets a non-NULL job_family (possibly "unknown"), so each
+    chunk always makes progress and a re-run never re-fetches the same rows.
+
+    Returns {"processed": int, "updated": int}.
+    """
+    engine = get_engine()
+
+    total_processed = 0
+    total_updated = 0
+
+    while total_processed < limit:
+        chunk_size = min(CHUNK_SIZE, limit - total_processed)
+
+        with engine.connect() as conn:
+            rows = get_jobs_missing_taxonomy(conn, chunk_size)
+
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            taxonomy = classify_taxonomy(
+                title=str(row.get("title") or ""),
+                department=row.get("source_department"),
+                job_role=row.get("job_role"),
+                seniority=row.get("seniority"),
+                specialization=row.get("specialization"),
+            )
+            updates.append({"job_id": row["job_id"], **taxonomy})
+
+        with engine.begin() as conn:
+            total_updated += update_job_taxonomy_bulk(conn, updates)
+
+        total_processed += len(rows)
+        if len(rows) < chunk_size:
+            break
+
+    logger.info(
+        "taxonomy_backfill finished",
+        extra={"processed": total_processed, "updated": total_updated, "taxonomy_cache": taxonomy_cache_info()},
+    )
+    return {"processed": total_processed, "updated": total_updated}
@@ -4,29 +4,35 @@ import os
 from datetime import datetime, timezone
 
 from storage.repositories.audit_repository import (
+    AUDIT_COMPANY_STATS_MIN_TOTAL_JOBS,
     get_audit_company_compliance_stats,
     get_audit_source_compliance_stats_last_7d,
     get_failing_ats_integrations,
     get_rejection_reasons_by_source,
     get_source_compliance_trend,
 )
+from storage.audit_cache import audit_cache_info, cached_audit_query
+from storage.db_engine import read_engine_profile
 from storage.repositories.system_repository import get_system_metrics
 
 logger = logging.getLogger("openjobseu.runtime")
 
 
 def _build_snapshot() -> dict:
+    # Refreshed after the tick's writes; the audit panel then reads these results from the cache.
     return {
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "metrics": get_system_metrics(),
         "ats_health": {
             "days_threshold": 3,
-            "items": get_failing_ats_integrations(days_threshold=3),
+            "items": cached_audit_query(get_failing_ats_integrations, refresh=True, days_threshold=3),
         },
-        "source_trend": get_source_compliance_trend(days=30),
-        "rejection_reasons": get_rejection_reasons_by_source(days=30),
-        "company_stats": get_audit_company_compliance_stats(min_total_jobs=5),
-        "source_7d": get_audit_source_compliance_stats_last_7d(),
+        "source_trend": cached_audit_query(get_source_compliance_trend, refresh=True, days=30),
+        "rejection_reasons": cached_audit_query(get_rejection_reasons_by_source, refresh=True, days=30),
+        "company_stats": cached_audit_query(
+            get_audit_company_compliance_stats, refresh=True, min_total_jobs=AUDIT_COMPANY_STATS_MIN_TOTAL_JOBS
+        ),
+        "source_7d": cached_audit_query(get_audit_source_compliance_stats_last_7d, refresh=True),
     }
 
 
@@ -40,7 +46,10 @@ def run_audit_export() -> dict:
     try:
         from google.cloud import storage
 
-        snapshot = _build_snapshot()
+        # The aggregations are shared with the audit endpoints; from the tick they run
+        # on the maintenance pool and timeout instead of the request-serving api one.
+        with read_engine_profile("maintenance"):
+            snapshot = _build_snapshot()
         payload = json.dumps(snapshot, default=str)
 
         client = storage.Client()
@@ -53,5 +62,5 @@ def run_audit_export() -> dict:
         logger.exception("audit_export_failed", extra={"error": str(e)})
         return {"status": "error", "error": str(e)}
 
-    logger.info("audit_export_done", extra={"bucket": bucket_name})
+    logger.info("audit_export_done", extra={"bucket": bucket_name, "audit_cache": audit_cache_info()})
     return {"status": "ok"}
@@ -4,13 +4,15 @@ import logging
 import requests
 import os
 import time
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.availability_repository import (
     get_jobs_for_verification,
     update_jobs_availability,
 )
 from app.adapters.ats.base import TimeoutSession
 
+get_engine = engine_getter("maintenance")
+
 logger = logging.getLogger("openjobseu.worker.availability")
 
 
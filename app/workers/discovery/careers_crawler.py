@@ -12,13 +12,15 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs
 
 from app.workers.discovery.ats_probe import probe_ats
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.discovery_repository import (
     insert_discovered_company_ats,
     load_discovery_companies,
     update_discovery_last_checked_at,
 )
 
+get_engine = engine_getter("discovery")
+
 logger = logging.getLogger("openjobseu.discovery")
 
 MAX_COMPANIES_PER_RUN = 10
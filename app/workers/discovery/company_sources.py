@@ -5,12 +5,14 @@ import zipfile
 import requests
 import time
 
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.discovery_repository import (
     insert_source_company,
     get_existing_brand_names,
 )
 
+get_engine = engine_getter("discovery")
+
 # Re-exports for compatibility with endpoints  internal.py
 
 logger = logging.getLogger("openjobseu.discovery")
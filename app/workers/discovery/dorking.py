@@ -6,9 +6,11 @@ from urllib.parse import urlparse
 from app.adapters.ats.registry import get_adapter, list_providers
 from app.utils.google_search import google_custom_search
 from app.utils.serper_search import serper_search
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.discovery_repository import insert_discovered_slugs
 
+get_engine = engine_getter("discovery")
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,9 +13,11 @@ import time
 import requests
 
 from app.adapters.ats.registry import get_adapter, list_providers
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.discovery_repository import insert_discovered_slugs
 
+get_engine = engine_getter("discovery")
+
 logger = logging.getLogger(__name__)
 
 # Providers whose slug is a subdomain of dorking_target (e.g. slug.traffit.com)
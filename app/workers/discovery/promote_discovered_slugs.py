@@ -5,7 +5,7 @@ import time
 from datetime import datetime, timezone, timedelta
 
 from app.workers.discovery.ats_probe import probe_ats
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.discovery_repository import (
     get_or_create_placeholder_company,
     insert_discovered_company_ats,
@@ -13,6 +13,8 @@ from storage.repositories.discovery_repository import (
     update_discovered_slug_status,
 )
 
+get_engine = engine_getter("discovery")
+
 logger = logging.getLogger("openjobseu.discovery")
 
 QUALITY_MIN_JOBS = 1
@@ -11,7 +11,7 @@ from urllib.robotparser import RobotFileParser
 import requests
 from bs4 import BeautifulSoup
 
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.discovery_repository import (
     insert_discovered_slugs,
     insert_discovered_slug,
@@ -19,6 +19,8 @@ from storage.repositories.discovery_repository import (
     load_discovery_companies,
 )
 
+get_engine = engine_getter("discovery")
+
 logger = logging.getLogger("openjobseu.discovery")
 
 MAX_COMPANIES_PER_RUN = 20
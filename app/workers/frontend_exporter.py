@@ -20,7 +20,7 @@ from app.workers.market_types import (
     SegmentsMeta,
     SegmentsResponse,
 )
-from storage.db_engine import get_engine
+from storage.db_engine import get_read_engine
 from storage.repositories.market_repository import get_active_jobs_compliance_counts, get_market_daily_stats
 from storage.repositories.market_segments_repository import _normalize_country_rows, get_market_segments_snapshot
 
@@ -115,8 +115,6 @@ def _export_feed(bucket) -> tuple[int, int]:
         FEED_MIN_COMPLIANCE_SCORE,
     )
 
-    from app.domain.taxonomy.taxonomy import classify_taxonomy
-
     jobs = get_jobs(
         status="visible",
         min_compliance_score=FEED_MIN_COMPLIANCE_SCORE,
@@ -124,18 +122,8 @@ def _export_feed(bucket) -> tuple[int, int]:
         offset=0,
     )
 
-    # Enrich jobs that have no job_family in the DB (historical data ingested before
-    # taxonomy classification was wired up). classify_taxonomy() is pure/fast — no I/O.
-    for job in jobs:
-        if not job.get("job_family") or job["job_family"] == "unknown":
-            result = classify_taxonomy(
-                title=str(job.get("title") or ""),
-                department=job.get("source_department"),
-            )
-            family = result.get("job_family")
-            if family and family != "unknown":
-                job["job_family"] = family
-
+    # Taxonomy is persisted at ingestion and backfilled by maintenance
+    # (backfill_missing_taxonomy), so the exporter only reads stored values.
     departments = Counter(job["job_family"] for job in jobs if job.get("job_family") and job["job_family"] != "unknown")
     departments_list = [{"name": name, "count": count} for name, count in departments.items()]
 
@@ -226,7 +214,7 @@ def _export_market_stats(bucket, chart_base_url: str) -> tuple[int, int]:
     3. Serialize MarketStatsResponse and upload as market-stats.json.
     Returns (rows_exported, charts_uploaded).
     """
-    engine = get_engine()
+    engine = get_read_engine(profile="maintenance")
     with engine.connect() as conn:
         raw_rows = get_market_daily_stats(conn, days=30)
         compliance_counts = get_active_jobs_compliance_counts(conn)
@@ -259,7 +247,7 @@ def _export_market_segments(bucket) -> int:
     3. Serialize as SegmentsResponse and upload as market-segments.json.
     Returns count of segment rows exported.
     """
-    engine = get_engine()
+    engine = get_read_engine(profile="maintenance")
     with engine.connect() as conn:
         raw_rows = get_market_segments_snapshot(conn)
 
@@ -8,7 +8,7 @@ import app.adapters.ats as ats  # noqa: F401
 from app.adapters.ats.registry import get_adapter
 from app.domain.jobs.enums import RemoteClass
 
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.ats_repository import (
     load_active_ats_companies,
     mark_ats_synced,
@@ -20,6 +20,8 @@ from app.workers.ingestion.fetch import FetchCompanyJobsError, fetch_company_job
 from app.workers.ingestion.metrics import IngestionMetrics
 from app.workers.ingestion.process_loop import process_company_jobs
 
+get_engine = engine_getter("ingestion")
+
 logger = logging.getLogger("openjobseu.ingestion.employer")
 SOURCE = "employer_ing"
 
@@ -36,6 +38,9 @@ def _merge_metrics(target: IngestionMetrics, source: IngestionMetrics):
     target.hard_geo_rejected_count += source.hard_geo_rejected_count
     target.salary_detected += source.salary_detected
     target.salary_missing += source.salary_missing
+    target.jobs_inserted += source.jobs_inserted
+    target.jobs_updated += source.jobs_updated
+    target.jobs_touched += source.jobs_touched
 
     for reason, count in source.rejected_by_reason.items():
         target.rejected_by_reason[reason] += count
@@ -244,6 +249,7 @@ def run_employer_ingestion() -> dict:
         RemoteClass.UNKNOWN.value: 0,
     }
     total_hard_geo_rejected = 0
+    job_writes = {"jobs_inserted": 0, "jobs_updated": 0, "jobs_touched": 0}
 
     try:
         tick_context = get_current_tick_context()
@@ -296,6 +302,8 @@ def run_employer_ingestion() -> dict:
                     for key in remote_model_counts:
                         remote_model_counts[key] += int(source_remote_model.get(key, 0) or 0)
                     total_hard_geo_rejected += int(result.get("hard_geo_rejected_count", 0) or 0)
+                    for key in job_writes:
+                        job_writes[key] += int(result.get(key, 0) or 0)
 
                 except Exception:
                     company_context = futures[future]
@@ -367,6 +375,7 @@ def run_employer_ingestion() -> dict:
         companies_invalid_slug=companies_invalid_slug,
         synced_ats_count=synced_ats_count,
         hard_geo_rejected_count=total_hard_geo_rejected,
+        **job_writes,
         companies_load_duration_ms=companies_load_duration_ms,
         ingestion_loop_duration_ms=ingestion_loop_duration_ms,
         duration_ms=duration_ms,
@@ -394,6 +403,7 @@ def run_employer_ingestion() -> dict:
             "synced_ats_count": synced_ats_count,
             "accepted_jobs": total_accepted,
             "hard_geo_rejected_count": total_hard_geo_rejected,
+            **job_writes,
             "duration_ms": duration_ms,
             **tick_context,
         },
@@ -32,6 +32,9 @@ class IngestionMetrics:
         }
         self.salary_detected = 0
         self.salary_missing = 0
+        self.jobs_inserted = 0
+        self.jobs_updated = 0
+        self.jobs_touched = 0
 
     def observe_normalized(self):
         self.normalized += 1
@@ -61,6 +64,11 @@ class IngestionMetrics:
         else:
             self.salary_missing += 1
 
+    def observe_job_writes(self, write_counts: dict[str, int]):
+        self.jobs_inserted += write_counts.get("inserted", 0)
+        self.jobs_updated += write_counts.get("updated", 0)
+        self.jobs_touched += write_counts.get("touched", 0)
+
     def to_result_dict(self) -> dict:
         return {
             "fetched": self.fetched,
@@ -73,4 +81,7 @@ class IngestionMetrics:
             "hard_geo_rejected_count": self.hard_geo_rejected_count,
             "salary_detected": self.salary_detected,
             "salary_missing": self.salary_missing,
+            "jobs_inserted": self.jobs_inserted,
+            "jobs_updated": self.jobs_updated,
+            "jobs_touched": self.jobs_touched,
         }
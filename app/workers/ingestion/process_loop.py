@@ -91,7 +91,9 @@ def process_company_jobs(
 
     # Bulk-persist all jobs in a single batch (replaces N × upsert_job calls).
     job_list = [job for job, _ in pending]
-    canonical_ids = bulk_upsert_jobs(job_list, conn, company_id=company_id, source=provider)
+    write_counts: dict[str, int] = {}
+    canonical_ids = bulk_upsert_jobs(job_list, conn, company_id=company_id, source=provider, write_counts=write_counts)
+    metrics.observe_job_writes(write_counts)
 
     compliance_reports_bulk = []
     salary_cases_bulk = []
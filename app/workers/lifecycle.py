@@ -1,10 +1,17 @@
-from storage.repositories.lifecycle_repository import (
-    activate_new_jobs_due_to_lifecycle,
-    expire_jobs_due_to_lifecycle,
-    mark_reposts_due_to_lifecycle,
-    reactivate_stale_jobs_due_to_lifecycle,
-    stale_active_jobs_due_to_lifecycle,
-)
+import os
+
+from app.domain.jobs.near_duplicates import DEFAULT_SIMILARITY_THRESHOLD
+from storage.repositories.lifecycle_repository import apply_lifecycle_transitions, mark_reposts_due_to_lifecycle
+from storage.repositories.near_duplicates_repository import link_near_duplicates_due_to_lifecycle
+
+
+def _near_duplicate_threshold() -> float:
+    raw = os.getenv("NEAR_DUPLICATE_THRESHOLD", str(DEFAULT_SIMILARITY_THRESHOLD))
+    try:
+        parsed = float(raw)
+        return parsed if 0.0 < parsed <= 1.0 else DEFAULT_SIMILARITY_THRESHOLD
+    except (TypeError, ValueError):
+        return DEFAULT_SIMILARITY_THRESHOLD
 
 
 def run_lifecycle_rules() -> None:
@@ -15,14 +22,24 @@ def run_lifecycle_rules() -> None:
     run_lifecycle_pipeline()
 
 
-def run_lifecycle_pipeline() -> None:
+def run_lifecycle_pipeline() -> dict:
     """
     Apply lifecycle rules to all eligible jobs using efficient, set-based SQL queries.
-    This is much more performant than fetching jobs and processing them in Python.
+    Status transitions (expire, stale, activate, reactivate) are computed in one
+    scan and applied in batches, expire first; reposts and near-duplicates follow.
     """
-    # Order matters: expire first to remove jobs from other transitions.
-    expire_jobs_due_to_lifecycle()
-    stale_active_jobs_due_to_lifecycle()
-    activate_new_jobs_due_to_lifecycle()
-    reactivate_stale_jobs_due_to_lifecycle()
-    mark_reposts_due_to_lifecycle()
+    transitions = apply_lifecycle_transitions()
+    reposts_marked = mark_reposts_due_to_lifecycle()
+    near_duplicates_linked = link_near_duplicates_due_to_lifecycle(threshold=_near_duplicate_threshold())
+    return {
+        "actions": ["lifecycle_pipeline_completed"],
+        "metrics": {
+            "status": "ok",
+            "expired": transitions["expire"],
+            "staled": transitions["stale"],
+            "activated": transitions["activate"],
+            "reactivated": transitions["reactivate"],
+            "reposts_marked": reposts_marked,
+            "near_duplicates_linked": near_duplicates_linked,
+        },
+    }
@@ -1,16 +1,31 @@
 import logging
 import os
 import uuid
-from time import perf_counter
+from datetime import datetime, timezone
+from time import perf_counter, time
 
+from app.domain.money.currency import load_exchange_rate_history
 from app.utils.backfill_compliance import backfill_missing_compliance_classes
 from app.utils.backfill_department import backfill_missing_departments
 from app.utils.backfill_salary import backfill_missing_salary_fields
+from app.utils.backfill_taxonomy import backfill_missing_taxonomy
 from app.utils.cloud_tasks import create_tick_task, is_tick_queue_configured
+from storage.db_engine import engine_getter
+from storage.repositories.compliance_repository import delete_orphaned_compliance_decisions
+from storage.repositories.exchange_rates_repository import apply_pending_exchange_rates, sync_exchange_rates
+from storage.repositories.jobs_repository import fold_job_sightings
 from storage.repositories.maintenance_repository import (
-    update_company_stats_and_posture_bulk,
-    update_company_signal_scores_bulk,
+    mark_company_stats_reconciliation_slice,
+    refresh_dirty_company_stats,
 )
+from storage.repositories.partitions_repository import apply_partition_retention, ensure_monthly_partitions
+from storage.repositories.system_repository import (
+    compact_system_counters,
+    reconcile_system_counters,
+    system_counters_reconciled_since,
+)
+
+get_engine = engine_getter("maintenance")
 
 logger = logging.getLogger("openjobseu.maintenance")
 
@@ -24,28 +39,101 @@ def _lag_warning_threshold_ms() -> int:
         return 60000
 
 
-def _update_company_stats_and_posture() -> int:
+def _refresh_company_stats() -> dict:
     """
-    Single-pass update for per-company job statistics and remote posture.
-
-    Replaces the former separate `_update_company_job_stats` and
-    `_update_company_remote_posture` calls. One scan of `jobs`, one UPDATE
-    on `companies` per batch — covers:
+    Recomputes per-company job statistics, remote posture and signal score for
+    companies marked dirty since the last tick (company_stats_dirty):
       - approved_jobs_count, rejected_jobs_count, total_jobs_count, last_active_job_at
       - remote_posture upgrade (UNKNOWN → REMOTE_FRIENDLY when remote_cnt >= 3)
+      - signal_score (posture, EU entity, EU HQ, approval ratio, salary transparency)
+    Each tick also marks one of COMPANY_STATS_RECONCILE_SLICES (default 24) hash
+    slices of all companies, one slice per hour, as a full reconciliation.
+    """
+    slices = _env_int("COMPANY_STATS_RECONCILE_SLICES", 24) or 1
+    slot = int(time() // 3600)
+    with get_engine().begin() as conn:
+        mark_company_stats_reconciliation_slice(conn, slices=slices, slot=slot)
+    return refresh_dirty_company_stats()
+
+
+def _sync_exchange_rates() -> int:
     """
-    return update_company_stats_and_posture_bulk()
+    Syncs app/domain/money/exchange_rates.csv into `exchange_rates` and applies
+    any rate that came into force to jobs.salary_*_eur in one set-based UPDATE.
+    """
+    with get_engine().begin() as conn:
+        sync_exchange_rates(conn, list(load_exchange_rate_history()))
+        result = apply_pending_exchange_rates(conn)
+    if result["currencies"]:
+        logger.info("exchange_rates_applied", extra=result)
+    return result["jobs_updated"]
+
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        parsed = int(os.getenv(name, default))
+        return parsed if parsed >= 0 else default
+    except (TypeError, ValueError):
+        return default
+
+
+# Retention per monthly-partitioned history table: env var and default in months.
+_PARTITION_RETENTION = {
+    "job_snapshots": ("JOB_SNAPSHOTS_RETENTION_MONTHS", 24),
+    "compliance_reports": ("COMPLIANCE_REPORTS_RETENTION_MONTHS", 12),
+}
 
-def _update_company_signal_scores() -> int:
+
+def _maintain_partitions() -> dict:
     """
-    Updates the signal_score for all companies based on rules:
-    - Remote posture (REMOTE_ONLY: 40, REMOTE_FRIENDLY: 20)
-    - EU entity verified: 25
-    - HQ in EU: 20
-    - Historical approval ratio (>= 80%: 15, >= 50%: 8)
+    Creates monthly partitions PARTITION_MONTHS_AHEAD (default 3) months ahead and
+    removes partitions past each table's retention. PARTITION_RETENTION_MODE=detach
+    only detaches expired partitions (for archiving) instead of dropping them.
+    Decisions cached for expired compliance reports are deleted with them.
     """
-    return update_company_signal_scores_bulk()
+    months_ahead = _env_int("PARTITION_MONTHS_AHEAD", 3)
+    detach_only = os.getenv("PARTITION_RETENTION_MODE", "drop").strip().lower() == "detach"
+    created, expired = [], []
+    with get_engine().begin() as conn:
+        for table, (env_name, default_months) in _PARTITION_RETENTION.items():
+            created += ensure_monthly_partitions(conn, table, months_ahead=months_ahead)
+            expired_now = apply_partition_retention(
+                conn, table, retention_months=_env_int(env_name, default_months), detach_only=detach_only
+            )
+            if table == "compliance_reports" and expired_now:
+                delete_orphaned_compliance_decisions(conn)
+            expired += expired_now
+    if created or expired:
+        logger.info("partitions_maintained", extra={"created": created, "expired": expired})
+    return {"created": len(created), "expired": len(expired)}
+
+
+def _maintain_system_counters() -> dict:
+    """
+    Folds the trigger-appended system_counters deltas every tick. Once a day, on
+    the first tick at or after the UTC hour SYSTEM_COUNTERS_RECONCILE_HOUR
+    (default 3), the counters are instead replaced by exact counts, repairing
+    any drift; the recount's marker row tells later ticks it already ran.
+    """
+    reconcile_hour = min(_env_int("SYSTEM_COUNTERS_RECONCILE_HOUR", 3), 23)
+    now = datetime.now(timezone.utc)
+    due_at = now.replace(hour=reconcile_hour, minute=0, second=0, microsecond=0)
+    with get_engine().begin() as conn:
+        if now >= due_at and not system_counters_reconciled_since(conn, due_at):
+            totals = reconcile_system_counters(conn)
+            logger.info("system_counters_reconciled", extra=totals)
+            return {"compacted": 0, "reconciled": 1}
+        return {"compacted": compact_system_counters(conn), "reconciled": 0}
+
+
+def _fold_job_sightings() -> int:
+    """
+    Folds the sightings recorded for unchanged, still-listed jobs into jobs and
+    job_sources once a job's stored last_seen_at is JOB_SIGHTINGS_FOLD_HOURS
+    (default 6) old.
+    """
+    with get_engine().begin() as conn:
+        return fold_job_sightings(conn, fold_after_hours=_env_int("JOB_SIGHTINGS_FOLD_HOURS", 6))
 
 
 _BACKFILL_SALARY_LIMIT = 5000
@@ -63,6 +151,20 @@ def _run_backfill_salary() -> int:
     return result["updated"]
 
 
+_BACKFILL_TAXONOMY_LIMIT = 5000
+
+
+def _run_backfill_taxonomy() -> int:
+    """
+    Persists taxonomy for jobs without job_family — one pass of up to BACKFILL_TAXONOMY_LIMIT.
+    Every processed job gets a job_family, so a continuation always makes progress.
+    """
+    result = backfill_missing_taxonomy(limit=_BACKFILL_TAXONOMY_LIMIT)
+    if result["processed"] >= _BACKFILL_TAXONOMY_LIMIT and is_tick_queue_configured():
+        _enqueue_backfill_continuation("backfill-taxonomy", _BACKFILL_TAXONOMY_LIMIT)
+    return result["updated"]
+
+
 def _run_backfill_department() -> int:
     """
     Backfills missing department fields by re-fetching from ATS.
@@ -117,23 +219,48 @@ def _run_backfill_compliance() -> int:
 def run_maintenance_pipeline() -> dict:
     started = perf_counter()
     metrics = {
+        "job_sightings_folded": 0,
+        "companies_refreshed": 0,
         "company_stats_updated": 0,
         "scores_updated": 0,
+        "salary_eur_renormalized": 0,
         "salary_backfilled": 0,
         "department_backfilled": 0,
+        "taxonomy_backfilled": 0,
         "compliance_backfilled": 0,
+        "partitions_created": 0,
+        "partitions_expired": 0,
+        "system_counters_compacted": 0,
+        "system_counters_reconciled": 0,
     }
 
     try:
-        # Company-level updates — single scan of `jobs` for stats + posture, then signal score
-        metrics["company_stats_updated"] = _update_company_stats_and_posture()
-        metrics["scores_updated"] = _update_company_signal_scores()
+        # Last-seen bookkeeping of unchanged jobs, before anything aggregates it
+        metrics["job_sightings_folded"] = _fold_job_sightings()
+
+        # Company-level updates — stats + posture, then signal score, for dirty companies only
+        companies = _refresh_company_stats()
+        metrics["companies_refreshed"] = companies["companies"]
+        metrics["company_stats_updated"] = companies["stats_updated"]
+        metrics["scores_updated"] = companies["scores_updated"]
 
         # Job-level backfills
+        metrics["salary_eur_renormalized"] = _sync_exchange_rates()
         metrics["salary_backfilled"] = _run_backfill_salary()
         metrics["department_backfilled"] = _run_backfill_department()
+        metrics["taxonomy_backfilled"] = _run_backfill_taxonomy()
         metrics["compliance_backfilled"] = _run_backfill_compliance()
 
+        # History tables — partitions ahead of time, retention behind
+        partitions = _maintain_partitions()
+        metrics["partitions_created"] = partitions["created"]
+        metrics["partitions_expired"] = partitions["expired"]
+
+        # /system/metrics counters — fold deltas, exact recount once a day
+        counters = _maintain_system_counters()
+        metrics["system_counters_compacted"] = counters["compacted"]
+        metrics["system_counters_reconciled"] = counters["reconciled"]
+
         metrics["status"] = "ok"
     except Exception as e:
         logger.error("maintenance pipeline failed", exc_info=True)
@@ -1,31 +1,53 @@
 import logging
+import os
 import time
 from datetime import datetime, timezone
 
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.repositories.market_repository import (
     compute_market_stats,
+    compute_market_stats_from_rollup,
     insert_market_daily_stats,
 )
+from storage.repositories.market_rollup_repository import fold_market_rollup_deltas
 from storage.repositories.market_segments_repository import (
     compute_market_segments,
+    compute_market_segments_from_rollup,
     insert_market_segments,
 )
 
+get_engine = engine_getter("maintenance")
+
 logger = logging.getLogger("openjobseu.worker.market_metrics")
 
 
+def _use_scope_lookup() -> bool:
+    """MARKET_SEGMENTS_SCOPE_LOOKUP=1 switches country segments to the persisted remote_scope lookup."""
+    return os.getenv("MARKET_SEGMENTS_SCOPE_LOOKUP", "").strip().lower() in ("1", "true", "yes")
+
+
+def _use_full_scan() -> bool:
+    """MARKET_METRICS_SOURCE=scan recomputes everything from the jobs table instead of market_rollup."""
+    return os.getenv("MARKET_METRICS_SOURCE", "rollup").strip().lower() == "scan"
+
+
 def run_market_metrics_worker() -> dict:
     start_time = time.perf_counter()
     today = datetime.now(timezone.utc).date()
     db_engine = get_engine()
+    full_scan = _use_full_scan()
+    deltas_folded = 0
 
     try:
         with db_engine.begin() as conn:
-            stats = compute_market_stats(conn, today)
+            if full_scan:
+                stats = compute_market_stats(conn, today)
+                segment_rows = compute_market_segments(conn, today, use_scope_lookup=_use_scope_lookup())
+            else:
+                deltas_folded = fold_market_rollup_deltas(conn)
+                stats = compute_market_stats_from_rollup(conn, today)
+                segment_rows = compute_market_segments_from_rollup(conn, today)
             insert_market_daily_stats(conn, stats)
-
-            segment_rows = compute_market_segments(conn, today)
             insert_market_segments(conn, segment_rows)
 
         duration_ms = int((time.perf_counter() - start_time) * 1000)
@@ -38,6 +60,8 @@ def run_market_metrics_worker() -> dict:
             "jobs_active": stats["jobs_active"],
             "jobs_reposted": stats["jobs_reposted"],
             "segments_count": len(segment_rows),
+            "source": "scan" if full_scan else "rollup",
+            "rollup_deltas_folded": deltas_folded,
             "duration_ms": duration_ms,
         }
         logger.info("market_metrics_completed", extra=metrics)
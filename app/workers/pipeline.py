@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime, timezone
 import sys
-from time import perf_counter
+from time import monotonic, perf_counter
 from typing import Any
 
 from app.utils.tick_context import reset_current_tick_context, set_current_tick_context
@@ -14,6 +14,9 @@ from app.workers.market_metrics import run_market_metrics_worker
 from app.workers.maintenance import run_maintenance_pipeline
 from app.workers.frontend_exporter import run_frontend_export
 from app.workers.audit_exporter import run_audit_export
+from storage.audit_cache import invalidate_audit_cache
+from storage.count_strategy import invalidate_count_cache
+from storage.db_engine import note_primary_write
 
 # Definiujemy __all__, aby poinformować analizatory statyczne (i Ruffa),
 # że te funkcje są częścią publicznego interfejsu tego modułu i muszą w nim pozostać.
@@ -64,6 +67,7 @@ def run_pipeline(group: str = "all", context: dict[str, Any] | None = None) -> d
     context = dict(context or {})
     tick_started_at = datetime.now(timezone.utc).isoformat()
     tick_started_perf = perf_counter()
+    tick_started_monotonic = monotonic()
     token = set_current_tick_context(context)
 
     actions = []
@@ -96,6 +100,9 @@ def run_pipeline(group: str = "all", context: dict[str, Any] | None = None) -> d
                 if "metrics" in result:
                     metrics[step_name] = result["metrics"]
 
+                # Later steps (exporters) read through the read engine; they must see this step's writes.
+                note_primary_write()
+
             except Exception as e:
                 logger.exception(
                     f"Step {step_name} failed: {e}",
@@ -104,6 +111,10 @@ def run_pipeline(group: str = "all", context: dict[str, Any] | None = None) -> d
                 metrics[step_name] = {"status": "error", **context}
     finally:
         reset_current_tick_context(token)
+        # The tick changed jobs/companies; cached listing totals are stale now.
+        invalidate_count_cache()
+        # Audit results from before the tick are stale too; the exporter's fresh ones stay.
+        invalidate_audit_cache(stored_before=tick_started_monotonic)
 
     tick_finished_at = datetime.now(timezone.utc).isoformat()
     tick_duration_ms = int((perf_counter() - tick_started_perf) * 1000)
@@ -294,7 +294,7 @@ async function loadJobs(includeCounts = true) {
   const data = await response.json();
 
   if (includeCounts) {
-    document.getElementById("total-count").textContent = String(data.total || 0);
+    document.getElementById("total-count").textContent = (data.total_is_estimate ? "~" : "") + String(data.total || 0);
     renderCountMap("count-status", data.counts?.status || {});
     renderCountMap("count-source", data.counts?.source || {});
     renderCountMap("count-compliance", data.counts?.compliance_status || {});
@@ -26,7 +26,12 @@ def main():
         # Pobieramy tylko te opisy, które w ogóle mają znak '<' i '>', by nie obciążać pamięci
         rows = (
             conn.execute(
-                text("SELECT job_id, source, company_name, description FROM jobs WHERE description LIKE '%<%>%'")
+                text("""
+                    SELECT j.job_id, j.source, j.company_name, t.description
+                    FROM jobs j
+                    JOIN job_texts t ON t.job_id = j.job_id
+                    WHERE t.description LIKE '%<%>%'
+                """)
             )
             .mappings()
             .all()
@@ -0,0 +1,46 @@
+import argparse
+import logging
+import os
+import sys
+
+# Zapewnienie dostępu do modułów projektu
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from storage.db_engine import get_engine
+from storage.repositories.near_duplicates_repository import (
+    get_jobs_missing_signatures,
+    sync_job_signatures,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill MinHash signatures for jobs missing from the LSH index.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    after_job_id = ""
+    total_scanned = 0
+    total_signed = 0
+
+    while True:
+        with engine.begin() as conn:
+            rows = get_jobs_missing_signatures(conn, after_job_id=after_job_id, limit=args.chunk_size)
+            if not rows:
+                break
+            total_signed += sync_job_signatures(conn, rows)
+
+        total_scanned += len(rows)
+        after_job_id = rows[-1]["job_id"]
+        logger.info(f"Przetworzono {total_scanned} ofert, zapisano {total_signed} sygnatur...")
+
+    logger.info(f"Gotowe! Zeskanowano {total_scanned} ofert, zapisano {total_signed} sygnatur.")
+
+
+if __name__ == "__main__":
+    main()
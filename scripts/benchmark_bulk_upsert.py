@@ -0,0 +1,196 @@
+"""
+Benchmarks bulk upserts: executemany over a VALUES statement vs. one unnest() statement.
+
+Creates scratch UNLOGGED copies of `jobs` and `job_sources` (same columns, defaults
+and indexes, no foreign keys or triggers) in the `bench_bulk_upsert` schema and
+writes synthetic batches of each size twice: into empty tables (insert path) and
+over the same keys again (ON CONFLICT DO UPDATE path). Every run is rolled back;
+the reported time is the median wall-clock time of the write over --iterations runs.
+
+Usage:
+    python scripts/benchmark_bulk_upsert.py [--batch-sizes 10,100,1000,5000] [--iterations 5] [--keep]
+
+The scratch schema is dropped at the end unless --keep is given.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import text  # noqa: E402
+
+from storage.common import execute_unnest, unnest_rows  # noqa: E402
+from storage.db_engine import get_engine  # noqa: E402
+from storage.repositories.jobs_repository import _JOB_SOURCE_COLUMNS, _JOB_UPSERT_COLUMNS  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("openjobseu.benchmark")
+
+SCHEMA = "bench_bulk_upsert"
+
+_JOB_COLUMNS = {name: sql_type for name, sql_type in _JOB_UPSERT_COLUMNS.items() if name != "repost_count"}
+
+# (table, columns, conflict clause) of each benchmarked write.
+TARGETS = {
+    "job_sources": (
+        "job_sources",
+        _JOB_SOURCE_COLUMNS,
+        """ON CONFLICT (source, source_job_id) DO UPDATE SET
+            job_id = excluded.job_id,
+            source_url = excluded.source_url,
+            last_seen_at = excluded.last_seen_at,
+            seen_count = job_sources.seen_count + 1,
+            updated_at = excluded.updated_at""",
+    ),
+    "jobs": (
+        "jobs",
+        _JOB_COLUMNS,
+        "ON CONFLICT (job_id) DO UPDATE SET "
+        + ", ".join(f"{name} = excluded.{name}" for name in _JOB_COLUMNS if name != "job_id"),
+    ),
+}
+
+
+def _use_scratch_schema(conn) -> None:
+    conn.execute(text(f"SET search_path = {SCHEMA}, public"))
+
+
+def _create_tables(conn) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for table, _, _ in TARGETS.values():
+        conn.execute(text(f"CREATE UNLOGGED TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"))
+
+
+def _statements(table: str, columns: dict[str, str], conflict: str) -> tuple[str, str]:
+    names = ", ".join(columns)
+    values = f"INSERT INTO {table} ({names}) VALUES ({', '.join(f':{name}' for name in columns)}) {conflict}"
+    unnest = f"INSERT INTO {table} ({names}) SELECT * FROM {unnest_rows(columns)} {conflict}"
+    return values, unnest
+
+
+def _rows(target: str, size: int, now: datetime) -> list[dict]:
+    rows = []
+    for i in range(size):
+        job_id = f"bench-{i}"
+        if target == "job_sources":
+            rows.append(
+                {
+                    "job_id": job_id,
+                    "source": "greenhouse:bench",
+                    "source_job_id": str(i),
+                    "source_url": f"https://example.com/jobs/{i}",
+                    "first_seen_at": now - timedelta(days=i % 30),
+                    "last_seen_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            continue
+        rows.append(
+            {
+                **dict.fromkeys(_JOB_COLUMNS),
+                "job_id": job_id,
+                "source": "greenhouse:bench",
+                "source_job_id": str(i),
+                "source_url": f"https://example.com/jobs/{i}",
+                "title": f"Backend Engineer {i % 50}",
+                "company_name": f"Company {i % 200}",
+                "remote_source_flag": True,
+                "remote_scope": "Europe",
+                "status": "active",
+                "first_seen_at": now - timedelta(days=i % 30),
+                "last_seen_at": now,
+                "remote_class": "remote_only",
+                "geo_class": "eu_member_state",
+                "company_id": uuid.UUID(int=i % 200 + 1),
+                "job_uid": f"uid-{i}",
+                "job_fingerprint": f"fp-{i}",
+                "policy_version": "v3",
+                "compliance_status": "approved",
+                "compliance_score": 90,
+                "job_family": "software_development",
+                "seniority": "senior",
+                "job_quality_score": 70,
+                "salary_min": 60000 + i % 10 * 1000,
+                "salary_max": 80000 + i % 10 * 1000,
+                "salary_currency": "EUR",
+                "salary_period": "yearly",
+                "salary_min_eur": 60000.0 + i % 10 * 1000,
+                "salary_max_eur": 80000.0 + i % 10 * 1000,
+            }
+        )
+    return rows
+
+
+def _time_write(engine, write, rows: list[dict], preload: bool, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        with engine.connect() as conn:
+            with conn.begin() as tx:
+                _use_scratch_schema(conn)
+                if preload:
+                    write(conn, rows)
+                started = time.perf_counter()
+                write(conn, rows)
+                timings.append((time.perf_counter() - started) * 1000)
+                tx.rollback()
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", default="10,100,1000,5000", help="comma-separated batch sizes")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    engine = get_engine()
+    with engine.begin() as conn:
+        _create_tables(conn)
+
+    now = datetime.now(timezone.utc)
+    try:
+        logger.info("%-12s %-8s %7s %14s %12s %8s", "table", "path", "rows", "executemany_ms", "unnest_ms", "speedup")
+        for target, (table, columns, conflict) in TARGETS.items():
+            values_sql, unnest_sql = _statements(table, columns, conflict)
+
+            def executemany(conn, rows, sql=text(values_sql)):
+                conn.execute(sql, rows)
+
+            def unnest(conn, rows, sql=text(unnest_sql), columns=columns):
+                execute_unnest(conn, sql, rows, columns)
+
+            for size in batch_sizes:
+                rows = _rows(target, size, now)
+                for path, preload in (("insert", False), ("update", True)):
+                    values_ms = _time_write(engine, executemany, rows, preload, args.iterations)
+                    unnest_ms = _time_write(engine, unnest, rows, preload, args.iterations)
+                    logger.info(
+                        "%-12s %-8s %7d %14.2f %12.2f %7.1fx",
+                        target,
+                        path,
+                        size,
+                        values_ms,
+                        unnest_ms,
+                        values_ms / unnest_ms if unnest_ms else 0.0,
+                    )
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Benchmarks job search: legacy ILIKE/trigram `q` vs. the tsvector full-text search.
+
+Builds scratch UNLOGGED `jobs` and `job_texts` tables (default 1M rows) in the
+`bench_job_search` schema — same `search_vector` weighting and the same GIN
+indexes — filled with synthetic titles, companies, departments and descriptions,
+then times each search query with EXPLAIN ANALYZE (median over --iterations runs).
+The search SQL fragments name `jobs`/`job_texts` unqualified, so the benchmark
+connection puts the scratch schema first on its search_path.
+
+Usage:
+    python scripts/benchmark_job_search.py [--rows 1000000] [--iterations 5] [--keep]
+
+The scratch schema is dropped at the end unless --keep is given (reuse it with
+--reuse to skip the data load).
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import text  # noqa: E402
+
+from storage.common import (  # noqa: E402
+    JOB_SEARCH_CANDIDATE_LIMIT,
+    JOB_SEARCH_ORDER_BY,
+    _job_search_params,
+    _job_search_where,
+)
+from storage.db_engine import get_engine  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("openjobseu.benchmark")
+
+SCHEMA = "bench_job_search"
+
+TITLES = [
+    "Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer", "Product Manager",
+    "Python Developer", "Site Reliability Engineer", "UX Designer", "Account Executive", "Customer Success Manager",
+    "Machine Learning Engineer", "QA Analyst", "Technical Writer", "Security Engineer", "Engineering Manager",
+]  # fmt: skip
+SENIORITY = ["Junior", "Mid", "Senior", "Staff", "Lead", "Principal"]
+DEPARTMENTS = ["Engineering", "Product", "Design", "Sales", "Customer Success", "Data", "Security", "People"]
+DESCRIPTION_WORDS = [
+    "kubernetes", "terraform", "python", "golang", "react", "typescript", "postgres", "kafka", "spark", "airflow",
+    "remote", "europe", "team", "customers", "ownership", "growth", "platform", "billing", "payments", "analytics",
+    "mentoring", "roadmap", "experiments", "latency", "reliability", "compliance", "privacy", "design", "mobile",
+]  # fmt: skip
+
+QUERIES = ["python", "kubernetes terraform", '"site reliability"', "payments -billing", "pyhton developer", "acme"]
+
+
+def _use_scratch_schema(conn) -> None:
+    conn.execute(text(f"SET search_path = {SCHEMA}, public"))
+
+
+def _create_tables(conn, rows: int) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    _use_scratch_schema(conn)
+    conn.execute(
+        text("""
+            CREATE UNLOGGED TABLE jobs (
+                job_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                company_name TEXT NOT NULL,
+                source_department TEXT,
+                first_seen_at TIMESTAMPTZ NOT NULL
+            )
+        """)
+    )
+    conn.execute(
+        text("""
+            CREATE UNLOGGED TABLE job_texts (
+                job_id TEXT PRIMARY KEY,
+                description TEXT,
+                search_vector tsvector NOT NULL
+            )
+        """)
+    )
+    started = time.perf_counter()
+    conn.execute(
+        text("""
+            WITH v AS (
+                SELECT
+                    CAST(:seniority AS TEXT[]) AS seniority,
+                    CAST(:titles AS TEXT[]) AS titles,
+                    CAST(:departments AS TEXT[]) AS departments,
+                    CAST(:words AS TEXT[]) AS words
+            ),
+            synthetic AS (
+                SELECT
+                    'bench-' || i AS job_id,
+                    v.seniority[1 + i % cardinality(v.seniority)] || ' '
+                        || v.titles[1 + (i / 7) % cardinality(v.titles)] AS title,
+                    'Company ' || (i % 20000) AS company_name,
+                    v.departments[1 + i % cardinality(v.departments)] AS source_department,
+                    (
+                        -- ~1 in 25 words is a searchable term, the rest is filler vocabulary
+                        SELECT string_agg(
+                            CASE
+                                WHEN (i * 31 + w * w * 17) % 25 = 0
+                                    THEN v.words[1 + ((i * 7 + w) % cardinality(v.words))]
+                                ELSE 'filler' || ((i * 131 + w * 977) % 5000)
+                            END,
+                            ' '
+                        )
+                        FROM generate_series(1, 80) AS w
+                    ) AS description,
+                    NOW() - (i % 86400) * INTERVAL '1 minute' AS first_seen_at
+                FROM v, generate_series(1, :rows) AS i
+            ),
+            jobs_loaded AS (
+                INSERT INTO jobs (job_id, title, company_name, source_department, first_seen_at)
+                SELECT job_id, title, company_name, source_department, first_seen_at FROM synthetic
+            )
+            INSERT INTO job_texts (job_id, description, search_vector)
+            SELECT job_id, description, job_search_vector(title, company_name, source_department, description)
+            FROM synthetic
+        """),
+        {
+            "rows": rows,
+            "seniority": SENIORITY,
+            "titles": TITLES,
+            "departments": DEPARTMENTS,
+            "words": DESCRIPTION_WORDS,
+        },
+    )
+    logger.info("loaded %s rows in %.1fs", rows, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    conn.execute(text("CREATE INDEX ON jobs (first_seen_at DESC, job_id DESC)"))
+    conn.execute(text("CREATE INDEX ON jobs USING GIN (title gin_trgm_ops)"))
+    conn.execute(text("CREATE INDEX ON jobs USING GIN (company_name gin_trgm_ops)"))
+    conn.execute(text("CREATE INDEX ON job_texts USING GIN (search_vector)"))
+    conn.execute(text("ANALYZE jobs"))
+    conn.execute(text("ANALYZE job_texts"))
+    logger.info("built indexes in %.1fs", time.perf_counter() - started)
+
+
+def _legacy_query() -> str:
+    return """
+        SELECT job_id FROM jobs
+        WHERE (title ILIKE :q_like OR company_name ILIKE :q_like)
+        ORDER BY LEAST(title <-> :q_search, company_name <-> :q_search) ASC, first_seen_at DESC
+        LIMIT 40
+    """
+
+
+def _full_text_query(*, fuzzy: bool = False) -> str:
+    # The listing's query: ranks the bounded candidate set (the fuzzy fallback ranks every match).
+    return f"""
+        SELECT job_id FROM jobs
+        {_job_search_where([], "q", fuzzy=fuzzy, limit_sql=":q_candidates")}
+        ORDER BY {JOB_SEARCH_ORDER_BY}, first_seen_at DESC, job_id DESC
+        LIMIT 40
+    """
+
+
+def _time_query(conn, sql: str, params: dict, iterations: int) -> tuple[float, int]:
+    timings = []
+    returned = 0
+    for _ in range(iterations):
+        raw = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar_one()
+        plan = json.loads(raw) if isinstance(raw, str) else raw
+        timings.append(float(plan[0]["Execution Time"]))
+        returned = int(plan[0]["Plan"]["Actual Rows"])
+    return statistics.median(timings), returned
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    parser.add_argument("--reuse", action="store_true", help="reuse an existing scratch schema")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    if not args.reuse:
+        with engine.begin() as conn:
+            _create_tables(conn, args.rows)
+
+    try:
+        with engine.connect() as conn:
+            _use_scratch_schema(conn)
+            logger.info("%-24s %12s %12s %12s %6s", "query", "ilike_ms", "fulltext_ms", "fallback_ms", "rows")
+            for q in QUERIES:
+                params = {**_job_search_params(q), "q_candidates": JOB_SEARCH_CANDIDATE_LIMIT}
+                legacy_ms, _ = _time_query(conn, _legacy_query(), params, args.iterations)
+                fts_ms, rows = _time_query(conn, _full_text_query(), params, args.iterations)
+                # The trigram typo fallback only runs when the full-text query found nothing.
+                fallback_ms = 0.0
+                if rows == 0:
+                    fallback_ms, rows = _time_query(conn, _full_text_query(fuzzy=True), params, args.iterations)
+                logger.info("%-24s %12.2f %12.2f %12.2f %6d", q, legacy_ms, fts_ms, fallback_ms, rows)
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Benchmarks job_snapshots storage: full copies vs. delta-encoded snapshots with keyframes.
+
+Reads the database's job history (load a synthetic dataset first, see
+scripts/generate_synthetic_dataset.py), writes it twice into scratch UNLOGGED
+`job_snapshots` tables — once as full rows (every row a keyframe, the previous
+format) in `bench_snapshots_full`, once delta-encoded the way
+snapshots_repository writes it in `bench_snapshots_delta` — and compares table
+size and history-read latency (get_job_history / get_job_state_at, median and p95
+over --sample jobs with at least two snapshots). The scratch tables are not
+partitioned; the repository reads them through the connection's search_path.
+
+Usage:
+    python scripts/benchmark_job_snapshots.py [--sample 1000] [--keep]
+
+The scratch schemas are dropped at the end unless --keep is given.
+"""
+
+import argparse
+import hashlib
+import itertools
+import logging
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import text  # noqa: E402
+
+from storage.common import execute_unnest, unnest_rows  # noqa: E402
+from storage.db_engine import get_engine  # noqa: E402
+from storage.repositories.snapshots_repository import (  # noqa: E402
+    _SNAPSHOT_COLUMNS,
+    _SNAPSHOT_ROW_COLUMNS,
+    _decode_snapshots,
+    _delta_row,
+    get_job_history,
+    get_job_state_at,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("openjobseu.benchmark")
+
+SCHEMAS = {"full": "bench_snapshots_full", "delta": "bench_snapshots_delta"}
+CHUNK_SIZE = 10_000
+
+_COLUMNS = {"snapshot_id": "BIGINT", "captured_at": "TIMESTAMPTZ", **_SNAPSHOT_COLUMNS}
+
+
+def _use_scratch_schema(conn, schema: str) -> None:
+    conn.execute(text(f"SET search_path = {schema}, public"))
+
+
+def _load_history(conn) -> list[list[dict]]:
+    """Decoded snapshots of every job, one chronological list per job."""
+    rows = conn.execute(
+        text(
+            f"SELECT {', '.join(_SNAPSHOT_ROW_COLUMNS)} FROM public.job_snapshots ORDER BY job_id, captured_at, snapshot_id"
+        )
+    ).mappings()
+    return [
+        [{"job_id": job_id, **state} for state in _decode_snapshots(list(chain))]
+        for job_id, chain in itertools.groupby(rows, key=lambda row: row["job_id"])
+    ]
+
+
+def _encoded(history: list[dict], delta: bool) -> list[dict]:
+    rows, chain, month = [], [], None
+    for state in history:
+        captured = state["captured_at"]
+        if (captured.year, captured.month) != month:
+            chain, month = [], (captured.year, captured.month)
+        encoded = _delta_row(state, chain) if delta else _delta_row(state, [])
+        rows.append(
+            {"snapshot_id": state["snapshot_id"], "captured_at": captured, "job_id": state["job_id"], **encoded}
+        )
+        chain.append(state)
+    return rows
+
+
+def _create_table(engine, schema: str, rows) -> None:
+    insert = text(f"INSERT INTO job_snapshots ({', '.join(_COLUMNS)}) SELECT * FROM {unnest_rows(_COLUMNS)}")
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        _use_scratch_schema(conn, schema)
+        conn.execute(text("CREATE UNLOGGED TABLE job_snapshots (LIKE public.job_snapshots INCLUDING DEFAULTS)"))
+        while batch := list(itertools.islice(rows, CHUNK_SIZE)):
+            execute_unnest(conn, insert, batch, _COLUMNS)
+        conn.execute(text("ALTER TABLE job_snapshots ADD PRIMARY KEY (snapshot_id, captured_at)"))
+        conn.execute(text("CREATE INDEX ON job_snapshots (job_id, captured_at DESC)"))
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"VACUUM ANALYZE {schema}.job_snapshots"))
+
+
+def _sizes(conn, schema: str) -> tuple[int, int, int]:
+    return tuple(
+        conn.execute(
+            text(f"""
+                SELECT COUNT(*),
+                    pg_relation_size('{schema}.job_snapshots'),
+                    pg_total_relation_size('{schema}.job_snapshots')
+                FROM {schema}.job_snapshots
+            """)
+        ).one()
+    )
+
+
+def _time_reads(engine, schema: str, read, job_ids: list[str]) -> tuple[float, float]:
+    timings = []
+    with engine.connect() as conn:
+        _use_scratch_schema(conn, schema)
+        for job_id in job_ids:  # warm-up pass, so neither format pays for a cold cache
+            read(conn, job_id)
+        for job_id in job_ids:
+            started = time.perf_counter()
+            read(conn, job_id)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", type=int, default=1000, help="jobs timed per read")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schemas")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        histories = _load_history(conn)
+    logger.info(
+        "read %s snapshots of %s jobs in %.1fs", sum(map(len, histories)), len(histories), time.perf_counter() - started
+    )
+    if not histories:
+        logger.error("job_snapshots is empty; load a synthetic dataset first")
+        return 1
+
+    # Deterministic sample of jobs with a history to decode.
+    multi = sorted((h for h in histories if len(h) > 1), key=lambda h: hashlib.md5(h[0]["job_id"].encode()).digest())
+    sample = multi[: args.sample]
+    job_ids = [h[0]["job_id"] for h in sample]
+    # The state in the middle of each sampled history: decodes a chain and reads the jobs row.
+    midpoints = {h[0]["job_id"]: h[len(h) // 2]["captured_at"] for h in sample}
+
+    try:
+        for name, schema in SCHEMAS.items():
+            started = time.perf_counter()
+            _create_table(engine, schema, (row for h in histories for row in _encoded(h, delta=name == "delta")))
+            logger.info("built %s in %.1fs", schema, time.perf_counter() - started)
+
+        logger.info("%-6s %9s %10s %10s %9s %12s %12s %12s %12s", "format", "rows", "heap_kb", "total_kb",
+                    "bytes/row", "history_p50", "history_p95", "state_at_p50", "state_at_p95")  # fmt: skip
+        for name, schema in SCHEMAS.items():
+            with engine.connect() as conn:
+                rows, heap, total = _sizes(conn, schema)
+            history_p50, history_p95 = _time_reads(engine, schema, get_job_history, job_ids)
+            state_p50, state_p95 = _time_reads(
+                engine, schema, lambda conn, job_id: get_job_state_at(conn, job_id, midpoints[job_id]), job_ids
+            )
+            logger.info(
+                "%-6s %9d %10d %10d %9.1f %12.3f %12.3f %12.3f %12.3f",
+                name,
+                rows,
+                heap // 1024,
+                total // 1024,
+                heap / rows,
+                history_p50,
+                history_p95,
+                state_p50,
+                state_p95,
+            )
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                for schema in SCHEMAS.values():
+                    conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Benchmarks `extract_salary` and verifies it reproduces the recorded outputs.
+
+Inputs come from the labelled regression corpus
+(validator/tests/data/salary_regression_corpus.json) and, with --from-db, from the
+hard cases collected in `salary_parsing_cases` (only timed, they carry no labels).
+
+Usage:
+    python scripts/benchmark_salary_parser.py [--iterations 200] [--from-db]
+
+Exits with status 1 when any corpus case produces a different output.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.domain.money.salary_parser import extract_salary  # noqa: E402
+
+CORPUS_PATH = os.path.join(PROJECT_ROOT, "validator", "tests", "data", "salary_regression_corpus.json")
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("openjobseu.benchmark")
+
+
+def _load_db_cases(limit: int) -> list[dict]:
+    from sqlalchemy import text
+
+    from storage.db_engine import get_engine
+
+    with get_engine().connect() as conn:
+        rows = conn.execute(
+            text("""
+                SELECT description_fragment
+                FROM salary_parsing_cases
+                WHERE description_fragment IS NOT NULL
+                ORDER BY id DESC
+                LIMIT :limit
+            """),
+            {"limit": limit},
+        ).fetchall()
+    return [{"title": None, "description": row[0]} for row in rows]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--from-db", action="store_true", help="also time salary_parsing_cases fragments")
+    parser.add_argument("--db-limit", type=int, default=5000)
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    mismatches = 0
+    for case in corpus:
+        actual = extract_salary(case["description"], title=case["title"])
+        if actual != case["expected"]:
+            mismatches += 1
+            logger.error("Output mismatch for %r: expected %s, got %s", case["description"], case["expected"], actual)
+
+    inputs = list(corpus)
+    if args.from_db:
+        inputs.extend(_load_db_cases(args.db_limit))
+
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        for case in inputs:
+            extract_salary(case["description"], title=case["title"])
+    elapsed = time.perf_counter() - started
+
+    calls = args.iterations * len(inputs)
+    logger.info(
+        "cases=%d iterations=%d total=%.3fs per_call=%.1fus mismatches=%d",
+        len(inputs),
+        args.iterations,
+        elapsed,
+        elapsed / calls * 1_000_000 if calls else 0.0,
+        mismatches,
+    )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
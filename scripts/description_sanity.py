@@ -44,10 +44,10 @@ def clean_description_text(description: str) -> tuple[str, list[str]]:
 
 
 def find_suspicious_rows(conn, source: str = None) -> list[dict]:
-    query = "SELECT job_id, source, description FROM jobs"
+    query = "SELECT j.job_id, j.source, t.description FROM jobs j JOIN job_texts t ON t.job_id = j.job_id"
     params = {}
     if source:
-        query += " WHERE source = :source"
+        query += " WHERE j.source = :source"
         params["source"] = source
 
     rows = conn.execute(text(query), params).mappings().all()
@@ -80,7 +80,7 @@ def apply_safe_fixes(conn, suspicious_rows: list[dict]) -> int:
     update_data = [{"desc": row["cleaned_description"], "job_id": row["job_id"]} for row in suspicious_rows]
 
     # Wykonanie wszystkich zmian w jednym zapytaniu do bazy (executemany)
-    conn.execute(text("UPDATE jobs SET description = :desc WHERE job_id = :job_id"), update_data)
+    conn.execute(text("UPDATE job_texts SET description = :desc WHERE job_id = :job_id"), update_data)
     return len(update_data)
 
 
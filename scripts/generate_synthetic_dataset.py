@@ -0,0 +1,769 @@
+"""
+Generates a synthetic, production-scale dataset in a local Postgres for performance work.
+
+Loads companies, company_ats, jobs, job_texts, job_sources, job_snapshots,
+compliance_reports (+ compliance_decisions) and market_daily_stats(_segments)
+with COPY, --chunk-size jobs per transaction. Triggers are off during the load
+(`session_replication_role = replica`, which needs a superuser — the local
+docker Postgres is one); afterwards the trigger-maintained tables are rebuilt
+with the same repository functions maintenance uses (market_rollup,
+system_counters, company stats) and every loaded table is VACUUM ANALYZEd, so
+benchmarks and EXPLAIN see settled statistics and visibility maps.
+
+Distributions (reproducible per --seed):
+  - ATS provider mix weighted toward Greenhouse / Lever / Ashby, ~10% of companies on two ATSes
+  - Zipf-like jobs per company (a few large employers, a long tail of one-job companies)
+  - log-normal description lengths, median ~2.5 KB, 300 B to 20 KB
+  - status new / active / stale / expired ~ 1 / 52 / 7 / 40 %, with first/last seen placed
+    inside the lifecycle thresholds; compliance approved / review / rejected ~ 62 / 13 / 25 %
+  - ~35% salary coverage across EUR / GBP / USD / PLN
+  - first_seen_at spread over --months, skewed toward recent months; ~1 snapshot per job on
+    average (geometric), one compliance report per job plus re-evaluations in later months
+
+Usage:
+    python scripts/generate_synthetic_dataset.py [--companies 10000] [--jobs 500000] [--months 12]
+        [--snapshots-per-job 1.0] [--seed 42] [--chunk-size 20000] [--truncate]
+
+Refuses to run with DB_MODE=cloudsql, and into a database that already holds
+companies or jobs unless --truncate is given (which empties every loaded table,
+and with CASCADE every table referencing them).
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from itertools import accumulate
+from uuid import UUID
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import text  # noqa: E402
+
+from app.domain.companies.scoring import EU_COUNTRIES  # noqa: E402
+from app.domain.compliance.engine import ENGINE_POLICY_VERSION  # noqa: E402
+from app.domain.taxonomy.taxonomy import classify_taxonomy  # noqa: E402
+from storage.db_engine import get_engine  # noqa: E402
+from storage.repositories.compliance_repository import compliance_decision_hash  # noqa: E402
+from storage.repositories.maintenance_repository import refresh_dirty_company_stats  # noqa: E402
+from storage.repositories.market_rollup_repository import rebuild_market_rollup  # noqa: E402
+from storage.repositories.partitions_repository import PARTITIONED_TABLES, ensure_monthly_partitions  # noqa: E402
+from storage.repositories.system_repository import reconcile_system_counters  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("openjobseu.synthetic_dataset")
+
+LOADED_TABLES = (
+    "companies",
+    "company_ats",
+    "company_stats_dirty",
+    "jobs",
+    "job_texts",
+    "job_sources",
+    "job_sightings",
+    "job_snapshots",
+    "compliance_reports",
+    "compliance_decisions",
+    "market_daily_stats",
+    "market_daily_stats_segments",
+    "market_rollup",
+    "market_rollup_deltas",
+    "system_counters",
+)
+
+PROVIDER_MIX = {
+    "greenhouse": 30, "lever": 18, "ashby": 14, "workable": 10, "smartrecruiters": 8, "recruitee": 6,
+    "teamtailor": 5, "personio": 5, "breezy": 2, "jobadder": 1, "traffit": 1,
+}  # fmt: skip
+DISCOVERY_SOURCE_MIX = {None: 60, "slug_harvest": 25, "crt_sh": 10, "dorking": 5}
+HQ_COUNTRY_MIX = {
+    "DE": 18, "GB": 14, "US": 16, "NL": 8, "PL": 8, "FR": 8, "ES": 6, "IE": 5, "SE": 5, "PT": 4, "CH": 3,
+    "DK": 3, "FI": 2,
+}  # fmt: skip
+REMOTE_POSTURE_MIX = {"REMOTE_ONLY": 30, "REMOTE_FRIENDLY": 50, "UNKNOWN": 20}
+STATUS_MIX = {"new": 1, "active": 52, "stale": 7, "expired": 40}
+COMPLIANCE_MIX = {"approved": 62, "review": 13, "rejected": 25}
+REMOTE_CLASS_MIX = {
+    "approved": {"remote_only": 60, "remote_region_locked": 40},
+    "review": {"remote_optional": 50, "unknown": 50},
+    "rejected": {"non_remote": 55, "remote_optional": 25, "unknown": 20},
+}
+# (remote_scope, geo_class)
+SCOPE_MIX = {
+    ("Europe", "eu_region"): 30, ("EU", "eu_explicit"): 12, ("Germany", "eu_member_state"): 8,
+    ("Poland", "eu_member_state"): 6, ("Spain", "eu_member_state"): 4, ("Netherlands", "eu_member_state"): 4,
+    ("France", "eu_member_state"): 4, ("Portugal", "eu_member_state"): 3, ("Ireland", "eu_member_state"): 3,
+    ("UK", "uk"): 8, ("Worldwide", "non_eu"): 10, ("US", "non_eu"): 8,
+}  # fmt: skip
+# currency: (EUR rate, weight, median annual salary_min in that currency)
+CURRENCIES = {"EUR": (1.0, 60, 60_000), "GBP": (1.17, 15, 55_000), "USD": (0.92, 20, 90_000), "PLN": (0.23, 5, 180_000)}
+SALARY_COVERAGE = 0.35
+# Postings listed at the start of the history were first seen up to this long before it.
+MAX_LIFETIME_DAYS = 180
+
+TITLES = [
+    "Backend Engineer", "Frontend Developer", "Fullstack Developer", "Data Scientist", "Data Engineer",
+    "DevOps Engineer", "Product Manager", "Product Designer", "UX Designer", "Account Executive",
+    "Customer Support Specialist", "Marketing Manager", "Content Writer", "Talent Recruiter", "Financial Analyst",
+    "Operations Manager", "Software Engineer", "Site Reliability Engineer", "Security Engineer", "QA Engineer",
+]  # fmt: skip
+SENIORITY_PREFIXES = ["Junior", "Senior", "Senior", "Lead", "Staff", "Principal", "Head of", "Associate"]
+DEPARTMENTS = ["Engineering", "Product", "Design", "Sales", "Customer Success", "Data", "Security", "People", "Finance"]
+COMPANY_PREFIXES = ["Nordic", "Blue", "Bright", "Open", "Euro", "Cloud", "Green", "Atlas", "Quantum", "Vertex", "Delta"]
+COMPANY_SUFFIXES = ["Labs", "Systems", "Software", "Health", "Payments", "Analytics", "Robotics", "Studio", "Energy"]
+DESCRIPTION_WORDS = [
+    "kubernetes", "terraform", "python", "golang", "react", "typescript", "postgres", "kafka", "spark", "airflow",
+    "remote", "europe", "customers", "ownership", "growth", "platform", "billing", "payments", "analytics",
+    "mentoring", "roadmap", "experiments", "latency", "reliability", "compliance", "privacy", "design", "mobile",
+]  # fmt: skip
+COMMON_WORDS = [
+    "we", "are", "looking", "for", "you", "will", "with", "our", "the", "and", "to", "of", "in", "team", "work",
+    "build", "help", "across", "experience", "company", "people", "product", "role", "join", "who", "on", "a",
+]  # fmt: skip
+TRANSPARENCY_STATEMENT = "Salary will be discussed during the interview process."
+
+JOB_COLUMNS = (
+    "job_id", "source", "source_job_id", "source_url", "title", "company_name", "remote_source_flag", "remote_scope",
+    "status", "first_seen_at", "last_seen_at", "last_verified_at", "verification_failures", "updated_at",
+    "remote_class", "geo_class", "compliance_status", "compliance_score", "company_id", "job_uid", "job_fingerprint",
+    "source_schema_hash", "policy_version", "job_family", "job_role", "seniority", "specialization",
+    "job_quality_score", "availability_status", "salary_min", "salary_max", "salary_currency", "salary_period",
+    "salary_source", "salary_min_eur", "salary_max_eur", "salary_transparency_status", "salary_confidence",
+    "is_repost", "repost_count", "source_department",
+)  # fmt: skip
+COMPANY_COLUMNS = (
+    "company_id", "legal_name", "brand_name", "hq_country", "eu_entity_verified", "remote_posture", "ats_provider",
+    "ats_slug", "ats_api_url", "careers_url", "is_active", "bootstrap", "created_at", "updated_at",
+)  # fmt: skip
+COMPANY_ATS_COLUMNS = (
+    "company_ats_id", "company_id", "provider", "ats_slug", "ats_api_url", "careers_url", "is_active",
+    "created_at", "updated_at", "last_sync_at", "discovery_source",
+)  # fmt: skip
+JOB_SOURCE_COLUMNS = (
+    "job_id", "source", "source_job_id", "source_url", "first_seen_at", "last_seen_at", "created_at", "updated_at",
+    "seen_count",
+)  # fmt: skip
+SNAPSHOT_COLUMNS = (
+    "job_id", "job_fingerprint", "title", "company_name", "salary_min", "salary_max", "salary_currency",
+    "captured_at", "remote_class", "geo_class",
+)  # fmt: skip
+REPORT_COLUMNS = (
+    "job_id", "job_uid", "policy_version", "remote_class", "geo_class", "hard_geo_flag", "base_score", "penalties",
+    "bonuses", "final_score", "final_status", "decision_vector", "created_at", "report_month",
+)  # fmt: skip
+DECISION_COLUMNS = ("job_uid", "job_id", "policy_version", "decision_hash", "decided_at")
+DAILY_STATS_COLUMNS = (
+    "date", "jobs_created", "jobs_expired", "jobs_active", "jobs_reposted", "avg_salary_eur", "median_salary_eur",
+    "avg_job_lifetime", "remote_ratio",
+)  # fmt: skip
+SEGMENT_COLUMNS = (
+    "date", "segment_type", "segment_value", "jobs_active", "jobs_created", "avg_salary_eur", "median_salary_eur",
+    "salary_count",
+)  # fmt: skip
+
+
+def _picker(rng: random.Random, mix: dict):
+    values = list(mix)
+    cum_weights = list(accumulate(mix.values()))
+    return lambda: rng.choices(values, cum_weights=cum_weights)[0]
+
+
+def _stable_hash(*parts: object, algorithm: str = "md5") -> str:
+    return hashlib.new(algorithm, "|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def _copy(conn, table: str, columns: tuple[str, ...], rows) -> int:
+    """COPY `rows` (tuples in `columns` order) into `table` on the connection's open transaction."""
+    count = 0
+    with conn.connection.driver_connection.cursor() as cursor:
+        with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+    return count
+
+
+def _disable_triggers(conn) -> None:
+    conn.execute(text("SET LOCAL session_replication_role = replica"))
+
+
+class _MarketHistory:
+    """
+    Per-day market aggregates of the generated jobs, shaped like the rows the
+    market metrics worker records. Counts and averages are exact (difference
+    arrays over each job's active days); medians come from a reservoir sample
+    of salaried jobs.
+    """
+
+    SAMPLE_SIZE = 5000
+
+    def __init__(self, rng: random.Random, first_day: date, last_day: date):
+        self.rng = rng
+        self.first_day = first_day
+        self.days = (last_day - first_day).days + 1
+        size = self.days + 1
+        self.created = [0] * size
+        self.expired = [0] * size
+        self.reposted = [0] * size
+        self.lifetime_sum = [0.0] * size
+        self.active = [0] * size
+        self.remote = [0] * size
+        self.salary_count = [0] * size
+        self.salary_sum = [0.0] * size
+        self.segments: dict[tuple[str, str], dict[str, list]] = {}
+        self.sample: list[tuple[int, int, float, tuple]] = []
+        self.salaried_seen = 0
+
+    def _day(self, ts: datetime) -> int:
+        return min(max((ts.date() - self.first_day).days, 0), self.days - 1)
+
+    def _segment(self, key: tuple[str, str]) -> dict[str, list]:
+        if key not in self.segments:
+            size = self.days + 1
+            self.segments[key] = {k: [0] * size for k in ("active", "created", "salary_count")}
+            self.segments[key]["salary_sum"] = [0.0] * size
+        return self.segments[key]
+
+    def add(self, job: dict) -> None:
+        # Jobs first seen before the history starts are active from its first day, not created on it.
+        created = job["first_seen_at"].date() >= self.first_day
+        first = self._day(job["first_seen_at"])
+        # Expired jobs stop counting as active the day they were last seen.
+        last = self._day(job["last_seen_at"]) if job["availability_status"] == "expired" else self.days - 1
+        eur = job["salary_min_eur"]
+        self.created[first] += created
+        self.reposted[first] += created and job["is_repost"]
+        if job["availability_status"] == "expired":
+            self.expired[last] += 1
+            self.lifetime_sum[last] += (job["last_seen_at"] - job["first_seen_at"]).total_seconds()
+        for series, amount in (
+            (self.active, 1),
+            (self.remote, job["remote_class"] in ("remote_only", "remote_region_locked")),
+            (self.salary_count, eur is not None),
+            (self.salary_sum, eur or 0.0),
+        ):
+            series[first] += amount
+            series[last + 1] -= amount
+
+        keys: tuple = ()
+        if job["compliance_status"] == "approved" and job["compliance_score"] >= 80:
+            country = job["remote_scope"] if job["geo_class"] not in ("uk", "non_eu") else "Non EU"
+            keys = (("country", country), ("job_family", job["job_family"]), ("seniority", job["seniority"]))
+            for key in keys:
+                segment = self._segment(key)
+                segment["created"][first] += created
+                for name, amount in (("active", 1), ("salary_count", eur is not None), ("salary_sum", eur or 0.0)):
+                    segment[name][first] += amount
+                    segment[name][last + 1] -= amount
+
+        if eur is not None:
+            self.salaried_seen += 1
+            if len(self.sample) < self.SAMPLE_SIZE:
+                self.sample.append((first, last, eur, keys))
+            else:
+                slot = self.rng.randrange(self.salaried_seen)
+                if slot < self.SAMPLE_SIZE:
+                    self.sample[slot] = (first, last, eur, keys)
+
+    @staticmethod
+    def _running(series: list) -> list:
+        return list(accumulate(series))
+
+    @staticmethod
+    def _median(values: list[float]) -> float | None:
+        return round(statistics.median(values), 2) if len(values) >= 5 else None
+
+    def daily_rows(self):
+        active, remote = self._running(self.active), self._running(self.remote)
+        salary_count, salary_sum = self._running(self.salary_count), self._running(self.salary_sum)
+        for d in range(self.days):
+            day = self.first_day + timedelta(days=d)
+            median = self._median([eur for first, last, eur, _ in self.sample if first <= d <= last])
+            yield (
+                day,
+                self.created[d],
+                self.expired[d],
+                active[d],
+                self.reposted[d],
+                round(salary_sum[d] / salary_count[d], 2) if salary_count[d] else None,
+                median,
+                timedelta(seconds=self.lifetime_sum[d] / self.expired[d]) if self.expired[d] else None,
+                round(remote[d] / active[d], 4) if active[d] else None,
+            )
+
+    def segment_rows(self):
+        samples: dict[tuple[str, str], list[tuple[int, int, float]]] = {}
+        for first, last, eur, keys in self.sample:
+            for key in keys:
+                samples.setdefault(key, []).append((first, last, eur))
+        for key, series in sorted(self.segments.items()):
+            sample = samples.get(key, [])
+            active, created = self._running(series["active"]), series["created"]
+            salary_count, salary_sum = self._running(series["salary_count"]), self._running(series["salary_sum"])
+            for d in range(self.days):
+                if not active[d] and not created[d]:
+                    continue
+                median = self._median([eur for first, last, eur in sample if first <= d <= last])
+                yield (
+                    self.first_day + timedelta(days=d),
+                    key[0],
+                    key[1],
+                    active[d],
+                    created[d],
+                    round(salary_sum[d] / salary_count[d], 2) if salary_count[d] else None,
+                    median,
+                    salary_count[d],
+                )
+
+
+class _DatasetGenerator:
+    def __init__(self, *, seed: int, companies: int, months: int, snapshots_per_job: float, now: datetime):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.now = now
+        self.span = timedelta(days=months * 30)
+        self.snapshot_continue = snapshots_per_job / (1.0 + snapshots_per_job)
+        self.policy_version = ENGINE_POLICY_VERSION.value
+
+        rng = self.rng
+        self.pick_provider = _picker(rng, PROVIDER_MIX)
+        self.pick_discovery_source = _picker(rng, DISCOVERY_SOURCE_MIX)
+        self.pick_hq_country = _picker(rng, HQ_COUNTRY_MIX)
+        self.pick_remote_posture = _picker(rng, REMOTE_POSTURE_MIX)
+        self.pick_status = _picker(rng, STATUS_MIX)
+        self.pick_compliance = _picker(rng, COMPLIANCE_MIX)
+        self.pick_remote_class = {status: _picker(rng, mix) for status, mix in REMOTE_CLASS_MIX.items()}
+        self.pick_scope = _picker(rng, SCOPE_MIX)
+        self.pick_currency = _picker(rng, {currency: weight for currency, (_, weight, _) in CURRENCIES.items()})
+        self.paragraphs = [self._paragraph() for _ in range(2000)]
+
+        self.companies = [self._company(n) for n in range(companies)]
+        company_weights = list(accumulate(1.0 / (rank + 1) ** 0.8 for rank in range(companies)))
+        self.pick_company = lambda: rng.choices(self.companies, cum_weights=company_weights)[0]
+
+        first_day = (now - self.span).date()
+        self.market = _MarketHistory(rng, first_day, now.date() - timedelta(days=1))
+
+    def _paragraph(self) -> str:
+        rng = self.rng
+        words = [
+            rng.choice(DESCRIPTION_WORDS) if rng.random() < 0.15 else rng.choice(COMMON_WORDS)
+            if rng.random() < 0.7 else f"term{rng.randrange(5000)}"
+            for _ in range(rng.randint(30, 80))
+        ]  # fmt: skip
+        return " ".join(words).capitalize() + "."
+
+    def _description(self, with_statement: bool) -> str:
+        target = int(min(20_000, max(300, self.rng.lognormvariate(math.log(2500), 0.6))))
+        parts, length = [], 0
+        while length < target:
+            paragraph = self.rng.choice(self.paragraphs)
+            parts.append(paragraph)
+            length += len(paragraph) + 2
+        if with_statement:
+            parts.append(TRANSPARENCY_STATEMENT)
+        return "\n\n".join(parts)
+
+    def _company(self, n: int) -> dict:
+        rng = self.rng
+        name = f"{rng.choice(COMPANY_PREFIXES)} {rng.choice(COMPANY_SUFFIXES)} {n}"
+        slug = name.lower().replace(" ", "-")
+        country = self.pick_hq_country()
+        created_at = self.now - self.span - timedelta(days=MAX_LIFETIME_DAYS + rng.uniform(1, 365))
+        providers = [self.pick_provider()]
+        if rng.random() < 0.1:
+            second = self.pick_provider()
+            if second != providers[0]:
+                providers.append(second)
+        ats = [
+            {
+                "company_ats_id": UUID(_stable_hash("synthetic-ats", self.seed, n, provider)),
+                "provider": provider,
+                "ats_slug": slug,
+                "ats_api_url": f"https://api.{provider}.example/{slug}",
+                "careers_url": f"https://{slug}.example.com/careers",
+                "is_active": rng.random() < 0.95,
+                "last_sync_at": self.now - timedelta(minutes=rng.uniform(0, 120)),
+                "discovery_source": self.pick_discovery_source(),
+            }
+            for provider in providers
+        ]
+        return {
+            "company_id": UUID(_stable_hash("synthetic-company", self.seed, n)),
+            "legal_name": f"{name} GmbH" if country == "DE" else f"{name} Ltd",
+            "brand_name": name,
+            "hq_country": country,
+            "eu_entity_verified": country in EU_COUNTRIES and rng.random() < 0.5,
+            "remote_posture": self.pick_remote_posture(),
+            "ats_provider": ats[0]["provider"],
+            "ats_slug": slug,
+            "ats_api_url": ats[0]["ats_api_url"],
+            "careers_url": ats[0]["careers_url"],
+            "is_active": rng.random() < 0.95,
+            "bootstrap": False,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "ats": ats,
+        }
+
+    def company_rows(self):
+        for company in self.companies:
+            yield tuple(company[c] for c in COMPANY_COLUMNS)
+
+    def company_ats_rows(self):
+        for company in self.companies:
+            for ats in company["ats"]:
+                yield tuple(
+                    company[c] if c in ("company_id", "created_at", "updated_at") else ats[c]
+                    for c in COMPANY_ATS_COLUMNS
+                )
+
+    def _seen_window(self, status: str) -> tuple[datetime, datetime]:
+        """first/last seen consistent with the lifecycle thresholds, so a lifecycle pass finds little to do."""
+        rng, now = self.rng, self.now
+        lifetime = timedelta(days=min(rng.lognormvariate(math.log(30), 0.8), MAX_LIFETIME_DAYS))
+        if status == "new":
+            return now - timedelta(hours=rng.uniform(1, 23)), now - timedelta(minutes=rng.uniform(0, 90))
+        if status == "active":
+            last_seen = now - timedelta(minutes=rng.uniform(0, 90))
+            # Still listed: somewhere inside its lifetime, and past the 24 hours a job stays "new".
+            return last_seen - timedelta(days=1) - lifetime * rng.random(), last_seen
+        if status == "stale":
+            last_seen = now - timedelta(days=rng.uniform(7, 30))
+            return last_seen - lifetime * rng.random(), last_seen
+        else:
+            # Expired postings spread over the whole history, more of them recent.
+            last_seen = now - timedelta(days=30) - (self.span - timedelta(days=30)) * rng.random() ** 1.5
+        return last_seen - lifetime, last_seen
+
+    def _salary(self) -> dict:
+        rng = self.rng
+        if rng.random() >= SALARY_COVERAGE:
+            return {
+                "salary_min": None,
+                "salary_max": None,
+                "salary_currency": None,
+                "salary_period": None,
+                "salary_source": None,
+                "salary_min_eur": None,
+                "salary_max_eur": None,
+                "salary_transparency_status": "transparent_statement" if rng.random() < 0.08 else "not_disclosed",
+                "salary_confidence": 0,
+            }
+        currency = self.pick_currency()
+        rate, _, median = CURRENCIES[currency]
+        salary_min = int(round(rng.lognormvariate(math.log(median), 0.35), -3))
+        salary_max = int(round(salary_min * rng.uniform(1.1, 1.5), -3))
+        return {
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "salary_currency": currency,
+            "salary_period": "year",
+            "salary_source": rng.choice(("ats", "description")),
+            "salary_min_eur": round(salary_min * rate, 2),
+            "salary_max_eur": round(salary_max * rate, 2),
+            "salary_transparency_status": "disclosed",
+            "salary_confidence": rng.randint(60, 100),
+        }
+
+    def _job(self, i: int) -> dict:
+        rng = self.rng
+        company = self.pick_company()
+        ats = company["ats"][0] if len(company["ats"]) == 1 or rng.random() < 0.8 else company["ats"][1]
+        status = self.pick_status()
+        first_seen, last_seen = self._seen_window(status)
+        compliance = self.pick_compliance()
+        if compliance == "approved":
+            score = rng.randint(80, 100) if rng.random() < 0.9 else rng.randint(60, 79)
+        else:
+            score = rng.randint(40, 79) if compliance == "review" else rng.randint(0, 39)
+        scope, geo_class = self.pick_scope()
+        title = rng.choice(TITLES)
+        if rng.random() < 0.7:
+            title = f"{rng.choice(SENIORITY_PREFIXES)} {title}"
+        department = rng.choice(DEPARTMENTS) if rng.random() < 0.7 else None
+        salary = self._salary()
+        source_job_id = str(4_000_000 + i)
+        job = {
+            "job_id": _stable_hash("synthetic-job", self.seed, i, algorithm="sha1"),
+            "source": f"{ats['provider']}:{ats['ats_slug']}",
+            "source_job_id": source_job_id,
+            "source_url": f"https://jobs.example.com/{ats['provider']}/{ats['ats_slug']}/{source_job_id}",
+            "title": title,
+            "company_name": company["brand_name"],
+            "remote_source_flag": rng.random() < 0.6,
+            "remote_scope": scope,
+            "status": status,
+            "first_seen_at": first_seen,
+            "last_seen_at": last_seen,
+            "last_verified_at": last_seen if status != "expired" else None,
+            "verification_failures": rng.randint(1, 2) if status == "stale" else 0,
+            "updated_at": last_seen,
+            "remote_class": self.pick_remote_class[compliance](),
+            "geo_class": geo_class,
+            "compliance_status": compliance,
+            "compliance_score": score,
+            "company_id": company["company_id"],
+            "job_uid": _stable_hash(company["company_id"], title.lower(), scope.lower(), i, algorithm="sha256"),
+            "job_fingerprint": _stable_hash("synthetic-fingerprint", self.seed, i),
+            "source_schema_hash": _stable_hash("schema", ats["provider"]),
+            "policy_version": self.policy_version,
+            "job_quality_score": rng.randint(20, 100),
+            "availability_status": "expired" if status == "expired" else "active",
+            "is_repost": rng.random() < 0.05,
+            "source_department": department,
+            **salary,
+            **classify_taxonomy(title, department),
+        }
+        job["repost_count"] = rng.randint(1, 3) if job["is_repost"] else 0
+        job["description"] = self._description(salary["salary_transparency_status"] == "transparent_statement")
+        job["source_payload"] = (
+            json.dumps({"id": source_job_id, "title": title, "departments": [department] if department else []})
+            if rng.random() < 0.6
+            else None
+        )
+        job["ats"] = ats
+        job["company"] = company
+        return job
+
+    def _job_sources(self, job: dict):
+        hours = (job["last_seen_at"] - job["first_seen_at"]).total_seconds() / 3600
+        mapping = (job["source"], job["source_job_id"], job["source_url"])
+        mappings = [mapping]
+        others = [ats for ats in job["company"]["ats"] if ats is not job["ats"]]
+        # A few postings are cross-listed on the company's second ATS.
+        if others and self.rng.random() < 0.3:
+            other = others[0]
+            source_job_id = f"x{job['source_job_id']}"
+            mappings.append(
+                (
+                    f"{other['provider']}:{other['ats_slug']}",
+                    source_job_id,
+                    f"https://jobs.example.com/{other['provider']}/{other['ats_slug']}/{source_job_id}",
+                )
+            )
+        for source, source_job_id, source_url in mappings:
+            yield (
+                job["job_id"],
+                source,
+                source_job_id,
+                source_url,
+                job["first_seen_at"],
+                job["last_seen_at"],
+                job["first_seen_at"],
+                job["last_seen_at"],
+                max(1, int(hours)),
+            )
+
+    def _snapshots(self, job: dict):
+        rng = self.rng
+        count = 0
+        while rng.random() < self.snapshot_continue:
+            count += 1
+        window = (job["last_seen_at"] - job["first_seen_at"]).total_seconds()
+        for n, offset in enumerate(sorted(rng.uniform(0, window) for _ in range(count))):
+            changed_salary = job["salary_min"] is not None and rng.random() < 0.5
+            yield (
+                job["job_id"],
+                _stable_hash("synthetic-snapshot", job["job_id"], n),
+                job["title"] if rng.random() < 0.7 else f"{job['title']} (Remote)",
+                job["company_name"],
+                int(job["salary_min"] * 0.9) if changed_salary else job["salary_min"],
+                job["salary_max"],
+                job["salary_currency"],
+                job["first_seen_at"] + timedelta(seconds=offset),
+                job["remote_class"],
+                job["geo_class"],
+            )
+
+    def _reports(self, job: dict) -> list[dict]:
+        score = job["compliance_score"]
+        evaluations = [(job["first_seen_at"], score)]
+        if job["last_seen_at"].date().replace(day=1) != job["first_seen_at"].date().replace(day=1):
+            if self.rng.random() < 0.4:
+                # Re-evaluated in a later month; the first decision scored slightly differently.
+                evaluations = [(job["first_seen_at"], min(100, score + 5)), (job["last_seen_at"], score)]
+        reports = []
+        for created_at, score in evaluations:
+            penalties = [] if score >= 80 else [{"reason": "geo_restriction", "points": 100 - score}]
+            report = {
+                "job_id": job["job_id"],
+                "policy_version": self.policy_version,
+                "remote_class": job["remote_class"],
+                "geo_class": job["geo_class"],
+                "hard_geo_flag": job["geo_class"] == "non_eu" and job["compliance_status"] == "rejected",
+                "base_score": 100,
+                "penalties": penalties,
+                "bonuses": [],
+                "final_score": score,
+                "final_status": job["compliance_status"],
+                "decision_vector": {"remote_class": job["remote_class"], "geo_class": job["geo_class"], "score": score},
+            }
+            report["decision_hash"] = compliance_decision_hash(report)
+            report.update(job_uid=job["job_uid"], created_at=created_at, report_month=created_at.date().replace(day=1))
+            reports.append(report)
+        return reports
+
+    def load_jobs(self, conn, start: int, stop: int) -> dict[str, int]:
+        jobs = [self._job(i) for i in range(start, stop)]
+        for job in jobs:
+            self.market.add(job)
+        reports = [report for job in jobs for report in self._reports(job)]
+        for report in reports:
+            for field in ("penalties", "bonuses", "decision_vector"):
+                report[field] = json.dumps(report[field])
+
+        counts = {"jobs": _copy(conn, "jobs", JOB_COLUMNS, (tuple(job[c] for c in JOB_COLUMNS) for job in jobs))}
+        # The search_vector trigger is off during the load: stage the texts and compute it on insert.
+        conn.execute(
+            text(
+                "CREATE TEMP TABLE synthetic_job_texts (job_id TEXT, description TEXT, source_payload JSONB) ON COMMIT DROP"
+            )
+        )
+        _copy(
+            conn,
+            "synthetic_job_texts",
+            ("job_id", "description", "source_payload"),
+            ((job["job_id"], job["description"], job["source_payload"]) for job in jobs),
+        )
+        counts["job_texts"] = conn.execute(
+            text("""
+                INSERT INTO job_texts (job_id, description, source_payload, search_vector)
+                SELECT s.job_id, s.description, s.source_payload,
+                       job_search_vector(j.title, j.company_name, j.source_department, s.description)
+                FROM synthetic_job_texts s
+                JOIN jobs j ON j.job_id = s.job_id
+            """)
+        ).rowcount
+        counts["job_sources"] = _copy(
+            conn, "job_sources", JOB_SOURCE_COLUMNS, (row for job in jobs for row in self._job_sources(job))
+        )
+        counts["job_snapshots"] = _copy(
+            conn, "job_snapshots", SNAPSHOT_COLUMNS, (row for job in jobs for row in self._snapshots(job))
+        )
+        counts["compliance_reports"] = _copy(
+            conn, "compliance_reports", REPORT_COLUMNS, (tuple(r[c] for c in REPORT_COLUMNS) for r in reports)
+        )
+        latest = {report["job_uid"]: report for report in reports}
+        counts["compliance_decisions"] = _copy(
+            conn,
+            "compliance_decisions",
+            DECISION_COLUMNS,
+            ((uid, r["job_id"], r["policy_version"], r["decision_hash"], r["created_at"]) for uid, r in latest.items()),
+        )
+        return counts
+
+
+def _log_table_sizes(conn) -> None:
+    for table in LOADED_TABLES:
+        rows, size = conn.execute(
+            # pg_partition_tree: a partitioned parent has no storage of its own.
+            text(f"""
+                SELECT
+                    (SELECT COUNT(*) FROM {table}),
+                    pg_size_pretty(COALESCE(SUM(pg_total_relation_size(relid)), pg_total_relation_size('{table}')))
+                FROM pg_partition_tree('{table}')
+            """)
+        ).one()
+        logger.info("%-28s %12d rows %12s", table, rows, size)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=10_000)
+    parser.add_argument("--jobs", type=int, default=500_000)
+    parser.add_argument("--months", type=int, default=12, help="history covered by first_seen_at and market rows")
+    parser.add_argument("--snapshots-per-job", type=float, default=1.0, help="mean of the geometric distribution")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=20_000, help="jobs per COPY transaction")
+    parser.add_argument("--truncate", action="store_true", help="empty the loaded tables first")
+    args = parser.parse_args()
+
+    if os.getenv("DB_MODE") == "cloudsql":
+        logger.error("refusing to load synthetic data through DB_MODE=cloudsql")
+        return 1
+
+    engine = get_engine()
+    now = datetime.now(timezone.utc)
+    generator = _DatasetGenerator(
+        seed=args.seed,
+        companies=args.companies,
+        months=args.months,
+        snapshots_per_job=args.snapshots_per_job,
+        now=now,
+    )
+
+    with engine.begin() as conn:
+        if args.truncate:
+            conn.execute(text(f"TRUNCATE {', '.join(LOADED_TABLES)} CASCADE"))
+        elif conn.execute(text("SELECT EXISTS (SELECT 1 FROM jobs) OR EXISTS (SELECT 1 FROM companies)")).scalar():
+            logger.error("database already holds companies or jobs; pass --truncate to replace them")
+            return 1
+        # Monthly partitions for the whole history, so snapshots and reports don't pile up in *_default.
+        for table in PARTITIONED_TABLES:
+            first_month = generator.market.first_day - timedelta(days=MAX_LIFETIME_DAYS)
+            ensure_monthly_partitions(conn, table, months_ahead=args.months + 9, today=first_month)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        _disable_triggers(conn)
+        companies = _copy(conn, "companies", COMPANY_COLUMNS, generator.company_rows())
+        ats_rows = _copy(conn, "company_ats", COMPANY_ATS_COLUMNS, generator.company_ats_rows())
+    logger.info("loaded %d companies, %d company_ats rows", companies, ats_rows)
+
+    totals: dict[str, int] = {}
+    for start in range(0, args.jobs, args.chunk_size):
+        stop = min(start + args.chunk_size, args.jobs)
+        with engine.begin() as conn:
+            _disable_triggers(conn)
+            for table, count in generator.load_jobs(conn, start, stop).items():
+                totals[table] = totals.get(table, 0) + count
+        logger.info("loaded jobs %d/%d (%.0fs)", stop, args.jobs, time.perf_counter() - started)
+
+    with engine.begin() as conn:
+        _disable_triggers(conn)
+        totals["market_daily_stats"] = _copy(
+            conn, "market_daily_stats", DAILY_STATS_COLUMNS, generator.market.daily_rows()
+        )
+        totals["market_daily_stats_segments"] = _copy(
+            conn, "market_daily_stats_segments", SEGMENT_COLUMNS, generator.market.segment_rows()
+        )
+    logger.info("loaded %s in %.0fs", totals, time.perf_counter() - started)
+
+    # Tables the disabled triggers would have maintained, rebuilt the way maintenance reconciles them.
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rollup_rows = rebuild_market_rollup(conn)
+        counters = reconcile_system_counters(conn)
+        conn.execute(
+            text("INSERT INTO company_stats_dirty (company_id) SELECT company_id FROM companies ON CONFLICT DO NOTHING")
+        )
+    company_stats = refresh_dirty_company_stats()
+    logger.info(
+        "rebuilt market_rollup (%d rows), system_counters %s, company stats %s in %.0fs",
+        rollup_rows,
+        counters,
+        company_stats,
+        time.perf_counter() - started,
+    )
+
+    started = time.perf_counter()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in LOADED_TABLES:
+            conn.execute(text(f"VACUUM ANALYZE {table}"))
+        logger.info("vacuumed and analyzed in %.0fs", time.perf_counter() - started)
+        _log_table_sizes(conn)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,714 @@
+"""
+Query-plan regression report for the repository queries.
+
+Every registered case calls a repository function with representative
+parameters, records the SQL it sends (before_cursor_execute) and then runs each
+statement again as EXPLAIN (ANALYZE, BUFFERS) inside a transaction that is
+rolled back. Capture stops at the first data-modifying statement: that
+statement is explained but never executed outside the rolled-back EXPLAIN, so
+the functions that commit their own batches (lifecycle, company stats) leave
+the database unchanged.
+
+Each case lists the indexes its plan must use, the large tables it may
+sequentially scan, and time / buffer budgets (summed over its statements). The
+budgets are sized for the default scripts/generate_synthetic_dataset.py dataset
+(500k jobs, 10k companies); --no-budgets checks plan shape only, and
+--no-seqscan (SET enable_seqscan = off) checks that the expected indexes are
+applicable at all on a small database, where the planner rightly prefers
+sequential scans.
+
+The JSON report (--output) is stable and meant to be committed or diffed
+between commits; --baseline compares against an earlier report and flags plan
+changes and time / buffer regressions above --max-regression.
+
+Usage:
+    python scripts/query_plan_report.py [--output report.json] [--baseline previous.json]
+        [--case jobs.] [--repeat 3] [--max-regression 1.5] [--no-budgets] [--no-seqscan]
+
+Exits 1 when a case violates its expectations or regresses against the baseline.
+"""
+
+import argparse
+import difflib
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+from collections.abc import Callable
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.engine import Connection, Engine  # noqa: E402
+
+from app.api.jobs import FEED_LIMIT, FEED_MIN_COMPLIANCE_SCORE  # noqa: E402
+from storage.db_engine import get_engine  # noqa: E402
+from storage.repositories.ats_repository import load_active_ats_companies  # noqa: E402
+from storage.repositories.audit_repository import get_jobs_audit  # noqa: E402
+from storage.repositories.availability_repository import get_jobs_for_verification  # noqa: E402
+from storage.repositories.companies_repository import get_companies_paginated  # noqa: E402
+from storage.repositories.compliance_repository import (  # noqa: E402
+    count_jobs_missing_compliance,
+    get_jobs_for_compliance_resolution,
+)
+from storage.repositories.discovery_repository import load_discovery_companies  # noqa: E402
+from storage.repositories.jobs_repository import (  # noqa: E402
+    _count_prior_postings,
+    fold_job_sightings,
+    get_jobs,
+    get_jobs_missing_taxonomy,
+    get_jobs_paginated,
+)
+from storage.repositories.lifecycle_repository import (  # noqa: E402
+    apply_lifecycle_transitions,
+    mark_reposts_due_to_lifecycle,
+)
+from storage.repositories.maintenance_repository import _COMPANY_STATS_STMT  # noqa: E402
+from storage.repositories.market_repository import (  # noqa: E402
+    compute_market_stats_from_rollup,
+    get_market_daily_stats,
+)
+from storage.repositories.market_segments_repository import compute_market_segments_from_rollup  # noqa: E402
+from storage.repositories.near_duplicates_repository import get_jobs_missing_signatures  # noqa: E402
+from storage.repositories.paid_api_repository import get_paid_api_jobs  # noqa: E402
+from storage.repositories.salary_repository import get_jobs_with_missing_salary  # noqa: E402
+from storage.repositories.snapshots_repository import get_job_history, get_job_state_at  # noqa: E402
+from storage.repositories.system_repository import get_system_metrics  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("openjobseu.query_plans")
+
+# Sequential scans of these tables are violations unless the case allows them.
+# job_sightings is left out: it only holds sightings since the last fold, and
+# the synthetic dataset has none, so scanning it is the right plan there.
+LARGE_TABLES = (
+    "jobs",
+    "job_texts",
+    "job_sources",
+    "job_snapshots",
+    "compliance_reports",
+    "compliance_decisions",
+    "companies",
+    "company_ats",
+)
+
+# A baseline regression needs both the ratio and this absolute growth, so
+# sub-millisecond noise on fast queries is not reported.
+REGRESSION_MIN_MS = 2.0
+REGRESSION_MIN_BUFFERS = 100
+
+# Session statements and the planner row estimates of the paginated listings are not explained.
+_SKIPPED_SQL = re.compile(r"^\s*(SET|SHOW|RESET|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|EXPLAIN)\b", re.IGNORECASE)
+_DDL_SQL = re.compile(r"^\s*(CREATE|ALTER|DROP|TRUNCATE|VACUUM|ANALYZE|REFRESH|LOCK)\b", re.IGNORECASE)
+_WRITE_SQL = re.compile(
+    r"\b(INSERT\s+INTO|DELETE\s+FROM|MERGE\s+INTO|UPDATE\s+\w+(\s+(AS\s+)?\w+)?\s+SET)\b",
+    re.IGNORECASE,
+)
+
+
+class _CaptureStopped(Exception):
+    """Raised from the cursor hook once a case reaches its first write."""
+
+
+@dataclass(frozen=True)
+class PlanCase:
+    """One repository call whose plans are checked.
+
+    `params(conn)` picks representative arguments from the database before
+    capture starts; `run(params)` makes the call. An `indexes` entry of the
+    form "a|b" is met by either index.
+    """
+
+    name: str
+    run: Callable[[dict], object]
+    indexes: tuple[str, ...] = ()
+    seq_scans: tuple[str, ...] = ()
+    max_ms: float = 50.0
+    max_buffers: int = 5_000
+    params: Callable[[Connection], dict] = lambda conn: {}
+
+
+@dataclass(frozen=True)
+class CapturedStatement:
+    sql: str
+    parameters: object
+
+
+def _in_transaction(fn: Callable[..., object], *args, **kwargs) -> object:
+    # Rolled back on exit: read paths leave nothing behind, and the capture hook
+    # stops write paths before they execute.
+    with get_engine().connect() as conn:
+        return fn(conn, *args, **kwargs)
+
+
+def _execute(stmt) -> Callable[[dict], object]:
+    return lambda params: _in_transaction(lambda conn: conn.execute(stmt, params))
+
+
+# Placeholders when the database is empty, so every case still sends its statements.
+_NO_COMPANY_ID = "00000000-0000-0000-0000-000000000000"
+_NO_JOB = {
+    "job_id": "",
+    "job_fingerprint": "",
+    "company_name": "",
+    "title": "",
+    "first_seen_at": datetime(1970, 1, 1, tzinfo=timezone.utc),
+}
+
+
+def _keyset_cursor(conn: Connection) -> dict:
+    # The cursor of the sixth /jobs page.
+    row = conn.execute(
+        text("""
+            SELECT first_seen_at, job_id FROM jobs
+            WHERE status IN ('new', 'active')
+            ORDER BY first_seen_at DESC, job_id DESC
+            OFFSET 200 LIMIT 1
+        """)
+    ).first()
+    return {"after": (row.first_seen_at, row.job_id) if row else (datetime.now(timezone.utc), "")}
+
+
+def _company_keyset_cursor(conn: Connection) -> dict:
+    row = conn.execute(
+        text("""
+            SELECT signal_score, created_at, company_id FROM companies
+            WHERE is_active = TRUE
+            ORDER BY signal_score DESC, created_at DESC, company_id DESC
+            OFFSET 200 LIMIT 1
+        """)
+    ).first()
+    if row is None:
+        return {"after": (0, datetime.now(timezone.utc), _NO_COMPANY_ID)}
+    return {"after": (row.signal_score, row.created_at, str(row.company_id))}
+
+
+def _repost_candidates(conn: Connection) -> dict:
+    # One ingestion batch worth of recent jobs, checked as if they were new postings.
+    rows = conn.execute(
+        text("""
+            SELECT job_id, job_fingerprint, company_name, title, first_seen_at FROM jobs
+            WHERE job_fingerprint IS NOT NULL
+            ORDER BY first_seen_at DESC
+            LIMIT 200
+        """)
+    ).mappings()
+    return {"candidates": [dict(row) for row in rows] or [_NO_JOB]}
+
+
+def _dirty_companies(conn: Connection) -> dict:
+    # Ingestion marks the companies of the jobs it writes: those of the most recent postings.
+    ids = conn.execute(
+        text("""
+            SELECT company_id FROM (
+                SELECT company_id, MAX(first_seen_at) AS last_posted FROM jobs
+                WHERE company_id IS NOT NULL AND first_seen_at > NOW() - INTERVAL '3 days'
+                GROUP BY company_id
+            ) recent
+            ORDER BY last_posted DESC
+            LIMIT 1000
+        """)
+    ).scalars()
+    return {"company_ids": [str(company_id) for company_id in ids] or [_NO_COMPANY_ID]}
+
+
+def _longest_history(conn: Connection) -> dict:
+    # The job with the most snapshots, read just before its last one: decodes the longest chain.
+    row = conn.execute(
+        text("""
+            SELECT job_id, MAX(captured_at) AS last_captured_at FROM job_snapshots
+            GROUP BY job_id
+            ORDER BY COUNT(*) DESC, job_id
+            LIMIT 1
+        """)
+    ).first()
+    if row is None:
+        return {"job_id": _NO_JOB["job_id"], "at": _NO_JOB["first_seen_at"]}
+    return {"job_id": row.job_id, "at": row.last_captured_at - timedelta(microseconds=1)}
+
+
+def _yesterday(conn: Connection) -> dict:
+    return {"date": date.today() - timedelta(days=1)}
+
+
+CASES: tuple[PlanCase, ...] = (
+    PlanCase(
+        name="jobs.list",
+        run=lambda p: get_jobs_paginated(status="visible", limit=40),
+        indexes=("idx_jobs_first_seen_job_id",),
+    ),
+    PlanCase(
+        name="jobs.list_keyset",
+        params=_keyset_cursor,
+        run=lambda p: get_jobs_paginated(status="visible", limit=40, after=p["after"]),
+        indexes=("idx_jobs_first_seen_job_id",),
+    ),
+    PlanCase(
+        # Only a bounded candidate set is ranked. A mid-frequency term (~5% of jobs here)
+        # reads its matches from the GIN index; the count probe stops at the exact threshold.
+        name="jobs.search",
+        run=lambda p: get_jobs_paginated(status="visible", q="data scientist", limit=40),
+        indexes=("idx_job_texts_search_vector", "idx_jobs_first_seen_job_id|idx_jobs_first_seen"),
+        max_ms=1_500.0,
+        max_buffers=400_000,
+    ),
+    PlanCase(
+        # A term in most descriptions: the candidate walk stops after the first matches
+        # in first_seen_at order instead of ranking every match.
+        name="jobs.search_broad",
+        run=lambda p: get_jobs(status="visible", q="python", limit=40),
+        indexes=("idx_jobs_first_seen_job_id|idx_jobs_first_seen",),
+        max_ms=200.0,
+        max_buffers=30_000,
+    ),
+    PlanCase(
+        # Most visible jobs pass the feed's compliance floor, so walking first_seen_at
+        # order and filtering beats idx_jobs_feed_optimal plus a sort.
+        name="jobs.feed",
+        run=lambda p: get_jobs(status="visible", min_compliance_score=FEED_MIN_COMPLIANCE_SCORE, limit=FEED_LIMIT),
+        indexes=("idx_jobs_first_seen_job_id",),
+    ),
+    PlanCase(
+        name="jobs.repost_lookup",
+        params=_repost_candidates,
+        run=lambda p: _in_transaction(_count_prior_postings, p["candidates"]),
+        indexes=("idx_jobs_repost_lookup|idx_jobs_job_fingerprint_unique",),
+    ),
+    PlanCase(
+        name="jobs.fold_sightings",
+        run=lambda p: _in_transaction(fold_job_sightings, fold_after_hours=6),
+        indexes=("jobs_pkey",),
+    ),
+    PlanCase(
+        name="jobs.missing_taxonomy",
+        run=lambda p: _in_transaction(get_jobs_missing_taxonomy, 500),
+        indexes=("idx_jobs_specialization",),
+    ),
+    PlanCase(
+        name="availability.verification_queue",
+        run=lambda p: get_jobs_for_verification(limit=50),
+        indexes=("idx_jobs_availability_queue",),
+    ),
+    PlanCase(
+        name="lifecycle.transitions",
+        run=lambda p: apply_lifecycle_transitions(),
+        indexes=("idx_jobs_lifecycle_expire_candidates", "idx_jobs_availability_queue"),
+        max_ms=500.0,
+        max_buffers=60_000,
+    ),
+    PlanCase(
+        # Flagged rows come from the partial index, then one repost lookup each; most
+        # buffers are the batch UPDATE and its triggers.
+        name="lifecycle.reposts",
+        run=lambda p: mark_reposts_due_to_lifecycle(),
+        indexes=("idx_jobs_repost_flagged", "idx_jobs_repost_lookup"),
+        max_ms=500.0,
+        max_buffers=150_000,
+    ),
+    PlanCase(
+        name="companies.list",
+        run=lambda p: get_companies_paginated(limit=40),
+        indexes=("idx_companies_active_score_keyset",),
+    ),
+    PlanCase(
+        name="companies.list_keyset",
+        params=_company_keyset_cursor,
+        run=lambda p: get_companies_paginated(limit=40, after=p["after"]),
+        indexes=("idx_companies_active_score_keyset",),
+    ),
+    PlanCase(
+        # A full batch of active companies covers a large share of jobs: one pass over
+        # jobs is cheaper than 1000 idx_jobs_company_id lookups.
+        name="companies.stats_refresh",
+        params=_dirty_companies,
+        run=_execute(_COMPANY_STATS_STMT),
+        seq_scans=("jobs", "companies"),
+        max_ms=1_000.0,
+        max_buffers=80_000,
+    ),
+    PlanCase(
+        name="ats.active_companies",
+        run=lambda p: _in_transaction(load_active_ats_companies, limit=100),
+        seq_scans=("companies", "company_ats"),
+    ),
+    PlanCase(
+        # Bootstrap companies are not filtered out, so idx_companies_careers_check
+        # (bootstrap = false) does not apply.
+        name="discovery.careers",
+        run=lambda p: _in_transaction(load_discovery_companies, "careers"),
+        seq_scans=("companies",),
+    ),
+    PlanCase(
+        name="compliance.missing_count",
+        run=lambda p: count_jobs_missing_compliance(),
+        indexes=("idx_jobs_pending_compliance",),
+    ),
+    PlanCase(
+        name="compliance.resolution_queue",
+        run=lambda p: get_jobs_for_compliance_resolution(limit=500, only_missing=True),
+        indexes=("idx_jobs_pending_compliance",),
+    ),
+    PlanCase(
+        # ORDER BY COALESCE(last_seen_at, ...) cannot read idx_jobs_last_seen.
+        name="salary.missing",
+        run=lambda p: _in_transaction(get_jobs_with_missing_salary, 500),
+        seq_scans=("jobs",),
+        max_ms=800.0,
+        max_buffers=80_000,
+    ),
+    PlanCase(
+        name="near_duplicates.missing_signatures",
+        run=lambda p: _in_transaction(get_jobs_missing_signatures, limit=500),
+        indexes=("jobs_pkey", "job_signatures_pkey"),
+    ),
+    PlanCase(
+        name="paid_api.jobs",
+        run=lambda p: get_paid_api_jobs(status="active", limit=50),
+        indexes=("idx_jobs_first_seen_job_id",),
+        max_buffers=15_000,
+    ),
+    PlanCase(
+        # The panel's facet counts aggregate the whole table (cached between requests).
+        name="audit.jobs",
+        run=lambda p: get_jobs_audit(limit=50),
+        seq_scans=("jobs", "job_sources"),
+        max_ms=5_000.0,
+        max_buffers=400_000,
+    ),
+    PlanCase(
+        # History reads visit every monthly partition; empty (future) ones are seq-scanned.
+        name="snapshots.history",
+        params=_longest_history,
+        run=lambda p: _in_transaction(get_job_history, p["job_id"]),
+        indexes=("idx_job_snapshots_job_id",),
+        seq_scans=("job_snapshots",),
+        max_buffers=500,
+    ),
+    PlanCase(
+        name="snapshots.state_at",
+        params=_longest_history,
+        run=lambda p: _in_transaction(get_job_state_at, p["job_id"], p["at"]),
+        indexes=("jobs_pkey", "idx_job_snapshots_job_id"),
+        seq_scans=("job_snapshots",),
+        max_buffers=500,
+    ),
+    PlanCase(
+        name="market.stats_from_rollup",
+        params=_yesterday,
+        run=lambda p: _in_transaction(compute_market_stats_from_rollup, p["date"]),
+        indexes=("idx_jobs_first_seen", "idx_job_sources_last_seen", "market_rollup_pkey"),
+        max_buffers=20_000,
+    ),
+    PlanCase(
+        name="market.segments_from_rollup",
+        params=_yesterday,
+        run=lambda p: _in_transaction(compute_market_segments_from_rollup, p["date"]),
+        max_buffers=15_000,
+    ),
+    PlanCase(
+        name="market.daily_stats",
+        run=lambda p: _in_transaction(get_market_daily_stats, days=30),
+        indexes=("idx_market_daily_stats_date",),
+    ),
+    PlanCase(
+        name="system.metrics",
+        run=lambda p: get_system_metrics(),
+    ),
+)
+
+
+@contextmanager
+def _capture_statements():
+    captured: list[CapturedStatement] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _SKIPPED_SQL.match(statement):
+            return
+        if _DDL_SQL.match(statement):
+            raise _CaptureStopped(statement)
+        if executemany:
+            parameters = parameters[0] if parameters else {}
+        captured.append(CapturedStatement(sql=statement, parameters=parameters))
+        if _WRITE_SQL.search(statement):
+            raise _CaptureStopped(statement)
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+
+def capture_case(case: PlanCase, params: dict) -> list[CapturedStatement]:
+    """Statements `case` sends to the database, up to and including its first write."""
+    with _capture_statements() as captured:
+        try:
+            case.run(params)
+        except _CaptureStopped:
+            pass
+    return captured
+
+
+def load_partition_parents(conn: Connection) -> dict[str, str]:
+    """Partition (and partition index) name -> parent name, so plans name the parents."""
+    rows = conn.execute(
+        text("""
+            SELECT child.relname AS child, parent.relname AS parent
+            FROM pg_inherits i
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_class parent ON parent.oid = i.inhparent
+        """)
+    )
+    return {row.child: row.parent for row in rows}
+
+
+def _node_label(node: dict, parents: dict[str, str]) -> str:
+    label = node["Node Type"]
+    if node.get("Index Name"):
+        label += f" using {parents.get(node['Index Name'], node['Index Name'])}"
+    if node.get("Relation Name"):
+        label += f" on {parents.get(node['Relation Name'], node['Relation Name'])}"
+    return label
+
+
+def _plan_lines(node: dict, parents: dict[str, str], depth: int = 0) -> list[str]:
+    lines = ["  " * depth + _node_label(node, parents)]
+    # Identical sibling subtrees (one per partition under an Append) collapse into one.
+    children: list[tuple[list[str], int]] = []
+    for child in node.get("Plans", []):
+        child_lines = _plan_lines(child, parents, depth + 1)
+        if children and children[-1][0] == child_lines:
+            children[-1] = (child_lines, children[-1][1] + 1)
+        else:
+            children.append((child_lines, 1))
+    for child_lines, count in children:
+        if count > 1:
+            child_lines = [f"{child_lines[0]} (x{count})", *child_lines[1:]]
+        lines.extend(child_lines)
+    return lines
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def summarize_plan(explained: list[dict], parents: dict[str, str]) -> dict:
+    """Plan shape, indexes, sequentially scanned relations, time and buffers of one EXPLAIN (FORMAT JSON)."""
+    root = explained[0]
+    nodes = list(_walk(root["Plan"]))
+    indexes = {parents.get(n["Index Name"], n["Index Name"]) for n in nodes if n.get("Index Name")}
+    seq_scans = {parents.get(n["Relation Name"], n["Relation Name"]) for n in nodes if n["Node Type"] == "Seq Scan"}
+    return {
+        "plan": _plan_lines(root["Plan"], parents),
+        "indexes": sorted(indexes),
+        "seq_scans": sorted(seq_scans),
+        "ms": float(root["Execution Time"]),
+        "buffers": int(root["Plan"].get("Shared Hit Blocks", 0)) + int(root["Plan"].get("Shared Read Blocks", 0)),
+    }
+
+
+def explain_statement(
+    conn: Connection,
+    statement: CapturedStatement,
+    parents: dict[str, str],
+    *,
+    repeat: int = 1,
+) -> dict:
+    """EXPLAIN (ANALYZE, BUFFERS) `statement` `repeat` times, each rolled back; median time, last buffers."""
+    summaries = []
+    for _ in range(repeat):
+        try:
+            explained = conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement.sql}", statement.parameters
+            ).scalar_one()
+        finally:
+            conn.rollback()
+        summaries.append(summarize_plan(json.loads(explained) if isinstance(explained, str) else explained, parents))
+    summary = summaries[-1]
+    summary["ms"] = statistics.median(s["ms"] for s in summaries)
+    return summary
+
+
+def _statement_label(sql: str) -> str:
+    return " ".join(sql.split())[:100]
+
+
+def run_case(
+    conn: Connection,
+    case: PlanCase,
+    parents: dict[str, str],
+    *,
+    repeat: int = 1,
+    budgets: bool = True,
+) -> dict:
+    """Captures and explains `case` on `conn`; the result includes its violations."""
+    params = case.params(conn)
+    conn.rollback()
+    statements = [
+        {"query": _statement_label(s.sql), **explain_statement(conn, s, parents, repeat=repeat)}
+        for s in capture_case(case, params)
+    ]
+    result = {
+        "ms": round(sum(s["ms"] for s in statements), 1),
+        "buffers": sum(s["buffers"] for s in statements),
+        "indexes": sorted({i for s in statements for i in s["indexes"]}),
+        "seq_scans": sorted({r for s in statements for r in s["seq_scans"]}),
+        "statements": [{**s, "ms": round(s["ms"], 1)} for s in statements],
+    }
+    result["violations"] = check_case(case, result, budgets=budgets)
+    return result
+
+
+def check_case(case: PlanCase, result: dict, *, budgets: bool = True) -> list[str]:
+    violations = []
+    if not result["statements"]:
+        violations.append("no statements captured")
+    violations.extend(
+        f"index not used: {name}"
+        for name in case.indexes
+        if not any(index in result["indexes"] for index in name.split("|"))
+    )
+    violations.extend(
+        f"sequential scan on {relation}"
+        for relation in result["seq_scans"]
+        if relation in LARGE_TABLES and relation not in case.seq_scans
+    )
+    if budgets and result["ms"] > case.max_ms:
+        violations.append(f"{result['ms']:.1f} ms over the {case.max_ms:.0f} ms budget")
+    if budgets and result["buffers"] > case.max_buffers:
+        violations.append(f"{result['buffers']} buffers over the {case.max_buffers} buffer budget")
+    return violations
+
+
+def compare_reports(report: dict, baseline: dict, *, max_regression: float) -> tuple[list[str], list[str]]:
+    """(plan changes, regressions) of `report` against `baseline`; only regressions fail the run."""
+    changes, regressions = [], []
+    for name, result in report["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous is None:
+            changes.append(f"{name}: new case")
+            continue
+        old_plan = [line for s in previous["statements"] for line in s["plan"]]
+        new_plan = [line for s in result["statements"] for line in s["plan"]]
+        if old_plan != new_plan:
+            diff = difflib.unified_diff(old_plan, new_plan, "baseline", "current", lineterm="", n=1)
+            changes.append(f"{name}: plan changed\n" + "\n".join(diff))
+        if result["ms"] > previous["ms"] * max_regression and result["ms"] - previous["ms"] >= REGRESSION_MIN_MS:
+            regressions.append(f"{name}: {previous['ms']:.1f} -> {result['ms']:.1f} ms")
+        if (
+            result["buffers"] > previous["buffers"] * max_regression
+            and result["buffers"] - previous["buffers"] >= REGRESSION_MIN_BUFFERS
+        ):
+            regressions.append(f"{name}: {previous['buffers']} -> {result['buffers']} buffers")
+    changes.extend(f"{name}: case removed" for name in baseline.get("cases", {}) if name not in report["cases"])
+    return changes, regressions
+
+
+def _table_rows(conn: Connection) -> dict[str, int]:
+    # Planner row estimates (summed over partitions), recorded so reports from
+    # differently sized databases are not compared by mistake.
+    rows = conn.execute(
+        text("""
+            SELECT t.name, COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint AS estimate
+            FROM unnest(CAST(:tables AS TEXT[])) AS t(name)
+            LEFT JOIN pg_partition_tree(to_regclass(t.name)) p ON TRUE
+            LEFT JOIN pg_class c ON c.oid = COALESCE(p.relid, to_regclass(t.name))
+            GROUP BY t.name
+        """),
+        {"tables": list(LARGE_TABLES)},
+    )
+    return {row.name: int(row.estimate) for row in rows}
+
+
+def build_report(
+    engine,
+    cases: tuple[PlanCase, ...] = CASES,
+    *,
+    repeat: int = 1,
+    budgets: bool = True,
+    seqscan: bool = True,
+) -> dict:
+    with engine.connect() as conn:
+        parents = load_partition_parents(conn)
+        report = {"tables": _table_rows(conn), "cases": {}}
+        conn.rollback()
+        if not seqscan:
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            conn.commit()
+        try:
+            for case in cases:
+                report["cases"][case.name] = run_case(conn, case, parents, repeat=repeat, budgets=budgets)
+        finally:
+            if not seqscan:
+                conn.exec_driver_sql("RESET enable_seqscan")
+                conn.commit()
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--case", action="append", default=[], help="only cases whose name starts with this")
+    parser.add_argument("--repeat", type=int, default=3, help="EXPLAIN ANALYZE runs per statement (median time)")
+    parser.add_argument("--max-regression", type=float, default=1.5, help="time / buffer ratio over the baseline")
+    parser.add_argument("--no-budgets", action="store_true", help="check plan shape only")
+    parser.add_argument("--no-seqscan", action="store_true", help="SET enable_seqscan = off (small databases)")
+    parser.add_argument("--show-plans", action="store_true", help="log every statement's plan")
+    args = parser.parse_args()
+
+    def selected(name: str) -> bool:
+        return not args.case or any(name.startswith(prefix) for prefix in args.case)
+
+    cases = tuple(c for c in CASES if selected(c.name))
+    report = build_report(
+        get_engine(),
+        cases,
+        repeat=args.repeat,
+        budgets=not args.no_budgets,
+        seqscan=not args.no_seqscan,
+    )
+
+    failed = 0
+    logger.info("%-36s %10s %10s  %s", "case", "ms", "buffers", "indexes")
+    for name, result in report["cases"].items():
+        logger.info("%-36s %10.1f %10d  %s", name, result["ms"], result["buffers"], ", ".join(result["indexes"]) or "-")
+        if args.show_plans:
+            for statement in result["statements"]:
+                logger.info("  %s\n    %s", statement["query"], "\n    ".join(statement["plan"]))
+        for violation in result["violations"]:
+            logger.error("  %s: %s", name, violation)
+        failed += bool(result["violations"])
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        baseline["cases"] = {name: result for name, result in baseline["cases"].items() if selected(name)}
+        changes, regressions = compare_reports(report, baseline, max_regression=args.max_regression)
+        for change in changes:
+            logger.warning("%s", change)
+        for regression in regressions:
+            logger.error("regression %s", regression)
+        failed += len(regressions)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True, default=str)
+            f.write("\n")
+        logger.info("wrote %s", args.output)
+
+    logger.info("%s cases, %s failing", len(report["cases"]), failed)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
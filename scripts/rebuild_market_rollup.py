@@ -0,0 +1,25 @@
+import logging
+import os
+import sys
+
+# Zapewnienie dostępu do modułów projektu
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from storage.db_engine import get_engine
+from storage.repositories.market_rollup_repository import rebuild_market_rollup
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Recompute market_rollup from the jobs table, e.g. after a TRUNCATE or a bulk load with triggers disabled."""
+    with get_engine("maintenance").begin() as conn:
+        rows = rebuild_market_rollup(conn)
+    logger.info(f"Gotowe! Zapisano {rows} wierszy market_rollup.")
+
+
+if __name__ == "__main__":
+    main()
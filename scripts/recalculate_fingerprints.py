@@ -25,9 +25,10 @@ def main():
         # Pobieramy pola i sortujemy po first_seen_at, aby zachować najstarszą ofertę jako oryginał
         result = conn.execute(
             text("""
-            SELECT job_id, job_fingerprint, title, company_name, description 
-            FROM jobs 
-            ORDER BY first_seen_at ASC
+            SELECT j.job_id, j.job_fingerprint, j.title, j.company_name, t.description
+            FROM jobs j
+            LEFT JOIN job_texts t ON t.job_id = j.job_id
+            ORDER BY j.first_seen_at ASC
         """)
         )
         rows = result.mappings().all()
@@ -48,13 +48,14 @@ def main():
             conn.execute(
                 text("""
                 SELECT
-                    job_id,
-                    title,
-                    description,
-                    remote_scope,
-                    remote_class
-                FROM jobs
-                WHERE source LIKE 'greenhouse:%'
+                    j.job_id,
+                    j.title,
+                    t.description,
+                    j.remote_scope,
+                    j.remote_class
+                FROM jobs j
+                LEFT JOIN job_texts t ON t.job_id = j.job_id
+                WHERE j.source LIKE 'greenhouse:%'
             """)
             )
             .mappings()
@@ -0,0 +1,229 @@
+"""split description, source_payload and search_vector into job_texts
+
+Revision ID: a2c8e4f6b7d9
+Revises: f9b5d1e3a4c6
+Create Date: 2026-06-25 00:00:00.000000+00:00
+
+The cleaned description, the raw source payload and the search tsvector are the
+widest parts of a `jobs` row, yet the lifecycle, availability, market and
+maintenance passes never read them; every `last_seen_at` update still copied them
+into a new tuple version. They move to `job_texts` (1:1 on job_id).
+
+search_vector now lives apart from the columns it weighs (title, company_name and
+source_department stay in `jobs`), so triggers keep it current: job_texts rows
+compute it on insert / description change from the jobs row; jobs creates the
+job_texts row on insert and refreshes the vector when a weighted column changes.
+
+Online, in stages that each hold their locks only briefly:
+1. job_texts and its triggers are created in one short transaction. Until the
+   old columns are dropped, jobs inserts and description / payload updates are
+   also copied into job_texts, so writers of either schema stay in sync.
+2. Existing rows are copied in keyset batches of _BACKFILL_BATCH jobs, each
+   committed on its own; rows the sync triggers already wrote are kept.
+3. The GIN indexes are built CONCURRENTLY.
+4. The old columns are dropped by the short final revision f4c8a6e2b1d7.
+"""
+
+from contextlib import contextmanager
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "a2c8e4f6b7d9"
+down_revision = "f9b5d1e3a4c6"
+branch_labels = None
+depends_on = None
+
+_BACKFILL_BATCH = 5_000
+
+# Same weighting as the jobs trigger of e1a7c3d5f6b8.
+_SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')
+    || setweight(to_tsvector('english'::regconfig, coalesce(company_name, '')), 'B')
+    || setweight(to_tsvector('english'::regconfig, coalesce(source_department, '')), 'C')
+    || setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'D')
+"""
+
+
+@contextmanager
+def _transaction():
+    # Revisions that build indexes CONCURRENTLY leave the connection in AUTOCOMMIT for
+    # the rest of the run; the schema objects of stage 1 still have to commit together.
+    bind = op.get_bind()
+    if bind.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        yield
+        bind.commit()
+        return
+    bind.commit()
+    bind.execution_options(isolation_level="READ COMMITTED")
+    try:
+        with bind.begin():
+            yield
+    finally:
+        bind.execution_options(isolation_level="AUTOCOMMIT")
+
+
+def upgrade() -> None:
+    with _transaction():
+        _create_job_texts()
+
+    conn = op.get_bind().execution_options(isolation_level="AUTOCOMMIT")
+    _backfill_job_texts(conn)
+    conn.execute(
+        sa.text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_texts_search_vector ON job_texts USING GIN (search_vector)"
+        )
+    )
+    conn.execute(
+        sa.text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_texts_payload_gin ON job_texts USING GIN (source_payload)"
+        )
+    )
+
+
+def _create_job_texts() -> None:
+    op.execute("""
+        CREATE TABLE job_texts (
+            job_id TEXT PRIMARY KEY REFERENCES jobs (job_id) ON DELETE CASCADE,
+            description TEXT,
+            source_payload JSONB,
+            search_vector TSVECTOR NOT NULL DEFAULT ''::tsvector
+        )
+    """)
+    op.execute(f"""
+        CREATE FUNCTION job_search_vector(title TEXT, company_name TEXT, source_department TEXT, description TEXT)
+        RETURNS tsvector
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT {_SEARCH_VECTOR_SQL}
+        $$
+    """)
+
+    op.execute("""
+        CREATE FUNCTION job_texts_search_vector() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            SELECT job_search_vector(j.title, j.company_name, j.source_department, NEW.description)
+            INTO NEW.search_vector
+            FROM jobs j
+            WHERE j.job_id = NEW.job_id;
+            RETURN NEW;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_job_texts_search_vector
+        BEFORE INSERT OR UPDATE OF description ON job_texts
+        FOR EACH ROW EXECUTE FUNCTION job_texts_search_vector()
+    """)
+
+    # Copies the old columns while they exist; f4c8a6e2b1d7 reduces it to the job_id.
+    op.execute("""
+        CREATE FUNCTION create_job_texts() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO job_texts (job_id, description, source_payload)
+            SELECT job_id, description, source_payload FROM new_rows
+            ON CONFLICT (job_id) DO NOTHING;
+            RETURN NULL;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_jobs_create_job_texts
+        AFTER INSERT ON jobs
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION create_job_texts()
+    """)
+
+    # Dropped by f4c8a6e2b1d7 with the old columns. An upsert, so a row the backfill
+    # copied from an older snapshot is overwritten and one it has yet to copy is kept.
+    op.execute("""
+        CREATE FUNCTION sync_job_texts_from_jobs() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO job_texts (job_id, description, source_payload)
+            VALUES (NEW.job_id, NEW.description, NEW.source_payload)
+            ON CONFLICT (job_id) DO UPDATE SET
+                description = EXCLUDED.description,
+                source_payload = EXCLUDED.source_payload;
+            RETURN NULL;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_jobs_sync_job_texts
+        AFTER UPDATE OF description, source_payload ON jobs
+        FOR EACH ROW
+        WHEN (
+            OLD.description IS DISTINCT FROM NEW.description
+            OR OLD.source_payload IS DISTINCT FROM NEW.source_payload
+        )
+        EXECUTE FUNCTION sync_job_texts_from_jobs()
+    """)
+
+    op.execute("""
+        CREATE FUNCTION refresh_job_texts_search_vector() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE job_texts
+            SET search_vector = job_search_vector(NEW.title, NEW.company_name, NEW.source_department, description)
+            WHERE job_id = NEW.job_id;
+            RETURN NULL;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_jobs_refresh_search_vector
+        AFTER UPDATE OF title, company_name, source_department ON jobs
+        FOR EACH ROW
+        WHEN (
+            OLD.title IS DISTINCT FROM NEW.title
+            OR OLD.company_name IS DISTINCT FROM NEW.company_name
+            OR OLD.source_department IS DISTINCT FROM NEW.source_department
+        )
+        EXECUTE FUNCTION refresh_job_texts_search_vector()
+    """)
+
+
+def _backfill_job_texts(conn) -> None:
+    after = ""
+    while True:
+        last = conn.execute(
+            sa.text("""
+                WITH batch AS (
+                    SELECT job_id, description, source_payload FROM jobs
+                    WHERE job_id > :after
+                    ORDER BY job_id
+                    LIMIT :batch
+                ),
+                copied AS (
+                    INSERT INTO job_texts (job_id, description, source_payload)
+                    SELECT job_id, description, source_payload FROM batch
+                    ON CONFLICT (job_id) DO NOTHING
+                )
+                SELECT MAX(job_id) FROM batch
+            """),
+            {"after": after, "batch": _BACKFILL_BATCH},
+        ).scalar()
+        if last is None:
+            return
+        after = last
+
+
+def downgrade() -> None:
+    # The old columns are still in place (f4c8a6e2b1d7 restores them on its downgrade).
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_job_texts_payload_gin"))
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_job_texts_search_vector"))
+    conn.execute(sa.text("DROP TRIGGER IF EXISTS trg_jobs_refresh_search_vector ON jobs"))
+    conn.execute(sa.text("DROP TRIGGER IF EXISTS trg_jobs_sync_job_texts ON jobs"))
+    conn.execute(sa.text("DROP TRIGGER IF EXISTS trg_jobs_create_job_texts ON jobs"))
+    conn.execute(sa.text("DROP TABLE IF EXISTS job_texts"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS refresh_job_texts_search_vector()"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS sync_job_texts_from_jobs()"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS create_job_texts()"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS job_texts_search_vector()"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS job_search_vector(TEXT, TEXT, TEXT, TEXT)"))
@@ -0,0 +1,39 @@
+"""Create compliance_decisions table
+
+Revision ID: a3c9e5f7b8d0
+Revises: f2b8d4e6a7c9
+Create Date: 2026-06-10 00:00:00.000000+00:00
+
+Latest compliance decision per job_uid, stored as a hash of the report fields.
+insert_compliance_reports compares against it and only writes reports whose
+decision changed. The table starts empty: the first sync after deploy writes
+one report per job and fills the cache.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a3c9e5f7b8d0"
+down_revision = "f2b8d4e6a7c9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "compliance_decisions",
+        sa.Column("job_uid", sa.Text(), primary_key=True),
+        sa.Column("job_id", sa.Text(), nullable=False),
+        sa.Column("policy_version", sa.Text(), nullable=False),
+        sa.Column("decision_hash", sa.Text(), nullable=False),
+        sa.Column("decided_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.job_id"], name="fk_compliance_decisions_job", ondelete="CASCADE"),
+    )
+    op.create_index("idx_compliance_decisions_job_id", "compliance_decisions", ["job_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_compliance_decisions_job_id", table_name="compliance_decisions")
+    op.drop_table("compliance_decisions")
@@ -0,0 +1,79 @@
+"""Create job_signatures and job_signature_bands tables
+
+Revision ID: a7c3e9f1b2d4
+Revises: f3a4b5c6d7e8
+Create Date: 2026-05-04 00:00:00.000000+00:00
+
+MinHash signatures (one row per job) and their LSH band hashes (LSH_BANDS rows
+per job). Near-duplicate lookup is an index probe on
+(band_index, band_hash) instead of a self-join over `jobs`.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "a7c3e9f1b2d4"
+down_revision = "f3a4b5c6d7e8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_signatures",
+        sa.Column(
+            "job_id",
+            sa.Text(),
+            sa.ForeignKey("jobs.job_id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("job_fingerprint", sa.Text(), nullable=False),
+        sa.Column("signature", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column(
+            "near_duplicate_of",
+            sa.Text(),
+            sa.ForeignKey("jobs.job_id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("near_duplicate_similarity", sa.Float(), nullable=True),
+        sa.Column("checked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+    )
+    op.create_index(
+        "idx_job_signatures_unchecked",
+        "job_signatures",
+        ["updated_at"],
+        postgresql_where=sa.text("checked_at IS NULL"),
+    )
+    op.create_index(
+        "idx_job_signatures_near_duplicate_of",
+        "job_signatures",
+        ["near_duplicate_of"],
+        postgresql_where=sa.text("near_duplicate_of IS NOT NULL"),
+    )
+
+    op.create_table(
+        "job_signature_bands",
+        sa.Column("band_index", sa.SmallInteger(), nullable=False),
+        sa.Column("band_hash", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "job_id",
+            sa.Text(),
+            sa.ForeignKey("jobs.job_id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("band_index", "band_hash", "job_id", name="pk_job_signature_bands"),
+    )
+    op.create_index("idx_job_signature_bands_job_id", "job_signature_bands", ["job_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_job_signature_bands_job_id", table_name="job_signature_bands")
+    op.drop_table("job_signature_bands")
+    op.drop_index("idx_job_signatures_near_duplicate_of", table_name="job_signatures")
+    op.drop_index("idx_job_signatures_unchecked", table_name="job_signatures")
+    op.drop_table("job_signatures")
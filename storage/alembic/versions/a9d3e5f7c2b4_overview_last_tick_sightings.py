@@ -0,0 +1,102 @@
+"""last tick of the audit overview includes pending job sightings
+
+Revision ID: a9d3e5f7c2b4
+Revises: f4c8a6e2b1d7
+Create Date: 2026-07-09 00:00:00.000000+00:00
+
+Unchanged re-sightings only upsert job_sightings and reach jobs.last_seen_at when
+fold_job_sightings runs, so MAX(jobs.last_seen_at) put the last ingestion tick up
+to JOB_SIGHTINGS_FOLD_HOURS behind. vw_looker_audit_overview (and
+get_system_metrics) now take the later of both tables; idx_job_sightings_last_seen
+keeps the job_sightings side an index endpoint lookup like idx_jobs_last_seen.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a9d3e5f7c2b4"
+down_revision = "f4c8a6e2b1d7"
+branch_labels = None
+depends_on = None
+
+OVERVIEW_VIEW = """
+    CREATE OR REPLACE VIEW public.vw_looker_audit_overview AS
+    SELECT
+        NOW() AS generated_at,
+        metrics.jobs_total,
+        metrics.jobs_24h,
+        metrics.companies_total,
+        metrics.companies_24h,
+        metrics.company_ats_total,
+        metrics.company_ats_24h,
+        metrics.last_tick_at,
+        company_activity.last_active_job_at,
+        window_7d.approved_7d,
+        window_7d.review_7d,
+        window_7d.rejected_7d,
+        window_7d.approved_ratio_7d,
+        ats_health.ats_health_count
+    FROM (
+        SELECT
+            (SELECT COUNT(*)::bigint FROM jobs) AS jobs_total,
+            (SELECT COUNT(*)::bigint FROM jobs WHERE first_seen_at >= NOW() - INTERVAL '24 hours') AS jobs_24h,
+            (SELECT COUNT(*)::bigint FROM companies) AS companies_total,
+            (SELECT COUNT(*)::bigint FROM companies WHERE created_at >= NOW() - INTERVAL '24 hours') AS companies_24h,
+            (SELECT COUNT(*)::bigint FROM company_ats) AS company_ats_total,
+            (SELECT COUNT(*)::bigint FROM company_ats WHERE created_at >= NOW() - INTERVAL '24 hours') AS company_ats_24h,
+            {last_tick} AS last_tick_at
+    ) AS metrics
+    CROSS JOIN (
+        SELECT MAX(last_active_job_at) AS last_active_job_at
+        FROM companies
+    ) AS company_activity
+    CROSS JOIN (
+        SELECT
+            COUNT(*) FILTER (WHERE compliance_status = 'approved')::bigint AS approved_7d,
+            COUNT(*) FILTER (WHERE compliance_status = 'review')::bigint AS review_7d,
+            COUNT(*) FILTER (WHERE compliance_status = 'rejected')::bigint AS rejected_7d,
+            ROUND(
+                COUNT(*) FILTER (WHERE compliance_status = 'approved')::numeric
+                / NULLIF(COUNT(*), 0) * 100,
+                2
+            ) AS approved_ratio_7d
+        FROM jobs
+        WHERE first_seen_at > NOW() - INTERVAL '7 days'
+    ) AS window_7d
+    CROSS JOIN (
+        SELECT COUNT(*)::bigint AS ats_health_count
+        FROM company_ats ca
+        JOIN companies c ON c.company_id = ca.company_id
+        WHERE ca.is_active = TRUE
+          AND c.is_active = TRUE
+          AND (
+              ca.last_sync_at < NOW() - INTERVAL '3 days'
+              OR (ca.last_sync_at IS NULL AND ca.created_at < NOW() - INTERVAL '3 days')
+          )
+    ) AS ats_health
+"""
+
+LAST_TICK_SQL = "GREATEST((SELECT MAX(last_seen_at) FROM jobs), (SELECT MAX(last_seen_at) FROM job_sightings))"
+
+# As created by 7d4e1f9c2a6b.
+JOBS_LAST_TICK_SQL = "(SELECT MAX(last_seen_at) FROM jobs)"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+    conn.execute(
+        sa.text("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_sightings_last_seen ON job_sightings (last_seen_at)")
+    )
+    conn.execute(sa.text(OVERVIEW_VIEW.format(last_tick=LAST_TICK_SQL)))
+
+
+def downgrade() -> None:
+    op.execute(OVERVIEW_VIEW.format(last_tick=JOBS_LAST_TICK_SQL))
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_job_sightings_last_seen"))
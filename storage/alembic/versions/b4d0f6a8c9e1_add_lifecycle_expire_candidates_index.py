@@ -0,0 +1,45 @@
+"""add lifecycle expire candidates index
+
+Revision ID: b4d0f6a8c9e1
+Revises: a3c9e5f7b8d0
+Create Date: 2026-06-16 00:00:00.000000+00:00
+
+The single-pass lifecycle scan (apply_lifecycle_transitions) reads its
+candidates as a BitmapOr over partial indexes, one per arm:
+  status <> 'expired' AND (verification_failures >= 3 OR availability_status = 'expired')
+                                            -> idx_jobs_lifecycle_expire_candidates (new)
+  status IN ('active', 'stale') AND last_verified_at < NOW() - INTERVAL '7 days'
+  status = 'stale' AND last_verified_at >= NOW() - INTERVAL '7 days' ...
+                                            -> idx_jobs_availability_queue
+  status = 'new'                            -> idx_jobs_lifecycle_new_activation
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "b4d0f6a8c9e1"
+down_revision = "a3c9e5f7b8d0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(
+        sa.text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_lifecycle_expire_candidates
+            ON jobs (job_id)
+            WHERE status <> 'expired' AND (verification_failures >= 3 OR availability_status = 'expired')
+        """)
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_lifecycle_expire_candidates"))
@@ -0,0 +1,57 @@
+"""add job_sightings
+
+Revision ID: b5d1f7a9c0e2
+Revises: a2c8e4f6b7d9
+Create Date: 2026-06-26 00:00:00.000000+00:00
+
+Postings that are still listed and unchanged no longer update `jobs` and
+`job_sources` on every ingestion tick. bulk_upsert_jobs upserts one narrow row
+per source mapping instead (last sighting, sightings since the last fold), and
+fold_job_sightings moves them into job_sources.last_seen_at / seen_count and
+jobs.last_seen_at once the job's folded last_seen_at is JOB_SIGHTINGS_FOLD_HOURS
+old. Readers that need the exact value use JOB_LAST_SEEN_SQL
+(storage/common.py).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "b5d1f7a9c0e2"
+down_revision = "a2c8e4f6b7d9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_sightings",
+        sa.Column("source", sa.Text(), nullable=False),
+        sa.Column("source_job_id", sa.Text(), nullable=False),
+        sa.Column("job_id", sa.Text(), sa.ForeignKey("jobs.job_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("seen_count", sa.Integer(), nullable=False, server_default=sa.text("1")),
+        sa.PrimaryKeyConstraint("source", "source_job_id", name="pk_job_sightings"),
+    )
+    op.create_index("idx_job_sightings_job_id", "job_sightings", ["job_id", "last_seen_at"])
+
+
+def downgrade() -> None:
+    # Pending sightings are folded first so no last_seen_at / seen_count is lost.
+    op.execute("""
+        WITH folded AS (
+            DELETE FROM job_sightings
+            RETURNING source, source_job_id, job_id, last_seen_at, seen_count
+        ),
+        sources AS (
+            UPDATE job_sources js
+            SET last_seen_at = GREATEST(js.last_seen_at, f.last_seen_at),
+                seen_count = js.seen_count + f.seen_count
+            FROM folded f
+            WHERE js.source = f.source AND js.source_job_id = f.source_job_id
+        )
+        UPDATE jobs j
+        SET last_seen_at = GREATEST(j.last_seen_at, f.last_seen_at)
+        FROM (SELECT job_id, MAX(last_seen_at) AS last_seen_at FROM folded GROUP BY job_id) f
+        WHERE j.job_id = f.job_id
+    """)
+    op.drop_table("job_sightings")
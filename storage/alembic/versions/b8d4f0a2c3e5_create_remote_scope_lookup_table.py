@@ -0,0 +1,38 @@
+"""Create remote_scope_lookup table
+
+Revision ID: b8d4f0a2c3e5
+Revises: a7c3e9f1b2d4
+Create Date: 2026-05-06 00:00:00.000000+00:00
+
+Persisted remote_scope -> geo/segment classification. Filled from the memoized
+Python classifier so SQL analytics (market segments) can join on it instead of
+re-deriving regions per query.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b8d4f0a2c3e5"
+down_revision = "a7c3e9f1b2d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "remote_scope_lookup",
+        sa.Column("remote_scope", sa.Text(), primary_key=True),
+        sa.Column("geo_class", sa.Text(), nullable=True),
+        sa.Column("reason", sa.Text(), nullable=True),
+        sa.Column("eu_member_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("segment_label", sa.Text(), nullable=True),
+        sa.Column("is_excluded", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("classifier_version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("remote_scope_lookup")
@@ -0,0 +1,96 @@
+"""delta-encode job_snapshots
+
+Revision ID: c4e8a2f6d1b9
+Revises: b5d1f7a9c0e2
+Create Date: 2026-07-03 00:00:00.000000+00:00
+
+Snapshots become field-level deltas against the job's previous snapshot. A new
+`delta_mask` column flags the fields a row stores (bit i = FIELDS[i]); the other
+fields are NULL. Rows with a NULL mask are keyframes holding every field: the
+first snapshot of a job in each UTC month (so chains never span partitions and
+retention stays safe) and every KEYFRAME_INTERVAL-th one within a month. The
+format is read and written by storage/repositories/snapshots_repository.py.
+
+Existing history is converted in place with one UPDATE; the space it frees is
+reused by later inserts, or returned with VACUUM FULL / pg_repack per partition.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c4e8a2f6d1b9"
+down_revision = "b5d1f7a9c0e2"
+branch_labels = None
+depends_on = None
+
+# Must match SNAPSHOT_FIELDS / SNAPSHOT_KEYFRAME_INTERVAL in snapshots_repository.
+FIELDS = (
+    "job_fingerprint",
+    "title",
+    "company_name",
+    "salary_min",
+    "salary_max",
+    "salary_currency",
+    "remote_class",
+    "geo_class",
+)
+KEYFRAME_INTERVAL = 8
+
+
+def _changed(field: str) -> str:
+    return f"{field} IS DISTINCT FROM prev_{field}"
+
+
+def _stored(bit: int) -> str:
+    return f"delta_mask IS NULL OR delta_mask & {1 << bit} <> 0"
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE job_snapshots ADD COLUMN delta_mask SMALLINT")
+    op.execute("ALTER TABLE job_snapshots ALTER COLUMN job_fingerprint DROP NOT NULL")
+    previous = ", ".join(f"LAG({field}) OVER w AS prev_{field}" for field in FIELDS)
+    mask = " | ".join(f"CASE WHEN {_changed(field)} THEN {1 << bit} ELSE 0 END" for bit, field in enumerate(FIELDS))
+    changed = ", ".join(f"CASE WHEN {_changed(field)} THEN {field} END AS {field}" for field in FIELDS)
+    # Every existing row is a full copy, so LAG() already yields the previous state.
+    op.execute(f"""
+        WITH chained AS (
+            SELECT
+                snapshot_id, captured_at, {", ".join(FIELDS)}, {previous},
+                ROW_NUMBER() OVER w - 1 AS position
+            FROM job_snapshots
+            WINDOW w AS (
+                PARTITION BY job_id, date_trunc('month', captured_at AT TIME ZONE 'UTC')
+                ORDER BY captured_at, snapshot_id
+            )
+        ),
+        deltas AS (
+            SELECT snapshot_id, captured_at, ({mask}) AS delta_mask, {changed}
+            FROM chained
+            WHERE position % {KEYFRAME_INTERVAL} <> 0
+        )
+        UPDATE job_snapshots s
+        SET delta_mask = d.delta_mask, {", ".join(f"{field} = d.{field}" for field in FIELDS)}
+        FROM deltas d
+        WHERE s.snapshot_id = d.snapshot_id AND s.captured_at = d.captured_at
+    """)
+
+
+def downgrade() -> None:
+    # A field's value is the last one a keyframe or a delta flagging it stored.
+    stored = ", ".join(
+        f"array_agg({field}) FILTER (WHERE {_stored(bit)}) OVER w AS {field}" for bit, field in enumerate(FIELDS)
+    )
+    op.execute(f"""
+        WITH decoded AS (
+            SELECT snapshot_id, captured_at, {stored}
+            FROM job_snapshots
+            WINDOW w AS (PARTITION BY job_id ORDER BY captured_at, snapshot_id)
+        )
+        UPDATE job_snapshots s
+        SET {", ".join(f"{field} = d.{field}[cardinality(d.{field})]" for field in FIELDS)}
+        FROM decoded d
+        WHERE s.snapshot_id = d.snapshot_id AND s.captured_at = d.captured_at AND s.delta_mask IS NOT NULL
+    """)
+    op.execute("ALTER TABLE job_snapshots ALTER COLUMN job_fingerprint SET NOT NULL")
+    op.execute("ALTER TABLE job_snapshots DROP COLUMN delta_mask")
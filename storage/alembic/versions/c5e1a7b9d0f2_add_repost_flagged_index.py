@@ -0,0 +1,41 @@
+"""add repost flagged index
+
+Revision ID: c5e1a7b9d0f2
+Revises: b4d0f6a8c9e1
+Create Date: 2026-06-18 00:00:00.000000+00:00
+
+Repost flags are now set at ingest by bulk_upsert_jobs (one lookup per batch
+through idx_jobs_repost_lookup). The lifecycle pass only reconciles jobs that
+are already flagged, so it reads them through this small partial index instead
+of self-joining every job first seen in the last 45 days.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c5e1a7b9d0f2"
+down_revision = "b4d0f6a8c9e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(
+        sa.text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_repost_flagged
+            ON jobs (first_seen_at)
+            WHERE is_repost OR repost_count > 0
+        """)
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_repost_flagged"))
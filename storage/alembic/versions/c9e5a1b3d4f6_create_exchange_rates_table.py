@@ -0,0 +1,47 @@
+"""Create exchange_rates table and current_exchange_rates view
+
+Revision ID: c9e5a1b3d4f6
+Revises: b8d4f0a2c3e5
+Create Date: 2026-05-08 00:00:00.000000+00:00
+
+Dated EUR conversion rates, synced from app/domain/money/exchange_rates.csv by
+the maintenance pipeline. `current_exchange_rates` resolves the rate in force
+today per currency and drives the set-based salary_*_eur re-normalization.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c9e5a1b3d4f6"
+down_revision = "b8d4f0a2c3e5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "exchange_rates",
+        sa.Column("currency", sa.Text(), nullable=False),
+        sa.Column("valid_from", sa.Date(), nullable=False),
+        sa.Column("rate_to_eur", sa.Float(precision=53), nullable=False),
+        # NULL until the rate (once in force) has been applied to jobs.salary_*_eur.
+        sa.Column("applied_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.PrimaryKeyConstraint("currency", "valid_from", name="pk_exchange_rates"),
+        sa.CheckConstraint("rate_to_eur > 0", name="ck_exchange_rates_positive"),
+    )
+    op.execute("""
+        CREATE VIEW current_exchange_rates AS
+        SELECT DISTINCT ON (currency) currency, valid_from, rate_to_eur
+        FROM exchange_rates
+        WHERE valid_from <= CURRENT_DATE
+        ORDER BY currency, valid_from DESC
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS current_exchange_rates")
+    op.drop_table("exchange_rates")
@@ -0,0 +1,62 @@
+"""add keyset pagination indexes
+
+Revision ID: d0f6b2c4e5a7
+Revises: c9e5a1b3d4f6
+Create Date: 2026-05-18 00:00:00.000000+00:00
+
+Supports cursor pagination on the list endpoints:
+  /jobs, /v1/jobs:  WHERE (first_seen_at, job_id) < (:ts, :id)
+                    ORDER BY first_seen_at DESC, job_id DESC
+  /companies:       WHERE is_active = TRUE AND (signal_score, created_at, company_id) < (...)
+                    ORDER BY signal_score DESC, created_at DESC, company_id DESC
+
+The trailing primary key makes the ordering total, so the row-value predicate
+resumes exactly after the previous page without skipping ties.
+
+idx_companies_active_score_keyset extends idx_companies_active_score
+(5c1b4a3e2f0d) with company_id, so the older index is dropped once the new one
+is built.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "d0f6b2c4e5a7"
+down_revision = "c9e5a1b3d4f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(
+        sa.text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_first_seen_job_id
+            ON jobs (first_seen_at DESC, job_id DESC)
+        """)
+    )
+    conn.execute(
+        sa.text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_companies_active_score_keyset
+            ON companies (is_active, signal_score DESC, created_at DESC, company_id DESC)
+        """)
+    )
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_companies_active_score"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(
+        sa.text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_companies_active_score
+            ON companies (is_active, signal_score DESC, created_at DESC)
+        """)
+    )
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_companies_active_score_keyset"))
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_first_seen_job_id"))
@@ -0,0 +1,57 @@
+"""jobs.first_seen_at NOT NULL
+
+Revision ID: d6a2f8c4b1e3
+Revises: c4e8a2f6d1b9
+Create Date: 2026-07-05 00:00:00.000000+00:00
+
+first_seen_at is the keyset of the /jobs and /v1/jobs cursors. A NULL there
+cannot be encoded in a cursor and the row-value predicate
+`(first_seen_at, job_id) < (...)` never matches it, so NULL-keyed rows were
+skipped by cursor pagination. Ingestion always sets the column; legacy NULLs
+are backfilled from last_seen_at / updated_at and the column becomes NOT NULL
+with a NOW() default.
+
+Online: the backfill is served by idx_jobs_first_seen_job_id, the CHECK is
+validated under SHARE UPDATE EXCLUSIVE (writes keep flowing), and SET NOT NULL
+then reuses the validated CHECK instead of scanning under ACCESS EXCLUSIVE.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d6a2f8c4b1e3"
+down_revision = "c4e8a2f6d1b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every statement commits on its own, so the validating scan never runs under
+    # the brief ACCESS EXCLUSIVE lock of ADD CONSTRAINT / SET NOT NULL.
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(
+        sa.text("""
+            UPDATE jobs
+            SET first_seen_at = COALESCE(last_seen_at, updated_at, NOW())
+            WHERE first_seen_at IS NULL
+        """)
+    )
+    conn.execute(sa.text("ALTER TABLE jobs ALTER COLUMN first_seen_at SET DEFAULT NOW()"))
+    conn.execute(
+        sa.text(
+            "ALTER TABLE jobs ADD CONSTRAINT jobs_first_seen_at_not_null CHECK (first_seen_at IS NOT NULL) NOT VALID"
+        )
+    )
+    conn.execute(sa.text("ALTER TABLE jobs VALIDATE CONSTRAINT jobs_first_seen_at_not_null"))
+    conn.execute(sa.text("ALTER TABLE jobs ALTER COLUMN first_seen_at SET NOT NULL"))
+    conn.execute(sa.text("ALTER TABLE jobs DROP CONSTRAINT jobs_first_seen_at_not_null"))
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs ALTER COLUMN first_seen_at DROP NOT NULL")
+    op.execute("ALTER TABLE jobs ALTER COLUMN first_seen_at DROP DEFAULT")
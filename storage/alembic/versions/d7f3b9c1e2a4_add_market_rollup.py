@@ -0,0 +1,206 @@
+"""add market rollup
+
+Revision ID: d7f3b9c1e2a4
+Revises: c5e1a7b9d0f2
+Create Date: 2026-06-20 00:00:00.000000+00:00
+
+Running aggregates of the active job set, so the market metrics worker no longer
+scans every job each day:
+  market_rollup         jobs, salary sum and remote jobs per (segment_type,
+                        segment_value, salary_bucket); segment_type 'all' is the
+                        whole active market, the others mirror the segments of
+                        market_daily_stats_segments. Salary buckets are 1000 EUR
+                        wide (-1 = no salary counted) and give the approximate
+                        medians.
+  market_rollup_deltas  append-only changes captured by statement-level triggers
+                        on jobs (transition tables, so any writer is covered);
+                        fold_market_rollup_deltas adds them to market_rollup.
+
+market_rollup_keys() is the single definition of which rollup rows a job counts
+towards. The rollup is filled from the current jobs in the same transaction that
+installs the triggers. idx_job_sources_last_seen turns the daily average job
+lifetime into a range scan.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "d7f3b9c1e2a4"
+down_revision = "c5e1a7b9d0f2"
+branch_labels = None
+depends_on = None
+
+
+_KEYS_COLUMNS = (
+    "availability_status",
+    "compliance_status",
+    "compliance_score",
+    "geo_class",
+    "remote_scope",
+    "job_family",
+    "seniority",
+    "salary_min_eur",
+    "remote_class",
+)
+
+
+def _keys_select(alias: str, sign: str = "") -> str:
+    """Rollup rows of every job in `alias`, negated with sign='-'."""
+    args = ", ".join(f"r.{column}" for column in _KEYS_COLUMNS)
+    return f"""
+        SELECT k.segment_type, k.segment_value, k.salary_bucket,
+               {sign}k.jobs AS jobs, {sign}k.salary_sum AS salary_sum, {sign}k.remote_jobs AS remote_jobs
+        FROM {alias} r
+        CROSS JOIN LATERAL market_rollup_keys({args}) k
+    """
+
+
+def upgrade() -> None:
+    op.create_table(
+        "market_rollup",
+        sa.Column("segment_type", sa.Text(), nullable=False),
+        sa.Column("segment_value", sa.Text(), nullable=False),
+        sa.Column("salary_bucket", sa.SmallInteger(), nullable=False),
+        sa.Column("jobs", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("salary_sum", sa.Numeric(), nullable=False, server_default="0"),
+        sa.Column("remote_jobs", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("segment_type", "segment_value", "salary_bucket"),
+    )
+    op.create_table(
+        "market_rollup_deltas",
+        sa.Column("delta_id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("segment_type", sa.Text(), nullable=False),
+        sa.Column("segment_value", sa.Text(), nullable=False),
+        sa.Column("salary_bucket", sa.SmallInteger(), nullable=False),
+        sa.Column("jobs", sa.BigInteger(), nullable=False),
+        sa.Column("salary_sum", sa.Numeric(), nullable=False),
+        sa.Column("remote_jobs", sa.BigInteger(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+    )
+
+    op.execute("""
+        CREATE FUNCTION market_rollup_keys(
+            availability_status TEXT,
+            compliance_status TEXT,
+            compliance_score INTEGER,
+            geo_class TEXT,
+            remote_scope TEXT,
+            job_family TEXT,
+            seniority TEXT,
+            salary_min_eur REAL,
+            remote_class TEXT
+        )
+        RETURNS TABLE (
+            segment_type TEXT,
+            segment_value TEXT,
+            salary_bucket SMALLINT,
+            jobs BIGINT,
+            salary_sum NUMERIC,
+            remote_jobs BIGINT
+        )
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT
+                k.segment_type,
+                k.segment_value,
+                CAST(CASE WHEN s.salary IS NULL THEN -1 ELSE LEAST(GREATEST(FLOOR(s.salary / 1000), 0), 500) END AS SMALLINT),
+                CAST(1 AS BIGINT),
+                COALESCE(CAST(s.salary AS NUMERIC), 0),
+                CAST(CASE WHEN remote_class IN ('remote_only', 'remote_region_locked') THEN 1 ELSE 0 END AS BIGINT)
+            FROM (
+                VALUES ('all', ''),
+                       ('country', CASE
+                           WHEN geo_class IS NULL THEN NULL
+                           WHEN geo_class IN ('eu_member_state', 'eu_explicit', 'eu_region')
+                               THEN COALESCE(remote_scope, geo_class)
+                           ELSE 'Non EU'
+                       END),
+                       ('job_family', job_family),
+                       ('seniority', seniority)
+            ) AS k(segment_type, segment_value)
+            -- The whole market counts every salary; segments only plausible yearly ones.
+            CROSS JOIN LATERAL (
+                SELECT CASE
+                    WHEN k.segment_type = 'all' THEN salary_min_eur
+                    WHEN salary_min_eur >= 10000 THEN salary_min_eur
+                END AS salary
+            ) s
+            WHERE availability_status = 'active'
+              AND k.segment_value IS NOT NULL
+              AND (k.segment_type = 'all' OR (compliance_status = 'approved' AND compliance_score >= 80))
+        $$
+    """)
+
+    op.execute(f"""
+        CREATE FUNCTION market_rollup_capture() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO market_rollup_deltas (segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs)
+                SELECT d.segment_type, d.segment_value, d.salary_bucket, SUM(d.jobs), SUM(d.salary_sum), SUM(d.remote_jobs)
+                FROM ({_keys_select("new_rows")}) d
+                GROUP BY 1, 2, 3;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO market_rollup_deltas (segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs)
+                SELECT d.segment_type, d.segment_value, d.salary_bucket, SUM(d.jobs), SUM(d.salary_sum), SUM(d.remote_jobs)
+                FROM ({_keys_select("old_rows", "-")}) d
+                GROUP BY 1, 2, 3;
+            ELSE
+                -- Updates that do not move a job between rollup rows cancel out here.
+                INSERT INTO market_rollup_deltas (segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs)
+                SELECT d.segment_type, d.segment_value, d.salary_bucket, SUM(d.jobs), SUM(d.salary_sum), SUM(d.remote_jobs)
+                FROM (
+                    {_keys_select("new_rows")}
+                    UNION ALL
+                    {_keys_select("old_rows", "-")}
+                ) d
+                GROUP BY 1, 2, 3
+                HAVING SUM(d.jobs) <> 0 OR SUM(d.salary_sum) <> 0 OR SUM(d.remote_jobs) <> 0;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+
+    for event, transition_tables in (
+        ("INSERT", "NEW TABLE AS new_rows"),
+        ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+        ("DELETE", "OLD TABLE AS old_rows"),
+    ):
+        op.execute(f"""
+            CREATE TRIGGER trg_jobs_market_rollup_{event.lower()}
+            AFTER {event} ON jobs
+            REFERENCING {transition_tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION market_rollup_capture()
+        """)
+
+    # The triggers hold a lock on jobs until commit, so no write slips between
+    # this initial fill and the first captured delta.
+    op.execute(f"""
+        INSERT INTO market_rollup (segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs)
+        SELECT d.segment_type, d.segment_value, d.salary_bucket, SUM(d.jobs), SUM(d.salary_sum), SUM(d.remote_jobs)
+        FROM ({_keys_select("jobs")}) d
+        GROUP BY 1, 2, 3
+    """)
+
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+    conn.execute(
+        sa.text("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_sources_last_seen ON job_sources (last_seen_at)")
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_job_sources_last_seen"))
+
+    for event in ("insert", "update", "delete"):
+        conn.execute(sa.text(f"DROP TRIGGER IF EXISTS trg_jobs_market_rollup_{event} ON jobs"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS market_rollup_capture()"))
+    conn.execute(
+        sa.text("DROP FUNCTION IF EXISTS market_rollup_keys(TEXT, TEXT, INTEGER, TEXT, TEXT, TEXT, TEXT, REAL, TEXT)")
+    )
+    conn.execute(sa.text("DROP TABLE IF EXISTS market_rollup_deltas"))
+    conn.execute(sa.text("DROP TABLE IF EXISTS market_rollup"))
@@ -0,0 +1,96 @@
+"""add jobs search_vector for full-text search
+
+Revision ID: e1a7c3d5f6b8
+Revises: d0f6b2c4e5a7
+Create Date: 2026-05-20 00:00:00.000000+00:00
+
+Weighted tsvector over title (A), company_name (B), source_department (C) and
+description (D). A BEFORE INSERT/UPDATE trigger keeps it current for every
+write done by upsert_job, without application code.
+
+Online: the column is added without a default (catalog-only, no rewrite of
+`jobs`) and the trigger covers writes from then on; existing rows are backfilled
+in short keyset batches that commit one by one, and the GIN index is built
+CONCURRENTLY.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e1a7c3d5f6b8"
+down_revision = "d0f6b2c4e5a7"
+branch_labels = None
+depends_on = None
+
+_BACKFILL_BATCH = 5_000
+
+
+def _search_vector_sql(row: str) -> str:
+    return f"""
+        setweight(to_tsvector('english'::regconfig, coalesce({row}title, '')), 'A')
+        || setweight(to_tsvector('english'::regconfig, coalesce({row}company_name, '')), 'B')
+        || setweight(to_tsvector('english'::regconfig, coalesce({row}source_department, '')), 'C')
+        || setweight(to_tsvector('english'::regconfig, coalesce({row}description, '')), 'D')
+    """
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION jobs_set_search_vector() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := {_search_vector_sql("NEW.")};
+            RETURN NEW;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_jobs_search_vector
+        BEFORE INSERT OR UPDATE OF title, company_name, source_department, description ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_set_search_vector()
+    """)
+
+    # The trigger is committed before the backfill starts, so rows written meanwhile are covered.
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    after = ""
+    while True:
+        last = conn.execute(
+            sa.text(f"""
+                WITH batch AS (
+                    SELECT job_id FROM jobs
+                    WHERE job_id > :after
+                    ORDER BY job_id
+                    LIMIT :batch
+                ),
+                updated AS (
+                    UPDATE jobs
+                    SET search_vector = {_search_vector_sql("jobs.")}
+                    FROM batch
+                    WHERE jobs.job_id = batch.job_id AND jobs.search_vector IS NULL
+                )
+                SELECT MAX(job_id) FROM batch
+            """),
+            {"after": after, "batch": _BACKFILL_BATCH},
+        ).scalar()
+        if last is None:
+            break
+        after = last
+
+    conn.execute(
+        sa.text("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_search_vector ON jobs USING GIN (search_vector)")
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+
+    conn.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_search_vector"))
+    conn.execute(sa.text("DROP TRIGGER IF EXISTS trg_jobs_search_vector ON jobs"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS jobs_set_search_vector()"))
+    conn.execute(sa.text("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector"))
@@ -0,0 +1,69 @@
+"""rejection reasons view reads only the latest compliance report
+
+Revision ID: e7b3c9d1f2a4
+Revises: d6a2f8c4b1e3
+Create Date: 2026-07-07 00:00:00.000000+00:00
+
+compliance_reports keeps one row per (job_uid, policy_version, report_month),
+so joining it on job_id matched every month of a job and a job whose
+hard_geo_flag changed between months was counted under two reasons. The view
+now joins only the job's latest report.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e7b3c9d1f2a4"
+down_revision = "d6a2f8c4b1e3"
+branch_labels = None
+depends_on = None
+
+REJECTION_REASONS_VIEW = """
+    CREATE OR REPLACE VIEW public.vw_looker_audit_rejection_reasons AS
+    SELECT
+        30::integer AS window_days,
+        js.source,
+        CASE
+            WHEN cr.hard_geo_flag = TRUE THEN 'hard_geo'
+            WHEN j.remote_class = 'NON_REMOTE' THEN 'non_remote'
+            WHEN j.geo_class = 'NON_EU' THEN 'non_eu_geo'
+            ELSE 'other'
+        END AS reason,
+        COUNT(DISTINCT j.job_id)::bigint AS count
+    FROM jobs j
+    JOIN job_sources js ON js.job_id = j.job_id
+    {report_join}
+    WHERE j.compliance_status = 'rejected'
+      AND j.first_seen_at > NOW() - INTERVAL '30 days'
+    GROUP BY js.source,
+        CASE
+            WHEN cr.hard_geo_flag = TRUE THEN 'hard_geo'
+            WHEN j.remote_class = 'NON_REMOTE' THEN 'non_remote'
+            WHEN j.geo_class = 'NON_EU' THEN 'non_eu_geo'
+            ELSE 'other'
+        END
+"""
+
+# Reports of a job are never older than the job itself, so the 30-day window
+# bounds report_month too and lets the planner prune older partitions.
+LATEST_REPORT_JOIN = """LEFT JOIN LATERAL (
+        SELECT cr.hard_geo_flag
+        FROM compliance_reports cr
+        WHERE cr.job_id = j.job_id
+          AND cr.report_month >= (date_trunc('month', (NOW() - INTERVAL '30 days') AT TIME ZONE 'UTC'))::date
+        ORDER BY cr.report_month DESC, cr.created_at DESC
+        LIMIT 1
+    ) cr ON TRUE"""
+
+# As created by f2b8d4e6a7c9.
+EVERY_REPORT_JOIN = """LEFT JOIN compliance_reports cr ON cr.job_id = j.job_id
+        AND cr.report_month >= (date_trunc('month', (NOW() - INTERVAL '30 days') AT TIME ZONE 'UTC'))::date"""
+
+
+def upgrade() -> None:
+    op.execute(REJECTION_REASONS_VIEW.format(report_join=LATEST_REPORT_JOIN))
+
+
+def downgrade() -> None:
+    op.execute(REJECTION_REASONS_VIEW.format(report_join=EVERY_REPORT_JOIN))
@@ -0,0 +1,123 @@
+"""add company_stats_dirty
+
+Revision ID: e8a4c0d2f3b5
+Revises: d7f3b9c1e2a4
+Create Date: 2026-06-22 00:00:00.000000+00:00
+
+Companies whose job statistics, remote posture or signal score may be out of
+date. Maintenance recomputes only these (refresh_dirty_company_stats) instead of
+aggregating every company's jobs on each tick. Marks are written by triggers:
+  jobs       statement-level, transition tables; inserts and deletes mark the
+             job's company, updates only when a column the company stats read
+             changed (status, compliance_status, first_seen_at,
+             remote_source_flag, salary_transparency_status, company_id)
+  companies  new companies and changes to the scoring inputs (remote_posture,
+             eu_entity_verified, hq_country)
+The table starts with every company, so the first tick reconciles them all.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e8a4c0d2f3b5"
+down_revision = "d7f3b9c1e2a4"
+branch_labels = None
+depends_on = None
+
+_STATS_COLUMNS = (
+    "status",
+    "compliance_status",
+    "first_seen_at",
+    "remote_source_flag",
+    "salary_transparency_status",
+    "company_id",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "company_stats_dirty",
+        sa.Column("company_id", sa.Uuid(), primary_key=True),
+        sa.Column("marked_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+    )
+
+    old_columns = ", ".join(f"o.{column}" for column in _STATS_COLUMNS)
+    new_columns = ", ".join(f"n.{column}" for column in _STATS_COLUMNS)
+    op.execute(f"""
+        CREATE FUNCTION mark_company_stats_dirty_from_jobs() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO company_stats_dirty (company_id)
+                SELECT DISTINCT company_id FROM new_rows WHERE company_id IS NOT NULL
+                ON CONFLICT (company_id) DO NOTHING;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO company_stats_dirty (company_id)
+                SELECT DISTINCT company_id FROM old_rows WHERE company_id IS NOT NULL
+                ON CONFLICT (company_id) DO NOTHING;
+            ELSE
+                INSERT INTO company_stats_dirty (company_id)
+                SELECT company_id
+                FROM (
+                    SELECT n.company_id AS new_company_id, o.company_id AS old_company_id
+                    FROM new_rows n
+                    JOIN old_rows o ON o.job_id = n.job_id
+                    WHERE ({new_columns}) IS DISTINCT FROM ({old_columns})
+                ) changed
+                CROSS JOIN LATERAL (VALUES (new_company_id), (old_company_id)) AS c(company_id)
+                WHERE company_id IS NOT NULL
+                GROUP BY company_id
+                ON CONFLICT (company_id) DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for event, transition_tables in (
+        ("INSERT", "NEW TABLE AS new_rows"),
+        ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+        ("DELETE", "OLD TABLE AS old_rows"),
+    ):
+        op.execute(f"""
+            CREATE TRIGGER trg_jobs_company_stats_dirty_{event.lower()}
+            AFTER {event} ON jobs
+            REFERENCING {transition_tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION mark_company_stats_dirty_from_jobs()
+        """)
+
+    op.execute("""
+        CREATE FUNCTION mark_company_stats_dirty_from_companies() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO company_stats_dirty (company_id)
+            VALUES (NEW.company_id)
+            ON CONFLICT (company_id) DO NOTHING;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_companies_stats_dirty_insert
+        AFTER INSERT ON companies
+        FOR EACH ROW EXECUTE FUNCTION mark_company_stats_dirty_from_companies()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_companies_stats_dirty_update
+        AFTER UPDATE OF remote_posture, eu_entity_verified, hq_country ON companies
+        FOR EACH ROW
+        WHEN ((OLD.remote_posture, OLD.eu_entity_verified, OLD.hq_country)
+              IS DISTINCT FROM (NEW.remote_posture, NEW.eu_entity_verified, NEW.hq_country))
+        EXECUTE FUNCTION mark_company_stats_dirty_from_companies()
+    """)
+
+    op.execute("INSERT INTO company_stats_dirty (company_id) SELECT company_id FROM companies")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_companies_stats_dirty_update ON companies")
+    op.execute("DROP TRIGGER IF EXISTS trg_companies_stats_dirty_insert ON companies")
+    op.execute("DROP FUNCTION IF EXISTS mark_company_stats_dirty_from_companies()")
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_jobs_company_stats_dirty_{event} ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS mark_company_stats_dirty_from_jobs()")
+    op.drop_table("company_stats_dirty")
@@ -0,0 +1,270 @@
+"""Partition job_snapshots and compliance_reports by month
+
+Revision ID: f2b8d4e6a7c9
+Revises: e1a7c3d5f6b8
+Create Date: 2026-06-02 00:00:00.000000+00:00
+
+Both history tables become declarative RANGE partitions with one partition per
+month (`<table>_pYYYY_MM`) plus a `<table>_default` safety net. The maintenance
+pipeline creates partitions ahead of time and detaches/drops partitions past
+the retention window (storage/repositories/partitions_repository.py).
+
+- job_snapshots is partitioned on captured_at; the primary key becomes
+  (snapshot_id, captured_at).
+- compliance_reports keeps its upsert per (job_uid, policy_version), but a
+  unique index on a partitioned table must contain the partition key, so the
+  key is a new `report_month` column (UTC month of the first report) and the
+  upsert key becomes (job_uid, policy_version, report_month).
+
+Existing rows are copied into the partitioned tables; partitions are created
+for every month that has data, through three months ahead.
+
+Not online: the renames take ACCESS EXCLUSIVE on both tables and the copy runs
+in the same transaction, so snapshot and compliance report writes (and reads)
+wait until it commits. Run it in a maintenance window with ingestion paused.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f2b8d4e6a7c9"
+down_revision = "e1a7c3d5f6b8"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+REJECTION_REASONS_VIEW = """
+    CREATE OR REPLACE VIEW public.vw_looker_audit_rejection_reasons AS
+    SELECT
+        30::integer AS window_days,
+        js.source,
+        CASE
+            WHEN cr.hard_geo_flag = TRUE THEN 'hard_geo'
+            WHEN j.remote_class = 'NON_REMOTE' THEN 'non_remote'
+            WHEN j.geo_class = 'NON_EU' THEN 'non_eu_geo'
+            ELSE 'other'
+        END AS reason,
+        COUNT(DISTINCT j.job_id)::bigint AS count
+    FROM jobs j
+    JOIN job_sources js ON js.job_id = j.job_id
+    LEFT JOIN compliance_reports cr ON cr.job_id = j.job_id{report_month_filter}
+    WHERE j.compliance_status = 'rejected'
+      AND j.first_seen_at > NOW() - INTERVAL '30 days'
+    GROUP BY js.source,
+        CASE
+            WHEN cr.hard_geo_flag = TRUE THEN 'hard_geo'
+            WHEN j.remote_class = 'NON_REMOTE' THEN 'non_remote'
+            WHEN j.geo_class = 'NON_EU' THEN 'non_eu_geo'
+            ELSE 'other'
+        END
+"""
+
+# Reports of a job are never older than the job itself, so the 30-day window
+# bounds report_month too and lets the planner prune older partitions.
+REPORT_MONTH_FILTER = """
+        AND cr.report_month >= (date_trunc('month', (NOW() - INTERVAL '30 days') AT TIME ZONE 'UTC'))::date"""
+
+
+def _create_monthly_partitions(table: str, first_month_sql: str) -> None:
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month_start DATE;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    COALESCE(({first_month_sql}), date_trunc('month', NOW() AT TIME ZONE 'UTC')::date),
+                    (date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '{MONTHS_AHEAD} months')::date,
+                    INTERVAL '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_p' || to_char(month_start, 'YYYY_MM'),
+                    month_start::text || ' 00:00:00+00',
+                    (month_start + INTERVAL '1 month')::date::text || ' 00:00:00+00'
+                );
+            END LOOP;
+        END
+        $$;
+    """)
+    op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+
+def upgrade() -> None:
+    # --- job_snapshots ---
+    op.execute("ALTER TABLE job_snapshots RENAME TO job_snapshots_unpartitioned")
+    op.execute("ALTER TABLE job_snapshots_unpartitioned DROP CONSTRAINT IF EXISTS fk_job_snapshots_job")
+    op.execute("ALTER INDEX job_snapshots_pkey RENAME TO job_snapshots_unpartitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS idx_job_snapshots_job_id")
+    op.execute("DROP INDEX IF EXISTS idx_job_snapshots_captured_at")
+    op.execute("ALTER SEQUENCE job_snapshots_snapshot_id_seq OWNED BY NONE")
+    op.execute("""
+        CREATE TABLE job_snapshots (
+            snapshot_id BIGINT NOT NULL DEFAULT nextval('job_snapshots_snapshot_id_seq'),
+            job_id TEXT NOT NULL,
+            job_fingerprint TEXT NOT NULL,
+            title TEXT,
+            company_name TEXT,
+            salary_min INTEGER,
+            salary_max INTEGER,
+            salary_currency TEXT,
+            captured_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            remote_class TEXT,
+            geo_class TEXT,
+            CONSTRAINT job_snapshots_pkey PRIMARY KEY (snapshot_id, captured_at),
+            CONSTRAINT fk_job_snapshots_job
+                FOREIGN KEY (job_id) REFERENCES jobs(job_id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (captured_at)
+    """)
+    op.execute("ALTER SEQUENCE job_snapshots_snapshot_id_seq OWNED BY job_snapshots.snapshot_id")
+    op.execute("CREATE INDEX idx_job_snapshots_job_id ON job_snapshots (job_id, captured_at DESC)")
+    op.execute("CREATE INDEX idx_job_snapshots_captured_at ON job_snapshots (captured_at)")
+    _create_monthly_partitions(
+        "job_snapshots",
+        "SELECT date_trunc('month', MIN(captured_at) AT TIME ZONE 'UTC')::date FROM job_snapshots_unpartitioned",
+    )
+    op.execute("""
+        INSERT INTO job_snapshots (
+            snapshot_id, job_id, job_fingerprint, title, company_name,
+            salary_min, salary_max, salary_currency, captured_at, remote_class, geo_class
+        )
+        SELECT
+            snapshot_id, job_id, job_fingerprint, title, company_name,
+            salary_min, salary_max, salary_currency, captured_at, remote_class, geo_class
+        FROM job_snapshots_unpartitioned
+    """)
+    op.execute("DROP TABLE job_snapshots_unpartitioned")
+
+    # --- compliance_reports ---
+    op.execute("ALTER TABLE compliance_reports RENAME TO compliance_reports_unpartitioned")
+    op.execute("ALTER TABLE compliance_reports_unpartitioned DROP CONSTRAINT IF EXISTS fk_compliance_reports_job")
+    op.execute("ALTER INDEX compliance_reports_pkey RENAME TO compliance_reports_unpartitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS idx_compliance_reports_job")
+    op.execute("DROP INDEX IF EXISTS idx_compliance_reports_status")
+    op.execute("DROP INDEX IF EXISTS idx_compliance_reports_policy")
+    op.execute("DROP INDEX IF EXISTS idx_compliance_report_unique")
+    op.execute("""
+        CREATE TABLE compliance_reports (
+            report_id UUID NOT NULL DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
+            job_id TEXT NOT NULL,
+            policy_version TEXT NOT NULL,
+            remote_class TEXT,
+            geo_class TEXT,
+            hard_geo_flag BOOLEAN,
+            base_score INTEGER,
+            penalties JSONB,
+            bonuses JSONB,
+            final_score INTEGER,
+            final_status TEXT,
+            decision_vector JSONB,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            job_uid TEXT NOT NULL,
+            report_month DATE NOT NULL DEFAULT (date_trunc('month', NOW() AT TIME ZONE 'UTC'))::date,
+            CONSTRAINT compliance_reports_pkey PRIMARY KEY (report_id, report_month),
+            CONSTRAINT fk_compliance_reports_job
+                FOREIGN KEY (job_id) REFERENCES jobs(job_id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (report_month)
+    """)
+    op.execute("CREATE INDEX idx_compliance_reports_job ON compliance_reports (job_id)")
+    op.execute("CREATE INDEX idx_compliance_reports_status ON compliance_reports (final_status)")
+    op.execute("CREATE INDEX idx_compliance_reports_policy ON compliance_reports (policy_version)")
+    op.execute("""
+        CREATE UNIQUE INDEX idx_compliance_report_unique
+        ON compliance_reports (job_uid, policy_version, report_month)
+    """)
+    _create_monthly_partitions(
+        "compliance_reports",
+        "SELECT date_trunc('month', MIN(created_at) AT TIME ZONE 'UTC')::date FROM compliance_reports_unpartitioned",
+    )
+    op.execute("""
+        INSERT INTO compliance_reports (
+            report_id, job_id, policy_version, remote_class, geo_class, hard_geo_flag, base_score,
+            penalties, bonuses, final_score, final_status, decision_vector, created_at, job_uid, report_month
+        )
+        SELECT
+            report_id, job_id, policy_version, remote_class, geo_class, hard_geo_flag, base_score,
+            penalties, bonuses, final_score, final_status, decision_vector, created_at, job_uid,
+            date_trunc('month', created_at AT TIME ZONE 'UTC')::date
+        FROM compliance_reports_unpartitioned
+    """)
+    # The view is bound to the renamed table; point it at the partitioned one before dropping.
+    op.execute(REJECTION_REASONS_VIEW.format(report_month_filter=REPORT_MONTH_FILTER))
+    op.execute("DROP TABLE compliance_reports_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE compliance_reports RENAME TO compliance_reports_partitioned")
+    op.execute("ALTER INDEX compliance_reports_pkey RENAME TO compliance_reports_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS idx_compliance_reports_job")
+    op.execute("DROP INDEX IF EXISTS idx_compliance_reports_status")
+    op.execute("DROP INDEX IF EXISTS idx_compliance_reports_policy")
+    op.execute("DROP INDEX IF EXISTS idx_compliance_report_unique")
+    op.execute("""
+        CREATE TABLE compliance_reports (
+            report_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
+            job_id TEXT NOT NULL,
+            policy_version TEXT NOT NULL,
+            remote_class TEXT,
+            geo_class TEXT,
+            hard_geo_flag BOOLEAN,
+            base_score INTEGER,
+            penalties JSONB,
+            bonuses JSONB,
+            final_score INTEGER,
+            final_status TEXT,
+            decision_vector JSONB,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            job_uid TEXT NOT NULL,
+            CONSTRAINT fk_compliance_reports_job
+                FOREIGN KEY (job_id) REFERENCES jobs(job_id) ON DELETE CASCADE
+        )
+    """)
+    # Keep only the newest report per (job_uid, policy_version), as the old unique index requires.
+    op.execute("""
+        INSERT INTO compliance_reports (
+            report_id, job_id, policy_version, remote_class, geo_class, hard_geo_flag, base_score,
+            penalties, bonuses, final_score, final_status, decision_vector, created_at, job_uid
+        )
+        SELECT DISTINCT ON (job_uid, policy_version)
+            report_id, job_id, policy_version, remote_class, geo_class, hard_geo_flag, base_score,
+            penalties, bonuses, final_score, final_status, decision_vector, created_at, job_uid
+        FROM compliance_reports_partitioned
+        ORDER BY job_uid, policy_version, created_at DESC
+    """)
+    op.execute("CREATE INDEX idx_compliance_reports_job ON compliance_reports (job_id)")
+    op.execute("CREATE INDEX idx_compliance_reports_status ON compliance_reports (final_status)")
+    op.execute("CREATE INDEX idx_compliance_reports_policy ON compliance_reports (policy_version)")
+    op.execute("CREATE UNIQUE INDEX idx_compliance_report_unique ON compliance_reports (job_uid, policy_version)")
+    op.execute(REJECTION_REASONS_VIEW.format(report_month_filter=""))
+    op.execute("DROP TABLE compliance_reports_partitioned")
+
+    op.execute("ALTER TABLE job_snapshots RENAME TO job_snapshots_partitioned")
+    op.execute("ALTER INDEX job_snapshots_pkey RENAME TO job_snapshots_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS idx_job_snapshots_job_id")
+    op.execute("DROP INDEX IF EXISTS idx_job_snapshots_captured_at")
+    op.execute("ALTER SEQUENCE job_snapshots_snapshot_id_seq OWNED BY NONE")
+    op.execute("""
+        CREATE TABLE job_snapshots (
+            snapshot_id BIGINT PRIMARY KEY DEFAULT nextval('job_snapshots_snapshot_id_seq'),
+            job_id TEXT NOT NULL,
+            job_fingerprint TEXT NOT NULL,
+            title TEXT,
+            company_name TEXT,
+            salary_min INTEGER,
+            salary_max INTEGER,
+            salary_currency TEXT,
+            captured_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            remote_class TEXT,
+            geo_class TEXT,
+            CONSTRAINT fk_job_snapshots_job
+                FOREIGN KEY (job_id) REFERENCES jobs(job_id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("ALTER SEQUENCE job_snapshots_snapshot_id_seq OWNED BY job_snapshots.snapshot_id")
+    op.execute("INSERT INTO job_snapshots SELECT * FROM job_snapshots_partitioned")
+    op.execute("CREATE INDEX idx_job_snapshots_job_id ON job_snapshots (job_id)")
+    op.execute("CREATE INDEX idx_job_snapshots_captured_at ON job_snapshots (captured_at)")
+    op.execute("DROP TABLE job_snapshots_partitioned")
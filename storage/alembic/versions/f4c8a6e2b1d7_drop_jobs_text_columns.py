@@ -0,0 +1,147 @@
+"""drop the jobs columns moved to job_texts
+
+Revision ID: f4c8a6e2b1d7
+Revises: e7b3c9d1f2a4
+Create Date: 2026-07-08 00:00:00.000000+00:00
+
+Final stage of the job_texts split (a2c8e4f6b7d9): once every writer uses
+job_texts, jobs.description, jobs.source_payload and jobs.search_vector are
+dropped together with the triggers that kept them in sync, and the jobs insert
+trigger creates bare job_texts rows.
+
+One short transaction: dropping columns only changes the catalog (old tuples
+shrink as they are next updated, or at once with VACUUM FULL/pg_repack), so the
+ACCESS EXCLUSIVE lock on jobs is held for moments. lock_timeout makes the
+revision fail instead of queueing every reader behind a long transaction; rerun
+it when that happens.
+"""
+
+from contextlib import contextmanager
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f4c8a6e2b1d7"
+down_revision = "e7b3c9d1f2a4"
+branch_labels = None
+depends_on = None
+
+_JOBS_SEARCH_VECTOR_SQL = " || ".join(
+    f"setweight(to_tsvector('english'::regconfig, coalesce(NEW.{column}, '')), '{weight}')"
+    for column, weight in (("title", "A"), ("company_name", "B"), ("source_department", "C"), ("description", "D"))
+)
+
+
+@contextmanager
+def _transaction():
+    # Revisions that build indexes CONCURRENTLY leave the connection in AUTOCOMMIT for
+    # the rest of the run; the trigger and column changes still have to commit together.
+    bind = op.get_bind()
+    if bind.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        yield
+        return
+    bind.commit()
+    bind.execution_options(isolation_level="READ COMMITTED")
+    try:
+        with bind.begin():
+            yield
+    finally:
+        bind.execution_options(isolation_level="AUTOCOMMIT")
+
+
+def upgrade() -> None:
+    with _transaction():
+        op.execute("SET LOCAL lock_timeout = '5s'")
+        op.execute("DROP TRIGGER IF EXISTS trg_jobs_sync_job_texts ON jobs")
+        op.execute("DROP TRIGGER IF EXISTS trg_jobs_search_vector ON jobs")
+        op.execute("DROP FUNCTION IF EXISTS sync_job_texts_from_jobs()")
+        op.execute("DROP FUNCTION IF EXISTS jobs_set_search_vector()")
+        op.execute("""
+            CREATE OR REPLACE FUNCTION create_job_texts() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO job_texts (job_id)
+                SELECT job_id FROM new_rows
+                ON CONFLICT (job_id) DO NOTHING;
+                RETURN NULL;
+            END;
+            $$
+        """)
+        # Drops idx_jobs_search_vector and idx_jobs_payload_gin with their columns.
+        op.execute("""
+            ALTER TABLE jobs
+                DROP COLUMN IF EXISTS search_vector,
+                DROP COLUMN IF EXISTS description,
+                DROP COLUMN IF EXISTS source_payload
+        """)
+
+
+def downgrade() -> None:
+    with _transaction():
+        op.execute("ALTER TABLE jobs ADD COLUMN description TEXT, ADD COLUMN source_payload JSONB")
+        op.execute("ALTER TABLE jobs ADD COLUMN search_vector tsvector")
+        op.execute(f"""
+            CREATE FUNCTION jobs_set_search_vector() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                NEW.search_vector := {_JOBS_SEARCH_VECTOR_SQL};
+                RETURN NEW;
+            END;
+            $$
+        """)
+        op.execute("""
+            CREATE TRIGGER trg_jobs_search_vector
+            BEFORE INSERT OR UPDATE OF title, company_name, source_department, description ON jobs
+            FOR EACH ROW EXECUTE FUNCTION jobs_set_search_vector()
+        """)
+        # Computes jobs.search_vector through the trigger above.
+        op.execute("""
+            UPDATE jobs j
+            SET description = t.description, source_payload = t.source_payload
+            FROM job_texts t
+            WHERE t.job_id = j.job_id
+        """)
+        op.execute("""
+            CREATE OR REPLACE FUNCTION create_job_texts() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO job_texts (job_id, description, source_payload)
+                SELECT job_id, description, source_payload FROM new_rows
+                ON CONFLICT (job_id) DO NOTHING;
+                RETURN NULL;
+            END;
+            $$
+        """)
+        op.execute("""
+            CREATE FUNCTION sync_job_texts_from_jobs() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO job_texts (job_id, description, source_payload)
+                VALUES (NEW.job_id, NEW.description, NEW.source_payload)
+                ON CONFLICT (job_id) DO UPDATE SET
+                    description = EXCLUDED.description,
+                    source_payload = EXCLUDED.source_payload;
+                RETURN NULL;
+            END;
+            $$
+        """)
+        op.execute("""
+            CREATE TRIGGER trg_jobs_sync_job_texts
+            AFTER UPDATE OF description, source_payload ON jobs
+            FOR EACH ROW
+            WHEN (
+                OLD.description IS DISTINCT FROM NEW.description
+                OR OLD.source_payload IS DISTINCT FROM NEW.source_payload
+            )
+            EXECUTE FUNCTION sync_job_texts_from_jobs()
+        """)
+
+    bind = op.get_bind()
+    bind.commit()
+    conn = bind.execution_options(isolation_level="AUTOCOMMIT")
+    conn.execute(
+        sa.text("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_search_vector ON jobs USING GIN (search_vector)")
+    )
+    conn.execute(
+        sa.text("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_payload_gin ON jobs USING GIN (source_payload)")
+    )
@@ -0,0 +1,97 @@
+"""add system_counters
+
+Revision ID: f9b5d1e3a4c6
+Revises: e8a4c0d2f3b5
+Create Date: 2026-06-24 00:00:00.000000+00:00
+
+Row counts for get_system_metrics without COUNT(*) over jobs, companies and
+company_ats. Statement-level triggers append one delta row per (counter, hour)
+touched by a statement, bucketed by the row's creation time (jobs.first_seen_at,
+created_at elsewhere); totals are the sum of a counter's rows and "last 24h"
+the sum of its recent buckets. Appending instead of updating one row per
+counter keeps concurrent writers from queueing on the same row lock.
+compact_system_counters folds the deltas and reconcile_system_counters
+recomputes them exactly (storage/repositories/system_repository.py).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f9b5d1e3a4c6"
+down_revision = "e8a4c0d2f3b5"
+branch_labels = None
+depends_on = None
+
+# Counted table -> (primary key, column whose hour is the row's bucket).
+_COUNTED_TABLES = {
+    "jobs": ("job_id", "first_seen_at"),
+    "companies": ("company_id", "created_at"),
+    "company_ats": ("company_ats_id", "created_at"),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "system_counters",
+        sa.Column("counter_row_id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("counter", sa.Text(), nullable=False),
+        sa.Column("bucket_hour", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("delta", sa.BigInteger(), nullable=False),
+    )
+    op.create_index("idx_system_counters_counter_bucket", "system_counters", ["counter", "bucket_hour"])
+
+    for table, (key_column, bucket_column) in _COUNTED_TABLES.items():
+        bucket = "COALESCE(date_trunc('hour', {alias}." + bucket_column + ", 'UTC'), '-infinity')"
+        op.execute(f"""
+            CREATE FUNCTION count_{table}_rows() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    INSERT INTO system_counters (counter, bucket_hour, delta)
+                    SELECT '{table}', {bucket.format(alias="n")}, COUNT(*) FROM new_rows n GROUP BY 2;
+                ELSIF TG_OP = 'DELETE' THEN
+                    INSERT INTO system_counters (counter, bucket_hour, delta)
+                    SELECT '{table}', {bucket.format(alias="o")}, -COUNT(*) FROM old_rows o GROUP BY 2;
+                ELSE
+                    -- Only rows whose creation time moved change buckets.
+                    INSERT INTO system_counters (counter, bucket_hour, delta)
+                    SELECT '{table}', b.bucket_hour, SUM(b.delta)
+                    FROM new_rows n
+                    JOIN old_rows o ON o.{key_column} = n.{key_column}
+                    CROSS JOIN LATERAL (
+                        VALUES ({bucket.format(alias="n")}, 1), ({bucket.format(alias="o")}, -1)
+                    ) AS b(bucket_hour, delta)
+                    WHERE n.{bucket_column} IS DISTINCT FROM o.{bucket_column}
+                    GROUP BY 2
+                    HAVING SUM(b.delta) <> 0;
+                END IF;
+                RETURN NULL;
+            END
+            $$
+        """)
+        for event, transition_tables in (
+            ("INSERT", "NEW TABLE AS new_rows"),
+            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("DELETE", "OLD TABLE AS old_rows"),
+        ):
+            op.execute(f"""
+                CREATE TRIGGER trg_{table}_system_counters_{event.lower()}
+                AFTER {event} ON {table}
+                REFERENCING {transition_tables}
+                FOR EACH STATEMENT EXECUTE FUNCTION count_{table}_rows()
+            """)
+
+        # Initial exact counts; the new triggers lock the table until commit.
+        op.execute(f"""
+            INSERT INTO system_counters (counter, bucket_hour, delta)
+            SELECT '{table}', {bucket.format(alias=table)}, COUNT(*) FROM {table} GROUP BY 2
+        """)
+
+
+def downgrade() -> None:
+    for table in _COUNTED_TABLES:
+        for event in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_system_counters_{event} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS count_{table}_rows()")
+    op.drop_index("idx_system_counters_counter_bucket", table_name="system_counters")
+    op.drop_table("system_counters")
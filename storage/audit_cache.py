@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+# Shared results of the audit aggregations.
+#
+# The audit exporter and the /internal/audit/* endpoints run the same multi-second
+# queries (source trend, rejection reasons, company stats, ATS health). Results are
+# kept per (function, arguments) for AUDIT_CACHE_TTL_SECONDS from the query's start;
+# concurrent misses of one key run the query once and share its result. The exporter
+# refreshes what it exports after the tick's writes, and the pipeline drops entries
+# whose query started before the tick when it ends. Cached values are shared between
+# callers and must not be mutated.
+
+AUDIT_CACHE_SIZE = 64
+AUDIT_CACHE_TTL_SECONDS = 900.0
+
+
+class _Flight:
+    def __init__(self, *, refresh: bool) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.refresh = refresh
+        # The result reflects the database as of the query's start, so it is stored with this time.
+        self.started_at = time.monotonic()
+
+
+# key -> (expires_at, stored_at, value), monotonic clock
+_cache: OrderedDict[tuple, tuple[float, float, Any]] = OrderedDict()
+_flights: dict[tuple, _Flight] = {}
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+_cache_coalesced = 0
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def cached_audit_query(fn: Callable[..., Any], /, *args, refresh: bool = False, **kwargs) -> Any:
+    """
+    `fn(*args, **kwargs)` through the shared audit cache. `refresh=True` skips the
+    cached value and stores a fresh one; it only joins a query in flight that is a
+    refresh too, since one started earlier may predate the writes being refreshed
+    for. Errors are raised to every waiting caller and never cached.
+    """
+    global _cache_hits, _cache_misses, _cache_coalesced
+    key = (fn, _freeze(args), _freeze(kwargs))
+    with _cache_lock:
+        entry = _cache.get(key)
+        if not refresh and entry is not None and entry[0] >= time.monotonic():
+            _cache.move_to_end(key)
+            _cache_hits += 1
+            return entry[2]
+        flight = _flights.get(key)
+        leader = flight is None or (refresh and not flight.refresh)
+        if leader:
+            flight = _flights[key] = _Flight(refresh=refresh)
+            _cache_misses += 1
+        else:
+            _cache_coalesced += 1
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    try:
+        flight.value = fn(*args, **kwargs)
+    except BaseException as e:
+        flight.error = e
+        raise
+    else:
+        with _cache_lock:
+            # A flight that started later (a refresh overtaking this one) may have stored already.
+            entry = _cache.get(key)
+            if entry is None or entry[1] <= flight.started_at:
+                _cache[key] = (flight.started_at + AUDIT_CACHE_TTL_SECONDS, flight.started_at, flight.value)
+                _cache.move_to_end(key)
+            while len(_cache) > AUDIT_CACHE_SIZE:
+                _cache.popitem(last=False)
+        return flight.value
+    finally:
+        with _cache_lock:
+            if _flights.get(key) is flight:
+                del _flights[key]
+        flight.done.set()
+
+
+def invalidate_audit_cache(stored_before: float | None = None) -> None:
+    """
+    Drops cached audit results; with `stored_before` (a `time.monotonic()` value)
+    only those whose query started earlier.
+    """
+    with _cache_lock:
+        if stored_before is None:
+            _cache.clear()
+            return
+        for key in [key for key, entry in _cache.items() if entry[1] < stored_before]:
+            del _cache[key]
+
+
+def audit_cache_info() -> dict:
+    with _cache_lock:
+        return {
+            "hits": _cache_hits,
+            "misses": _cache_misses,
+            "coalesced": _cache_coalesced,
+            "size": len(_cache),
+            "max_size": AUDIT_CACHE_SIZE,
+        }
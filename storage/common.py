@@ -1,8 +1,10 @@
+import json
 import logging
 import random
 import time
 from functools import wraps
 
+from sqlalchemy import TextClause
 from sqlalchemy.engine import Connection
 from sqlalchemy.exc import DBAPIError, OperationalError
 
@@ -88,3 +90,165 @@ def _require_open_conn(conn: Connection | None, *, op_name: str) -> Connection:
     if conn is None:
         raise ValueError(f"{op_name} requires an explicit open transaction connection (conn).")
     return conn
+
+
+# A job is a repost when an earlier job with the same (job_fingerprint, company_name,
+# title) was last seen less than this many days before it was first seen.
+REPOST_WINDOW_DAYS = 30
+
+
+# Job full-text search. `job_texts.search_vector` (title A, company B, department C,
+# description D) is kept current by triggers; ILIKE keeps partial-word matches on
+# title/company. JOB_SEARCH_PREDICATE matches every such job and is what totals and
+# planner estimates read. Pages never evaluate it: a broad term matches most of the
+# table, and hashing or ranking every match costs seconds. They read a bounded
+# candidate set instead (`_job_search_where(..., limit_sql=...)`), and ranking only
+# orders those candidates. The trigram word-similarity predicate catches typos, but
+# it cannot use the tsvector index and is evaluated per row, so callers only fall
+# back to it when the full-text query matched nothing.
+# All fragments expect the outer query to read `jobs` unaliased.
+JOB_SEARCH_CONFIG = "english"
+JOB_SEARCH_TSQUERY = f"websearch_to_tsquery('{JOB_SEARCH_CONFIG}', :q_search)"
+JOB_SEARCH_PREDICATE = f"""jobs.job_id IN (
+    SELECT jt_q.job_id FROM job_texts jt_q WHERE jt_q.search_vector @@ {JOB_SEARCH_TSQUERY}
+    UNION
+    SELECT j_q.job_id FROM jobs j_q WHERE j_q.title ILIKE :q_like OR j_q.company_name ILIKE :q_like
+)"""
+JOB_SEARCH_FUZZY_PREDICATE = "(:q_search <% title OR :q_search <% company_name)"
+JOB_SEARCH_ORDER_BY = (
+    f"ts_rank_cd((SELECT jt_r.search_vector FROM job_texts jt_r WHERE jt_r.job_id = jobs.job_id), "
+    f"{JOB_SEARCH_TSQUERY}) DESC, LEAST(title <-> :q_search, company_name <-> :q_search) ASC"
+)
+# Relevance-ordered listings rank the freshest matches of each branch (full-text,
+# title/company) and paginate inside them: at least JOB_SEARCH_CANDIDATE_LIMIT per
+# branch, and enough to fill the requested page (see _job_search_candidate_limit),
+# so every page up to `total` is reachable.
+JOB_SEARCH_CANDIDATE_LIMIT = 500
+
+# Description of the outer `jobs` row; descriptions live in job_texts (1:1).
+JOB_DESCRIPTION_SQL = "(SELECT jt.description FROM job_texts jt WHERE jt.job_id = jobs.job_id)"
+
+# Last sighting of the job row aliased `{t}`. Unchanged re-sightings go to job_sightings
+# and reach jobs.last_seen_at only when fold_job_sightings runs; aggregates read the
+# folded column, per-job comparisons and payloads read this.
+JOB_LAST_SEEN_SQL = (
+    "GREATEST({t}.last_seen_at, (SELECT MAX(s.last_seen_at) FROM job_sightings s WHERE s.job_id = {t}.job_id))"
+)
+
+
+# Set-based bulk writes. A batch is sent as one array per column and read back as a
+# relation with unnest(), so it is a single statement (one bind, one plan) whatever
+# its size, where executemany binds and runs the statement once per row. Statements
+# read the batch as `FROM {unnest_rows(columns)}`, e.g. INSERT ... SELECT ... ON CONFLICT.
+def unnest_rows(columns: dict[str, str], alias: str = "r") -> str:
+    """`unnest(CAST(:col AS type[]), ...) AS alias(col, ...)` over `columns` (name -> SQL type)."""
+    arrays = ", ".join(f"CAST(:{name} AS {sql_type}[])" for name, sql_type in columns.items())
+    return f"unnest({arrays}) AS {alias}({', '.join(columns)})"
+
+
+def _unnest_array(values: list, sql_type: str) -> list:
+    if sql_type.upper() in ("JSON", "JSONB"):
+        values = [None if v is None else json.dumps(v, default=str) for v in values]
+    # psycopg dumps a list with a single element type; mixed lists (UUID and str company
+    # ids, int and float scores) are sent as float or text and cast back server-side.
+    kinds = {type(v) for v in values if v is not None}
+    if len(kinds) <= 1:
+        return values
+    if kinds <= {int, float}:
+        return [None if v is None else float(v) for v in values]
+    return [None if v is None else str(v) for v in values]
+
+
+def execute_unnest(
+    conn: Connection,
+    statement: TextClause,
+    rows: list[dict],
+    columns: dict[str, str],
+    *,
+    key: tuple[str, ...] = (),
+    params: dict | None = None,
+) -> int:
+    """
+    Runs `statement` (which reads `unnest_rows(columns)`) once for all `rows`;
+    missing row keys bind NULL and `params` adds scalar parameters. An
+    INSERT ... ON CONFLICT DO UPDATE cannot touch one row twice, so rows repeating
+    a conflict `key` go to follow-up statements, in order, as executemany applied
+    them. Returns the summed rowcount.
+    """
+    rounds: list[list[dict]] = []
+    occurrences: dict[tuple, int] = {}
+    for row in rows:
+        row_key = tuple(row.get(name) for name in key)
+        round_index = occurrences.get(row_key, 0) if key else 0
+        occurrences[row_key] = round_index + 1
+        if round_index == len(rounds):
+            rounds.append([])
+        rounds[round_index].append(row)
+
+    written = 0
+    for batch in rounds:
+        arrays = {name: _unnest_array([row.get(name) for row in batch], sql_type) for name, sql_type in columns.items()}
+        written += conn.execute(statement, {**(params or {}), **arrays}).rowcount
+    return written
+
+
+def _job_search_predicate(fuzzy: bool) -> str:
+    return JOB_SEARCH_FUZZY_PREDICATE if fuzzy else JOB_SEARCH_PREDICATE
+
+
+def _job_search_passes(q: str | None, offset: int = 0) -> tuple[bool, ...]:
+    """`fuzzy` flags to try in order: the typo fallback only applies to a first page."""
+    return (False, True) if q and not offset else (False,)
+
+
+def _job_search_params(q: str) -> dict:
+    return {"q_search": q, "q_like": f"%{q}%"}
+
+
+def _job_search_candidate_limit(limit: int, offset: int) -> int:
+    """Candidates per search branch for a page: the floor, or the page's end past it."""
+    return max(offset + limit, JOB_SEARCH_CANDIDATE_LIMIT)
+
+
+def _job_search_candidates(filters: list[str], limit_sql: str, *, ordered: bool = True) -> str:
+    # Each branch is limited on its own, so the planner either walks jobs (in
+    # idx_jobs_first_seen_job_id order when `ordered`) and stops after `limit_sql`
+    # matches (broad terms) or reads the few matches from a GIN index (rare ones).
+    # Filters bind to the branch's own unaliased `jobs`.
+    where = "".join(f" AND {clause}" for clause in filters)
+    order_limit = (
+        f"ORDER BY jobs.first_seen_at DESC, jobs.job_id DESC LIMIT {limit_sql}" if ordered else f"LIMIT {limit_sql}"
+    )
+    return f"""jobs.job_id IN (
+    (SELECT jobs.job_id FROM jobs
+     WHERE EXISTS (
+        SELECT 1 FROM job_texts jt_q WHERE jt_q.job_id = jobs.job_id AND jt_q.search_vector @@ {JOB_SEARCH_TSQUERY}
+     ){where}
+     {order_limit})
+    UNION
+    (SELECT jobs.job_id FROM jobs
+     WHERE (jobs.title ILIKE :q_like OR jobs.company_name ILIKE :q_like){where}
+     {order_limit})
+)"""
+
+
+def _job_search_where(
+    filters: list[str],
+    q: str | None,
+    *,
+    fuzzy: bool = False,
+    limit_sql: str | None = None,
+    ordered: bool = True,
+) -> str:
+    """
+    WHERE clause over `filters` and, with `q`, its match. Without `limit_sql` it
+    selects every match (totals, facet counts). With it, a full-text `q` selects the
+    first `limit_sql` full-text and the first `limit_sql` title/company matches in
+    first_seen_at DESC, job_id DESC order, which holds the first `limit_sql` rows of
+    that order and bounds what the page ranks; `ordered=False` takes any of them
+    (count probes). The fuzzy pass stays unbounded.
+    """
+    if q and limit_sql is not None and not fuzzy:
+        return f"WHERE {_job_search_candidates(filters, limit_sql, ordered=ordered)}"
+    clauses = [*filters, _job_search_predicate(fuzzy)] if q else filters
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
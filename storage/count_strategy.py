@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Filtered totals for paginated listings.
+#
+# An exact COUNT(*) over a broad filter costs as much as scanning the whole match set,
+# on every page request. Small result sets are still counted exactly; above
+# COUNT_EXACT_THRESHOLD the total becomes the planner's row estimate (flagged as
+# `is_estimate`). Results are kept in a small TTL'd LRU keyed by (SQL, params), which
+# the pipeline clears at the end of every tick in this process.
+
+COUNT_EXACT_THRESHOLD = 10_000
+COUNT_CACHE_SIZE = 256
+COUNT_CACHE_TTL_SECONDS = 60.0
+
+
+class RowCount(int):
+    """`int` total that also records whether it is a planner estimate.
+
+    Subclassing int keeps `(items, total)` callers and response models unchanged.
+    """
+
+    is_estimate: bool
+
+    def __new__(cls, value: int, is_estimate: bool = False):
+        obj = super().__new__(cls, max(0, int(value)))
+        obj.is_estimate = is_estimate
+        return obj
+
+
+_cache: OrderedDict[tuple, tuple[float, RowCount]] = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _cache_key(from_where_sql: str, params: dict) -> tuple:
+    return (" ".join(from_where_sql.split()), tuple(sorted((k, _freeze(v)) for k, v in params.items())))
+
+
+def _cache_get(key: tuple) -> RowCount | None:
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            _cache.pop(key, None)
+            _cache_misses += 1
+            return None
+        _cache.move_to_end(key)
+        _cache_hits += 1
+        return entry[1]
+
+
+def _cache_put(key: tuple, value: RowCount) -> None:
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + COUNT_CACHE_TTL_SECONDS, value)
+        _cache.move_to_end(key)
+        while len(_cache) > COUNT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def invalidate_count_cache() -> None:
+    """Drops every cached total (called once per pipeline tick)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def count_cache_info() -> dict:
+    with _cache_lock:
+        return {"hits": _cache_hits, "misses": _cache_misses, "size": len(_cache), "max_size": COUNT_CACHE_SIZE}
+
+
+def _planner_estimate(conn: Connection, from_where_sql: str, params: dict) -> int:
+    raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_where_sql}"), params).scalar_one()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _table_estimate(conn: Connection, table: str) -> int:
+    value = conn.execute(
+        text("""
+            SELECT CAST(c.reltuples AS BIGINT)
+            FROM pg_class c
+            JOIN pg_namespace n ON c.relnamespace = n.oid
+            WHERE n.nspname = 'public' AND c.relname = :table
+        """),
+        {"table": table},
+    ).scalar()
+    return int(value or 0)
+
+
+def count_rows(
+    conn: Connection,
+    table: str,
+    where_clause: str,
+    params: dict,
+    *,
+    exact_threshold: int = COUNT_EXACT_THRESHOLD,
+    probe_where_clause: str | None = None,
+) -> RowCount:
+    """
+    Total for `SELECT ... FROM {table} {where_clause}`.
+
+    Counts exactly while the match set has at most `exact_threshold` rows (probed with
+    a LIMIT-ed count, so the cost is bounded). Larger sets return the planner estimate
+    (or `reltuples` without a filter), never below the probed lower bound.
+    `probe_where_clause` replaces `where_clause` in the probe when the same rows are
+    cheaper to find up to a limit; it reads that limit as `:_count_probe_limit`.
+    """
+    from_where_sql = f"FROM {table} {where_clause}".rstrip()
+    key = _cache_key(from_where_sql, params)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    if not where_clause:
+        estimate = _table_estimate(conn, table)
+        if estimate > exact_threshold:
+            result = RowCount(estimate, is_estimate=True)
+            _cache_put(key, result)
+            return result
+
+    probe_sql = f"FROM {table} {probe_where_clause}" if probe_where_clause else from_where_sql
+    probed = conn.execute(
+        text(f"SELECT COUNT(*) FROM (SELECT 1 {probe_sql} LIMIT :_count_probe_limit) AS probe"),
+        {**params, "_count_probe_limit": exact_threshold + 1},
+    ).scalar_one()
+
+    if probed <= exact_threshold:
+        result = RowCount(probed)
+    elif where_clause:
+        result = RowCount(max(_planner_estimate(conn, from_where_sql, params), probed), is_estimate=True)
+    else:
+        result = RowCount(max(_table_estimate(conn, table), probed), is_estimate=True)
+
+    _cache_put(key, result)
+    return result
@@ -1,15 +1,155 @@
+import logging
 import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import Callable, Iterator
+
 import sqlalchemy
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Pool and session settings for one workload."""
+
+    pool_size: int
+    max_overflow: int
+    statement_timeout_ms: int | None = None
+    # psycopg prepares a statement server-side after it ran this many times on a
+    # connection; None disables prepared statements (e.g. behind PgBouncer).
+    prepare_threshold: int | None = 5
+
+
+DEFAULT_PROFILE = EngineProfile(pool_size=3, max_overflow=2)
+
+# Sized to each workload's concurrency: ingestion runs 5 company threads that all
+# upsert, maintenance runs long set-based statements one at a time, discovery probes
+# mostly hit HTTP. Override per deployment with DB_<PROFILE>_POOL_SIZE,
+# DB_<PROFILE>_MAX_OVERFLOW, DB_<PROFILE>_STATEMENT_TIMEOUT_MS, DB_<PROFILE>_PREPARE_THRESHOLD.
+ENGINE_PROFILES: dict[str, EngineProfile] = {
+    "api": EngineProfile(pool_size=5, max_overflow=5, statement_timeout_ms=15_000, prepare_threshold=5),
+    "ingestion": EngineProfile(pool_size=5, max_overflow=2, statement_timeout_ms=120_000, prepare_threshold=2),
+    "maintenance": EngineProfile(pool_size=2, max_overflow=1, statement_timeout_ms=900_000, prepare_threshold=None),
+    "discovery": EngineProfile(pool_size=2, max_overflow=2, statement_timeout_ms=60_000, prepare_threshold=5),
+}
 
 _engine: Engine | None = None
+_profile_engines: dict[str, Engine] = {}
+_engine_lock = threading.Lock()
+# Replica engines per profile; None when no read URL is configured.
+_read_engines: dict[str, Engine | None] = {}
+# Profile of get_read_engine() calls that do not name one (see read_engine_profile).
+_read_engine_profile: ContextVar[str] = ContextVar("read_engine_profile", default="api")
+# WAL position of the latest write this process must be able to read back (see note_primary_write).
+_read_your_writes_lsn: str | None = None
+
+DEFAULT_READ_POOL_SIZE = 5
+DEFAULT_READ_MAX_OVERFLOW = 5
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkout_count = 0
+        self.checkout_wait_total_s = 0.0
+        self.checkout_wait_max_s = 0.0
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = perf_counter() - started
+            with self._stats_lock:
+                self.checkout_count += 1
+                self.checkout_wait_total_s += waited
+                self.checkout_wait_max_s = max(self.checkout_wait_max_s, waited)
+
+    def recreate(self):
+        # Keep the instrumented class when SQLAlchemy rebuilds the pool (engine.dispose()).
+        return self.__class__(
+            self._creator,
+            pool_size=self._pool.maxsize,
+            max_overflow=self._max_overflow,
+            pre_ping=self._pre_ping,
+            use_lifo=self._pool.use_lifo,
+            timeout=self._timeout,
+            recycle=self._recycle,
+            echo=self.echo,
+            logging_name=self._orig_logging_name,
+            reset_on_return=self._reset_on_return,
+            _dispatch=self.dispatch,
+            dialect=self._dialect,
+        )
 
+    def stats(self) -> dict:
+        with self._stats_lock:
+            count = self.checkout_count
+            total = self.checkout_wait_total_s
+            maximum = self.checkout_wait_max_s
+        return {
+            "pool_size": self.size(),
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "checkouts": count,
+            "checkout_wait_ms_total": round(total * 1000, 2),
+            "checkout_wait_ms_avg": round(total * 1000 / count, 3) if count else 0.0,
+            "checkout_wait_ms_max": round(maximum * 1000, 2),
+        }
 
-def _create_cloud_sql_engine() -> Engine:
+
+def _profile_from_env(name: str, profile: EngineProfile) -> EngineProfile:
+    prefix = f"DB_{name.upper()}_"
+
+    def _optional_int(key: str, default: int | None) -> int | None:
+        raw = os.getenv(prefix + key)
+        if raw is None:
+            return default
+        return None if raw.strip().lower() in ("", "none", "off") else int(raw)
+
+    return replace(
+        profile,
+        pool_size=int(os.getenv(prefix + "POOL_SIZE", profile.pool_size)),
+        max_overflow=int(os.getenv(prefix + "MAX_OVERFLOW", profile.max_overflow)),
+        statement_timeout_ms=_optional_int("STATEMENT_TIMEOUT_MS", profile.statement_timeout_ms),
+        prepare_threshold=_optional_int("PREPARE_THRESHOLD", profile.prepare_threshold),
+    )
+
+
+def _install_statement_timeout(engine: Engine, statement_timeout_ms: int | None) -> None:
+    if not statement_timeout_ms:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_statement_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET statement_timeout = {int(statement_timeout_ms)}")
+        finally:
+            cursor.close()
+        # Session-level SET must not be undone by the pool's rollback-on-return.
+        dbapi_connection.commit()
+
+
+def _create_cloud_sql_engine(
+    instance_connection_name: str | None = None,
+    *,
+    profile: EngineProfile = DEFAULT_PROFILE,
+) -> Engine:
     from google.cloud.sql.connector import Connector
 
-    instance_connection_name = os.environ["INSTANCE_CONNECTION_NAME"]
+    instance_connection_name = instance_connection_name or os.environ["INSTANCE_CONNECTION_NAME"]
     db_name = os.environ["DB_NAME"]
     db_user = os.environ["DB_USER"]
 
@@ -24,56 +164,229 @@ def _create_cloud_sql_engine() -> Engine:
             enable_iam_auth=True,
         )
 
-    return sqlalchemy.create_engine(
+    # pg8000 has no prepare_threshold; only pool sizing and the statement timeout apply.
+    engine = sqlalchemy.create_engine(
         "postgresql+pg8000://",
         creator=getconn,
+        poolclass=InstrumentedQueuePool,
         pool_pre_ping=True,
-        pool_size=3,
-        max_overflow=2,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
         pool_timeout=30,
         pool_recycle=1800,
         future=True,
     )
+    _install_statement_timeout(engine, profile.statement_timeout_ms)
+    return engine
 
 
-def _create_standard_postgres_engine(database_url: str) -> Engine:
+def _create_standard_postgres_engine(
+    database_url: str,
+    *,
+    profile: EngineProfile = DEFAULT_PROFILE,
+    read_only: bool = False,
+) -> Engine:
+    connect_args = {"connect_timeout": 10, "prepare_threshold": profile.prepare_threshold}
+    options = []
+    if profile.statement_timeout_ms:
+        options.append(f"-c statement_timeout={int(profile.statement_timeout_ms)}")
+    if read_only:
+        # Guards against accidental writes through the read engine, also when it shares the primary DSN.
+        options.append("-c default_transaction_read_only=on")
+    if options:
+        connect_args["options"] = " ".join(options)
     return sqlalchemy.create_engine(
         database_url,
+        poolclass=InstrumentedQueuePool,
         pool_pre_ping=True,
-        pool_size=3,
-        max_overflow=2,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
         pool_timeout=30,
         pool_recycle=1800,
-        connect_args={"connect_timeout": 10},
+        connect_args=connect_args,
         future=True,
     )
 
 
-def _resolve_engine() -> Engine:
+def _validate_standard_url(name: str, database_url: str) -> None:
+    if not database_url.startswith("postgresql+psycopg://"):
+        raise RuntimeError(f"{name} must use postgresql+psycopg://")
+
+
+def _resolve_engine(profile: EngineProfile = DEFAULT_PROFILE) -> Engine:
     db_mode = os.getenv("DB_MODE")
 
     if not db_mode:
         raise RuntimeError("DB_MODE is not set (expected 'cloudsql' or 'standard').")
 
     if db_mode == "cloudsql":
-        return _create_cloud_sql_engine()
+        return _create_cloud_sql_engine(profile=profile)
 
     if db_mode == "standard":
         database_url = os.getenv("DATABASE_URL")
         if not database_url:
             raise RuntimeError("DATABASE_URL must be set in DB_MODE=standard.")
-        if not database_url.startswith("postgresql+psycopg://"):
-            raise RuntimeError("DATABASE_URL must use postgresql+psycopg://")
-        return _create_standard_postgres_engine(database_url)
+        _validate_standard_url("DATABASE_URL", database_url)
+        return _create_standard_postgres_engine(database_url, profile=profile)
 
     raise RuntimeError(f"Unsupported DB_MODE: {db_mode}")
 
 
-def get_engine() -> Engine:
+def get_engine(profile: str | None = None) -> Engine:
+    """
+    Primary (read-write) engine. Without `profile` this is the shared default engine;
+    a named profile from ENGINE_PROFILES gets its own pool and session settings.
+    """
     global _engine
-    if _engine is None:
-        _engine = _resolve_engine()
-    return _engine
+    if profile is None:
+        if _engine is None:
+            _engine = _resolve_engine()
+        return _engine
+
+    engine = _profile_engines.get(profile)
+    if engine is None:
+        if profile not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown engine profile: {profile}")
+        with _engine_lock:
+            engine = _profile_engines.get(profile)
+            if engine is None:
+                engine = _resolve_engine(_profile_from_env(profile, ENGINE_PROFILES[profile]))
+                _profile_engines[profile] = engine
+    return engine
+
+
+def engine_getter(profile: str) -> Callable[[], Engine]:
+    """Zero-argument accessor bound to `profile`, used as a worker module's `get_engine`."""
+
+    def _get_profile_engine() -> Engine:
+        return get_engine(profile)
+
+    return _get_profile_engine
+
+
+def pool_metrics() -> dict[str, dict]:
+    """Checkout wait and in-use gauges for every engine created in this process."""
+    engines: dict[str, Engine | None] = {
+        "default": _engine,
+        **_profile_engines,
+        **{"read" if name == "api" else f"read_{name}": engine for name, engine in _read_engines.items()},
+    }
+    metrics = {}
+    for name, engine in engines.items():
+        pool = getattr(engine, "pool", None)
+        if isinstance(pool, InstrumentedQueuePool):
+            metrics[name] = pool.stats()
+    return metrics
+
+
+def _read_profile(profile: str) -> EngineProfile:
+    # A replica engine keeps its profile's session settings; the api one is sized by DB_READ_*.
+    settings = _profile_from_env(profile, ENGINE_PROFILES[profile])
+    if profile != "api":
+        return settings
+    return replace(
+        settings,
+        pool_size=int(os.getenv("DB_READ_POOL_SIZE", DEFAULT_READ_POOL_SIZE)),
+        max_overflow=int(os.getenv("DB_READ_MAX_OVERFLOW", DEFAULT_READ_MAX_OVERFLOW)),
+    )
+
+
+def _resolve_read_engine(profile: str) -> Engine | None:
+    db_mode = os.getenv("DB_MODE")
+
+    if db_mode == "cloudsql":
+        instance_connection_name = os.getenv("READ_INSTANCE_CONNECTION_NAME")
+        if not instance_connection_name:
+            return None
+        return _create_cloud_sql_engine(instance_connection_name, profile=_read_profile(profile))
+
+    if db_mode == "standard":
+        read_url = os.getenv("DATABASE_READ_URL")
+        if not read_url:
+            return None
+        _validate_standard_url("DATABASE_READ_URL", read_url)
+        return _create_standard_postgres_engine(read_url, profile=_read_profile(profile), read_only=True)
+
+    return None
+
+
+def _get_configured_read_engine(profile: str = "api") -> Engine | None:
+    if profile not in _read_engines:
+        with _engine_lock:
+            if profile not in _read_engines:
+                _read_engines[profile] = _resolve_read_engine(profile)
+    return _read_engines[profile]
+
+
+@contextmanager
+def read_engine_profile(profile: str) -> Iterator[None]:
+    """Routes get_read_engine() calls without a profile to `profile` (e.g. a worker reusing API repositories)."""
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown engine profile: {profile}")
+    token = _read_engine_profile.set(profile)
+    try:
+        yield
+    finally:
+        _read_engine_profile.reset(token)
+
+
+def _replica_has_replayed(read_engine: Engine, lsn: str) -> bool:
+    # pg_last_wal_replay_lsn() is NULL on a server that is not in recovery (e.g. the
+    # primary DSN reused as the read URL locally) — it then sees every write.
+    with read_engine.connect() as conn:
+        replayed = conn.execute(
+            text("SELECT pg_last_wal_replay_lsn() IS NULL OR pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"),
+            {"lsn": lsn},
+        ).scalar()
+    return bool(replayed)
+
+
+def get_read_engine(profile: str | None = None) -> Engine:
+    """
+    Engine for read-only workloads (API listings, exporters, audit aggregations).
+
+    `profile` (default: the read_engine_profile() in effect, else `api`) picks the
+    pool and session settings: HTTP handlers read with `api`, workers with their own
+    profile. Returns that profile's engine for DATABASE_READ_URL
+    (READ_INSTANCE_CONNECTION_NAME on Cloud SQL) when configured, otherwise the
+    primary engine of the profile. After `note_primary_write()` reads stay on the
+    primary until the replica has replayed that write, so a process always reads back
+    its own writes.
+    """
+    global _read_your_writes_lsn
+    profile = profile or _read_engine_profile.get()
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown engine profile: {profile}")
+    read_engine = _get_configured_read_engine(profile)
+    if read_engine is None:
+        return get_engine(profile)
+
+    lsn = _read_your_writes_lsn
+    if lsn is not None:
+        try:
+            caught_up = _replica_has_replayed(read_engine, lsn)
+        except Exception:
+            logger.warning("read_replica_lag_check_failed", exc_info=True)
+            return get_engine(profile)
+        if not caught_up:
+            return get_engine(profile)
+        if _read_your_writes_lsn == lsn:
+            _read_your_writes_lsn = None
+
+    return read_engine
+
+
+def note_primary_write() -> None:
+    """
+    Records the primary's current WAL position so later `get_read_engine()` calls in
+    this process fall back to the primary until the replica has replayed it.
+    No-op without a read engine.
+    """
+    global _read_your_writes_lsn
+    if _get_configured_read_engine() is None:
+        return
+    with get_engine().connect() as conn:
+        _read_your_writes_lsn = conn.execute(text("SELECT CAST(pg_current_wal_lsn() AS TEXT)")).scalar()
 
 
 def db_healthcheck() -> None:
@@ -5,7 +5,9 @@ from datetime import date
 
 from sqlalchemy import text
 
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
+
+get_engine = engine_getter("api")
 
 TIER_QUOTAS: dict[str, int] = {
     "free": 500,
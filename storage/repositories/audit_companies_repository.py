@@ -1,5 +1,5 @@
 from sqlalchemy import text
-from storage.db_engine import get_engine
+from storage.db_engine import get_read_engine
 
 
 def get_audit_companies_list(
@@ -10,7 +10,7 @@ def get_audit_companies_list(
     limit: int = 50,
     offset: int = 0,
 ) -> dict:
-    engine = get_engine()
+    engine = get_read_engine()
     where_clauses, params = [], {"limit": limit, "offset": offset}
     order_by_sql = "signal_score DESC, created_at DESC"
 
@@ -1,11 +1,22 @@
 from sqlalchemy import text
-from storage.db_engine import get_engine
+from storage.common import (
+    JOB_LAST_SEEN_SQL,
+    JOB_SEARCH_ORDER_BY,
+    _job_search_candidate_limit,
+    _job_search_params,
+    _job_search_where,
+)
+from storage.db_engine import get_read_engine
+from storage.count_strategy import count_rows
 
-engine = get_engine()
+# Company stats threshold of the audit panel's default view; the exporter refreshes
+# the same cache entry.
+AUDIT_COMPANY_STATS_MIN_TOTAL_JOBS = 10
 
 
 def _build_jobs_audit_filter_clauses(
     *,
+    q: str | None = None,
     status: str | None = None,
     source: str | None = None,
     company: str | None = None,
@@ -17,10 +28,14 @@ def _build_jobs_audit_filter_clauses(
     min_compliance_score: int | None = None,
     max_compliance_score: int | None = None,
 ) -> tuple[list[str], dict]:
+    """Filter clauses (without the `q` match, see `_job_search_where`) and their params."""
     clauses: list[str] = []
     params: dict = {}
     param_counter = 0
 
+    if q:
+        params.update(_job_search_params(q))
+
     if status:
         param_counter += 1
         clauses.append(f"status = :p{param_counter}")
@@ -89,6 +104,7 @@ def _rows_to_count_map(rows: list) -> dict[str, int]:
 
 def get_jobs_audit(
     *,
+    q: str | None = None,
     status: str | None = None,
     source: str | None = None,
     company: str | None = None,
@@ -104,6 +120,7 @@ def get_jobs_audit(
     include_counts: bool = True,
 ) -> dict:
     clauses, params = _build_jobs_audit_filter_clauses(
+        q=q,
         status=status,
         source=source,
         company=company,
@@ -116,13 +133,21 @@ def get_jobs_audit(
         max_compliance_score=max_compliance_score,
     )
 
-    where_clause = ""
-    if clauses:
-        where_clause = "WHERE " + " AND ".join(clauses)
+    where_clause = _job_search_where(clauses, q)
+    page_where_clause = _job_search_where(clauses, q, limit_sql=":q_candidates")
+
+    order_by_sql = "COALESCE(last_seen_at, '1970-01-01T00:00:00+00:00') DESC"
+    if q:
+        order_by_sql = f"{JOB_SEARCH_ORDER_BY}, {order_by_sql}, job_id DESC"
 
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         # Prepare params for queries
-        query_params = {**params, "limit": limit, "offset": offset}
+        query_params = {
+            **params,
+            "limit": limit,
+            "offset": offset,
+            "q_candidates": _job_search_candidate_limit(limit, offset),
+        }
 
         jobs_rows = (
             conn.execute(
@@ -143,8 +168,8 @@ def get_jobs_audit(
                     last_seen_at,
                     source_department
                 FROM jobs
-                {where_clause}
-                ORDER BY COALESCE(last_seen_at, '1970-01-01T00:00:00+00:00') DESC
+                {page_where_clause}
+                ORDER BY {order_by_sql}
                 LIMIT :limit OFFSET :offset
             """),
                 query_params,
@@ -153,15 +178,13 @@ def get_jobs_audit(
             .all()
         )
 
-        if not where_clause:
-            total_query = "SELECT GREATEST(0, CAST(reltuples AS BIGINT)) AS total FROM pg_class c JOIN pg_namespace n ON c.relnamespace = n.oid WHERE n.nspname = 'public' AND c.relname = 'jobs'"
-        else:
-            total_query = f"SELECT COUNT(*) AS total FROM jobs {where_clause}"
-
-        total_row = conn.execute(
-            text(total_query),
+        total = count_rows(
+            conn,
+            "jobs",
+            where_clause,
             params,
-        ).fetchone()
+            probe_where_clause=_job_search_where(clauses, q, limit_sql=":_count_probe_limit", ordered=False),
+        )
 
         status_counts = {}
         source_counts = {}
@@ -233,7 +256,8 @@ def get_jobs_audit(
             source_counts = _rows_to_count_map(source_rows)
 
     return {
-        "total": int(total_row[0]) if total_row else 0,
+        "total": int(total),
+        "total_is_estimate": total.is_estimate,
         "limit": int(limit),
         "offset": int(offset),
         "items": [dict(row) for row in jobs_rows],
@@ -248,7 +272,7 @@ def get_jobs_audit(
 
 
 def get_compliance_stats_last_7d() -> dict:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         row = (
             conn.execute(
                 text("""
@@ -282,7 +306,7 @@ def get_compliance_stats_last_7d() -> dict:
 
 
 def get_audit_source_filter_values() -> list[str]:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         rows = (
             conn.execute(
                 text("""
@@ -305,9 +329,9 @@ def get_audit_source_filter_values() -> list[str]:
 
 def get_audit_company_compliance_stats(
     *,
-    min_total_jobs: int = 10,
+    min_total_jobs: int = AUDIT_COMPANY_STATS_MIN_TOTAL_JOBS,
 ) -> list[dict]:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         rows = (
             conn.execute(
                 text("""
@@ -349,7 +373,7 @@ def get_audit_company_compliance_stats(
 
 
 def get_audit_source_compliance_stats_last_7d() -> list[dict]:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         rows = (
             conn.execute(
                 text("""
@@ -390,7 +414,7 @@ def get_audit_source_compliance_stats_last_7d() -> list[dict]:
 
 
 def get_source_compliance_trend(days: int = 30) -> list[dict]:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         rows = (
             conn.execute(
                 text("""
@@ -435,7 +459,7 @@ def get_source_compliance_trend(days: int = 30) -> list[dict]:
 
 
 def get_rejection_reasons_by_source(days: int = 30) -> list[dict]:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         rows = (
             conn.execute(
                 text("""
@@ -450,7 +474,17 @@ def get_rejection_reasons_by_source(days: int = 30) -> list[dict]:
                     COUNT(DISTINCT j.job_id) AS count
                 FROM jobs j
                 JOIN job_sources js ON js.job_id = j.job_id
-                LEFT JOIN compliance_reports cr ON cr.job_id = j.job_id
+                -- A job has one report per month; only the latest decides its reason.
+                LEFT JOIN LATERAL (
+                    SELECT cr.hard_geo_flag
+                    FROM compliance_reports cr
+                    WHERE cr.job_id = j.job_id
+                      -- Reports are never older than their job: bounds report_month for partition pruning.
+                      AND cr.report_month
+                          >= (date_trunc('month', (NOW() - INTERVAL '1 day' * :days) AT TIME ZONE 'UTC'))::date
+                    ORDER BY cr.report_month DESC, cr.created_at DESC
+                    LIMIT 1
+                ) cr ON TRUE
                 WHERE j.compliance_status = 'rejected'
                   AND j.first_seen_at > NOW() - INTERVAL '1 day' * :days
                 GROUP BY 1, 2
@@ -466,7 +500,7 @@ def get_rejection_reasons_by_source(days: int = 30) -> list[dict]:
 
 
 def get_ghost_jobs(days_threshold: int = 3) -> list[dict]:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         rows = (
             conn.execute(
                 text("""
@@ -491,7 +525,7 @@ def get_ghost_jobs(days_threshold: int = 3) -> list[dict]:
 
 
 def get_job_lifetime_stats() -> dict:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         row = (
             conn.execute(
                 text("""
@@ -515,10 +549,11 @@ def get_job_lifetime_stats() -> dict:
 
 
 def get_repost_candidates(days_threshold: int = 30) -> list[dict]:
-    with engine.connect() as conn:
+    # prev's last sighting may still be pending in job_sightings; same rule as ingest and lifecycle.
+    with get_read_engine().connect() as conn:
         rows = (
             conn.execute(
-                text("""
+                text(f"""
                 SELECT
                     j.job_id,
                     j.company_name,
@@ -527,11 +562,14 @@ def get_repost_candidates(days_threshold: int = 30) -> list[dict]:
                     prev.last_seen_at AS previous_last_seen_at,
                     (j.first_seen_at - prev.last_seen_at) AS gap
                 FROM jobs j
-                JOIN jobs prev
-                  ON j.job_fingerprint = prev.job_fingerprint
-                 AND j.company_name = prev.company_name
-                 AND j.title = prev.title
-                 AND j.job_id <> prev.job_id
+                JOIN LATERAL (
+                    SELECT p.job_id, {JOB_LAST_SEEN_SQL.format(t="p")} AS last_seen_at
+                    FROM jobs p
+                    WHERE p.job_fingerprint = j.job_fingerprint
+                      AND p.company_name = j.company_name
+                      AND p.title = j.title
+                      AND p.job_id <> j.job_id
+                ) prev ON TRUE
                 WHERE j.first_seen_at > NOW() - ((:days_threshold + 15) * INTERVAL '1 day')
                   AND j.first_seen_at > prev.last_seen_at
                   AND j.first_seen_at - prev.last_seen_at < (:days_threshold * INTERVAL '1 day')
@@ -547,7 +585,7 @@ def get_repost_candidates(days_threshold: int = 30) -> list[dict]:
 
 
 def get_failing_ats_integrations(days_threshold: int = 3) -> list[dict]:
-    with engine.connect() as conn:
+    with get_read_engine().connect() as conn:
         rows = (
             conn.execute(
                 text("""
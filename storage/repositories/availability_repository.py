@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
 from storage.common import _require_open_conn
 
+get_engine = engine_getter("maintenance")
+
 engine = get_engine()
 
 
@@ -23,7 +25,7 @@ def get_jobs_for_verification(limit: int = 20) -> list[dict]:
                     status IN ('active', 'stale')
                     AND (last_verified_at IS NULL OR last_verified_at < NOW() - INTERVAL '6 hours')
                 ORDER BY
-                    COALESCE(last_verified_at, '1970-01-01T00:00:00+00:00') ASC
+                    last_verified_at ASC NULLS FIRST
                 LIMIT :limit
             """),
                 {"limit": limit},
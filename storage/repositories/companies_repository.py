@@ -1,14 +1,26 @@
-from sqlalchemy import text
-from storage.db_engine import get_engine
-
+from datetime import datetime
 
-def get_companies_paginated(q: str | None = None, limit: int = 40, offset: int = 0) -> tuple[list[dict], int]:
-    engine = get_engine()
+from sqlalchemy import text
+from storage.db_engine import get_read_engine
+
+
+def get_companies_paginated(
+    q: str | None = None,
+    limit: int = 40,
+    offset: int = 0,
+    after: tuple[int, datetime, str] | None = None,
+) -> tuple[list[dict], int]:
+    """
+    `after` = (signal_score, created_at, company_id) of the previous page's last row
+    switches to keyset pagination (default ordering only, no `q`). Rows include
+    signal_score and created_at so callers can build the next cursor.
+    """
+    engine = get_read_engine()
 
     # Publiczny endpoint udostępnia tylko aktywne firmy
     where_clauses = ["is_active = TRUE"]
     params = {"limit": limit, "offset": offset}
-    order_by_sql = "signal_score DESC, created_at DESC"
+    order_by_sql = "signal_score DESC, created_at DESC, company_id DESC"
 
     if q:
         where_clauses.append("(legal_name ILIKE :q_like OR brand_name ILIKE :q_like)")
@@ -17,6 +29,15 @@ def get_companies_paginated(q: str | None = None, limit: int = 40, offset: int =
         order_by_sql = "LEAST(legal_name <-> :q_exact, brand_name <-> :q_exact) ASC, signal_score DESC"
 
     where_sql = "WHERE " + " AND ".join(where_clauses)
+    page_where_sql = where_sql
+    if after is not None:
+        if q:
+            raise ValueError("keyset pagination is not supported with q")
+        page_where_sql += (
+            " AND (signal_score, created_at, company_id)"
+            " < (:after_signal_score, :after_created_at, CAST(:after_company_id AS uuid))"
+        )
+        params["after_signal_score"], params["after_created_at"], params["after_company_id"] = after
 
     with engine.connect() as conn:
         total_query = f"SELECT COUNT(*) FROM companies {where_sql}"
@@ -25,9 +46,9 @@ def get_companies_paginated(q: str | None = None, limit: int = 40, offset: int =
         query = f"""
             SELECT 
                 company_id, legal_name, brand_name, hq_country, remote_posture,
-                approved_jobs_count, total_jobs_count
+                approved_jobs_count, total_jobs_count, signal_score, created_at
             FROM companies 
-            {where_sql}
+            {page_where_sql}
             ORDER BY {order_by_sql}
             LIMIT :limit OFFSET :offset
         """
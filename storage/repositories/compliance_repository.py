@@ -1,59 +1,150 @@
+import hashlib
 import json
 from datetime import datetime, timezone
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Connection
 
-from storage.common import _require_open_conn
+from storage.common import JOB_DESCRIPTION_SQL, _require_open_conn, execute_unnest, unnest_rows
 
 
 def _get_engine():
     """Lazy engine getter — avoids import-time side effects during testing."""
     from storage.db_engine import get_engine
 
-    return get_engine()
+    return get_engine("maintenance")
 
 
-def insert_compliance_reports(conn: Connection, reports: list[dict]) -> None:
-    """Insert multiple compliance reports in a single bulk operation."""
-    if not reports:
-        return
+# Report fields that make up a decision; a report is only written when one of them changes.
+_DECISION_FIELDS = (
+    "job_id",
+    "policy_version",
+    "remote_class",
+    "geo_class",
+    "hard_geo_flag",
+    "base_score",
+    "penalties",
+    "bonuses",
+    "final_score",
+    "final_status",
+    "decision_vector",
+)
+
+
+def compliance_decision_hash(report: dict) -> str:
+    payload = json.dumps({field: report.get(field) for field in _DECISION_FIELDS}, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
 
+
+def _changed_reports(conn: Connection, reports: list[dict]) -> list[dict]:
+    latest: dict[str, dict] = {}
     for r in reports:
-        if r.get("penalties") is not None:
-            r["penalties"] = json.dumps(r["penalties"], default=str)
-        if r.get("bonuses") is not None:
-            r["bonuses"] = json.dumps(r["bonuses"], default=str)
-        if r.get("decision_vector") is not None:
-            r["decision_vector"] = json.dumps(r["decision_vector"], default=str)
+        latest[r["job_uid"]] = {**r, "decision_hash": compliance_decision_hash(r)}
 
-    conn.execute(
+    # A decision cached in an earlier month is stale: its report lives in an older
+    # report_month partition that retention will drop, so every month gets one full report.
+    stored = dict(
+        conn.execute(
+            text("""
+                SELECT job_uid, decision_hash
+                FROM compliance_decisions
+                WHERE job_uid IN :job_uids
+                  AND date_trunc('month', decided_at AT TIME ZONE 'UTC') = date_trunc('month', NOW() AT TIME ZONE 'UTC')
+            """).bindparams(bindparam("job_uids", expanding=True)),
+            {"job_uids": list(latest)},
+        ).all()
+    )
+    return [r for uid, r in latest.items() if stored.get(uid) != r["decision_hash"]]
+
+
+_REPORT_COLUMNS = {
+    "job_id": "TEXT",
+    "job_uid": "TEXT",
+    "policy_version": "TEXT",
+    "remote_class": "TEXT",
+    "geo_class": "TEXT",
+    "hard_geo_flag": "BOOLEAN",
+    "base_score": "INTEGER",
+    "penalties": "JSONB",
+    "bonuses": "JSONB",
+    "final_score": "INTEGER",
+    "final_status": "TEXT",
+    "decision_vector": "JSONB",
+}
+_REPORTS_UPSERT_STMT = text(f"""
+    INSERT INTO compliance_reports (
+        job_id, job_uid, policy_version, remote_class, geo_class,
+        hard_geo_flag, base_score, penalties, bonuses,
+        final_score, final_status, decision_vector, created_at
+    )
+    SELECT r.*, NOW() FROM {unnest_rows(_REPORT_COLUMNS)}
+    ON CONFLICT (job_uid, policy_version, report_month) DO UPDATE SET
+        job_id = EXCLUDED.job_id,
+        remote_class = EXCLUDED.remote_class,
+        geo_class = EXCLUDED.geo_class,
+        hard_geo_flag = EXCLUDED.hard_geo_flag,
+        base_score = EXCLUDED.base_score,
+        penalties = EXCLUDED.penalties,
+        bonuses = EXCLUDED.bonuses,
+        final_score = EXCLUDED.final_score,
+        final_status = EXCLUDED.final_status,
+        decision_vector = EXCLUDED.decision_vector,
+        created_at = NOW()
+""")
+
+_DECISION_COLUMNS = {"job_uid": "TEXT", "job_id": "TEXT", "policy_version": "TEXT", "decision_hash": "TEXT"}
+_DECISIONS_UPSERT_STMT = text(f"""
+    INSERT INTO compliance_decisions (job_uid, job_id, policy_version, decision_hash, decided_at)
+    SELECT r.*, NOW() FROM {unnest_rows(_DECISION_COLUMNS)}
+    ON CONFLICT (job_uid) DO UPDATE SET
+        job_id = EXCLUDED.job_id,
+        policy_version = EXCLUDED.policy_version,
+        decision_hash = EXCLUDED.decision_hash,
+        decided_at = NOW()
+""")
+
+
+def insert_compliance_reports(conn: Connection, reports: list[dict]) -> int:
+    """
+    Insert multiple compliance reports in a single bulk operation.
+
+    Only reports whose decision differs from the one cached in
+    `compliance_decisions` during the current month are written; unchanged jobs
+    cost one indexed read per batch and no writes. Reports are upserted per
+    (job_uid, policy_version) within the current `report_month` partition; the
+    first evaluation in a later month writes a new row even if the decision is
+    unchanged. Returns the number of reports written.
+    """
+    if not reports:
+        return 0
+
+    changed = _changed_reports(conn, reports)
+    if not changed:
+        return 0
+
+    execute_unnest(conn, _REPORTS_UPSERT_STMT, changed, _REPORT_COLUMNS, key=("job_uid", "policy_version"))
+    execute_unnest(conn, _DECISIONS_UPSERT_STMT, changed, _DECISION_COLUMNS, key=("job_uid",))
+    return len(changed)
+
+
+def delete_orphaned_compliance_decisions(conn: Connection) -> int:
+    """
+    Deletes cached decisions whose report is gone, e.g. after partition
+    retention dropped its `report_month`. Returns the number of rows deleted.
+    """
+    result = conn.execute(
         text("""
-            INSERT INTO compliance_reports (
-                job_id, job_uid, policy_version, remote_class, geo_class,
-                hard_geo_flag, base_score, penalties, bonuses,
-                final_score, final_status, decision_vector, created_at
-            )
-            VALUES (
-                :job_id, :job_uid, :policy_version, :remote_class, :geo_class,
-                :hard_geo_flag, :base_score, :penalties, :bonuses,
-                :final_score, :final_status, :decision_vector, NOW()
-            )
-            ON CONFLICT (job_uid, policy_version) DO UPDATE SET
-                job_id = EXCLUDED.job_id,
-                remote_class = EXCLUDED.remote_class,
-                geo_class = EXCLUDED.geo_class,
-                hard_geo_flag = EXCLUDED.hard_geo_flag,
-                base_score = EXCLUDED.base_score,
-                penalties = EXCLUDED.penalties,
-                bonuses = EXCLUDED.bonuses,
-                final_score = EXCLUDED.final_score,
-                final_status = EXCLUDED.final_status,
-                decision_vector = EXCLUDED.decision_vector,
-                created_at = NOW()
-        """),
-        reports,
+            DELETE FROM compliance_decisions d
+            WHERE d.decided_at < date_trunc('month', NOW() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+              AND NOT EXISTS (
+                  SELECT 1 FROM compliance_reports cr
+                  WHERE cr.job_uid = d.job_uid
+                    AND cr.policy_version = d.policy_version
+                    AND cr.report_month = (date_trunc('month', d.decided_at AT TIME ZONE 'UTC'))::date
+              )
+        """)
     )
+    return result.rowcount
 
 
 def insert_compliance_report(
@@ -194,9 +285,9 @@ def update_jobs_compliance_resolution(
 
 def get_jobs_for_compliance_backfill(conn: Connection, *, limit: int, current_policy_version: str) -> list[dict]:
     """Fetch jobs missing compliance data or with an outdated policy version."""
-    query = text("""
+    query = text(f"""
         SELECT
-            job_id, job_uid, title, description, remote_scope, source,
+            job_id, job_uid, title, {JOB_DESCRIPTION_SQL} AS description, remote_scope, source,
             company_id, company_name, remote_source_flag,
             remote_class, geo_class, compliance_status, compliance_score, policy_version
         FROM jobs
@@ -1,7 +1,9 @@
 import uuid
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
-from storage.db_engine import get_engine
+from storage.db_engine import engine_getter
+
+get_engine = engine_getter("discovery")
 
 engine = get_engine()
 
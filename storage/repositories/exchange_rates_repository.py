@@ -0,0 +1,122 @@
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+
+
+def sync_exchange_rates(conn: Connection, rows: list[dict]) -> int:
+    """
+    Upserts dated rates (currency, valid_from, rate_to_eur) into `exchange_rates`.
+    Rows whose rate is unchanged are not rewritten; changed rows are marked as
+    not applied yet. Returns the number of rows inserted or changed.
+    """
+    if not rows:
+        return 0
+
+    changed = conn.execute(
+        text("""
+            INSERT INTO exchange_rates (currency, valid_from, rate_to_eur, created_at, updated_at)
+            SELECT currency, valid_from, rate_to_eur, NOW(), NOW()
+            FROM unnest(
+                CAST(:currencies AS TEXT[]),
+                CAST(:valid_froms AS DATE[]),
+                CAST(:rates AS DOUBLE PRECISION[])
+            ) AS src(currency, valid_from, rate_to_eur)
+            ON CONFLICT (currency, valid_from) DO UPDATE SET
+                rate_to_eur = EXCLUDED.rate_to_eur,
+                applied_at = NULL,
+                updated_at = NOW()
+            WHERE exchange_rates.rate_to_eur IS DISTINCT FROM EXCLUDED.rate_to_eur
+            RETURNING currency
+        """),
+        {
+            "currencies": [row["currency"] for row in rows],
+            "valid_froms": [row["valid_from"] for row in rows],
+            "rates": [row["rate_to_eur"] for row in rows],
+        },
+    ).fetchall()
+    return len(changed)
+
+
+def get_current_exchange_rates(conn: Connection) -> dict[str, float]:
+    rows = conn.execute(text("SELECT currency, rate_to_eur FROM current_exchange_rates")).fetchall()
+    return {row[0]: float(row[1]) for row in rows}
+
+
+def renormalize_salary_eur(conn: Connection, currencies: list[str] | None = None) -> int:
+    """
+    Set-based recompute of salary_min_eur / salary_max_eur from the rates in
+    force today (`current_exchange_rates`), optionally limited to `currencies`.
+
+    Mirrors normalize_to_eur + int() at ingestion: float8 multiplication,
+    truncation, NULL for zero/missing amounts. Rows whose EUR values would not
+    change are skipped, so re-running is cheap.
+    Returns the number of jobs updated.
+    """
+    currency_filter = "AND r.currency IN :currencies" if currencies else ""
+    stmt = text(f"""
+        WITH recomputed AS (
+            SELECT
+                j.job_id,
+                CASE WHEN COALESCE(j.salary_min, 0) = 0 THEN NULL
+                     ELSE trunc(j.salary_min::float8 * r.rate_to_eur) END AS min_eur,
+                CASE WHEN COALESCE(j.salary_max, 0) = 0 THEN NULL
+                     ELSE trunc(j.salary_max::float8 * r.rate_to_eur) END AS max_eur
+            FROM jobs j
+            JOIN current_exchange_rates r ON r.currency = upper(j.salary_currency)
+            WHERE j.salary_currency IS NOT NULL
+              {currency_filter}
+        )
+        UPDATE jobs j
+        SET salary_min_eur = c.min_eur,
+            salary_max_eur = c.max_eur
+        FROM recomputed c
+        WHERE j.job_id = c.job_id
+          AND (
+              j.salary_min_eur IS DISTINCT FROM c.min_eur::real
+              OR j.salary_max_eur IS DISTINCT FROM c.max_eur::real
+          )
+    """)
+    params = {}
+    if currencies:
+        stmt = stmt.bindparams(bindparam("currencies", expanding=True))
+        params["currencies"] = [currency.upper() for currency in currencies]
+    return conn.execute(stmt, params).rowcount
+
+
+def apply_pending_exchange_rates(conn: Connection) -> dict:
+    """
+    Re-normalizes EUR salaries for currencies whose rate in force has not been
+    applied yet (new/changed rows, or future-dated rows that became current),
+    then marks those rates as applied.
+    Returns {"currencies": [...], "jobs_updated": int}.
+    """
+    currencies = [
+        row[0]
+        for row in conn.execute(
+            text("""
+                SELECT e.currency
+                FROM exchange_rates e
+                JOIN current_exchange_rates c
+                  ON c.currency = e.currency AND c.valid_from = e.valid_from
+                WHERE e.applied_at IS NULL
+                ORDER BY e.currency
+            """)
+        )
+    ]
+    if not currencies:
+        return {"currencies": [], "jobs_updated": 0}
+
+    jobs_updated = renormalize_salary_eur(conn, currencies)
+
+    conn.execute(
+        text("""
+            UPDATE exchange_rates e
+            SET applied_at = NOW()
+            FROM current_exchange_rates c
+            WHERE c.currency = e.currency
+              AND c.valid_from = e.valid_from
+              AND e.applied_at IS NULL
+              AND e.currency IN :currencies
+        """).bindparams(bindparam("currencies", expanding=True)),
+        {"currencies": currencies},
+    )
+    return {"currencies": currencies, "jobs_updated": jobs_updated}
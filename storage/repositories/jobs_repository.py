@@ -1,15 +1,218 @@
+import hashlib
 import logging
 from datetime import datetime, timezone
 from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Connection
-from storage.db_engine import get_engine
-from storage.common import _derive_source_fields, _require_open_conn
+from storage.db_engine import get_read_engine
+from storage.common import (
+    JOB_DESCRIPTION_SQL,
+    JOB_LAST_SEEN_SQL,
+    JOB_SEARCH_CANDIDATE_LIMIT,
+    JOB_SEARCH_ORDER_BY,
+    REPOST_WINDOW_DAYS,
+    _derive_source_fields,
+    _job_search_candidate_limit,
+    _job_search_params,
+    _job_search_passes,
+    _job_search_where,
+    _require_open_conn,
+    execute_unnest,
+    unnest_rows,
+)
+from storage.count_strategy import count_rows
 from app.domain.jobs.identity import compute_job_fingerprint, compute_job_uid
 from app.domain.money.salary_parser import extract_salary
-from .snapshots_repository import insert_job_snapshot
+from .near_duplicates_repository import sync_job_signatures
+from .snapshots_repository import insert_job_snapshot, insert_job_snapshots
 
 logger = logging.getLogger(__name__)
 
+# Columns the bulk jobs upsert overwrites with the incoming value, and those it only fills while NULL.
+_JOB_OVERWRITTEN_COLUMNS = (
+    "title",
+    "company_name",
+    "remote_source_flag",
+    "remote_scope",
+    "status",
+    "remote_class",
+    "geo_class",
+    "job_uid",
+    "job_fingerprint",
+    "source_schema_hash",
+    "policy_version",
+    "compliance_status",
+    "compliance_score",
+    "job_family",
+    "job_role",
+    "seniority",
+    "specialization",
+    "job_quality_score",
+    "salary_min",
+    "salary_max",
+    "salary_currency",
+    "salary_period",
+    "salary_source",
+    "salary_min_eur",
+    "salary_max_eur",
+    "salary_transparency_status",
+    "source_department",
+)
+_JOB_FILLED_COLUMNS = ("source", "source_job_id", "source_url", "company_id")
+
+# Rows of the bulk jobs upsert (execute_unnest), by column type. A NULL repost_count
+# leaves the stored repost flags alone.
+_JOB_UPSERT_COLUMNS = {
+    "job_id": "TEXT",
+    "source": "TEXT",
+    "source_job_id": "TEXT",
+    "source_url": "TEXT",
+    "title": "TEXT",
+    "company_name": "TEXT",
+    "remote_source_flag": "BOOLEAN",
+    "remote_scope": "TEXT",
+    "status": "TEXT",
+    "first_seen_at": "TIMESTAMPTZ",
+    "last_seen_at": "TIMESTAMPTZ",
+    "remote_class": "TEXT",
+    "geo_class": "TEXT",
+    "company_id": "UUID",
+    "job_uid": "TEXT",
+    "job_fingerprint": "TEXT",
+    "source_schema_hash": "TEXT",
+    "policy_version": "TEXT",
+    "compliance_status": "TEXT",
+    "compliance_score": "INTEGER",
+    "job_family": "TEXT",
+    "job_role": "TEXT",
+    "seniority": "TEXT",
+    "specialization": "TEXT",
+    "job_quality_score": "INTEGER",
+    "salary_min": "INTEGER",
+    "salary_max": "INTEGER",
+    "salary_currency": "TEXT",
+    "salary_period": "TEXT",
+    "salary_source": "TEXT",
+    "salary_min_eur": "REAL",
+    "salary_max_eur": "REAL",
+    "salary_transparency_status": "TEXT",
+    "source_department": "TEXT",
+    "repost_count": "INTEGER",
+}
+_JOB_TEXT_COLUMNS = {"job_id": "TEXT", "description": "TEXT"}
+_JOB_SIGHTING_COLUMNS = {"source": "TEXT", "source_job_id": "TEXT", "job_id": "TEXT", "last_seen_at": "TIMESTAMPTZ"}
+_JOB_SOURCE_COLUMNS = {
+    "job_id": "TEXT",
+    "source": "TEXT",
+    "source_job_id": "TEXT",
+    "source_url": "TEXT",
+    "first_seen_at": "TIMESTAMPTZ",
+    "last_seen_at": "TIMESTAMPTZ",
+    "created_at": "TIMESTAMPTZ",
+    "updated_at": "TIMESTAMPTZ",
+}
+
+# ON CONFLICT guard of the bulk jobs upsert: rows whose upsert would only move
+# last_seen_at are not rewritten (see _job_row_unchanged).
+_JOB_ROW_CHANGED_SQL = f"""
+    ({", ".join(f"jobs.{c}" for c in _JOB_OVERWRITTEN_COLUMNS)})
+        IS DISTINCT FROM ({", ".join(f"excluded.{c}" for c in _JOB_OVERWRITTEN_COLUMNS)})
+    OR ({", ".join(f"jobs.{c}" for c in _JOB_FILLED_COLUMNS)})
+        IS DISTINCT FROM ({", ".join(f"COALESCE(jobs.{c}, excluded.{c})" for c in _JOB_FILLED_COLUMNS)})
+    OR excluded.first_seen_at < jobs.first_seen_at
+"""
+
+
+def _jobs_upsert_sql(*, repost_known: bool) -> str:
+    # ON CONFLICT DO UPDATE only sees `excluded`, where a NULL repost_count has become
+    # 0, so rows with and without a repost_count go through separate statements.
+    insert_columns = [c for c in _JOB_UPSERT_COLUMNS if c != "repost_count"]
+    repost_set, repost_changed = "", ""
+    if repost_known:
+        repost_set = "is_repost = excluded.is_repost, repost_count = excluded.repost_count,"
+        repost_changed = (
+            "OR (jobs.is_repost, jobs.repost_count) IS DISTINCT FROM (excluded.is_repost, excluded.repost_count)"
+        )
+    return f"""
+        INSERT INTO jobs ({", ".join(insert_columns)}, is_repost, repost_count)
+        SELECT {", ".join(f"r.{c}" for c in insert_columns)},
+            COALESCE(r.repost_count, 0) > 0, COALESCE(r.repost_count, 0)
+        FROM {unnest_rows(_JOB_UPSERT_COLUMNS)}
+        ON CONFLICT (job_id) DO UPDATE SET
+            {repost_set}
+            source = COALESCE(jobs.source, excluded.source),
+            source_job_id = COALESCE(jobs.source_job_id, excluded.source_job_id),
+            source_url = COALESCE(jobs.source_url, excluded.source_url),
+            title = excluded.title,
+            company_name = excluded.company_name,
+            remote_source_flag = excluded.remote_source_flag,
+            remote_scope = excluded.remote_scope,
+            status = excluded.status,
+            remote_class = excluded.remote_class,
+            geo_class = excluded.geo_class,
+            company_id = COALESCE(jobs.company_id, excluded.company_id),
+            job_uid = excluded.job_uid,
+            job_fingerprint = excluded.job_fingerprint,
+            source_schema_hash = excluded.source_schema_hash,
+            policy_version = excluded.policy_version,
+            compliance_status = excluded.compliance_status,
+            compliance_score = excluded.compliance_score,
+            job_family = excluded.job_family,
+            job_role = excluded.job_role,
+            seniority = excluded.seniority,
+            specialization = excluded.specialization,
+            job_quality_score = excluded.job_quality_score,
+            salary_min = excluded.salary_min,
+            salary_max = excluded.salary_max,
+            salary_currency = excluded.salary_currency,
+            salary_period = excluded.salary_period,
+            salary_source = excluded.salary_source,
+            salary_min_eur = excluded.salary_min_eur,
+            salary_max_eur = excluded.salary_max_eur,
+            salary_transparency_status = excluded.salary_transparency_status,
+            source_department = excluded.source_department,
+            first_seen_at = CASE
+                WHEN excluded.first_seen_at < jobs.first_seen_at THEN excluded.first_seen_at
+                ELSE jobs.first_seen_at
+            END,
+            last_seen_at = excluded.last_seen_at
+        WHERE {_JOB_ROW_CHANGED_SQL} {repost_changed}
+    """
+
+
+_JOBS_UPSERT_STMTS = {known: text(_jobs_upsert_sql(repost_known=known)) for known in (True, False)}
+
+# Descriptions live in job_texts (1:1 with jobs); its search_vector follows by trigger.
+_JOB_TEXTS_UPSERT_STMT = text(f"""
+    INSERT INTO job_texts (job_id, description)
+    SELECT * FROM {unnest_rows(_JOB_TEXT_COLUMNS)}
+    ON CONFLICT (job_id) DO UPDATE SET description = excluded.description
+    WHERE job_texts.description IS DISTINCT FROM excluded.description
+""")
+
+_JOB_SIGHTINGS_UPSERT_STMT = text(f"""
+    INSERT INTO job_sightings (source, source_job_id, job_id, last_seen_at)
+    SELECT * FROM {unnest_rows(_JOB_SIGHTING_COLUMNS)}
+    ON CONFLICT (source, source_job_id) DO UPDATE SET
+        job_id = excluded.job_id,
+        last_seen_at = excluded.last_seen_at,
+        seen_count = job_sightings.seen_count + 1
+""")
+
+_JOB_SOURCES_UPSERT_STMT = text(f"""
+    INSERT INTO job_sources (job_id, source, source_job_id, source_url, first_seen_at, last_seen_at, created_at, updated_at)
+    SELECT * FROM {unnest_rows(_JOB_SOURCE_COLUMNS)}
+    ON CONFLICT (source, source_job_id) DO UPDATE SET
+        job_id = excluded.job_id,
+        source_url = excluded.source_url,
+        first_seen_at = CASE
+            WHEN excluded.first_seen_at < job_sources.first_seen_at THEN excluded.first_seen_at
+            ELSE job_sources.first_seen_at
+        END,
+        last_seen_at = excluded.last_seen_at,
+        seen_count = job_sources.seen_count + 1,
+        updated_at = excluded.updated_at
+""")
+
 
 def _build_get_jobs_query(
     status: str | None = None,
@@ -19,11 +222,15 @@ def _build_get_jobs_query(
     source: str | None = None,
     remote_scope: str | None = None,
     min_compliance_score: int | None = None,
-) -> tuple[str, dict, str]:
+    fuzzy: bool = False,
+    candidates: int = JOB_SEARCH_CANDIDATE_LIMIT,
+) -> tuple[list[str], dict, str]:
+    """Filter clauses (without the `q` match, see `_job_search_where`), params and ORDER BY."""
     clauses = []
     params = {}
     param_counter = 0
-    order_by_sql = "first_seen_at DESC"
+    # job_id breaks ties so the order is total (required by keyset pagination).
+    order_by_sql = "first_seen_at DESC, job_id DESC"
 
     if status == "visible":
         clauses.append("status IN ('new', 'active')")
@@ -58,11 +265,12 @@ def _build_get_jobs_query(
         params[f"p{param_counter}"] = remote_scope
 
     if q:
-        clauses.append("(title ILIKE :q_like OR company_name ILIKE :q_like)")
-        params["q_like"] = f"%{q}%"
-        params["q_exact"] = q
-        # Opis celowo omijamy w LEAST(). Dystans trigramowy dla długich tekstów jest bliski 1.0, co psuje ranking.
-        order_by_sql = "LEAST(title <-> :q_exact, company_name <-> :q_exact) ASC, first_seen_at DESC"
+        params.update(_job_search_params(q))
+        # Ranking pełnotekstowy (tytuł > firma > dział > opis), remisy rozstrzyga dystans trigramowy
+        # tytułu/firmy — opis celowo poza LEAST(), bo dla długich tekstów dystans jest bliski 1.0.
+        order_by_sql = f"{JOB_SEARCH_ORDER_BY}, first_seen_at DESC, job_id DESC"
+        if not fuzzy:
+            params["q_candidates"] = candidates
 
     if min_compliance_score is not None:
         param_counter += 1
@@ -73,11 +281,7 @@ def _build_get_jobs_query(
             clauses.append(f"compliance_score >= :p{param_counter}")
         params[f"p{param_counter}"] = int(min_compliance_score)
 
-    where_clause = ""
-    if clauses:
-        where_clause = "WHERE " + " AND ".join(clauses)
-
-    return where_clause, params, order_by_sql
+    return clauses, params, order_by_sql
 
 
 def get_jobs(
@@ -91,10 +295,35 @@ def get_jobs(
     limit: int = 20,
     offset: int = 0,
 ) -> list[dict]:
-    where_clause, params, order_by_sql = _build_get_jobs_query(
-        status, q, company, title, source, remote_scope, min_compliance_score
-    )
+    engine = get_read_engine()
+    with engine.connect() as conn:
+        for fuzzy in _job_search_passes(q, offset):
+            filters, params, order_by_sql = _build_get_jobs_query(
+                status,
+                q,
+                company,
+                title,
+                source,
+                remote_scope,
+                min_compliance_score,
+                fuzzy=fuzzy,
+                candidates=_job_search_candidate_limit(limit, offset),
+            )
+            rows = _select_jobs(
+                conn,
+                _job_search_where(filters, q, fuzzy=fuzzy, limit_sql=":q_candidates"),
+                params,
+                order_by_sql,
+                limit=limit,
+                offset=offset,
+            )
+            if rows:
+                break
+
+    return [dict(row) for row in rows]
 
+
+def _select_jobs(conn: Connection, where_clause: str, params: dict, order_by_sql: str, *, limit: int, offset: int):
     query = f"""
         SELECT
             job_id,
@@ -105,8 +334,8 @@ def get_jobs(
             remote_scope,
             status,
             first_seen_at,
-            last_seen_at,
-            description,
+            {JOB_LAST_SEEN_SQL.format(t="jobs")} AS last_seen_at,
+            {JOB_DESCRIPTION_SQL} AS description,
             source_department,
             job_family,
             salary_min,
@@ -121,14 +350,7 @@ def get_jobs(
         LIMIT :limit OFFSET :offset
     """
 
-    params["limit"] = limit
-    params["offset"] = offset
-
-    engine = get_engine()
-    with engine.connect() as conn:
-        rows = conn.execute(text(query), params).mappings().all()
-
-    return [dict(row) for row in rows]
+    return conn.execute(text(query), {**params, "limit": limit, "offset": offset}).mappings().all()
 
 
 def get_jobs_paginated(
@@ -141,42 +363,69 @@ def get_jobs_paginated(
     min_compliance_score: int | None = None,
     limit: int = 20,
     offset: int = 0,
+    after: tuple[datetime, str] | None = None,
 ) -> tuple[list[dict], int]:
-    where_clause, params, order_by_sql = _build_get_jobs_query(
-        status, q, company, title, source, remote_scope, min_compliance_score
-    )
-
-    query = f"""
-        SELECT
-            job_id,
-            source,
-            source_url,
-            title,
-            company_name,
-            remote_scope,
-            status,
-            first_seen_at,
-            last_seen_at
-        FROM jobs
-        {where_clause}
-        ORDER BY {order_by_sql}
-        LIMIT :limit OFFSET :offset
     """
+    Paginated job listing. `after` = (first_seen_at, job_id) of the last row of the
+    previous page switches to keyset pagination (default ordering only, no `q`);
+    `total` covers the full filtered set and is a `RowCount` (large sets are estimated,
+    see `storage.count_strategy`).
+    """
+    if after is not None and q:
+        raise ValueError("keyset pagination is not supported with q")
 
-    if not where_clause:
-        total_query = "SELECT GREATEST(0, CAST(reltuples AS BIGINT)) AS total FROM pg_class c JOIN pg_namespace n ON c.relnamespace = n.oid WHERE n.nspname = 'public' AND c.relname = 'jobs'"
-    else:
-        total_query = f"SELECT COUNT(*) AS total FROM jobs {where_clause}"
-
-    params["limit"] = limit
-    params["offset"] = offset
-
-    engine = get_engine()
+    engine = get_read_engine()
     with engine.connect() as conn:
-        rows = conn.execute(text(query), params).mappings().all()
-        total_row = conn.execute(text(total_query), params).fetchone()
+        for fuzzy in _job_search_passes(q, offset):
+            filters, params, order_by_sql = _build_get_jobs_query(
+                status,
+                q,
+                company,
+                title,
+                source,
+                remote_scope,
+                min_compliance_score,
+                fuzzy=fuzzy,
+                candidates=_job_search_candidate_limit(limit, offset),
+            )
+            count_params = {key: value for key, value in params.items() if key != "q_candidates"}
+            where_clause = _job_search_where(filters, q, fuzzy=fuzzy)
+            page_where_clause = _job_search_where(filters, q, fuzzy=fuzzy, limit_sql=":q_candidates")
+            if after is not None:
+                keyset = "(first_seen_at, job_id) < (:after_first_seen_at, :after_job_id)"
+                page_where_clause = f"{where_clause} AND {keyset}" if where_clause else f"WHERE {keyset}"
+                params["after_first_seen_at"], params["after_job_id"] = after
+
+            query = f"""
+                SELECT
+                    job_id,
+                    source,
+                    source_url,
+                    title,
+                    company_name,
+                    remote_scope,
+                    status,
+                    first_seen_at,
+                    {JOB_LAST_SEEN_SQL.format(t="jobs")} AS last_seen_at
+                FROM jobs
+                {page_where_clause}
+                ORDER BY {order_by_sql}
+                LIMIT :limit OFFSET :offset
+            """
+            rows = conn.execute(text(query), {**params, "limit": limit, "offset": offset}).mappings().all()
+            if rows:
+                break
+
+        total = count_rows(
+            conn,
+            "jobs",
+            where_clause,
+            count_params,
+            probe_where_clause=_job_search_where(
+                filters, q, fuzzy=fuzzy, limit_sql=":_count_probe_limit", ordered=False
+            ),
+        )
 
-    total = int(total_row[0]) if total_row else 0
     return [dict(row) for row in rows], total
 
 
@@ -204,6 +453,50 @@ def update_job_department_and_taxonomy_bulk(conn: Connection, updates: list[dict
     return result.rowcount
 
 
+def get_jobs_missing_taxonomy(conn: Connection, limit: int) -> list[dict]:
+    """
+    Fetches jobs whose taxonomy was never persisted (job_family IS NULL),
+    e.g. rows ingested before classification was wired into ingestion.
+    """
+    rows = (
+        conn.execute(
+            text("""
+                SELECT job_id, title, source_department, job_role, seniority, specialization
+                FROM jobs
+                WHERE job_family IS NULL
+                ORDER BY job_id
+                LIMIT :limit
+            """),
+            {"limit": limit},
+        )
+        .mappings()
+        .all()
+    )
+    return [dict(row) for row in rows]
+
+
+def update_job_taxonomy_bulk(conn: Connection, updates: list[dict]) -> int:
+    """
+    Persists derived taxonomy for jobs that still have no job_family.
+    The guard keeps concurrent ingestion writes authoritative.
+    Returns the total number of rows updated.
+    """
+    if not updates:
+        return 0
+
+    stmt = text("""
+        UPDATE jobs
+        SET job_family = :job_family,
+            job_role = :job_role,
+            seniority = :seniority,
+            specialization = :specialization
+        WHERE job_id = :job_id
+          AND job_family IS NULL
+    """)
+    result = conn.execute(stmt, updates)
+    return result.rowcount
+
+
 def _find_job_id_by_source_mapping(conn: Connection, *, source: str, source_job_id: str) -> str | None:
     row = conn.execute(
         text("""
@@ -444,7 +737,6 @@ def _upsert_job_in_conn(
                 source_url,
                 title,
                 company_name,
-                description,
                 remote_source_flag,
                 remote_scope,
                 status,
@@ -481,7 +773,6 @@ def _upsert_job_in_conn(
                 :source_url,
                 :title,
                 :company_name,
-                :description,
                 :remote_source_flag,
                 :remote_scope,
                 :status,
@@ -517,7 +808,6 @@ def _upsert_job_in_conn(
                 source_url = COALESCE(jobs.source_url, excluded.source_url),
                 title = excluded.title,
                 company_name = excluded.company_name,
-                description = excluded.description,
                 remote_source_flag = excluded.remote_source_flag,
                 remote_scope = excluded.remote_scope,
                 status = excluded.status,
@@ -558,7 +848,6 @@ def _upsert_job_in_conn(
             "source_url": resolved_source_url,
             "title": job["title"],
             "company_name": job["company_name"],
-            "description": job["description"],
             "remote_source_flag": bool(job["remote_source_flag"]),
             "remote_scope": job["remote_scope"],
             "status": job["status"],
@@ -589,6 +878,12 @@ def _upsert_job_in_conn(
             "source_department": str(job.get("department"))[:255] if job.get("department") else None,
         },
     )
+    execute_unnest(
+        conn,
+        _JOB_TEXTS_UPSERT_STMT,
+        [{"job_id": canonical_job_id, "description": job["description"]}],
+        _JOB_TEXT_COLUMNS,
+    )
 
     _upsert_job_source_mapping_in_conn(
         conn,
@@ -617,16 +912,134 @@ def upsert_job(job: dict, conn: Connection | None = None, *, company_id: str | N
     )
 
 
+def _count_prior_postings(conn: Connection, candidates: list[dict]) -> dict[str, int]:
+    """
+    Number of earlier jobs sharing each candidate's repost key (fingerprint,
+    company, title) last seen within REPOST_WINDOW_DAYS before the candidate was
+    first seen. One query per batch, served by idx_jobs_repost_lookup.
+    """
+    if not candidates:
+        return {}
+    prev_last_seen = JOB_LAST_SEEN_SQL.format(t="prev")
+    rows = conn.execute(
+        text(f"""
+            SELECT n.job_id, COUNT(prev.job_id) AS prior_count
+            FROM unnest(
+                CAST(:job_ids AS TEXT[]),
+                CAST(:fingerprints AS TEXT[]),
+                CAST(:company_names AS TEXT[]),
+                CAST(:titles AS TEXT[]),
+                CAST(:first_seen AS TIMESTAMPTZ[])
+            ) AS n(job_id, job_fingerprint, company_name, title, first_seen_at)
+            JOIN jobs prev
+              ON prev.job_fingerprint = n.job_fingerprint
+             AND prev.company_name = n.company_name
+             AND prev.title = n.title
+             AND prev.job_id <> n.job_id
+             AND {prev_last_seen} < n.first_seen_at
+             AND {prev_last_seen} > n.first_seen_at - (:days_threshold * INTERVAL '1 day')
+            GROUP BY n.job_id
+        """),
+        {
+            "job_ids": [c["job_id"] for c in candidates],
+            "fingerprints": [c["job_fingerprint"] for c in candidates],
+            "company_names": [c["company_name"] for c in candidates],
+            "titles": [c["title"] for c in candidates],
+            "first_seen": [c["first_seen_at"] for c in candidates],
+            "days_threshold": REPOST_WINDOW_DAYS,
+        },
+    )
+    counts = {c["job_id"]: 0 for c in candidates}
+    counts.update({str(row[0]): int(row[1]) for row in rows})
+    return counts
+
+
+def _as_aware_datetime(value) -> datetime | None:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime) or value.tzinfo is None:
+        return None
+    return value
+
+
+def _job_row_unchanged(existing: dict, row: dict) -> bool:
+    """
+    True when the bulk jobs upsert of `row` would only move last_seen_at (the
+    Python side of _JOB_ROW_CHANGED_SQL). An active job re-sighted as 'new'
+    counts as unchanged: the lifecycle pass would only activate it again.
+    """
+    first_seen_at = _as_aware_datetime(row["first_seen_at"])
+    if first_seen_at is None or first_seen_at < existing["first_seen_at"]:
+        return False
+    if row["repost_count"] is not None and (existing["is_repost"], existing["repost_count"]) != (
+        row["repost_count"] > 0,
+        row["repost_count"],
+    ):
+        return False
+    for column in _JOB_OVERWRITTEN_COLUMNS:
+        if existing[column] != row[column] and (column, existing[column], row[column]) != ("status", "active", "new"):
+            return False
+    return not any(existing[column] is None and row[column] is not None for column in _JOB_FILLED_COLUMNS)
+
+
+def _description_md5(description: str | None) -> str | None:
+    return hashlib.md5(description.encode("utf-8")).hexdigest() if description is not None else None
+
+
+def _find_unchanged_source_mappings(conn: Connection, prepared: list[dict], positions: list[int]) -> set[int]:
+    """
+    Those of `positions` whose job_sources row already maps the same source job to
+    the same canonical job and URL, so upserting it would only count a sighting
+    (0–1 query).
+    """
+    if not positions:
+        return set()
+    rows = conn.execute(
+        text("""
+            SELECT js.source, js.source_job_id, js.job_id, js.source_url, js.first_seen_at
+            FROM unnest(CAST(:sources AS TEXT[]), CAST(:source_job_ids AS TEXT[])) AS k(source, source_job_id)
+            JOIN job_sources js ON js.source = k.source AND js.source_job_id = k.source_job_id
+        """),
+        {
+            "sources": [prepared[i]["resolved_source"] for i in positions],
+            "source_job_ids": [prepared[i]["resolved_source_job_id"] for i in positions],
+        },
+    ).mappings()
+    mappings = {(row["source"], row["source_job_id"]): row for row in rows}
+
+    unchanged = set()
+    for i in positions:
+        p = prepared[i]
+        mapping = mappings.get((p["resolved_source"], p["resolved_source_job_id"]))
+        first_seen_at = _as_aware_datetime(p["first_seen_at"])
+        if (
+            mapping is not None
+            and mapping["job_id"] == p["canonical_job_id"]
+            and mapping["source_url"] == p["resolved_source_url"]
+            and first_seen_at is not None
+            and first_seen_at >= mapping["first_seen_at"]
+        ):
+            unchanged.add(i)
+    return unchanged
+
+
 def bulk_upsert_jobs(
     jobs: list[dict],
     conn: Connection,
     *,
     company_id: str | None = None,
     source: str | None = None,
+    write_counts: dict[str, int] | None = None,
 ) -> list[str]:
     """
     Bulk version of upsert_job. Returns canonical job IDs in same order as input.
     Reduces round-trips from 5–6 per job to ~7 total for any batch size.
+    Jobs that come back unchanged are only recorded in job_sightings. When given,
+    `write_counts` accumulates the batch's jobs rows inserted, materially updated
+    and only touched (seen again).
     """
     if not jobs:
         return []
@@ -735,15 +1148,16 @@ def bulk_upsert_jobs(
     # --- Phase 5: Batch fetch existing job states for snapshot comparison (1 query) ---
     all_canonical_ids = list({p["canonical_job_id"] for p in prepared})
     existing_jobs: dict[str, dict] = {}
-    existing_stmt = text("""
-        SELECT job_id, job_fingerprint, title, company_name,
-               salary_min, salary_max, salary_currency, remote_class, geo_class
+    existing_stmt = text(f"""
+        SELECT job_id, first_seen_at, {", ".join(_JOB_OVERWRITTEN_COLUMNS)},
+               source, source_job_id, source_url, CAST(company_id AS TEXT) AS company_id, is_repost, repost_count,
+               (SELECT md5(jt.description) FROM job_texts jt WHERE jt.job_id = jobs.job_id) AS description_md5
         FROM jobs WHERE job_id IN :ids
     """).bindparams(bindparam("ids", expanding=True))
     for row in conn.execute(existing_stmt, {"ids": all_canonical_ids}).mappings():
         existing_jobs[str(row["job_id"])] = dict(row)
 
-    # --- Phase 6: Batch snapshot insert (0–1 query) ---
+    # --- Phase 6: Batch delta-encoded snapshot insert (0–2 queries) ---
     snapshots_to_insert = []
     for p in prepared:
         existing = existing_jobs.get(p["canonical_job_id"])
@@ -775,19 +1189,29 @@ def bulk_upsert_jobs(
             )
 
     if snapshots_to_insert:
-        snap_stmt = text("""
-            INSERT INTO job_snapshots (
-                job_id, job_fingerprint, title, company_name,
-                salary_min, salary_max, salary_currency, remote_class, geo_class, captured_at
-            ) VALUES (
-                :job_id, :job_fingerprint, :title, :company_name,
-                :salary_min, :salary_max, :salary_currency, :remote_class, :geo_class, NOW()
-            )
-        """)
-        conn.execute(snap_stmt, snapshots_to_insert)
+        insert_job_snapshots(conn, snapshots_to_insert)
         logger.debug("bulk_snapshots_created", extra={"count": len(snapshots_to_insert)})
 
-    # --- Phase 7: Batch jobs upsert (1 query via executemany) ---
+    # --- Phase 6b: Repost detection for new or re-keyed jobs (0–1 query) ---
+    # Jobs whose (fingerprint, company, title) key is unchanged keep their flags;
+    # the lifecycle pass only reconciles already-flagged rows.
+    repost_candidates: dict[str, dict] = {}
+    for p in prepared:
+        job = p["job"]
+        existing = existing_jobs.get(p["canonical_job_id"])
+        key = (p["job_fingerprint"], job.get("company_name"), job.get("title"))
+        if existing and key == (existing["job_fingerprint"], existing["company_name"], existing["title"]):
+            continue
+        repost_candidates[p["canonical_job_id"]] = {
+            "job_id": p["canonical_job_id"],
+            "job_fingerprint": key[0],
+            "company_name": key[1],
+            "title": key[2],
+            "first_seen_at": p["first_seen_at"],
+        }
+    repost_counts = _count_prior_postings(conn, list(repost_candidates.values()))
+
+    # --- Phase 7: Batch jobs upsert for new or materially changed jobs (0–2 queries via unnest) ---
     job_rows = []
     for p in prepared:
         job = p["job"]
@@ -799,7 +1223,6 @@ def bulk_upsert_jobs(
                 "source_url": p["resolved_source_url"],
                 "title": job["title"],
                 "company_name": job["company_name"],
-                "description": job["description"],
                 "remote_source_flag": bool(job["remote_source_flag"]),
                 "remote_scope": job["remote_scope"],
                 "status": job["status"],
@@ -828,101 +1251,153 @@ def bulk_upsert_jobs(
                 "salary_max_eur": int(job["salary_max_eur"]) if job.get("salary_max_eur") is not None else None,
                 "salary_transparency_status": job.get("salary_transparency_status"),
                 "source_department": str(job.get("department"))[:255] if job.get("department") else None,
+                # None leaves an existing row's repost flags untouched.
+                "repost_count": repost_counts.get(p["canonical_job_id"]),
             }
         )
 
-    jobs_upsert_stmt = text("""
-        INSERT INTO jobs (
-            job_id, source, source_job_id, source_url, title, company_name, description,
-            remote_source_flag, remote_scope, status, first_seen_at, last_seen_at,
-            remote_class, geo_class, company_id, job_uid, job_fingerprint, source_schema_hash,
-            policy_version, compliance_status, compliance_score, job_family, job_role,
-            seniority, specialization, job_quality_score, salary_min, salary_max,
-            salary_currency, salary_period, salary_source, salary_min_eur, salary_max_eur,
-            salary_transparency_status, source_department
-        ) VALUES (
-            :job_id, :source, :source_job_id, :source_url, :title, :company_name, :description,
-            :remote_source_flag, :remote_scope, :status, :first_seen_at, :last_seen_at,
-            :remote_class, :geo_class, :company_id, :job_uid, :job_fingerprint, :source_schema_hash,
-            :policy_version, :compliance_status, :compliance_score, :job_family, :job_role,
-            :seniority, :specialization, :job_quality_score, :salary_min, :salary_max,
-            :salary_currency, :salary_period, :salary_source, :salary_min_eur, :salary_max_eur,
-            :salary_transparency_status, :source_department
+    # Existing jobs whose upsert would only move last_seen_at are not rewritten; their
+    # sighting is recorded in Phase 7a instead.
+    upsert_positions = [
+        i
+        for i, (p, row) in enumerate(zip(prepared, job_rows))
+        if p["canonical_job_id"] not in existing_jobs
+        or not _job_row_unchanged(existing_jobs[p["canonical_job_id"]], row)
+    ]
+    inserted = len({prepared[i]["canonical_job_id"] for i in upsert_positions} - existing_jobs.keys())
+
+    upsert_rows = [job_rows[i] for i in upsert_positions]
+    written = 0
+    for repost_known, stmt in _JOBS_UPSERT_STMTS.items():
+        rows = [row for row in upsert_rows if (row["repost_count"] is not None) == repost_known]
+        if rows:
+            written += execute_unnest(conn, stmt, rows, _JOB_UPSERT_COLUMNS, key=("job_id",))
+    updated = max(written - inserted, 0)
+
+    # --- Phase 7a: Sightings of unchanged source mappings (0–3 queries) ---
+    # A still-listed posting whose mapping is as stored only upserts its job_sightings
+    # row; fold_job_sightings moves it into job_sources and jobs.last_seen_at later.
+    # An unchanged job seen through a changed mapping gets a bare last_seen_at update.
+    upserted = set(upsert_positions)
+    sighted = _find_unchanged_source_mappings(
+        conn, prepared, [i for i, p in enumerate(prepared) if p["canonical_job_id"] in existing_jobs]
+    )
+    if sighted:
+        execute_unnest(
+            conn,
+            _JOB_SIGHTINGS_UPSERT_STMT,
+            [
+                {
+                    "source": prepared[i]["resolved_source"],
+                    "source_job_id": prepared[i]["resolved_source_job_id"],
+                    "job_id": prepared[i]["canonical_job_id"],
+                    "last_seen_at": now,
+                }
+                for i in sorted(sighted)
+            ],
+            _JOB_SIGHTING_COLUMNS,
+            key=("source", "source_job_id"),
+        )
+    touched_ids = sorted(
+        {prepared[i]["canonical_job_id"] for i in range(len(prepared)) if i not in upserted and i not in sighted}
+    )
+    if touched_ids:
+        conn.execute(
+            text(
+                "UPDATE jobs SET last_seen_at = :now WHERE job_id = ANY(CAST(:job_ids AS TEXT[])) AND last_seen_at < :now"
+            ),
+            {"now": now, "job_ids": touched_ids},
         )
-        ON CONFLICT (job_id) DO UPDATE SET
-            source = COALESCE(jobs.source, excluded.source),
-            source_job_id = COALESCE(jobs.source_job_id, excluded.source_job_id),
-            source_url = COALESCE(jobs.source_url, excluded.source_url),
-            title = excluded.title,
-            company_name = excluded.company_name,
-            description = excluded.description,
-            remote_source_flag = excluded.remote_source_flag,
-            remote_scope = excluded.remote_scope,
-            status = excluded.status,
-            remote_class = excluded.remote_class,
-            geo_class = excluded.geo_class,
-            company_id = COALESCE(jobs.company_id, excluded.company_id),
-            job_uid = excluded.job_uid,
-            job_fingerprint = excluded.job_fingerprint,
-            source_schema_hash = excluded.source_schema_hash,
-            policy_version = excluded.policy_version,
-            compliance_status = excluded.compliance_status,
-            compliance_score = excluded.compliance_score,
-            job_family = excluded.job_family,
-            job_role = excluded.job_role,
-            seniority = excluded.seniority,
-            specialization = excluded.specialization,
-            job_quality_score = excluded.job_quality_score,
-            salary_min = excluded.salary_min,
-            salary_max = excluded.salary_max,
-            salary_currency = excluded.salary_currency,
-            salary_period = excluded.salary_period,
-            salary_source = excluded.salary_source,
-            salary_min_eur = excluded.salary_min_eur,
-            salary_max_eur = excluded.salary_max_eur,
-            salary_transparency_status = excluded.salary_transparency_status,
-            source_department = excluded.source_department,
-            first_seen_at = CASE
-                WHEN excluded.first_seen_at < jobs.first_seen_at THEN excluded.first_seen_at
-                ELSE jobs.first_seen_at
-            END,
-            last_seen_at = excluded.last_seen_at
-    """)
-    conn.execute(jobs_upsert_stmt, job_rows)
 
-    # --- Phase 8: Batch job_sources upsert (1 query via executemany) ---
+    # --- Phase 7b: Batch job_texts upsert for new or changed descriptions (0–1 query via unnest) ---
+    # Rows exist already (created by the jobs insert trigger); the WHERE also skips rewrites.
+    text_rows = [
+        {"job_id": p["canonical_job_id"], "description": p["job"].get("description")}
+        for p in prepared
+        if p["canonical_job_id"] not in existing_jobs
+        or _description_md5(p["job"].get("description")) != existing_jobs[p["canonical_job_id"]]["description_md5"]
+    ]
+    if text_rows:
+        execute_unnest(conn, _JOB_TEXTS_UPSERT_STMT, text_rows, _JOB_TEXT_COLUMNS, key=("job_id",))
+
+    # --- Phase 8: Batch job_sources upsert (0–1 query via unnest) ---
     source_rows = [
         {
-            "job_id": p["canonical_job_id"],
-            "source": p["resolved_source"],
-            "source_job_id": p["resolved_source_job_id"],
-            "source_url": p["resolved_source_url"],
-            "first_seen_at": p["first_seen_at"],
+            "job_id": prepared[i]["canonical_job_id"],
+            "source": prepared[i]["resolved_source"],
+            "source_job_id": prepared[i]["resolved_source_job_id"],
+            "source_url": prepared[i]["resolved_source_url"],
+            "first_seen_at": prepared[i]["first_seen_at"],
             "last_seen_at": now,
             "created_at": now,
             "updated_at": now,
         }
-        for p in prepared
+        for i in range(len(prepared))
+        if i not in sighted
     ]
-    src_upsert_stmt = text("""
-        INSERT INTO job_sources (
-            job_id, source, source_job_id, source_url,
-            first_seen_at, last_seen_at, created_at, updated_at
-        ) VALUES (
-            :job_id, :source, :source_job_id, :source_url,
-            :first_seen_at, :last_seen_at, :created_at, :updated_at
+    if source_rows:
+        execute_unnest(
+            conn, _JOB_SOURCES_UPSERT_STMT, source_rows, _JOB_SOURCE_COLUMNS, key=("source", "source_job_id")
         )
-        ON CONFLICT (source, source_job_id) DO UPDATE SET
-            job_id = excluded.job_id,
-            source_url = excluded.source_url,
-            first_seen_at = CASE
-                WHEN excluded.first_seen_at < job_sources.first_seen_at THEN excluded.first_seen_at
-                ELSE job_sources.first_seen_at
-            END,
-            last_seen_at = excluded.last_seen_at,
-            seen_count = job_sources.seen_count + 1,
-            updated_at = excluded.updated_at
-    """)
-    conn.execute(src_upsert_stmt, source_rows)
+
+    # --- Phase 9: Near-duplicate signatures for new or re-fingerprinted jobs (0–3 queries) ---
+    # Existing jobs with an unchanged fingerprint keep their signature, so the common
+    # "still listed" case costs no shingling at all.
+    signature_jobs: dict[str, dict] = {}
+    for p in prepared:
+        existing = existing_jobs.get(p["canonical_job_id"])
+        if existing and existing["job_fingerprint"] == p["job_fingerprint"]:
+            continue
+        signature_jobs[p["canonical_job_id"]] = {
+            "job_id": p["canonical_job_id"],
+            "job_fingerprint": p["job_fingerprint"],
+            "title": p["job"].get("title"),
+            "description": p["job"].get("description"),
+        }
+    if signature_jobs:
+        sync_job_signatures(conn, list(signature_jobs.values()))
+
+    counts = {"inserted": inserted, "updated": updated, "touched": len(prepared) - inserted - updated}
+    logger.debug("bulk_jobs_written", extra=counts)
+    if write_counts is not None:
+        for key, value in counts.items():
+            write_counts[key] = write_counts.get(key, 0) + value
 
     return [p["canonical_job_id"] for p in prepared]
+
+
+def fold_job_sightings(conn: Connection, *, fold_after_hours: int) -> int:
+    """
+    Moves pending job_sightings into job_sources (last_seen_at, seen_count) and
+    jobs.last_seen_at for jobs whose stored last_seen_at is at least
+    `fold_after_hours` old, so each still-listed job is rewritten at most once per
+    that window. A sighting upserted concurrently is either folded with its new
+    count or recorded again after the fold. Returns the number of sightings folded.
+    """
+    return conn.execute(
+        text("""
+            WITH folded AS (
+                DELETE FROM job_sightings s
+                USING jobs j
+                WHERE j.job_id = s.job_id
+                  AND j.last_seen_at <= NOW() - (:fold_after_hours * INTERVAL '1 hour')
+                RETURNING s.source, s.source_job_id, s.job_id, s.last_seen_at, s.seen_count
+            ),
+            sources AS (
+                UPDATE job_sources js
+                SET last_seen_at = GREATEST(js.last_seen_at, f.last_seen_at),
+                    seen_count = js.seen_count + f.seen_count,
+                    updated_at = NOW()
+                FROM folded f
+                WHERE js.source = f.source AND js.source_job_id = f.source_job_id
+            ),
+            jobs_folded AS (
+                UPDATE jobs j
+                SET last_seen_at = GREATEST(j.last_seen_at, f.last_seen_at)
+                FROM (SELECT job_id, MAX(last_seen_at) AS last_seen_at FROM folded GROUP BY job_id) f
+                WHERE j.job_id = f.job_id
+            )
+            SELECT COUNT(*) FROM folded
+        """),
+        {"fold_after_hours": int(fold_after_hours)},
+    ).scalar_one()
@@ -1,192 +1,197 @@
-from sqlalchemy import text
-from storage.db_engine import get_engine
+from sqlalchemy import bindparam, text
+from storage.common import JOB_LAST_SEEN_SQL, REPOST_WINDOW_DAYS
+from storage.db_engine import engine_getter
 
+get_engine = engine_getter("maintenance")
 
-def expire_jobs_due_to_lifecycle() -> int:
+
+# Lifecycle transitions in priority order (expire first) and the status each one sets.
+LIFECYCLE_TRANSITIONS = {
+    "expire": "expired",
+    "stale": "stale",
+    "activate": "active",
+    "reactivate": "active",
+}
+
+# Next transition for a job row aliased `{t}`; NULL when the job stays as it is.
+# One CASE keeps the former sequential semantics: a job that expires is never
+# also staled/activated, and activation (new -> active) runs after staling, so a
+# freshly activated job is not staled in the same run.
+_TRANSITION_SQL = """
+    CASE
+        WHEN {t}.status <> 'expired' AND (
+            {t}.verification_failures >= 3
+            OR {t}.availability_status = 'expired'
+            OR {t}.last_verified_at < NOW() - INTERVAL '30 days'
+        ) THEN 'expire'
+        WHEN {t}.status = 'active' AND {t}.last_verified_at < NOW() - INTERVAL '7 days' THEN 'stale'
+        WHEN {t}.status = 'new' AND {t}.first_seen_at < NOW() - INTERVAL '24 hours' THEN 'activate'
+        WHEN {t}.status = 'stale'
+            AND {t}.availability_status = 'active'
+            AND {t}.last_verified_at >= NOW() - INTERVAL '7 days' THEN 'reactivate'
+    END
+"""
+
+# Superset of the rows _TRANSITION_SQL can move, one arm per partial index
+# (see migration b4d0f6a8c9e1) so the candidates are read in a single bitmap scan.
+_CANDIDATES_SQL = """
+    (j.status <> 'expired' AND (j.verification_failures >= 3 OR j.availability_status = 'expired'))
+    OR (j.status IN ('active', 'stale') AND j.last_verified_at < NOW() - INTERVAL '7 days')
+    OR (j.status = 'stale' AND j.availability_status = 'active' AND j.last_verified_at >= NOW() - INTERVAL '7 days')
+    OR j.status = 'new'
+"""
+
+
+def apply_lifecycle_transitions(
+    transitions: tuple[str, ...] | None = None,
+    *,
+    batch_size: int = 1000,
+) -> dict[str, int]:
     """
-    Expire jobs that have too many verification failures or are too old.
+    Single-pass lifecycle state machine: computes every job's next transition
+    (expire, stale, activate, reactivate) in one scan, then applies the status
+    changes in batches of `batch_size`, expire batches first. Each batch re-checks
+    the transition under FOR UPDATE SKIP LOCKED, so rows changed or locked by a
+    concurrent writer since the scan are left for the next run.
 
-    This corresponds to EXPIRE_AFTER_DAYS and MAX_FAILURES settings.
-    Returns the number of affected rows.
+    `transitions` limits the run to a subset. Returns rows changed per transition.
     """
+    selected = tuple(transitions or LIFECYCLE_TRANSITIONS)
+    counts = {name: 0 for name in selected}
     engine = get_engine()
-    batch_size = 1000
-    total_updated = 0
-    while True:
+
+    with engine.connect() as conn:
+        candidates = conn.execute(
+            text(f"""
+                SELECT job_id, transition
+                FROM (
+                    SELECT j.job_id, {_TRANSITION_SQL.format(t="j")} AS transition
+                    FROM jobs j
+                    WHERE {_CANDIDATES_SQL}
+                ) c
+                WHERE transition IN :transitions
+                ORDER BY array_position(CAST(:priority AS TEXT[]), transition), job_id
+            """).bindparams(bindparam("transitions", expanding=True)),
+            {"transitions": list(selected), "priority": list(LIFECYCLE_TRANSITIONS)},
+        ).all()
+
+    apply_stmt = text(f"""
+        WITH batch AS (
+            SELECT job_id, transition, to_status
+            FROM unnest(
+                CAST(:job_ids AS TEXT[]),
+                CAST(:transitions AS TEXT[]),
+                CAST(:to_statuses AS TEXT[])
+            ) AS b(job_id, transition, to_status)
+        ),
+        locked AS (
+            SELECT j.job_id, batch.transition, batch.to_status
+            FROM jobs j
+            JOIN batch ON batch.job_id = j.job_id
+            WHERE {_TRANSITION_SQL.format(t="j")} = batch.transition
+            FOR UPDATE OF j SKIP LOCKED
+        )
+        UPDATE jobs
+        SET status = locked.to_status,
+            updated_at = NOW()
+        FROM locked
+        WHERE jobs.job_id = locked.job_id
+        RETURNING locked.transition
+    """)
+
+    for offset in range(0, len(candidates), batch_size):
+        batch = candidates[offset : offset + batch_size]
         with engine.begin() as conn:
-            result = conn.execute(
-                text("""
-                    WITH target_jobs AS (
-                        SELECT job_id
-                        FROM jobs
-                        WHERE status != 'expired'
-                        AND (
-                            verification_failures >= 3
-                            OR availability_status = 'expired'
-                            OR (last_verified_at IS NOT NULL AND last_verified_at < NOW() - INTERVAL '30 days')
-                        )
-                        LIMIT :batch_size
-                        FOR UPDATE SKIP LOCKED
-                    )
-                    UPDATE jobs
-                    SET status = 'expired',
-                        updated_at = NOW()
-                    FROM target_jobs
-                    WHERE jobs.job_id = target_jobs.job_id
-                """),
-                {"batch_size": batch_size},
-            )
-            total_updated += result.rowcount
-            if result.rowcount == 0:
-                break
-    return total_updated
+            applied = conn.execute(
+                apply_stmt,
+                {
+                    "job_ids": [row.job_id for row in batch],
+                    "transitions": [row.transition for row in batch],
+                    "to_statuses": [LIFECYCLE_TRANSITIONS[row.transition] for row in batch],
+                },
+            ).scalars()
+            for transition in applied:
+                counts[transition] += 1
+    return counts
+
+
+def expire_jobs_due_to_lifecycle() -> int:
+    """
+    Expire jobs that have too many verification failures or are too old.
+    Returns the number of affected rows.
+    """
+    return apply_lifecycle_transitions(("expire",))["expire"]
 
 
 def stale_active_jobs_due_to_lifecycle() -> int:
     """
     Transition active jobs to stale if they haven't been verified recently.
-
-    This corresponds to STALE_AFTER_DAYS setting.
     Returns the number of affected rows.
     """
-    engine = get_engine()
-    batch_size = 1000
-    total_updated = 0
-    while True:
-        with engine.begin() as conn:
-            result = conn.execute(
-                text("""
-                    WITH target_jobs AS (
-                        SELECT job_id
-                        FROM jobs
-                        WHERE status = 'active'
-                        AND last_verified_at IS NOT NULL
-                        AND last_verified_at < NOW() - INTERVAL '7 days'
-                        LIMIT :batch_size
-                        FOR UPDATE SKIP LOCKED
-                    )
-                    UPDATE jobs
-                    SET status = 'stale',
-                        updated_at = NOW()
-                    FROM target_jobs
-                    WHERE jobs.job_id = target_jobs.job_id
-                """),
-                {"batch_size": batch_size},
-            )
-            total_updated += result.rowcount
-            if result.rowcount == 0:
-                break
-    return total_updated
+    return apply_lifecycle_transitions(("stale",))["stale"]
 
 
 def activate_new_jobs_due_to_lifecycle() -> int:
     """
     Transition new jobs to active after a certain period.
-
-    This corresponds to NEW_AFTER_HOURS setting.
     Returns the number of affected rows.
     """
-    engine = get_engine()
-    batch_size = 1000
-    total_updated = 0
-    while True:
-        with engine.begin() as conn:
-            result = conn.execute(
-                text("""
-                    WITH target_jobs AS (
-                        SELECT job_id
-                        FROM jobs
-                        WHERE status = 'new'
-                        AND first_seen_at < NOW() - INTERVAL '24 hours'
-                        LIMIT :batch_size
-                        FOR UPDATE SKIP LOCKED
-                    )
-                    UPDATE jobs
-                    SET status = 'active',
-                        updated_at = NOW()
-                    FROM target_jobs
-                    WHERE jobs.job_id = target_jobs.job_id
-                """),
-                {"batch_size": batch_size},
-            )
-            total_updated += result.rowcount
-            if result.rowcount == 0:
-                break
-    return total_updated
+    return apply_lifecycle_transitions(("activate",))["activate"]
 
 
 def reactivate_stale_jobs_due_to_lifecycle() -> int:
     """
     Transition stale jobs back to active if they have been verified recently.
-    This acts as a healing mechanism for data consistency.
     Returns the number of affected rows.
     """
-    engine = get_engine()
-    batch_size = 1000
-    total_updated = 0
-    while True:
-        with engine.begin() as conn:
-            result = conn.execute(
-                text("""
-                    WITH target_jobs AS (
-                        SELECT job_id
-                        FROM jobs
-                        WHERE status = 'stale'
-                        AND availability_status = 'active'
-                        AND last_verified_at IS NOT NULL
-                        AND last_verified_at >= NOW() - INTERVAL '7 days'
-                        LIMIT :batch_size
-                        FOR UPDATE SKIP LOCKED
-                    )
-                    UPDATE jobs
-                    SET status = 'active',
-                        updated_at = NOW()
-                    FROM target_jobs
-                    WHERE jobs.job_id = target_jobs.job_id
-                """),
-                {"batch_size": batch_size},
-            )
-            total_updated += result.rowcount
-            if result.rowcount == 0:
-                break
-    return total_updated
+    return apply_lifecycle_transitions(("reactivate",))["reactivate"]
 
 
-def mark_reposts_due_to_lifecycle(*, days_threshold: int = 30) -> int:
+def mark_reposts_due_to_lifecycle(*, days_threshold: int = REPOST_WINDOW_DAYS) -> int:
     """
-    Mark jobs as reposts when there is a previous job with the same
-    fingerprint + company + title whose last_seen_at is within threshold days.
-    Also stores how many qualifying previous jobs were found.
+    Reconcile repost flags set at ingest (bulk_upsert_jobs). A flagged job keeps
+    its flag only while previous jobs with the same fingerprint + company + title
+    were last seen within threshold days before it was first seen; re-sightings of
+    those previous jobs can move them out of the window, so counts only go down
+    here. Only flagged rows first seen in the last threshold + 15 days are read
+    (idx_jobs_repost_flagged); each one counts its previous jobs through
+    idx_jobs_repost_lookup. The flagged set is a MATERIALIZED CTE so the batch
+    LIMIT does not tempt the planner into walking `jobs` for the first matches.
     """
     engine = get_engine()
     batch_size = 1000
     total_updated = 0
+    prev_last_seen = JOB_LAST_SEEN_SQL.format(t="prev")
     while True:
         with engine.begin() as conn:
             result = conn.execute(
-                text("""
-                    WITH target_jobs AS (
-                        SELECT
-                            cur.job_id,
-                            COUNT(prev.job_id) AS new_repost_count
-                        FROM jobs cur
-                        LEFT JOIN jobs prev
-                          ON cur.job_fingerprint = prev.job_fingerprint
-                         AND cur.company_name = prev.company_name
-                         AND cur.title = prev.title
-                         AND cur.job_id <> prev.job_id
-                         AND cur.first_seen_at > prev.last_seen_at
-                         AND cur.first_seen_at - prev.last_seen_at < (:days_threshold * INTERVAL '1 day')
-                        -- OPTYMALIZACJA: Bada status "repost" tylko dla ofert dodanych w ciagu ostatnich X dni.
-                        WHERE cur.first_seen_at > NOW() - ((:days_threshold + 15) * INTERVAL '1 day')
-                        GROUP BY cur.job_id, cur.repost_count, cur.is_repost
-                        HAVING COALESCE(cur.repost_count, 0) <> COUNT(prev.job_id)
-                            OR cur.is_repost <> (COUNT(prev.job_id) > 0)
+                text(f"""
+                    WITH flagged AS MATERIALIZED (
+                        SELECT job_id, job_fingerprint, company_name, title, first_seen_at, repost_count, is_repost
+                        FROM jobs
+                        WHERE (is_repost OR repost_count > 0)
+                          AND first_seen_at > NOW() - ((:days_threshold + 15) * INTERVAL '1 day')
+                    ),
+                    target_jobs AS (
+                        SELECT flagged.job_id, prior.new_repost_count
+                        FROM flagged
+                        CROSS JOIN LATERAL (
+                            SELECT COUNT(*) AS new_repost_count
+                            FROM jobs prev
+                            WHERE prev.job_fingerprint = flagged.job_fingerprint
+                              AND prev.company_name = flagged.company_name
+                              AND prev.title = flagged.title
+                              AND prev.job_id <> flagged.job_id
+                              AND flagged.first_seen_at > {prev_last_seen}
+                              AND flagged.first_seen_at - {prev_last_seen} < (:days_threshold * INTERVAL '1 day')
+                        ) prior
+                        WHERE flagged.repost_count <> prior.new_repost_count
+                           OR flagged.is_repost <> (prior.new_repost_count > 0)
                         LIMIT :batch_size
                     )
                     UPDATE jobs j
                     SET
-                        is_repost = CASE WHEN target_jobs.new_repost_count > 0 THEN TRUE ELSE FALSE END,
+                        is_repost = target_jobs.new_repost_count > 0,
                         repost_count = target_jobs.new_repost_count,
                         updated_at = NOW()
                     FROM target_jobs
@@ -195,6 +200,7 @@ def mark_reposts_due_to_lifecycle(*, days_threshold: int = 30) -> int:
                 {"days_threshold": int(days_threshold), "batch_size": batch_size},
             )
             total_updated += result.rowcount
-            if result.rowcount == 0:
+            # A short batch means no candidates are left; skip the extra empty round-trip.
+            if result.rowcount < batch_size:
                 break
     return total_updated
@@ -1,8 +1,104 @@
 from sqlalchemy import bindparam, text
-from storage.db_engine import get_engine
+from sqlalchemy.engine import Connection
+from storage.db_engine import engine_getter
 
 from app.domain.companies.scoring import CompanyScoringRules, EU_COUNTRIES
 
+get_engine = engine_getter("maintenance")
+
+
+# Job statistics and remote posture for the companies in :company_ids; one scan of
+# their jobs, one UPDATE that skips companies whose values did not change.
+_COMPANY_STATS_STMT = text("""
+    WITH stats AS (
+        SELECT
+            c2.company_id,
+            COUNT(j.job_id)                                               AS total_cnt,
+            COUNT(j.job_id) FILTER (WHERE j.compliance_status = 'approved') AS approved_cnt,
+            COUNT(j.job_id) FILTER (WHERE j.compliance_status = 'rejected') AS rejected_cnt,
+            MAX(j.first_seen_at) FILTER (WHERE j.status = 'active')      AS last_active,
+            COUNT(j.job_id) FILTER (WHERE j.remote_source_flag = TRUE)   AS remote_cnt
+        FROM companies c2
+        LEFT JOIN jobs j ON c2.company_id = j.company_id
+        WHERE c2.company_id IN :company_ids
+        GROUP BY c2.company_id
+    )
+    UPDATE companies c
+    SET
+        approved_jobs_count = COALESCE(s.approved_cnt, 0),
+        rejected_jobs_count = COALESCE(s.rejected_cnt, 0),
+        total_jobs_count    = COALESCE(s.total_cnt, 0),
+        last_active_job_at  = s.last_active,
+        remote_posture = CASE
+            WHEN s.remote_cnt >= 3 AND c.remote_posture = 'UNKNOWN'
+            THEN 'REMOTE_FRIENDLY'
+            ELSE c.remote_posture
+        END,
+        updated_at = NOW()
+    FROM stats s
+    WHERE c.company_id = s.company_id
+      AND (
+          COALESCE(c.approved_jobs_count, -1) != COALESCE(s.approved_cnt, 0)
+          OR COALESCE(c.rejected_jobs_count, -1) != COALESCE(s.rejected_cnt, 0)
+          OR COALESCE(c.total_jobs_count, -1) != COALESCE(s.total_cnt, 0)
+          OR c.last_active_job_at IS DISTINCT FROM s.last_active
+          OR (s.remote_cnt >= 3 AND c.remote_posture = 'UNKNOWN')
+      )
+""").bindparams(bindparam("company_ids", expanding=True))
+
+# Signal score for the companies in :company_ids (see CompanyScoringRules).
+_COMPANY_SIGNAL_SCORE_STMT = text(f"""
+    WITH batch_companies AS (
+        SELECT c.*
+        FROM companies c
+        WHERE c.company_id IN :company_ids
+    ),
+    stats AS (
+        SELECT
+            bc.company_id,
+            COUNT(j.job_id) AS total,
+            COUNT(j.job_id) FILTER (WHERE j.compliance_status = 'approved') AS approved,
+            COUNT(j.job_id) FILTER (WHERE j.salary_transparency_status = 'disclosed') AS transparent
+        FROM batch_companies bc
+        LEFT JOIN jobs j ON bc.company_id = j.company_id
+        GROUP BY bc.company_id
+    ),
+    new_score AS (
+        SELECT
+            bc.company_id,
+            CAST(ROUND((
+                CASE WHEN bc.remote_posture = 'REMOTE_ONLY'     THEN {CompanyScoringRules.REMOTE_ONLY_POINTS}
+                     WHEN bc.remote_posture = 'REMOTE_FRIENDLY' THEN {CompanyScoringRules.REMOTE_FRIENDLY_POINTS}
+                     ELSE 0 END
+                +
+                CASE WHEN bc.eu_entity_verified THEN {CompanyScoringRules.EU_ENTITY_POINTS} ELSE 0 END
+                +
+                CASE WHEN bc.hq_country IN :eu_countries THEN {CompanyScoringRules.EU_HQ_POINTS} ELSE 0 END
+                +
+                CASE
+                    WHEN s.total > 0 AND (CAST(s.approved AS NUMERIC) / NULLIF(s.total, 0)) >= {CompanyScoringRules.APPROVAL_RATIO_HIGH_THRESHOLD} THEN {CompanyScoringRules.APPROVAL_RATIO_HIGH_POINTS}
+                    WHEN s.total > 0 AND (CAST(s.approved AS NUMERIC) / NULLIF(s.total, 0)) >= {CompanyScoringRules.APPROVAL_RATIO_MID_THRESHOLD}  THEN {CompanyScoringRules.APPROVAL_RATIO_MID_POINTS}
+                    ELSE 0 END
+            ) * (
+                CASE
+                    WHEN s.total > 0 AND (CAST(s.transparent AS NUMERIC) / NULLIF(s.total, 0)) >= {CompanyScoringRules.TRANSPARENCY_RATIO_THRESHOLD} THEN {CompanyScoringRules.TRANSPARENCY_MULTIPLIER}
+                    ELSE 1.0 END
+            )) AS INTEGER) AS score
+        FROM batch_companies bc
+        JOIN stats s ON bc.company_id = s.company_id
+    )
+    UPDATE companies c
+    SET signal_score = COALESCE(ns.score, 0),
+        signal_last_computed_at = NOW(),
+        updated_at = NOW()
+    FROM new_score ns
+    WHERE c.company_id = ns.company_id
+      AND COALESCE(c.signal_score, -1) != COALESCE(ns.score, 0)
+""").bindparams(
+    bindparam("company_ids", expanding=True),
+    bindparam("eu_countries", expanding=True),
+)
+
 
 def update_company_stats_and_posture_bulk() -> int:
     """
@@ -21,45 +117,6 @@ def update_company_stats_and_posture_bulk() -> int:
     total_updated = 0
     last_id = "00000000-0000-0000-0000-000000000000"
 
-    # Pre-compiled statement with expanding IN — SQLAlchemy generates the correct
-    # number of bind params per batch without string interpolation.
-    stmt = text("""
-        WITH stats AS (
-            SELECT
-                c2.company_id,
-                COUNT(j.job_id)                                               AS total_cnt,
-                COUNT(j.job_id) FILTER (WHERE j.compliance_status = 'approved') AS approved_cnt,
-                COUNT(j.job_id) FILTER (WHERE j.compliance_status = 'rejected') AS rejected_cnt,
-                MAX(j.first_seen_at) FILTER (WHERE j.status = 'active')      AS last_active,
-                COUNT(j.job_id) FILTER (WHERE j.remote_source_flag = TRUE)   AS remote_cnt
-            FROM companies c2
-            LEFT JOIN jobs j ON c2.company_id = j.company_id
-            WHERE c2.company_id IN :company_ids
-            GROUP BY c2.company_id
-        )
-        UPDATE companies c
-        SET
-            approved_jobs_count = COALESCE(s.approved_cnt, 0),
-            rejected_jobs_count = COALESCE(s.rejected_cnt, 0),
-            total_jobs_count    = COALESCE(s.total_cnt, 0),
-            last_active_job_at  = s.last_active,
-            remote_posture = CASE
-                WHEN s.remote_cnt >= 3 AND c.remote_posture = 'UNKNOWN'
-                THEN 'REMOTE_FRIENDLY'
-                ELSE c.remote_posture
-            END,
-            updated_at = NOW()
-        FROM stats s
-        WHERE c.company_id = s.company_id
-          AND (
-              COALESCE(c.approved_jobs_count, -1) != COALESCE(s.approved_cnt, 0)
-              OR COALESCE(c.rejected_jobs_count, -1) != COALESCE(s.rejected_cnt, 0)
-              OR COALESCE(c.total_jobs_count, -1) != COALESCE(s.total_cnt, 0)
-              OR c.last_active_job_at IS DISTINCT FROM s.last_active
-              OR (s.remote_cnt >= 3 AND c.remote_posture = 'UNKNOWN')
-          )
-    """).bindparams(bindparam("company_ids", expanding=True))
-
     while True:
         with engine.begin() as conn:
             batch_rows = conn.execute(
@@ -77,7 +134,7 @@ def update_company_stats_and_posture_bulk() -> int:
                 break
 
             company_ids = [str(r[0]) for r in batch_rows]
-            result = conn.execute(stmt, {"company_ids": company_ids})
+            result = conn.execute(_COMPANY_STATS_STMT, {"company_ids": company_ids})
             total_updated += result.rowcount
             last_id = company_ids[-1]
 
@@ -92,58 +149,6 @@ def update_company_signal_scores_bulk() -> int:
 
     eu_countries = list(EU_COUNTRIES)
 
-    stmt = text(f"""
-        WITH batch_companies AS (
-            SELECT c.*
-            FROM companies c
-            WHERE c.company_id IN :company_ids
-        ),
-        stats AS (
-            SELECT
-                bc.company_id,
-                COUNT(j.job_id) AS total,
-                COUNT(j.job_id) FILTER (WHERE j.compliance_status = 'approved') AS approved,
-                COUNT(j.job_id) FILTER (WHERE j.salary_transparency_status = 'disclosed') AS transparent
-            FROM batch_companies bc
-            LEFT JOIN jobs j ON bc.company_id = j.company_id
-            GROUP BY bc.company_id
-        ),
-        new_score AS (
-            SELECT
-                bc.company_id,
-                CAST(ROUND((
-                    CASE WHEN bc.remote_posture = 'REMOTE_ONLY'     THEN {CompanyScoringRules.REMOTE_ONLY_POINTS}
-                         WHEN bc.remote_posture = 'REMOTE_FRIENDLY' THEN {CompanyScoringRules.REMOTE_FRIENDLY_POINTS}
-                         ELSE 0 END
-                    +
-                    CASE WHEN bc.eu_entity_verified THEN {CompanyScoringRules.EU_ENTITY_POINTS} ELSE 0 END
-                    +
-                    CASE WHEN bc.hq_country IN :eu_countries THEN {CompanyScoringRules.EU_HQ_POINTS} ELSE 0 END
-                    +
-                    CASE
-                        WHEN s.total > 0 AND (CAST(s.approved AS NUMERIC) / NULLIF(s.total, 0)) >= {CompanyScoringRules.APPROVAL_RATIO_HIGH_THRESHOLD} THEN {CompanyScoringRules.APPROVAL_RATIO_HIGH_POINTS}
-                        WHEN s.total > 0 AND (CAST(s.approved AS NUMERIC) / NULLIF(s.total, 0)) >= {CompanyScoringRules.APPROVAL_RATIO_MID_THRESHOLD}  THEN {CompanyScoringRules.APPROVAL_RATIO_MID_POINTS}
-                        ELSE 0 END
-                ) * (
-                    CASE
-                        WHEN s.total > 0 AND (CAST(s.transparent AS NUMERIC) / NULLIF(s.total, 0)) >= {CompanyScoringRules.TRANSPARENCY_RATIO_THRESHOLD} THEN {CompanyScoringRules.TRANSPARENCY_MULTIPLIER}
-                        ELSE 1.0 END
-                )) AS INTEGER) AS score
-            FROM batch_companies bc
-            JOIN stats s ON bc.company_id = s.company_id
-        )
-        UPDATE companies c
-        SET signal_score = COALESCE(ns.score, 0),
-            signal_last_computed_at = NOW(),
-            updated_at = NOW()
-        FROM new_score ns
-        WHERE c.company_id = ns.company_id
-          AND COALESCE(c.signal_score, -1) != COALESCE(ns.score, 0)
-    """).bindparams(
-        bindparam("company_ids", expanding=True),
-        bindparam("eu_countries", expanding=True),
-    )
-
     while True:
         with engine.begin() as conn:
             batch_rows = conn.execute(
@@ -161,8 +166,73 @@ def update_company_signal_scores_bulk() -> int:
                 break
 
             company_ids = [str(r[0]) for r in batch_rows]
-            result = conn.execute(stmt, {"company_ids": company_ids, "eu_countries": eu_countries})
+            result = conn.execute(
+                _COMPANY_SIGNAL_SCORE_STMT, {"company_ids": company_ids, "eu_countries": eu_countries}
+            )
             total_updated += result.rowcount
             last_id = company_ids[-1]
 
     return total_updated
+
+
+def mark_company_stats_reconciliation_slice(conn: Connection, *, slices: int, slot: int) -> int:
+    """
+    Marks one of `slices` hash slices of all companies dirty, so refreshing the
+    dirty set also re-checks every company once per `slices` slots — a safety net
+    for changes the triggers cannot see (e.g. TRUNCATE, triggers disabled during a
+    bulk load). Returns the number of companies newly marked.
+    """
+    return conn.execute(
+        text("""
+            INSERT INTO company_stats_dirty (company_id)
+            SELECT company_id
+            FROM companies
+            WHERE mod(abs(hashtext(CAST(company_id AS TEXT))), :slices) = :slot
+            ON CONFLICT (company_id) DO NOTHING
+        """),
+        {"slices": slices, "slot": slot % slices},
+    ).rowcount
+
+
+def refresh_dirty_company_stats(*, batch_size: int = 1000) -> dict[str, int]:
+    """
+    Recomputes job statistics, remote posture and signal score for the companies
+    in company_stats_dirty (marked by triggers on jobs and companies). Each batch
+    removes its marks and writes the results in one transaction, so a failed
+    batch stays dirty, and a company re-marked mid-run is refreshed next time.
+    Returns companies refreshed and rows changed per step.
+    """
+    engine = get_engine()
+    eu_countries = list(EU_COUNTRIES)
+    totals = {"companies": 0, "stats_updated": 0, "scores_updated": 0}
+
+    while True:
+        with engine.begin() as conn:
+            company_ids = [
+                str(company_id)
+                for company_id in conn.execute(
+                    text("""
+                        DELETE FROM company_stats_dirty
+                        WHERE company_id IN (
+                            SELECT company_id
+                            FROM company_stats_dirty
+                            ORDER BY company_id
+                            LIMIT :batch_size
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING company_id
+                    """),
+                    {"batch_size": batch_size},
+                ).scalars()
+            ]
+            if not company_ids:
+                break
+            totals["companies"] += len(company_ids)
+            # Stats first: the score reads the remote_posture it may upgrade.
+            totals["stats_updated"] += conn.execute(_COMPANY_STATS_STMT, {"company_ids": company_ids}).rowcount
+            totals["scores_updated"] += conn.execute(
+                _COMPANY_SIGNAL_SCORE_STMT, {"company_ids": company_ids, "eu_countries": eu_countries}
+            ).rowcount
+        if len(company_ids) < batch_size:
+            break
+    return totals
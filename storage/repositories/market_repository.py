@@ -3,6 +3,8 @@ from datetime import date, datetime, timedelta, timezone
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
 
+from storage.repositories.market_rollup_repository import approximate_median, get_market_rollup
+
 
 def compute_market_stats(conn: Connection, date: date) -> dict:
     start_time = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
@@ -51,6 +53,60 @@ def compute_market_stats(conn: Connection, date: date) -> dict:
     }
 
 
+def compute_market_stats_from_rollup(conn: Connection, date: date) -> dict:
+    """
+    Same figures as compute_market_stats without a full jobs scan: active-market
+    aggregates come from market_rollup (median from its salary histogram), the
+    per-day counts from index range scans on first_seen_at / last_seen_at.
+    Fold pending deltas first (fold_market_rollup_deltas) for up-to-date values.
+    """
+    start_time = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(days=1)
+
+    day_stats = (
+        conn.execute(
+            text("""
+            SELECT
+                COUNT(*) FILTER (WHERE first_seen_at >= :start_time AND first_seen_at < :end_time) AS jobs_created,
+                COUNT(*) FILTER (WHERE availability_status = 'expired' AND last_seen_at >= :start_time AND last_seen_at < :end_time) AS jobs_expired,
+                COUNT(*) FILTER (WHERE is_repost = TRUE AND first_seen_at >= :start_time AND first_seen_at < :end_time) AS jobs_reposted
+            FROM jobs
+            WHERE (first_seen_at >= :start_time AND first_seen_at < :end_time)
+               OR (last_seen_at >= :start_time AND last_seen_at < :end_time)
+        """),
+            {"start_time": start_time, "end_time": end_time},
+        )
+        .mappings()
+        .one()
+    )
+
+    avg_job_lifetime = conn.execute(
+        text(
+            """
+            SELECT AVG(last_seen_at - first_seen_at)
+            FROM job_sources
+            WHERE last_seen_at >= :start_time AND last_seen_at < :end_time
+            """
+        ),
+        {"start_time": start_time, "end_time": end_time},
+    ).scalar_one()
+
+    market = get_market_rollup(conn, ("all",)).get(("all", ""))
+    jobs_active = int(market["jobs_active"]) if market else 0
+
+    return {
+        "date": date,
+        "jobs_created": int(day_stats["jobs_created"] or 0),
+        "jobs_expired": int(day_stats["jobs_expired"] or 0),
+        "jobs_active": jobs_active,
+        "jobs_reposted": int(day_stats["jobs_reposted"] or 0),
+        "avg_salary_eur": market["salary_sum"] / market["salary_count"] if market and market["salary_count"] else None,
+        "median_salary_eur": approximate_median(market["histogram"]) if market else None,
+        "avg_job_lifetime": avg_job_lifetime,
+        "remote_ratio": market["remote_jobs"] / jobs_active if jobs_active else None,
+    }
+
+
 def get_market_daily_stats(conn: Connection, *, days: int = 30) -> list[dict]:
     """Return the last `days` rows from market_daily_stats, ordered chronologically."""
     from datetime import date, timedelta
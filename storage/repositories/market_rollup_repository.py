@@ -0,0 +1,138 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Salary histogram layout of market_rollup; must match market_rollup_keys()
+# (migration d7f3b9c1e2a4). Bucket -1 holds jobs without a counted salary, the
+# last bucket everything from SALARY_BUCKET_CAP * SALARY_BUCKET_EUR upwards.
+SALARY_BUCKET_EUR = 1000
+SALARY_BUCKET_CAP = 500
+
+_JOBS_ROLLUP_ROWS_SQL = """
+    SELECT k.segment_type, k.segment_value, k.salary_bucket,
+           SUM(k.jobs) AS jobs, SUM(k.salary_sum) AS salary_sum, SUM(k.remote_jobs) AS remote_jobs
+    FROM jobs j
+    CROSS JOIN LATERAL market_rollup_keys(
+        j.availability_status, j.compliance_status, j.compliance_score, j.geo_class,
+        j.remote_scope, j.job_family, j.seniority, j.salary_min_eur, j.remote_class
+    ) k
+    WHERE j.availability_status = 'active'
+    GROUP BY 1, 2, 3
+"""
+
+
+def fold_market_rollup_deltas(conn: Connection) -> int:
+    """
+    Adds the deltas captured by the jobs triggers to market_rollup and drops rows
+    that fell back to zero. Returns the number of delta rows folded.
+    """
+    folded = conn.execute(
+        text("""
+            WITH drained AS (
+                DELETE FROM market_rollup_deltas
+                RETURNING segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs
+            ),
+            applied AS (
+                INSERT INTO market_rollup (segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs)
+                SELECT segment_type, segment_value, salary_bucket, SUM(jobs), SUM(salary_sum), SUM(remote_jobs)
+                FROM drained
+                GROUP BY 1, 2, 3
+                ON CONFLICT (segment_type, segment_value, salary_bucket) DO UPDATE SET
+                    jobs = market_rollup.jobs + EXCLUDED.jobs,
+                    salary_sum = market_rollup.salary_sum + EXCLUDED.salary_sum,
+                    remote_jobs = market_rollup.remote_jobs + EXCLUDED.remote_jobs
+                RETURNING 1
+            )
+            SELECT COUNT(*) FROM drained
+        """)
+    ).scalar_one()
+    if folded:
+        conn.execute(text("DELETE FROM market_rollup WHERE jobs = 0 AND salary_sum = 0 AND remote_jobs = 0"))
+    return int(folded)
+
+
+def rebuild_market_rollup(conn: Connection) -> int:
+    """
+    Recomputes market_rollup from the active jobs in one scan, discarding pending
+    deltas. Clearing the deltas and reading jobs share one statement snapshot, so
+    a concurrent write is either in the scan or left as a delta, never both.
+    Returns the number of rollup rows written.
+    """
+    conn.execute(text("DELETE FROM market_rollup"))
+    return conn.execute(
+        text(f"""
+            WITH cleared AS (
+                DELETE FROM market_rollup_deltas RETURNING 1
+            )
+            INSERT INTO market_rollup (segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs)
+            SELECT segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs
+            FROM ({_JOBS_ROLLUP_ROWS_SQL}) r
+        """)
+    ).rowcount
+
+
+def get_market_rollup(conn: Connection, segment_types: tuple[str, ...]) -> dict[tuple[str, str], dict]:
+    """
+    Rollup aggregates per (segment_type, segment_value): active jobs, salary count
+    and sum, remote jobs, plus the salary histogram as {bucket: jobs}.
+    """
+    segments: dict[tuple[str, str], dict] = {}
+    rows = conn.execute(
+        text("""
+            SELECT segment_type, segment_value, salary_bucket, jobs, salary_sum, remote_jobs
+            FROM market_rollup
+            WHERE segment_type = ANY(CAST(:segment_types AS TEXT[]))
+        """),
+        {"segment_types": list(segment_types)},
+    )
+    for row in rows.mappings():
+        segment = segments.setdefault(
+            (row["segment_type"], row["segment_value"]),
+            {"jobs_active": 0, "salary_count": 0, "salary_sum": 0, "remote_jobs": 0, "histogram": {}},
+        )
+        merge_rollup_segment(
+            segment,
+            {
+                "jobs_active": row["jobs"],
+                "salary_count": row["jobs"] if row["salary_bucket"] >= 0 else 0,
+                "salary_sum": row["salary_sum"],
+                "remote_jobs": row["remote_jobs"],
+                "histogram": {row["salary_bucket"]: row["jobs"]} if row["salary_bucket"] >= 0 else {},
+            },
+        )
+    return segments
+
+
+def merge_rollup_segment(target: dict, other: dict) -> dict:
+    """Adds the aggregates of `other` into `target` (both as returned by get_market_rollup)."""
+    for key in ("jobs_active", "salary_count", "salary_sum", "remote_jobs"):
+        target[key] += other[key]
+    for bucket, jobs in other["histogram"].items():
+        target["histogram"][bucket] = target["histogram"].get(bucket, 0) + jobs
+    return target
+
+
+def approximate_median(histogram: dict[int, int]) -> float | None:
+    """
+    Median estimated from a salary histogram, spreading each bucket's jobs evenly
+    across its width (the open-ended top bucket reports its lower bound). Off by
+    at most SALARY_BUCKET_EUR below the top bucket.
+    """
+    buckets = sorted((bucket, jobs) for bucket, jobs in histogram.items() if jobs > 0)
+    total = sum(jobs for _, jobs in buckets)
+    if not total:
+        return None
+
+    def value_at(position: int) -> float:
+        seen = 0
+        for bucket, jobs in buckets:
+            if position < seen + jobs:
+                lower = bucket * SALARY_BUCKET_EUR
+                if bucket >= SALARY_BUCKET_CAP:
+                    return float(lower)
+                return lower + SALARY_BUCKET_EUR * (position - seen + 0.5) / jobs
+            seen += jobs
+        raise ValueError(position)
+
+    # Interpolates between the two middle positions, like percentile_cont(0.5).
+    low, high = value_at((total - 1) // 2), value_at(total // 2)
+    return (low + high) / 2
@@ -4,8 +4,21 @@ from datetime import date, datetime, timedelta, timezone
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
 
+from app.domain.compliance.classifiers.geo import classify_remote_scope
+from storage.repositories.market_rollup_repository import (
+    approximate_median,
+    get_market_rollup,
+    merge_rollup_segment,
+)
+
 _EXCLUDE_SCOPE_KEYWORDS = ["americ", "apac", "latam", "asia pacific"]
 
+# Bump when classify_remote_scope or _segment_label rules change, so
+# sync_remote_scope_lookup re-derives already persisted rows.
+REMOTE_SCOPE_LOOKUP_VERSION = 1
+
+_EU_GEO_CLASSES_SQL = "('eu_member_state', 'eu_explicit', 'eu_region')"
+
 
 def _canonical_region(val: str) -> str:
     """Strip remote markers and formal country name prefixes to get the base region name."""
@@ -24,15 +37,21 @@ def _remote_priority(val: str) -> int:
     return 2
 
 
+def _segment_label(val: str) -> str | None:
+    """Country-segment label for a remote_scope value, or None when the scope is excluded (non-EU regions)."""
+    if any(kw in val.lower() for kw in _EXCLUDE_SCOPE_KEYWORDS):
+        return None
+    val = _re.sub(r"(?i)^home\s+based\s*[-–]\s*", "Remote - ", val)
+    # "Remote Job, Warsaw" → "Remote - Warsaw"
+    return _re.sub(r"(?i)^remote\s+job\s*[,\s]+\s*", "Remote - ", val)
+
+
 def _normalize_country_rows(rows: list[dict]) -> list[dict]:
     normalized = []
     for row in rows:
-        val = row["segment_value"] or ""
-        if any(kw in val.lower() for kw in _EXCLUDE_SCOPE_KEYWORDS):
+        val = _segment_label(row["segment_value"] or "")
+        if val is None:
             continue
-        val = _re.sub(r"(?i)^home\s+based\s*[-–]\s*", "Remote - ", val)
-        # "Remote Job, Warsaw" → "Remote - Warsaw"
-        val = _re.sub(r"(?i)^remote\s+job\s*[,\s]+\s*", "Remote - ", val)
         normalized.append({**row, "segment_value": val})
 
     # For each canonical region, keep only the highest-priority label.
@@ -50,94 +69,246 @@ def _normalize_country_rows(rows: list[dict]) -> list[dict]:
     return [r for r in normalized if r["segment_value"] in best_labels]
 
 
-def compute_market_segments(conn: Connection, date: date) -> list[dict]:
-    start_time = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
-    end_time = start_time + timedelta(days=1)
+def sync_remote_scope_lookup(conn: Connection) -> int:
+    """
+    Persists the classification of every remote_scope value that is not in
+    `remote_scope_lookup` yet (or was derived by an older rule version).
+    Each distinct value is classified once, through the memoized geo classifier.
+    Returns the number of lookup rows written.
+    """
+    scopes = [
+        row[0]
+        for row in conn.execute(
+            text("""
+                SELECT DISTINCT j.remote_scope
+                FROM jobs j
+                LEFT JOIN remote_scope_lookup l ON l.remote_scope = j.remote_scope
+                WHERE j.remote_scope IS NOT NULL
+                  AND (l.remote_scope IS NULL OR l.classifier_version <> :version)
+            """),
+            {"version": REMOTE_SCOPE_LOOKUP_VERSION},
+        )
+    ]
+    if not scopes:
+        return 0
 
-    rows: list[dict] = []
+    lookup_rows = []
+    for scope in scopes:
+        geo = classify_remote_scope(scope) or {}
+        label = _segment_label(scope)
+        lookup_rows.append(
+            {
+                "remote_scope": scope,
+                "geo_class": geo["geo_class"].value if geo else None,
+                "reason": geo.get("reason"),
+                "eu_member_count": geo.get("eu_member_count", 0),
+                "segment_label": label,
+                "is_excluded": label is None,
+                "classifier_version": REMOTE_SCOPE_LOOKUP_VERSION,
+            }
+        )
 
-    # Country segment: group EU jobs by remote_scope, aggregate all non-EU into "Non EU"
-    country_result = conn.execute(
+    conn.execute(
         text("""
+            INSERT INTO remote_scope_lookup (
+                remote_scope, geo_class, reason, eu_member_count,
+                segment_label, is_excluded, classifier_version, updated_at
+            )
+            VALUES (
+                :remote_scope, :geo_class, :reason, :eu_member_count,
+                :segment_label, :is_excluded, :classifier_version, NOW()
+            )
+            ON CONFLICT (remote_scope) DO UPDATE SET
+                geo_class = EXCLUDED.geo_class,
+                reason = EXCLUDED.reason,
+                eu_member_count = EXCLUDED.eu_member_count,
+                segment_label = EXCLUDED.segment_label,
+                is_excluded = EXCLUDED.is_excluded,
+                classifier_version = EXCLUDED.classifier_version,
+                updated_at = NOW()
+        """),
+        lookup_rows,
+    )
+    return len(lookup_rows)
+
+
+SEGMENT_TYPES = ("country", "job_family", "seniority")
+
+
+def _country_value_sql(use_scope_lookup: bool) -> str:
+    """Country segment value of job `j`; NULL keeps the job out of the country segments only."""
+    if use_scope_lookup:
+        # Labels and exclusions come pre-derived from remote_scope_lookup (joined as `l`);
+        # scopes not synced yet fall back to the raw value and are still normalized in Python.
+        eu_value = "CASE WHEN COALESCE(l.is_excluded, FALSE) THEN NULL ELSE COALESCE(l.segment_label, j.remote_scope, j.geo_class) END"
+    else:
+        eu_value = "COALESCE(j.remote_scope, j.geo_class)"
+    return f"""
+        CASE
+            WHEN j.geo_class IS NULL THEN NULL
+            WHEN j.geo_class IN {_EU_GEO_CLASSES_SQL} THEN {eu_value}
+            ELSE 'Non EU'
+        END"""
+
+
+def _segments_query(aggregates: str, where: str, *, use_scope_lookup: bool = False):
+    """
+    One GROUPING SETS scan over approved jobs producing the `aggregates` of every
+    segment type; each result row is one (segment_type, segment_value) group.
+    """
+    source = "jobs j"
+    if use_scope_lookup:
+        source += " LEFT JOIN remote_scope_lookup l ON l.remote_scope = j.remote_scope"
+    return text(f"""
+        SELECT *
+        FROM (
             SELECT
                 CASE
-                    WHEN geo_class IN ('eu_member_state', 'eu_explicit', 'eu_region')
-                        THEN COALESCE(remote_scope, geo_class)
-                    ELSE 'Non EU'
+                    WHEN GROUPING(s.country) = 0 THEN 'country'
+                    WHEN GROUPING(s.job_family) = 0 THEN 'job_family'
+                    ELSE 'seniority'
+                END AS segment_type,
+                CASE
+                    WHEN GROUPING(s.country) = 0 THEN s.country
+                    WHEN GROUPING(s.job_family) = 0 THEN s.job_family
+                    ELSE s.seniority
                 END AS segment_value,
-                COUNT(*) FILTER (WHERE availability_status = 'active') AS jobs_active,
-                COUNT(*) FILTER (WHERE first_seen_at >= :start_time AND first_seen_at < :end_time) AS jobs_created,
-                COUNT(*) FILTER (WHERE salary_min_eur >= 10000) AS salary_count,
-                AVG(CASE WHEN salary_min_eur >= 10000 THEN salary_min_eur END) AS avg_salary_eur,
+                {aggregates}
+            FROM (
+                SELECT
+                    {_country_value_sql(use_scope_lookup)} AS country,
+                    j.job_family,
+                    j.seniority,
+                    j.availability_status,
+                    j.first_seen_at,
+                    j.salary_min_eur
+                FROM {source}
+                WHERE j.compliance_status = 'approved'
+                  AND j.compliance_score >= 80
+                  AND {where}
+            ) s
+            GROUP BY GROUPING SETS ((s.country), (s.job_family), (s.seniority))
+        ) g
+        WHERE segment_value IS NOT NULL
+        ORDER BY array_position(CAST(:segment_types AS TEXT[]), segment_type), segment_value
+    """)
+
+
+def _segment_rows(date: date, result_rows) -> list[dict]:
+    rows = [
+        {
+            "date": date,
+            "segment_type": item["segment_type"],
+            "segment_value": item["segment_value"],
+            "jobs_active": int(item["jobs_active"] or 0),
+            "jobs_created": int(item["jobs_created"] or 0),
+            "salary_count": int(item["salary_count"] or 0),
+            "avg_salary_eur": item["avg_salary_eur"],
+            "median_salary_eur": item["median_salary_eur"],
+        }
+        for item in result_rows
+    ]
+    country_rows = [row for row in rows if row["segment_type"] == "country"]
+    return _normalize_country_rows(country_rows) + [row for row in rows if row["segment_type"] != "country"]
+
+
+def compute_market_segments(conn: Connection, date: date, *, use_scope_lookup: bool = False) -> list[dict]:
+    """
+    Computes country, job_family and seniority segments for `date` from a full scan
+    of the approved jobs, all three segment types in a single GROUPING SETS pass.
+    Exact; compute_market_segments_from_rollup is the incremental counterpart.
+
+    With `use_scope_lookup`, the remote_scope lookup table is synced first and the
+    country segment joins on it for labels/exclusions instead of deriving them
+    from every grouped row.
+    """
+    start_time = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(days=1)
+
+    if use_scope_lookup:
+        sync_remote_scope_lookup(conn)
+
+    # Country segment: EU jobs by remote_scope, all non-EU aggregated into "Non EU".
+    result = conn.execute(
+        _segments_query(
+            """
+                COUNT(*) FILTER (WHERE s.availability_status = 'active') AS jobs_active,
+                COUNT(*) FILTER (WHERE s.first_seen_at >= :start_time AND s.first_seen_at < :end_time) AS jobs_created,
+                COUNT(*) FILTER (WHERE s.salary_min_eur >= 10000) AS salary_count,
+                AVG(CASE WHEN s.salary_min_eur >= 10000 THEN s.salary_min_eur END) AS avg_salary_eur,
                 percentile_cont(0.5)
-                    WITHIN GROUP (ORDER BY CASE WHEN salary_min_eur >= 10000 THEN salary_min_eur END) AS median_salary_eur
-            FROM jobs
-            WHERE geo_class IS NOT NULL
-              AND compliance_status = 'approved'
-              AND compliance_score >= 80
-              AND (availability_status = 'active'
-                   OR (first_seen_at >= :start_time AND first_seen_at < :end_time))
-            GROUP BY segment_value
-        """),
-        {"start_time": start_time, "end_time": end_time},
+                    WITHIN GROUP (ORDER BY CASE WHEN s.salary_min_eur >= 10000 THEN s.salary_min_eur END) AS median_salary_eur
+            """,
+            """(j.availability_status = 'active'
+                       OR (j.first_seen_at >= :start_time AND j.first_seen_at < :end_time))""",
+            use_scope_lookup=use_scope_lookup,
+        ),
+        {"start_time": start_time, "end_time": end_time, "segment_types": list(SEGMENT_TYPES)},
     )
+    return _segment_rows(date, result.mappings())
 
-    country_rows = []
-    for item in country_result.mappings():
-        country_rows.append(
-            {
-                "date": date,
-                "segment_type": "country",
-                "segment_value": item["segment_value"],
-                "jobs_active": int(item["jobs_active"] or 0),
-                "jobs_created": int(item["jobs_created"] or 0),
-                "salary_count": int(item["salary_count"] or 0),
-                "avg_salary_eur": item["avg_salary_eur"],
-                "median_salary_eur": item["median_salary_eur"],
-            }
-        )
-    rows.extend(_normalize_country_rows(country_rows))
 
-    # job_family and seniority segments: filter to approved offers only
-    for segment_type, column_name in [("job_family", "job_family"), ("seniority", "seniority")]:
-        result = conn.execute(
-            text(
-                f"""
-                SELECT
-                    {column_name} AS segment_value,
-                    COUNT(*) FILTER (WHERE availability_status = 'active') AS jobs_active,
-                    COUNT(*) FILTER (WHERE first_seen_at >= :start_time AND first_seen_at < :end_time) AS jobs_created,
-                    COUNT(*) FILTER (WHERE salary_min_eur >= 10000) AS salary_count,
-                    AVG(CASE WHEN salary_min_eur >= 10000 THEN salary_min_eur END) AS avg_salary_eur,
-                    percentile_cont(0.5)
-                        WITHIN GROUP (ORDER BY CASE WHEN salary_min_eur >= 10000 THEN salary_min_eur END) AS median_salary_eur
-                FROM jobs
-                WHERE {column_name} IS NOT NULL
-                  AND compliance_status = 'approved'
-                  AND compliance_score >= 80
-                  AND (availability_status = 'active'
-                       OR (first_seen_at >= :start_time AND first_seen_at < :end_time))
-                GROUP BY {column_name}
-                """
+def compute_market_segments_from_rollup(conn: Connection, date: date) -> list[dict]:
+    """
+    Segments for `date` without a full jobs scan: active jobs and salary figures
+    come from market_rollup (median from its salary histogram), jobs_created from
+    an index range scan over the day's new jobs. Unlike compute_market_segments,
+    salary figures cover active jobs only. Country values are relabelled with
+    _segment_label and merged per label. Fold pending deltas first
+    (fold_market_rollup_deltas) for up-to-date values.
+    """
+    start_time = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(days=1)
+
+    created = {
+        (item["segment_type"], item["segment_value"]): int(item["jobs_created"])
+        for item in conn.execute(
+            _segments_query(
+                "COUNT(*) AS jobs_created",
+                "j.first_seen_at >= :start_time AND j.first_seen_at < :end_time",
             ),
-            {"start_time": start_time, "end_time": end_time},
+            {"start_time": start_time, "end_time": end_time, "segment_types": list(SEGMENT_TYPES)},
+        ).mappings()
+    }
+    rollup = get_market_rollup(conn, SEGMENT_TYPES)
+
+    segments: dict[tuple[str, str], dict] = {}
+    for segment_type, segment_value in sorted(set(rollup) | set(created)):
+        label = _segment_label(segment_value) if segment_type == "country" else segment_value
+        if label is None:
+            continue
+        segment = segments.setdefault(
+            (segment_type, label),
+            {
+                "jobs_active": 0,
+                "salary_count": 0,
+                "salary_sum": 0,
+                "remote_jobs": 0,
+                "histogram": {},
+                "jobs_created": 0,
+            },
         )
+        if (segment_type, segment_value) in rollup:
+            merge_rollup_segment(segment, rollup[(segment_type, segment_value)])
+        segment["jobs_created"] += created.get((segment_type, segment_value), 0)
 
-        for item in result.mappings():
-            rows.append(
-                {
-                    "date": date,
-                    "segment_type": segment_type,
-                    "segment_value": item["segment_value"],
-                    "jobs_active": int(item["jobs_active"] or 0),
-                    "jobs_created": int(item["jobs_created"] or 0),
-                    "salary_count": int(item["salary_count"] or 0),
-                    "avg_salary_eur": item["avg_salary_eur"],
-                    "median_salary_eur": item["median_salary_eur"],
-                }
+    return _segment_rows(
+        date,
+        (
+            {
+                "segment_type": segment_type,
+                "segment_value": segment_value,
+                "jobs_active": segment["jobs_active"],
+                "jobs_created": segment["jobs_created"],
+                "salary_count": segment["salary_count"],
+                "avg_salary_eur": segment["salary_sum"] / segment["salary_count"] if segment["salary_count"] else None,
+                "median_salary_eur": approximate_median(segment["histogram"]),
+            }
+            for (segment_type, segment_value), segment in sorted(
+                segments.items(), key=lambda item: (SEGMENT_TYPES.index(item[0][0]), item[0][1])
             )
-
-    return rows
+        ),
+    )
 
 
 def get_market_segments_snapshot(conn: Connection) -> list[dict]:
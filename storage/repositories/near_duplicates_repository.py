@@ -0,0 +1,307 @@
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+
+from app.domain.jobs.near_duplicates import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    compute_band_hashes,
+    compute_minhash_signature,
+    estimate_similarity,
+)
+from storage.db_engine import engine_getter
+
+get_engine = engine_getter("maintenance")
+
+
+def upsert_job_signatures(conn: Connection, rows: list[dict]) -> int:
+    """
+    Stores MinHash signatures and replaces their LSH band rows.
+
+    Each row needs `job_id`, `job_fingerprint` and `signature`. A changed signature
+    resets `checked_at`, so the lifecycle pass re-evaluates the job.
+    Returns the number of signatures written.
+    """
+    if not rows:
+        return 0
+
+    job_ids = [row["job_id"] for row in rows]
+
+    conn.execute(
+        text("""
+            INSERT INTO job_signatures (job_id, job_fingerprint, signature, created_at, updated_at)
+            VALUES (:job_id, :job_fingerprint, :signature, NOW(), NOW())
+            ON CONFLICT (job_id) DO UPDATE SET
+                job_fingerprint = excluded.job_fingerprint,
+                signature = excluded.signature,
+                near_duplicate_of = NULL,
+                near_duplicate_similarity = NULL,
+                checked_at = NULL,
+                updated_at = NOW()
+        """),
+        [
+            {
+                "job_id": row["job_id"],
+                "job_fingerprint": row["job_fingerprint"],
+                "signature": list(row["signature"]),
+            }
+            for row in rows
+        ],
+    )
+
+    conn.execute(
+        text("DELETE FROM job_signature_bands WHERE job_id IN :job_ids").bindparams(
+            bindparam("job_ids", expanding=True)
+        ),
+        {"job_ids": job_ids},
+    )
+
+    band_rows = [
+        {"band_index": band_index, "band_hash": band_hash, "job_id": row["job_id"]}
+        for row in rows
+        for band_index, band_hash in enumerate(compute_band_hashes(row["signature"]))
+    ]
+    conn.execute(
+        text("""
+            INSERT INTO job_signature_bands (band_index, band_hash, job_id)
+            VALUES (:band_index, :band_hash, :job_id)
+            ON CONFLICT DO NOTHING
+        """),
+        band_rows,
+    )
+    return len(rows)
+
+
+def delete_job_signatures(conn: Connection, job_ids: list[str]) -> None:
+    """Removes jobs from the near-duplicate index (e.g. text became too short to sign)."""
+    if not job_ids:
+        return
+
+    for table in ("job_signature_bands", "job_signatures"):
+        conn.execute(
+            text(f"DELETE FROM {table} WHERE job_id IN :job_ids").bindparams(bindparam("job_ids", expanding=True)),
+            {"job_ids": job_ids},
+        )
+
+
+def sync_job_signatures(conn: Connection, jobs: list[dict]) -> int:
+    """
+    Computes and stores signatures for jobs whose content is new or changed.
+
+    Each item needs `job_id`, `job_fingerprint`, `title` and `description`.
+    Callers are expected to pass only new or re-fingerprinted jobs; unchanged jobs
+    keep their existing signature.
+    """
+    rows = []
+    unsigned_job_ids = []
+    for job in jobs:
+        signature = compute_minhash_signature(job.get("description"), title=job.get("title"))
+        if signature is None:
+            unsigned_job_ids.append(job["job_id"])
+            continue
+        rows.append(
+            {
+                "job_id": job["job_id"],
+                "job_fingerprint": job["job_fingerprint"],
+                "signature": signature,
+            }
+        )
+
+    delete_job_signatures(conn, unsigned_job_ids)
+    return upsert_job_signatures(conn, rows)
+
+
+def _load_signatures(conn: Connection, job_ids: list[str]) -> dict[str, list[int]]:
+    if not job_ids:
+        return {}
+
+    stmt = text("SELECT job_id, signature FROM job_signatures WHERE job_id IN :job_ids").bindparams(
+        bindparam("job_ids", expanding=True)
+    )
+    return {str(row[0]): list(row[1]) for row in conn.execute(stmt, {"job_ids": job_ids})}
+
+
+def find_near_duplicates(
+    conn: Connection,
+    job_ids: list[str],
+    *,
+    threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+) -> dict[str, list[dict]]:
+    """
+    Batch near-duplicate lookup for already indexed jobs.
+
+    Candidates come from the band index (jobs sharing at least one LSH band),
+    then get verified against the full signature. Returns
+    {job_id: [{"job_id": candidate_id, "similarity": float}, ...]} sorted by
+    descending similarity; jobs without matches are omitted.
+    """
+    if not job_ids:
+        return {}
+
+    candidate_stmt = text("""
+        SELECT DISTINCT src.job_id, cand.job_id AS candidate_id
+        FROM job_signature_bands src
+        JOIN job_signature_bands cand
+          ON cand.band_index = src.band_index
+         AND cand.band_hash = src.band_hash
+         AND cand.job_id <> src.job_id
+        WHERE src.job_id IN :job_ids
+    """).bindparams(bindparam("job_ids", expanding=True))
+    pairs = [(str(row[0]), str(row[1])) for row in conn.execute(candidate_stmt, {"job_ids": list(job_ids)})]
+    if not pairs:
+        return {}
+
+    signatures = _load_signatures(conn, list({job_id for pair in pairs for job_id in pair}))
+
+    matches: dict[str, list[dict]] = {}
+    for job_id, candidate_id in pairs:
+        similarity = estimate_similarity(signatures.get(job_id, []), signatures.get(candidate_id, []))
+        if similarity >= threshold:
+            matches.setdefault(job_id, []).append({"job_id": candidate_id, "similarity": similarity})
+
+    for candidates in matches.values():
+        candidates.sort(key=lambda item: (-item["similarity"], item["job_id"]))
+    return matches
+
+
+def find_near_duplicates_for_text(
+    conn: Connection,
+    description: str | None,
+    *,
+    title: str | None = None,
+    threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    exclude_job_id: str | None = None,
+) -> list[dict]:
+    """
+    Incremental lookup for a single (possibly not yet persisted) job text.
+    Returns [{"job_id": str, "similarity": float}, ...] sorted by descending similarity.
+    """
+    signature = compute_minhash_signature(description, title=title)
+    if signature is None:
+        return []
+
+    band_hashes = compute_band_hashes(signature)
+    rows = conn.execute(
+        text("""
+            SELECT DISTINCT b.job_id
+            FROM unnest(CAST(:band_indexes AS SMALLINT[]), CAST(:band_hashes AS BIGINT[])) AS q(band_index, band_hash)
+            JOIN job_signature_bands b
+              ON b.band_index = q.band_index
+             AND b.band_hash = q.band_hash
+        """),
+        {"band_indexes": list(range(len(band_hashes))), "band_hashes": band_hashes},
+    ).fetchall()
+    candidate_ids = [str(row[0]) for row in rows if str(row[0]) != exclude_job_id]
+
+    results = []
+    for candidate_id, candidate_signature in _load_signatures(conn, candidate_ids).items():
+        similarity = estimate_similarity(signature, candidate_signature)
+        if similarity >= threshold:
+            results.append({"job_id": candidate_id, "similarity": similarity})
+
+    results.sort(key=lambda item: (-item["similarity"], item["job_id"]))
+    return results
+
+
+def get_jobs_missing_signatures(conn: Connection, *, after_job_id: str = "", limit: int = 500) -> list[dict]:
+    """Keyset-paginated scan of jobs that are not in the near-duplicate index yet."""
+    rows = (
+        conn.execute(
+            text("""
+                SELECT j.job_id, j.job_fingerprint, j.title, t.description
+                FROM jobs j
+                LEFT JOIN job_texts t ON t.job_id = j.job_id
+                WHERE j.job_id > :after_job_id
+                  AND NOT EXISTS (SELECT 1 FROM job_signatures s WHERE s.job_id = j.job_id)
+                ORDER BY j.job_id
+                LIMIT :limit
+            """),
+            {"after_job_id": after_job_id, "limit": limit},
+        )
+        .mappings()
+        .all()
+    )
+    return [dict(row) for row in rows]
+
+
+def link_near_duplicates_due_to_lifecycle(
+    *,
+    threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    batch_size: int = 500,
+) -> int:
+    """
+    Links freshly (re)signed jobs to the earliest-seen near-duplicate, if any.
+
+    Only signatures with `checked_at IS NULL` are evaluated, so a tick without new
+    content costs a single index probe. Candidates are restricted to jobs seen
+    before the evaluated one and the earliest-seen of them above the threshold wins,
+    however similar the others are, which keeps the original posting as the link target.
+    Returns the number of jobs linked to a near-duplicate.
+    """
+    engine = get_engine()
+    total_linked = 0
+    while True:
+        with engine.begin() as conn:
+            job_ids = [
+                str(row[0])
+                for row in conn.execute(
+                    text("""
+                        SELECT job_id
+                        FROM job_signatures
+                        WHERE checked_at IS NULL
+                        ORDER BY updated_at
+                        LIMIT :batch_size
+                        FOR UPDATE SKIP LOCKED
+                    """),
+                    {"batch_size": batch_size},
+                )
+            ]
+            if not job_ids:
+                break
+
+            matches = find_near_duplicates(conn, job_ids, threshold=threshold)
+
+            involved_ids = set(job_ids) | {c["job_id"] for candidates in matches.values() for c in candidates}
+            seen_stmt = text("SELECT job_id, first_seen_at FROM jobs WHERE job_id IN :job_ids").bindparams(
+                bindparam("job_ids", expanding=True)
+            )
+            first_seen = {str(row[0]): row[1] for row in conn.execute(seen_stmt, {"job_ids": list(involved_ids)})}
+
+            updates = []
+            for job_id in job_ids:
+                own_key = (first_seen.get(job_id), job_id)
+                best = None
+                for candidate in matches.get(job_id, []):
+                    candidate_seen = first_seen.get(candidate["job_id"])
+                    if candidate_seen is None or own_key[0] is None:
+                        continue
+                    if (candidate_seen, candidate["job_id"]) >= own_key:
+                        continue
+                    if best is None or (candidate_seen, candidate["job_id"]) < (
+                        first_seen[best["job_id"]],
+                        best["job_id"],
+                    ):
+                        best = candidate
+
+                updates.append(
+                    {
+                        "job_id": job_id,
+                        "near_duplicate_of": best["job_id"] if best else None,
+                        "near_duplicate_similarity": best["similarity"] if best else None,
+                    }
+                )
+                if best:
+                    total_linked += 1
+
+            conn.execute(
+                text("""
+                    UPDATE job_signatures
+                    SET near_duplicate_of = :near_duplicate_of,
+                        near_duplicate_similarity = :near_duplicate_similarity,
+                        checked_at = NOW()
+                    WHERE job_id = :job_id
+                """),
+                updates,
+            )
+
+        if len(job_ids) < batch_size:
+            break
+    return total_linked
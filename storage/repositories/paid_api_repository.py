@@ -1,20 +1,18 @@
-from datetime import date
+from datetime import date, datetime
 
 from sqlalchemy import text
 
-from storage.db_engine import get_engine
-
-_engine = None
-
-
-def _get_engine():
-    global _engine
-    if _engine is None:
-        _engine = get_engine()
-    return _engine
-
-
-_PAID_JOB_SELECT = """
+from storage.common import (
+    JOB_DESCRIPTION_SQL,
+    JOB_LAST_SEEN_SQL,
+    _job_search_candidate_limit,
+    _job_search_params,
+    _job_search_where,
+)
+from storage.db_engine import get_read_engine
+from storage.count_strategy import count_rows
+
+_PAID_JOB_SELECT = f"""
     SELECT
         job_id,
         source,
@@ -28,7 +26,7 @@ _PAID_JOB_SELECT = """
         compliance_status,
         compliance_score,
         job_quality_score AS quality_score,
-        description,
+        {JOB_DESCRIPTION_SQL} AS description,
         source_department,
         job_family,
         job_role,
@@ -41,7 +39,7 @@ _PAID_JOB_SELECT = """
         salary_min_eur,
         salary_max_eur,
         first_seen_at,
-        last_seen_at
+        {JOB_LAST_SEEN_SQL.format(t="jobs")} AS last_seen_at
     FROM jobs
 """
 
@@ -64,7 +62,8 @@ def _build_paid_jobs_where(
     specialization: str | None,
     first_seen_after: date | None,
     first_seen_before: date | None,
-) -> tuple[str, dict]:
+) -> tuple[list[str], dict]:
+    """Filter clauses (without the `q` match, see `_job_search_where`) and their params."""
     clauses: list[str] = []
     params: dict = {}
     n = 0
@@ -129,11 +128,11 @@ def _build_paid_jobs_where(
         clauses.append(f"first_seen_at < {_p(first_seen_before)}::timestamptz + INTERVAL '1 day'")
 
     if q:
-        clauses.append("(title ILIKE :q_like OR company_name ILIKE :q_like)")
-        params["q_like"] = f"%{q}%"
+        # Full-text match without the typo fallback: API clients get a deterministic filter,
+        # and ordering stays first_seen_at so cursors keep working.
+        params.update(_job_search_params(q))
 
-    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
-    return where, params
+    return clauses, params
 
 
 def get_paid_api_jobs(
@@ -156,6 +155,7 @@ def get_paid_api_jobs(
     first_seen_before: date | None = None,
     limit: int = 20,
     offset: int = 0,
+    after: tuple[datetime, str] | None = None,
 ) -> tuple[list[dict], int]:
     """Return paginated full-field jobs for the paid API.
 
@@ -163,11 +163,14 @@ def get_paid_api_jobs(
         All filter args map directly to DB column filters.
         limit: Max rows to return (1–100).
         offset: Row offset for pagination.
+        after: (first_seen_at, job_id) of the previous page's last row — keyset
+            pagination that stays cheap for deep pages (full-dataset mirroring).
 
     Returns:
-        Tuple of (list of job dicts, total matching count).
+        Tuple of (list of job dicts, total matching count). The total is a `RowCount`
+        that is estimated for large result sets (`total.is_estimate`).
     """
-    where, params = _build_paid_jobs_where(
+    filters, params = _build_paid_jobs_where(
         status=status,
         q=q,
         company=company,
@@ -186,17 +189,33 @@ def get_paid_api_jobs(
         first_seen_before=first_seen_before,
     )
 
+    count_params = dict(params)
+    where = _job_search_where(filters, q)
+
+    page_filters = list(filters)
+    if after is not None:
+        page_filters.append("(first_seen_at, job_id) < (:after_first_seen_at, :after_job_id)")
+        params["after_first_seen_at"], params["after_job_id"] = after
+    # The page holds at most the first offset + limit matches in first_seen_at order. The
+    # candidate floor keeps the planner off "walk first_seen_at and stop early" plans for
+    # small pages, which read the whole table when the term is rare.
+    page_where = _job_search_where(page_filters, q, limit_sql=":q_candidates")
+
     params["limit"] = limit
     params["offset"] = offset
+    params["q_candidates"] = _job_search_candidate_limit(limit, offset)
 
-    data_sql = f"{_PAID_JOB_SELECT}{where}\nORDER BY first_seen_at DESC\nLIMIT :limit OFFSET :offset"
-    count_sql = f"SELECT COUNT(*) FROM jobs {where}"
+    data_sql = f"{_PAID_JOB_SELECT}{page_where}\nORDER BY first_seen_at DESC, job_id DESC\nLIMIT :limit OFFSET :offset"
 
-    engine = _get_engine()
+    engine = get_read_engine()
     with engine.connect() as conn:
         rows = conn.execute(text(data_sql), params).mappings().all()
-        total = conn.execute(
-            text(count_sql), {k: v for k, v in params.items() if k not in ("limit", "offset")}
-        ).scalar_one()
+        total = count_rows(
+            conn,
+            "jobs",
+            where,
+            count_params,
+            probe_where_clause=_job_search_where(filters, q, limit_sql=":_count_probe_limit", ordered=False),
+        )
 
-    return [dict(row) for row in rows], int(total)
+    return [dict(row) for row in rows], total
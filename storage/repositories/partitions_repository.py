@@ -0,0 +1,131 @@
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Monthly RANGE-partitioned history tables: partition key column and its type.
+PARTITIONED_TABLES = {
+    "job_snapshots": ("captured_at", "TIMESTAMPTZ"),
+    "compliance_reports": ("report_month", "DATE"),
+}
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def _month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _bound(month: date) -> str:
+    # Explicit UTC offset: timestamptz bounds must not depend on the session TimeZone.
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def _check_table(table: str) -> tuple[str, str]:
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"Not a partitioned table: {table}")
+    return PARTITIONED_TABLES[table]
+
+
+def list_monthly_partitions(conn: Connection, table: str) -> dict[date, str]:
+    """Attached monthly partitions of `table`, keyed by the first day of the month."""
+    _check_table(table)
+    rows = conn.execute(
+        text("""
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = :table
+        """),
+        {"table": table},
+    ).scalars()
+    partitions = {}
+    for name in rows:
+        match = _PARTITION_SUFFIX.search(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def ensure_monthly_partitions(
+    conn: Connection,
+    table: str,
+    *,
+    months_ahead: int = 3,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Creates the partitions for the current month through `months_ahead` months
+    ahead. Rows that already landed in `<table>_default` for a new month are
+    moved into its partition first (attaching would fail otherwise).
+    Returns the names of the created partitions.
+    """
+    key, key_type = _check_table(table)
+    current = _month_start(today or _utc_today())
+    existing = list_monthly_partitions(conn, table)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(current, offset)
+        if month in existing:
+            continue
+        name = partition_name(table, month)
+        bounds = {"lower": _bound(month), "upper": _bound(_add_months(month, 1))}
+        conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        conn.execute(
+            text(f"""
+                WITH moved AS (
+                    DELETE FROM {table}_default
+                    WHERE {key} >= CAST(:lower AS {key_type}) AND {key} < CAST(:upper AS {key_type})
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """),
+            bounds,
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+def apply_partition_retention(
+    conn: Connection,
+    table: str,
+    *,
+    retention_months: int,
+    detach_only: bool = False,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Detaches every monthly partition that ends before the retention window
+    (the current month plus `retention_months` full months back) and drops it
+    unless `detach_only` is set — detached tables stay around for archiving.
+    Returns the names of the affected partitions.
+    """
+    _check_table(table)
+    cutoff = _add_months(_month_start(today or _utc_today()), -retention_months)
+    expired = [name for month, name in sorted(list_monthly_partitions(conn, table).items()) if month < cutoff]
+    for name in expired:
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if not detach_only:
+            conn.execute(text(f"DROP TABLE {name}"))
+    return expired
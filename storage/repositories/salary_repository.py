@@ -1,6 +1,8 @@
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
 
+from storage.common import JOB_DESCRIPTION_SQL, execute_unnest, unnest_rows
+
 
 def insert_salary_parsing_case(
     conn: Connection,
@@ -56,6 +58,32 @@ def insert_salary_parsing_case(
     )
 
 
+_CASE_COLUMNS = {
+    "job_id": "TEXT",
+    "salary_raw": "TEXT",
+    "description_fragment": "TEXT",
+    "parser_confidence": "INTEGER",
+    "extracted_min": "INTEGER",
+    "extracted_max": "INTEGER",
+    "extracted_currency": "TEXT",
+}
+_CASES_INSERT_STMT = text(f"""
+    INSERT INTO salary_parsing_cases (
+        job_id,
+        salary_raw,
+        description_fragment,
+        parser_confidence,
+        extracted_min,
+        extracted_max,
+        extracted_currency,
+        status,
+        created_at
+    )
+    SELECT r.*, 'needs_review', NOW() FROM {unnest_rows(_CASE_COLUMNS)}
+    ON CONFLICT DO NOTHING
+""")
+
+
 def insert_salary_parsing_cases(conn: Connection, cases: list[dict]) -> None:
     """
     Wersja bulk (wsadowa) dla zapisu trudnych przypadków ekstrakcji wynagrodzenia.
@@ -63,41 +91,16 @@ def insert_salary_parsing_cases(conn: Connection, cases: list[dict]) -> None:
     if not cases:
         return
 
-    stmt = text("""
-        INSERT INTO salary_parsing_cases (
-            job_id,
-            salary_raw,
-            description_fragment,
-            parser_confidence,
-            extracted_min,
-            extracted_max,
-            extracted_currency,
-            status,
-            created_at
-        ) VALUES (
-            :job_id,
-            :salary_raw,
-            :description_fragment,
-            :parser_confidence,
-            :extracted_min,
-            :extracted_max,
-            :extracted_currency,
-            'needs_review',
-            NOW()
-        )
-        ON CONFLICT DO NOTHING
-    """)
-
-    conn.execute(stmt, cases)
+    execute_unnest(conn, _CASES_INSERT_STMT, cases, _CASE_COLUMNS)
 
 
 def get_jobs_with_missing_salary(conn: Connection, limit: int) -> list[dict]:
     """
     Fetches jobs that are missing salary data (both min and max are NULL).
     """
-    query = text("""
+    query = text(f"""
         SELECT
-            job_id, title, description
+            job_id, title, {JOB_DESCRIPTION_SQL} AS description
         FROM jobs
         WHERE salary_min IS NULL AND salary_max IS NULL
         ORDER BY COALESCE(last_seen_at, '1970-01-01T00:00:00+00:00') DESC
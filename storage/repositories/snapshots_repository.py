@@ -1,6 +1,132 @@
-from sqlalchemy import text
+from datetime import datetime
+
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Connection
 
+from storage.common import execute_unnest, unnest_rows
+
+# Snapshots are stored as field-level deltas. A row with a NULL delta_mask is a
+# keyframe holding every field; otherwise bit i of delta_mask marks SNAPSHOT_FIELDS[i]
+# as changed since the job's previous snapshot and the other fields are stored NULL.
+# The first snapshot of a job in each UTC month (= partition) is a keyframe, so a
+# chain never spans partitions and retention can drop any month, plus every
+# SNAPSHOT_KEYFRAME_INTERVAL-th snapshot within a month to bound decoding.
+SNAPSHOT_FIELDS = (
+    "job_fingerprint",
+    "title",
+    "company_name",
+    "salary_min",
+    "salary_max",
+    "salary_currency",
+    "remote_class",
+    "geo_class",
+)
+SNAPSHOT_KEYFRAME_INTERVAL = 8
+
+_SNAPSHOT_COLUMNS = {
+    "job_id": "TEXT",
+    "delta_mask": "SMALLINT",
+    "job_fingerprint": "TEXT",
+    "title": "TEXT",
+    "company_name": "TEXT",
+    "salary_min": "INTEGER",
+    "salary_max": "INTEGER",
+    "salary_currency": "TEXT",
+    "remote_class": "TEXT",
+    "geo_class": "TEXT",
+}
+_SNAPSHOTS_INSERT_SQL = f"""
+    INSERT INTO job_snapshots ({", ".join(_SNAPSHOT_COLUMNS)}, captured_at)
+    SELECT r.*, CAST(:captured_at AS TIMESTAMPTZ) FROM {unnest_rows(_SNAPSHOT_COLUMNS)}
+"""
+_SNAPSHOT_ROW_COLUMNS = ("snapshot_id", "job_id", "captured_at", "delta_mask", *SNAPSHOT_FIELDS)
+_MONTH_START_SQL = "date_trunc('month', {ts} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+
+
+def _delta_row(state: dict, month_chain: list[dict]) -> dict:
+    """Storage row for `state` after `month_chain`, the job's earlier snapshots this month."""
+    if len(month_chain) % SNAPSHOT_KEYFRAME_INTERVAL == 0:
+        return {"delta_mask": None, **{field: state.get(field) for field in SNAPSHOT_FIELDS}}
+    previous = month_chain[-1]
+    row = {"delta_mask": 0}
+    for bit, field in enumerate(SNAPSHOT_FIELDS):
+        row[field] = None
+        if state.get(field) != previous.get(field):
+            row["delta_mask"] |= 1 << bit
+            row[field] = state.get(field)
+    return row
+
+
+def _decode_snapshots(rows) -> list[dict]:
+    """Full states of one job's snapshot rows, in captured_at order."""
+    states = []
+    state = dict.fromkeys(SNAPSHOT_FIELDS)
+    for row in rows:
+        mask = row["delta_mask"]
+        state = {
+            field: row[field] if mask is None or mask & (1 << bit) else state[field]
+            for bit, field in enumerate(SNAPSHOT_FIELDS)
+        }
+        states.append({"snapshot_id": row["snapshot_id"], "captured_at": row["captured_at"], **state})
+    return states
+
+
+def _encode_snapshots(conn: Connection, snapshots: list[dict]) -> tuple[datetime, list[dict]]:
+    """
+    (captured_at, storage rows) of `snapshots`, delta-encoded against this month's chain.
+    Writers of the same job take its advisory lock (in key order, so overlapping batches
+    cannot deadlock) before reading the chain, so each delta follows the tail the
+    previous writer committed. captured_at is read after the locks rather than NOW(),
+    the transaction start, which could sort a row before the tail it was encoded against.
+    """
+    job_ids = sorted({s["job_id"] for s in snapshots})
+    conn.execute(
+        text("""
+            SELECT pg_advisory_xact_lock(lock_key)
+            FROM (
+                SELECT DISTINCT hashtext(job_id) AS lock_key
+                FROM unnest(CAST(:job_ids AS TEXT[])) AS job_id
+                ORDER BY lock_key
+            ) keys
+        """),
+        {"job_ids": job_ids},
+    )
+    captured_at = conn.execute(text("SELECT statement_timestamp()")).scalar_one()
+    rows = conn.execute(
+        text(f"""
+            SELECT {", ".join(_SNAPSHOT_ROW_COLUMNS)}
+            FROM job_snapshots
+            WHERE job_id IN :job_ids AND captured_at >= {_MONTH_START_SQL.format(ts="CAST(:captured_at AS TIMESTAMPTZ)")}
+            ORDER BY job_id, captured_at, snapshot_id
+        """).bindparams(bindparam("job_ids", expanding=True)),
+        {"job_ids": job_ids, "captured_at": captured_at},
+    ).mappings()
+    chains: dict[str, list[dict]] = {}
+    for row in rows:
+        chains.setdefault(row["job_id"], []).append(row)
+    month_chains = {job_id: _decode_snapshots(chain) for job_id, chain in chains.items()}
+
+    encoded = []
+    for snapshot in snapshots:
+        chain = month_chains.setdefault(snapshot["job_id"], [])
+        encoded.append({"job_id": snapshot["job_id"], **_delta_row(snapshot, chain)})
+        chain.append(snapshot)
+    return captured_at, encoded
+
+
+def insert_job_snapshots(conn: Connection, snapshots: list[dict]) -> int:
+    """
+    Inserts snapshots (job_id plus SNAPSHOT_FIELDS, the state being replaced) in one
+    statement, delta-encoded against each job's previous snapshot this month. Several
+    snapshots of the same job chain in list order. Returns the number inserted.
+    """
+    if not snapshots:
+        return 0
+    captured_at, encoded = _encode_snapshots(conn, snapshots)
+    return execute_unnest(
+        conn, text(_SNAPSHOTS_INSERT_SQL), encoded, _SNAPSHOT_COLUMNS, params={"captured_at": captured_at}
+    )
+
 
 def insert_job_snapshot(
     conn: Connection,
@@ -18,46 +144,84 @@ def insert_job_snapshot(
     Wstawia nowy zrzut historii ogłoszenia do tabeli job_snapshots.
     Zaprojektowane w celu śledzenia zmian tytułów oraz widełek wynagrodzeń w czasie.
     """
-    stmt = text("""
-        INSERT INTO job_snapshots (
-            job_id,
-            job_fingerprint,
-            title,
-            company_name,
-            salary_min,
-            salary_max,
-            salary_currency,
-            remote_class,
-            geo_class,
-            captured_at
-        ) VALUES (
-            :job_id,
-            :job_fingerprint,
-            :title,
-            :company_name,
-            :salary_min,
-            :salary_max,
-            :salary_currency,
-            :remote_class,
-            :geo_class,
-            NOW()
-        )
+    captured_at, (encoded,) = _encode_snapshots(
+        conn,
+        [
+            dict(
+                job_id=job_id,
+                job_fingerprint=job_fingerprint,
+                title=title,
+                company_name=company_name,
+                salary_min=salary_min,
+                salary_max=salary_max,
+                salary_currency=salary_currency,
+                remote_class=remote_class,
+                geo_class=geo_class,
+            )
+        ],
+    )
+    stmt = text(f"""
+        INSERT INTO job_snapshots ({", ".join(_SNAPSHOT_COLUMNS)}, captured_at)
+        VALUES ({", ".join(f":{column}" for column in _SNAPSHOT_COLUMNS)}, :captured_at)
         RETURNING snapshot_id;
     """)
 
-    result = conn.execute(
-        stmt,
-        dict(
-            job_id=job_id,
-            job_fingerprint=job_fingerprint,
-            title=title,
-            company_name=company_name,
-            salary_min=salary_min,
-            salary_max=salary_max,
-            salary_currency=salary_currency,
-            remote_class=remote_class,
-            geo_class=geo_class,
-        ),
-    )
+    result = conn.execute(stmt, {**encoded, "captured_at": captured_at})
     row = result.fetchone()
     return row[0] if row else 0
+
+
+def get_job_history(conn: Connection, job_id: str) -> list[dict]:
+    """Decoded snapshots of a job (snapshot_id, captured_at, SNAPSHOT_FIELDS), oldest first."""
+    rows = conn.execute(
+        text(f"""
+            SELECT {", ".join(_SNAPSHOT_ROW_COLUMNS)}
+            FROM job_snapshots
+            WHERE job_id = :job_id
+            ORDER BY captured_at, snapshot_id
+        """),
+        {"job_id": job_id},
+    ).mappings()
+    return _decode_snapshots(rows)
+
+
+def get_job_state_at(conn: Connection, job_id: str, at: datetime) -> dict | None:
+    """
+    SNAPSHOT_FIELDS of a job as of `at`, or None if the job was first seen later.
+    A snapshot keeps the state replaced at its captured_at, so the state at `at` is
+    the first snapshot captured after it, or the current jobs row if there is none.
+    Only that snapshot's month is read: its keyframe is in the same partition.
+    """
+    current = (
+        conn.execute(
+            text(f"SELECT first_seen_at, {', '.join(SNAPSHOT_FIELDS)} FROM jobs WHERE job_id = :job_id"),
+            {"job_id": job_id},
+        )
+        .mappings()
+        .first()
+    )
+    if current is None or current["first_seen_at"] > at:
+        return None
+
+    rows = conn.execute(
+        text(f"""
+            WITH target AS (
+                SELECT snapshot_id, captured_at
+                FROM job_snapshots
+                WHERE job_id = :job_id AND captured_at > :at
+                ORDER BY captured_at, snapshot_id
+                LIMIT 1
+            )
+            SELECT {", ".join(f"s.{column}" for column in _SNAPSHOT_ROW_COLUMNS)}
+            FROM job_snapshots s, target t
+            WHERE s.job_id = :job_id
+              AND s.captured_at >= {_MONTH_START_SQL.format(ts="t.captured_at")}
+              AND (s.captured_at, s.snapshot_id) <= (t.captured_at, t.snapshot_id)
+            ORDER BY s.captured_at, s.snapshot_id
+        """),
+        {"job_id": job_id, "at": at},
+    ).mappings()
+    history = _decode_snapshots(rows)
+    if not history:
+        return {field: current[field] for field in SNAPSHOT_FIELDS}
+    return {field: history[-1][field] for field in SNAPSHOT_FIELDS}
@@ -1,28 +1,138 @@
+from datetime import datetime
+
 from sqlalchemy import text
-from storage.db_engine import get_engine
+from sqlalchemy.engine import Connection
+from storage.db_engine import get_read_engine
+
+# Counter -> (table, column whose hour buckets the row); kept by the triggers of
+# migration f9b5d1e3a4c6.
+SYSTEM_COUNTERS = {
+    "jobs": ("jobs", "first_seen_at"),
+    "companies": ("companies", "created_at"),
+    "company_ats": ("company_ats", "created_at"),
+}
+
+# Hourly buckets older than this are folded into one '-infinity' bucket per counter.
+SYSTEM_COUNTERS_KEEP_HOURS = 48
+
+# Marker row written by reconcile_system_counters: its bucket_hour is the hour of
+# the last exact recount. Not a counted table, so metrics never sum it.
+SYSTEM_COUNTERS_RECONCILED = "reconciled"
+
+_BUCKET_SQL = """
+    CASE
+        WHEN {ts} IS NULL OR {ts} < date_trunc('hour', NOW() - :keep_hours * INTERVAL '1 hour', 'UTC')
+            THEN CAST('-infinity' AS TIMESTAMPTZ)
+        ELSE date_trunc('hour', {ts}, 'UTC')
+    END
+"""
 
 
 def get_system_metrics() -> dict:
-    engine = get_engine()
+    """
+    Row totals and last-24h counts from system_counters (the 24h window is
+    rounded down to a whole hour), plus the latest job sighting: jobs.last_seen_at
+    or a pending job_sightings row, through idx_jobs_last_seen and
+    idx_job_sightings_last_seen.
+    """
+    engine = get_read_engine()
     query = """
-        SELECT 
-            (SELECT COUNT(*) FROM jobs) as jobs_total,
-            (SELECT COUNT(*) FROM jobs WHERE first_seen_at >= NOW() - INTERVAL '24 hours') as jobs_24h,
-            (SELECT COUNT(*) FROM companies) as companies_total,
-            (SELECT COUNT(*) FROM companies WHERE created_at >= NOW() - INTERVAL '24 hours') as companies_24h,
-            (SELECT COUNT(*) FROM company_ats) as company_ats_total,
-            (SELECT COUNT(*) FROM company_ats WHERE created_at >= NOW() - INTERVAL '24 hours') as company_ats_24h,
-            (SELECT MAX(last_seen_at) FROM jobs) as last_tick_at
+        SELECT
+            COALESCE(SUM(delta) FILTER (WHERE counter = 'jobs'), 0) AS jobs_total,
+            COALESCE(SUM(delta) FILTER (WHERE counter = 'jobs' AND bucket_hour >= s.since), 0) AS jobs_24h,
+            COALESCE(SUM(delta) FILTER (WHERE counter = 'companies'), 0) AS companies_total,
+            COALESCE(SUM(delta) FILTER (WHERE counter = 'companies' AND bucket_hour >= s.since), 0) AS companies_24h,
+            COALESCE(SUM(delta) FILTER (WHERE counter = 'company_ats'), 0) AS company_ats_total,
+            COALESCE(SUM(delta) FILTER (WHERE counter = 'company_ats' AND bucket_hour >= s.since), 0) AS company_ats_24h,
+            GREATEST(
+                (SELECT MAX(last_seen_at) FROM jobs),
+                (SELECT MAX(last_seen_at) FROM job_sightings)
+            ) AS last_tick_at
+        FROM (SELECT date_trunc('hour', NOW() - INTERVAL '24 hours', 'UTC') AS since) s
+        LEFT JOIN system_counters ON TRUE
     """
     with engine.connect() as conn:
         row = conn.execute(text(query)).mappings().first()
 
     return {
-        "jobs_total": row["jobs_total"] if row else 0,
-        "jobs_24h": row["jobs_24h"] if row else 0,
-        "companies_total": row["companies_total"] if row else 0,
-        "companies_24h": row["companies_24h"] if row else 0,
-        "company_ats_total": row["company_ats_total"] if row else 0,
-        "company_ats_24h": row["company_ats_24h"] if row else 0,
+        "jobs_total": int(row["jobs_total"]) if row else 0,
+        "jobs_24h": int(row["jobs_24h"]) if row else 0,
+        "companies_total": int(row["companies_total"]) if row else 0,
+        "companies_24h": int(row["companies_24h"]) if row else 0,
+        "company_ats_total": int(row["company_ats_total"]) if row else 0,
+        "company_ats_24h": int(row["company_ats_24h"]) if row else 0,
         "last_tick_at": row["last_tick_at"].isoformat() if row and row["last_tick_at"] else None,
     }
+
+
+def compact_system_counters(conn: Connection) -> int:
+    """
+    Folds the appended deltas into one row per (counter, hour), merging hours
+    older than SYSTEM_COUNTERS_KEEP_HOURS. Deltas committed concurrently are not
+    in this statement's snapshot and are folded next time.
+    Returns the number of rows folded.
+    """
+    return conn.execute(
+        text(f"""
+            WITH drained AS (
+                DELETE FROM system_counters
+                RETURNING counter, bucket_hour, delta
+            ),
+            folded AS (
+                INSERT INTO system_counters (counter, bucket_hour, delta)
+                SELECT counter, {_BUCKET_SQL.format(ts="bucket_hour")}, SUM(delta)
+                FROM drained
+                GROUP BY 1, 2
+                HAVING SUM(delta) <> 0
+            )
+            SELECT COUNT(*) FROM drained
+        """),
+        {"keep_hours": SYSTEM_COUNTERS_KEEP_HOURS},
+    ).scalar_one()
+
+
+def reconcile_system_counters(conn: Connection) -> dict[str, int]:
+    """
+    Replaces the counters with exact counts of the counted tables and stamps the
+    SYSTEM_COUNTERS_RECONCILED marker. Clearing and counting share one statement
+    snapshot, so concurrent writes are counted either here or by their own
+    deltas. Returns the exact total per counter.
+    """
+    counts = " UNION ALL ".join(
+        f"SELECT '{counter}', {_BUCKET_SQL.format(ts=column)}, COUNT(*) FROM {table} GROUP BY 2"
+        for counter, (table, column) in SYSTEM_COUNTERS.items()
+    )
+    rows = conn.execute(
+        text(f"""
+            WITH cleared AS (
+                DELETE FROM system_counters
+            ),
+            counted AS (
+                INSERT INTO system_counters (counter, bucket_hour, delta)
+                {counts}
+                RETURNING counter, delta
+            ),
+            marked AS (
+                INSERT INTO system_counters (counter, bucket_hour, delta)
+                VALUES (:marker, date_trunc('hour', NOW(), 'UTC'), 1)
+            )
+            SELECT counter, SUM(delta) FROM counted GROUP BY counter
+        """),
+        {"keep_hours": SYSTEM_COUNTERS_KEEP_HOURS, "marker": SYSTEM_COUNTERS_RECONCILED},
+    ).all()
+    totals = {counter: 0 for counter in SYSTEM_COUNTERS}
+    totals.update({counter: int(total) for counter, total in rows})
+    return totals
+
+
+def system_counters_reconciled_since(conn: Connection, since: datetime) -> bool:
+    """Whether reconcile_system_counters ran in the hour of `since` or later."""
+    return conn.execute(
+        text("""
+            SELECT EXISTS (
+                SELECT 1 FROM system_counters
+                WHERE counter = :marker AND bucket_hour >= date_trunc('hour', CAST(:since AS TIMESTAMPTZ), 'UTC')
+            )
+        """),
+        {"marker": SYSTEM_COUNTERS_RECONCILED, "since": since},
+    ).scalar_one()
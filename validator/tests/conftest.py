@@ -48,6 +48,8 @@ else:
 # if any modules create an engine at import time we want it pointed at the
 # right database; grab it now so the fixture below can reset state easily.
 from storage.db_engine import get_engine
+from storage.audit_cache import invalidate_audit_cache
+from storage.count_strategy import invalidate_count_cache
 from alembic import command
 from alembic.config import Config
 
@@ -154,10 +156,20 @@ def clean_db(db_engine_setup, request):
         # zwłaszcza na pustych lub małych tabelach. Usuwamy od dzieci do rodziców.
         conn.execute(text("DELETE FROM job_snapshots;"))
         conn.execute(text("DELETE FROM compliance_reports;"))
+        conn.execute(text("DELETE FROM compliance_decisions;"))
+        conn.execute(text("DELETE FROM job_sightings;"))
         conn.execute(text("DELETE FROM job_sources;"))
         conn.execute(text("DELETE FROM jobs;"))
+        conn.execute(text("DELETE FROM market_rollup_deltas;"))
+        conn.execute(text("DELETE FROM market_rollup;"))
         conn.execute(text("DELETE FROM company_ats;"))
         conn.execute(text("DELETE FROM companies;"))
+        conn.execute(text("DELETE FROM company_stats_dirty;"))
+        conn.execute(text("DELETE FROM remote_scope_lookup;"))
+        conn.execute(text("DELETE FROM exchange_rates;"))
+        conn.execute(text("DELETE FROM system_counters;"))
+    invalidate_count_cache()
+    invalidate_audit_cache()
     clean_elapsed = perf_counter() - clean_started
     _db_profile_stats["clean_db_calls"] += 1
     _db_profile_stats["clean_db_total_s"] += clean_elapsed
@@ -285,11 +297,17 @@ class DbFactory:
         data.update(overrides)
 
         # Dynamiczne budowanie zapytania (tylko z kluczy, które faktycznie przekazano do słownika)
-        columns = ", ".join(data.keys())
-        placeholders = ", ".join(f":{k}" for k in data.keys())
+        job_columns = [k for k in data.keys() if k != "description"]
+        columns = ", ".join(job_columns)
+        placeholders = ", ".join(f":{k}" for k in job_columns)
 
         with self.engine.begin() as conn:
             conn.execute(text(f"INSERT INTO jobs ({columns}) VALUES ({placeholders})"), data)
+            # Wiersz job_texts tworzy trigger na jobs; opis trafia tylko tam
+            conn.execute(
+                text("UPDATE job_texts SET description = :description WHERE job_id = :job_id"),
+                {"job_id": job_id, "description": data.get("description")},
+            )
         return data
 
     def create_job_snapshot(self, job_id: str, **overrides) -> dict:
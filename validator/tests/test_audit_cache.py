@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from storage import audit_cache
+from storage.audit_cache import audit_cache_info, cached_audit_query, invalidate_audit_cache
+
+
+def test_cached_audit_query_keys_by_function_and_arguments():
+    calls: list[int] = []
+
+    def trend(days: int = 30) -> list[dict]:
+        calls.append(days)
+        return [{"days": days}]
+
+    before = audit_cache_info()
+    assert cached_audit_query(trend, days=30) == [{"days": 30}]
+    assert cached_audit_query(trend, days=30) == [{"days": 30}]
+    assert cached_audit_query(trend, days=60) == [{"days": 60}]
+    assert cached_audit_query(trend, refresh=True, days=30) == [{"days": 30}]
+
+    after = audit_cache_info()
+    assert calls == [30, 60, 30]
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 3
+
+
+def test_cached_audit_query_expires_and_invalidates_by_age(monkeypatch):
+    calls: list[str] = []
+
+    def stats(name: str) -> str:
+        calls.append(name)
+        return name
+
+    cached_audit_query(stats, "old")
+    cutoff = time.monotonic()
+    cached_audit_query(stats, "new")
+    invalidate_audit_cache(stored_before=cutoff)
+    cached_audit_query(stats, "old")
+    cached_audit_query(stats, "new")
+    assert calls == ["old", "new", "old"]
+
+    monkeypatch.setattr(audit_cache, "AUDIT_CACHE_TTL_SECONDS", -1.0)
+    cached_audit_query(stats, "ttl")
+    cached_audit_query(stats, "ttl")
+    assert calls[-2:] == ["ttl", "ttl"]
+
+
+def test_concurrent_misses_share_one_query():
+    release = threading.Event()
+    calls: list[int] = []
+
+    def slow_stats() -> list[int]:
+        calls.append(1)
+        release.wait(5)
+        return [42]
+
+    results: list[list[int]] = []
+    threads = [threading.Thread(target=lambda: results.append(cached_audit_query(slow_stats))) for _ in range(4)]
+    coalesced_before = audit_cache_info()["coalesced"]
+    for thread in threads:
+        thread.start()
+    while audit_cache_info()["coalesced"] - coalesced_before < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [[42]] * 4
+
+
+def test_failed_query_is_not_cached():
+    calls: list[int] = []
+
+    def flaky() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("statement timeout")
+        return "ok"
+
+    with pytest.raises(RuntimeError):
+        cached_audit_query(flaky)
+    assert cached_audit_query(flaky) == "ok"
+    assert cached_audit_query(flaky) == "ok"
+    assert len(calls) == 2
+
+
+def test_entry_is_dated_by_its_query_start():
+    calls: list[int] = []
+    cutoffs: list[float] = []
+
+    def stats() -> int:
+        calls.append(1)
+        # The tick starts while the query is still running.
+        cutoffs.append(time.monotonic())
+        return len(calls)
+
+    cached_audit_query(stats)
+    invalidate_audit_cache(stored_before=cutoffs[0])
+    assert cached_audit_query(stats) == 2
+
+
+def test_refresh_never_joins_a_plain_query_in_flight():
+    started = threading.Event()
+    release = threading.Event()
+    versions = iter(["before tick", "after tick"])
+
+    def stats() -> str:
+        version = next(versions)
+        if version == "before tick":
+            started.set()
+            release.wait(5)
+        return version
+
+    results: list[str] = []
+    plain = threading.Thread(target=lambda: results.append(cached_audit_query(stats)))
+    plain.start()
+    started.wait(5)
+
+    assert cached_audit_query(stats, refresh=True) == "after tick"
+    release.set()
+    plain.join()
+
+    assert results == ["before tick"]
+    # The slower, earlier query does not replace the refreshed entry.
+    assert cached_audit_query(stats) == "after tick"
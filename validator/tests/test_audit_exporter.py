@@ -98,3 +98,19 @@ def test_run_audit_export_returns_error_on_exception(mock_storage_client, mock_t
     assert result["status"] == "error"
     assert "db down" in result["error"]
     mock_storage_client.return_value.bucket.return_value.blob.return_value.upload_from_string.assert_not_called()
+
+
+@patch("google.cloud.storage.Client")
+def test_run_audit_export_reads_on_the_maintenance_profile(mock_storage_client, monkeypatch):
+    from app.workers import audit_exporter
+    from storage import db_engine
+
+    monkeypatch.setenv("INTERNAL_AUDIT_BUCKET", "test-audit-bucket")
+    monkeypatch.delenv("DATABASE_READ_URL", raising=False)
+    monkeypatch.setattr(db_engine, "_read_engines", {})
+    engines = []
+    monkeypatch.setattr(audit_exporter, "_build_snapshot", lambda: engines.append(db_engine.get_read_engine()) or {})
+
+    assert audit_exporter.run_audit_export()["status"] == "ok"
+    assert engines == [db_engine.get_engine("maintenance")]
+    assert db_engine.get_read_engine() is db_engine.get_engine("api")
@@ -15,20 +15,28 @@ def test_backfill_missing_compliance_classes():
     with engine.begin() as conn:
         conn.execute(
             text("""
-                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, description, remote_scope, source, compliance_status)
+                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, remote_scope, source, compliance_status)
                 VALUES 
-                ('id1', 'job1', 'fp1', 'Software Engineer', 'Remote job in EU', 'EU_ONLY', 'source1', NULL),
-                ('id2', 'job2', 'fp2', 'Product Manager', 'Office job', 'OFFICE', 'source2', NULL)
+                ('id1', 'job1', 'fp1', 'Software Engineer', 'EU_ONLY', 'source1', NULL),
+                ('id2', 'job2', 'fp2', 'Product Manager', 'OFFICE', 'source2', NULL)
             """)
         )
         # Outdated policy
         conn.execute(
             text("""
-                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, description, remote_scope, source, compliance_status, compliance_score, policy_version)
+                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, remote_scope, source, compliance_status, compliance_score, policy_version)
                 VALUES 
-                ('id3', 'job3', 'fp3', 'Designer', 'Remote job', 'REMOTE', 'source3', 'active', 100, 'v0')
+                ('id3', 'job3', 'fp3', 'Designer', 'REMOTE', 'source3', 'active', 100, 'v0')
             """)
         )
+        conn.execute(
+            text("UPDATE job_texts SET description = :description WHERE job_id = :job_id"),
+            [
+                {"job_id": "id1", "description": "Remote job in EU"},
+                {"job_id": "id2", "description": "Office job"},
+                {"job_id": "id3", "description": "Remote job"},
+            ],
+        )
 
     # 2. Run backfill
     updated_count = backfill_missing_compliance_classes(limit=10)
@@ -53,10 +61,11 @@ def test_backfill_endpoint():
     with engine.begin() as conn:
         conn.execute(
             text("""
-                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, description, remote_scope, source, compliance_status)
-                VALUES ('id1', 'job1', 'fp1', 'DevOps', 'Cloud', 'REMOTE', 'source1', NULL)
+                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, remote_scope, source, compliance_status)
+                VALUES ('id1', 'job1', 'fp1', 'DevOps', 'REMOTE', 'source1', NULL)
             """)
         )
+        conn.execute(text("UPDATE job_texts SET description = 'Cloud' WHERE job_id = 'id1'"))
 
     # 2. Call endpoint
     response = client.post("/internal/backfill-compliance?limit=10")
@@ -26,10 +26,10 @@ def test_backfill_missing_departments(monkeypatch):
         )
         conn.execute(
             text("""
-                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, description, source, source_job_id, source_department, company_id, first_seen_at)
+                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, source, source_job_id, source_department, company_id, first_seen_at)
                 VALUES 
-                ('job_dept_1', 'uid_dept_1', 'fp_dept_1', 'Backend Engineer', 'desc', 'dummy_ats:dept-co', 'src_1', NULL, :company_id, NOW()),
-                ('job_dept_2', 'uid_dept_2', 'fp_dept_2', 'Frontend', 'desc', 'dummy_ats:dept-co', 'src_2', 'Already Set', :company_id, NOW())
+                ('job_dept_1', 'uid_dept_1', 'fp_dept_1', 'Backend Engineer', 'dummy_ats:dept-co', 'src_1', NULL, :company_id, NOW()),
+                ('job_dept_2', 'uid_dept_2', 'fp_dept_2', 'Frontend', 'dummy_ats:dept-co', 'src_2', 'Already Set', :company_id, NOW())
                 ON CONFLICT DO NOTHING
             """),
             {"company_id": company_id},
@@ -14,13 +14,21 @@ def test_backfill_missing_salary_fields():
     with engine.begin() as conn:
         conn.execute(
             text("""
-                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, description, remote_scope, source, salary_min, salary_max)
+                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, remote_scope, source, salary_min, salary_max)
                 VALUES 
-                ('id1', 'uid1', 'fp1', 'Software Engineer', 'We pay 100k - 120k USD per year', 'EU_ONLY', 'source1', NULL, NULL),
-                ('id2', 'uid2', 'fp2', 'Product Manager', 'Office job, no salary mention', 'OFFICE', 'source2', NULL, NULL),
-                ('id3', 'uid3', 'fp3', 'Designer', 'Already has salary', 'REMOTE', 'source3', 50000, 60000)
+                ('id1', 'uid1', 'fp1', 'Software Engineer', 'EU_ONLY', 'source1', NULL, NULL),
+                ('id2', 'uid2', 'fp2', 'Product Manager', 'OFFICE', 'source2', NULL, NULL),
+                ('id3', 'uid3', 'fp3', 'Designer', 'REMOTE', 'source3', 50000, 60000)
             """)
         )
+        conn.execute(
+            text("UPDATE job_texts SET description = :description WHERE job_id = :job_id"),
+            [
+                {"job_id": "id1", "description": "We pay 100k - 120k USD per year"},
+                {"job_id": "id2", "description": "Office job, no salary mention"},
+                {"job_id": "id3", "description": "Already has salary"},
+            ],
+        )
 
     # 2. Run backfill
     result = backfill_missing_salary_fields(limit=10)
@@ -60,10 +68,11 @@ def test_backfill_salary_endpoint():
     with engine.begin() as conn:
         conn.execute(
             text("""
-                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, description, remote_scope, source, salary_min, salary_max)
-                VALUES ('id1', 'uid1', 'fp1', 'DevOps', 'Salary: 80000 EUR yearly', 'REMOTE', 'source1', NULL, NULL)
+                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, remote_scope, source, salary_min, salary_max)
+                VALUES ('id1', 'uid1', 'fp1', 'DevOps', 'REMOTE', 'source1', NULL, NULL)
             """)
         )
+        conn.execute(text("UPDATE job_texts SET description = 'Salary: 80000 EUR yearly' WHERE job_id = 'id1'"))
 
     # 2. Call endpoint
     response = client.post("/internal/backfill-salary?limit=10")
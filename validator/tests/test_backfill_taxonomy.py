@@ -0,0 +1,40 @@
+from sqlalchemy import text
+
+from app.utils.backfill_taxonomy import backfill_missing_taxonomy
+from storage.db_engine import get_engine
+
+
+def test_backfill_missing_taxonomy_persists_classification_once():
+    engine = get_engine()
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO jobs (job_id, job_uid, job_fingerprint, title, source_department, source, job_family)
+                VALUES
+                ('id1', 'uid1', 'fp1', 'Senior Backend Engineer', NULL, 'source1', NULL),
+                ('id2', 'uid2', 'fp2', 'Manager', 'Sales', 'source2', NULL),
+                ('id3', 'uid3', 'fp3', 'Chief Happiness Wizard', NULL, 'source3', NULL),
+                ('id4', 'uid4', 'fp4', 'Backend Engineer', NULL, 'source4', 'design')
+            """)
+        )
+
+    result = backfill_missing_taxonomy(limit=10)
+
+    assert result == {"processed": 3, "updated": 3}
+
+    with engine.connect() as conn:
+        rows = {
+            row["job_id"]: row
+            for row in conn.execute(text("SELECT job_id, job_family, job_role, seniority FROM jobs")).mappings()
+        }
+
+    assert rows["id1"]["job_family"] == "software_development"
+    assert rows["id1"]["job_role"] == "engineer"
+    assert rows["id1"]["seniority"] == "senior"
+    assert rows["id2"]["job_family"] == "sales"
+    # Unclassifiable titles are persisted as "unknown" so they are not re-fetched forever.
+    assert rows["id3"]["job_family"] == "unknown"
+    assert rows["id4"]["job_family"] == "design"
+
+    assert backfill_missing_taxonomy(limit=10) == {"processed": 0, "updated": 0}
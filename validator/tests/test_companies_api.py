@@ -44,3 +44,29 @@ def test_list_companies_pagination_structure():
     assert data["limit"] == 2
     assert data["offset"] == 1
     assert len(data["items"]) == 2
+
+
+def test_list_companies_cursor_matches_offset_order():
+    with engine.begin() as conn:
+        for i in range(7):
+            _insert_company(conn, f"Cursor Company {i}")
+
+    offset_ids = [item["company_id"] for item in client.get("/companies?limit=100").json()["items"]]
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        data = client.get("/companies?limit=3" + (f"&cursor={cursor}" if cursor else "")).json()
+        assert all(set(item) == set(data["items"][0]) for item in data["items"])
+        assert "signal_score" not in data["items"][0]
+        seen.extend(item["company_id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == offset_ids
+    assert len(seen) == 7
+
+
+def test_list_companies_rejects_malformed_cursor():
+    assert client.get("/companies?cursor=%%%").status_code == 400
@@ -1,15 +1,18 @@
 import json
+from datetime import date
 
 from sqlalchemy import text
 
 from storage.repositories.compliance_repository import (
     count_jobs_missing_compliance,
+    delete_orphaned_compliance_decisions,
     get_jobs_for_compliance_resolution,
     insert_compliance_report,
     insert_compliance_reports,
     update_job_compliance_resolution,
     update_jobs_compliance_resolution,
 )
+from storage.repositories.partitions_repository import apply_partition_retention, ensure_monthly_partitions
 
 
 def _as_json(value):
@@ -162,3 +165,109 @@ def test_bulk_compliance_helpers_cover_insert_count_fetch_and_update(db_factory)
     assert row == {"compliance_status": "rejected", "compliance_score": 10}
     assert _as_json(report["penalties"]) == {"missing": 1}
     assert _as_json(report["decision_vector"]) == {"source": "bulk"}
+
+
+def test_insert_compliance_reports_skips_unchanged_decisions(db_factory):
+    company = db_factory.create_company()
+    db_factory.create_job(company["company_id"], job_id="job-same", job_uid="uid-same")
+    report = {
+        "job_id": "job-same",
+        "job_uid": "uid-same",
+        "policy_version": "v3",
+        "remote_class": "REMOTE_ONLY",
+        "geo_class": "EU_REGION",
+        "hard_geo_flag": False,
+        "base_score": 90,
+        "penalties": None,
+        "bonuses": None,
+        "final_score": 90,
+        "final_status": "approved",
+        "decision_vector": {"remote": True, "geo": "eu"},
+    }
+
+    with db_factory.engine.begin() as conn:
+        assert insert_compliance_reports(conn, [dict(report)]) == 1
+        first_written = conn.execute(
+            text("SELECT created_at FROM compliance_reports WHERE job_uid = 'uid-same'")
+        ).scalar_one()
+    with db_factory.engine.begin() as conn:
+        # Same decision (key order in the vector does not matter): nothing is written.
+        assert insert_compliance_reports(conn, [{**report, "decision_vector": {"geo": "eu", "remote": True}}]) == 0
+        assert (
+            conn.execute(text("SELECT created_at FROM compliance_reports WHERE job_uid = 'uid-same'")).scalar_one()
+            == first_written
+        )
+    with db_factory.engine.begin() as conn:
+        assert insert_compliance_reports(conn, [{**report, "final_score": 40, "final_status": "rejected"}]) == 1
+        row = conn.execute(
+            text("SELECT final_score, final_status FROM compliance_reports WHERE job_uid = 'uid-same'")
+        ).one()
+
+    assert tuple(row) == (40, "rejected")
+
+
+def _kept_report() -> dict:
+    return {
+        "job_id": "job-kept",
+        "job_uid": "uid-kept",
+        "policy_version": "v3",
+        "remote_class": "REMOTE_ONLY",
+        "geo_class": "EU_REGION",
+        "hard_geo_flag": False,
+        "base_score": 90,
+        "penalties": None,
+        "bonuses": None,
+        "final_score": 90,
+        "final_status": "approved",
+        "decision_vector": None,
+    }
+
+
+def test_insert_compliance_reports_writes_one_report_per_month_for_unchanged_decisions(db_factory):
+    company = db_factory.create_company()
+    db_factory.create_job(company["company_id"], job_id="job-kept", job_uid="uid-kept")
+
+    with db_factory.engine.begin() as conn:
+        assert insert_compliance_reports(conn, [_kept_report()]) == 1
+        conn.execute(
+            text(
+                "UPDATE compliance_decisions SET decided_at = decided_at - INTERVAL '1 month' WHERE job_uid = 'uid-kept'"
+            )
+        )
+
+        # Cached in an earlier month: stale, so this month's report is written in full once.
+        assert insert_compliance_reports(conn, [_kept_report()]) == 1
+        assert insert_compliance_reports(conn, [_kept_report()]) == 0
+
+
+def test_insert_compliance_reports_rewrites_reports_dropped_by_retention(db_factory):
+    company = db_factory.create_company()
+    db_factory.create_job(company["company_id"], job_id="job-kept", job_uid="uid-kept")
+
+    with db_factory.engine.begin() as conn:
+        ensure_monthly_partitions(conn, "compliance_reports", months_ahead=0, today=date(2020, 5, 1))
+        assert insert_compliance_reports(conn, [_kept_report()]) == 1
+        # The report (and its cached decision) date from May 2020.
+        conn.execute(
+            text("""
+                UPDATE compliance_reports
+                SET report_month = '2020-05-01', created_at = '2020-05-10T00:00:00+00:00'
+                WHERE job_uid = 'uid-kept'
+            """)
+        )
+        conn.execute(
+            text("UPDATE compliance_decisions SET decided_at = '2020-05-10T00:00:00+00:00' WHERE job_uid = 'uid-kept'")
+        )
+
+        assert apply_partition_retention(conn, "compliance_reports", retention_months=12) == [
+            "compliance_reports_p2020_05"
+        ]
+        assert delete_orphaned_compliance_decisions(conn) == 1
+        assert conn.execute(text("SELECT COUNT(*) FROM compliance_decisions")).scalar_one() == 0
+
+        assert insert_compliance_reports(conn, [_kept_report()]) == 1
+        months = (
+            conn.execute(text("SELECT report_month FROM compliance_reports WHERE job_uid = 'uid-kept'")).scalars().all()
+        )
+
+    assert len(months) == 1 and months[0] > date(2020, 5, 1)
@@ -0,0 +1,73 @@
+from sqlalchemy import text
+
+from storage import count_strategy
+from storage.count_strategy import RowCount, count_cache_info, count_rows, invalidate_count_cache
+from storage.db_engine import get_engine
+
+
+def _insert_jobs(conn, count: int, *, status: str = "active", prefix: str = "cnt"):
+    conn.execute(
+        text("""
+            INSERT INTO jobs (job_id, job_uid, job_fingerprint, source, source_job_id, source_url, title, company_name,
+                              status, first_seen_at)
+            SELECT :prefix || '_' || i, :prefix || '_uid_' || i, :prefix || '_fp_' || i, 'bulk', i::text,
+                   'https://example.com/' || :prefix || '/' || i, 'Engineer ' || i, 'Count Corp', :status, NOW()
+            FROM generate_series(1, :count) AS i
+        """),
+        {"prefix": prefix, "count": count, "status": status},
+    )
+
+
+def test_row_count_behaves_like_int():
+    total = RowCount(42, is_estimate=True)
+
+    assert total == 42
+    assert total + 1 == 43
+    assert total.is_estimate is True
+    assert RowCount(5).is_estimate is False
+
+
+def test_count_rows_is_exact_below_threshold_and_estimated_above():
+    engine = get_engine()
+    with engine.begin() as conn:
+        _insert_jobs(conn, 30)
+        _insert_jobs(conn, 3, status="expired", prefix="old")
+
+    with engine.connect() as conn:
+        small = count_rows(conn, "jobs", "WHERE status = :status", {"status": "expired"}, exact_threshold=10)
+        large = count_rows(conn, "jobs", "WHERE status = :status", {"status": "active"}, exact_threshold=10)
+
+    assert (small, small.is_estimate) == (3, False)
+    assert large.is_estimate is True
+    # Never below the probed lower bound, even if the planner underestimates.
+    assert large >= 11
+
+
+def test_count_rows_serves_cache_until_invalidated():
+    engine = get_engine()
+    with engine.begin() as conn:
+        _insert_jobs(conn, 4)
+
+    with engine.connect() as conn:
+        first = count_rows(conn, "jobs", "WHERE status = :status", {"status": "active"})
+    with engine.begin() as conn:
+        _insert_jobs(conn, 2, prefix="late")
+
+    hits_before = count_cache_info()["hits"]
+    with engine.connect() as conn:
+        cached = count_rows(conn, "jobs", "WHERE status = :status", {"status": "active"})
+        invalidate_count_cache()
+        fresh = count_rows(conn, "jobs", "WHERE status = :status", {"status": "active"})
+
+    assert (first, cached, fresh) == (4, 4, 6)
+    assert count_cache_info()["hits"] == hits_before + 1
+
+
+def test_count_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(count_strategy, "COUNT_CACHE_SIZE", 2)
+    engine = get_engine()
+    with engine.connect() as conn:
+        for status in ("a", "b", "c"):
+            count_rows(conn, "jobs", "WHERE status = :status", {"status": status})
+
+    assert count_cache_info()["size"] == 2
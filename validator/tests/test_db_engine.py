@@ -0,0 +1,165 @@
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from storage import db_engine
+from storage.db_engine import (
+    engine_getter,
+    get_engine,
+    get_read_engine,
+    note_primary_write,
+    pool_metrics,
+    read_engine_profile,
+)
+
+
+@pytest.fixture
+def read_engine(monkeypatch):
+    """Read engine on the primary DSN with its own (smaller) pool — the local two-engine setup."""
+    monkeypatch.setenv("DATABASE_READ_URL", os.environ["DATABASE_URL"])
+    monkeypatch.setenv("DB_READ_POOL_SIZE", "2")
+    monkeypatch.setenv("DB_READ_MAX_OVERFLOW", "1")
+    monkeypatch.setattr(db_engine, "_read_engines", {})
+    monkeypatch.setattr(db_engine, "_read_your_writes_lsn", None)
+
+    engine = get_read_engine()
+    yield engine
+    for replica in db_engine._read_engines.values():
+        replica.dispose()
+
+
+def test_read_engine_defaults_to_primary(monkeypatch):
+    monkeypatch.delenv("DATABASE_READ_URL", raising=False)
+    monkeypatch.setattr(db_engine, "_read_engines", {})
+
+    assert get_read_engine() is get_engine("api")
+    note_primary_write()  # no-op without a read engine
+    assert db_engine._read_your_writes_lsn is None
+
+
+def test_read_engine_has_own_pool_and_rejects_writes(read_engine):
+    assert read_engine is not get_engine()
+    assert read_engine.pool.size() == 2
+
+    with read_engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+    with pytest.raises(DBAPIError):
+        with read_engine.begin() as conn:
+            conn.execute(text("DELETE FROM jobs WHERE job_id = 'never-there'"))
+
+
+def test_read_your_writes_falls_back_to_primary_until_replayed(read_engine, monkeypatch):
+    replayed = {"value": False}
+    monkeypatch.setattr(db_engine, "_replica_has_replayed", lambda engine, lsn: replayed["value"])
+
+    note_primary_write()
+    assert db_engine._read_your_writes_lsn is not None
+    assert get_read_engine() is get_engine("api")
+
+    replayed["value"] = True
+    assert get_read_engine() is read_engine
+    # Once caught up, the lag check is not repeated.
+    assert db_engine._read_your_writes_lsn is None
+
+
+def test_replay_check_treats_non_replica_as_caught_up(read_engine):
+    note_primary_write()
+
+    assert get_read_engine() is read_engine
+
+
+def test_listing_reads_go_through_read_engine(read_engine, db_factory):
+    from storage.repositories.jobs_repository import get_jobs_paginated
+
+    company = db_factory.create_company(legal_name="Replica Labs")
+    db_factory.create_job(company["company_id"], job_id="replica-1", status="active")
+
+    items, total = get_jobs_paginated(status="active")
+
+    assert [item["job_id"] for item in items] == ["replica-1"]
+    assert total == 1
+    assert read_engine.pool.checkedin() >= 1
+
+
+def test_worker_reads_use_their_profile_on_the_replica(read_engine):
+    maintenance = get_read_engine(profile="maintenance")
+
+    assert maintenance is not read_engine
+    assert get_read_engine(profile="maintenance") is maintenance
+    with read_engine_profile("maintenance"):
+        assert get_read_engine() is maintenance
+    assert get_read_engine() is read_engine
+    with maintenance.connect() as conn:
+        assert conn.execute(text("SHOW statement_timeout")).scalar() == "15min"
+        assert conn.execute(text("SHOW default_transaction_read_only")).scalar() == "on"
+    assert "read_maintenance" in pool_metrics()
+
+
+@pytest.fixture
+def profile_engines(monkeypatch):
+    monkeypatch.setattr(db_engine, "_profile_engines", {})
+    yield db_engine._profile_engines
+    for engine in db_engine._profile_engines.values():
+        engine.dispose()
+
+
+def test_profiles_get_own_pools_and_session_settings(profile_engines, monkeypatch):
+    monkeypatch.setenv("DB_MAINTENANCE_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAINTENANCE_STATEMENT_TIMEOUT_MS", "1234")
+
+    api = get_engine("api")
+    maintenance = engine_getter("maintenance")()
+
+    assert api is get_engine("api")
+    assert maintenance is not api and maintenance is not get_engine()
+    assert api.pool.size() == db_engine.ENGINE_PROFILES["api"].pool_size
+    assert maintenance.pool.size() == 1
+
+    with maintenance.connect() as conn:
+        assert conn.execute(text("SHOW statement_timeout")).scalar() == "1234ms"
+    with api.connect() as conn:
+        assert conn.execute(text("SHOW statement_timeout")).scalar() == "15s"
+
+
+def test_unknown_profile_is_rejected(profile_engines):
+    with pytest.raises(ValueError):
+        get_engine("reporting")
+
+
+def test_pool_metrics_report_checkouts_and_in_use(profile_engines):
+    engine = get_engine("discovery")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        in_use = pool_metrics()["discovery"]["in_use"]
+    stats = pool_metrics()["discovery"]
+
+    assert in_use == 1
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["checkout_wait_ms_max"] >= 0
+    assert "default" in pool_metrics()
+
+
+def test_frontend_exporter_reads_without_the_api_timeout(profile_engines, monkeypatch):
+    from app.workers import frontend_exporter
+
+    monkeypatch.delenv("DATABASE_READ_URL", raising=False)
+    monkeypatch.setattr(db_engine, "_read_engines", {})
+    timeouts = []
+
+    def _market_daily_stats(conn, days):
+        timeouts.append(conn.execute(text("SHOW statement_timeout")).scalar())
+        return []
+
+    monkeypatch.setattr(frontend_exporter, "get_market_daily_stats", _market_daily_stats)
+    monkeypatch.setattr(frontend_exporter, "get_active_jobs_compliance_counts", lambda conn: {})
+    monkeypatch.setattr(frontend_exporter, "_export_charts", lambda bucket, stats: 0)
+
+    frontend_exporter._export_market_stats(MagicMock(), "https://cdn.openjobseu.org")
+
+    assert timeouts == ["15min"]
+    assert "api" not in profile_engines
@@ -0,0 +1,79 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.domain.money.currency import exchange_rates_as_of, load_exchange_rate_history, normalize_to_eur
+from storage.repositories.exchange_rates_repository import (
+    apply_pending_exchange_rates,
+    get_current_exchange_rates,
+    sync_exchange_rates,
+)
+from storage.repositories.jobs_repository import upsert_job
+
+pytestmark = pytest.mark.integration_db
+
+
+def _job(company, job_id, salary_min, salary_max, currency):
+    return {
+        "job_id": job_id,
+        "source": "test_source",
+        "source_job_id": job_id,
+        "source_url": f"https://example.com/jobs/{job_id}",
+        "company_id": company["company_id"],
+        "company_name": company["legal_name"],
+        "title": f"Engineer {job_id}",
+        "description": "No salary in text.",
+        "status": "new",
+        "remote_source_flag": True,
+        "remote_scope": "Europe",
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "salary_currency": currency,
+        "salary_min_eur": normalize_to_eur(salary_min or 0, currency),
+        "salary_max_eur": normalize_to_eur(salary_max or 0, currency),
+    }
+
+
+def _eur(conn, job_id):
+    return conn.execute(
+        text("SELECT salary_min_eur, salary_max_eur FROM jobs WHERE job_id = :job_id"), {"job_id": job_id}
+    ).one()
+
+
+def test_set_based_renormalization_matches_ingestion_and_applies_rate_changes(db_factory):
+    company = db_factory.create_company()
+    today = datetime.now(timezone.utc).date()
+
+    with db_factory.engine.begin() as conn:
+        upsert_job(_job(company, "usd-job", 100000, 120000, "USD"), conn=conn)
+        upsert_job(_job(company, "pln-job", 15000, 0, "PLN"), conn=conn)
+        upsert_job(_job(company, "eur-job", 50000, 60000, "EUR"), conn=conn)
+
+        assert sync_exchange_rates(conn, list(load_exchange_rate_history())) == 12
+        assert get_current_exchange_rates(conn)["USD"] == 0.92
+
+        # Rates already used at ingestion: the SQL path reproduces the same values.
+        first = apply_pending_exchange_rates(conn)
+        assert first["jobs_updated"] == 0
+        assert "USD" in first["currencies"]
+        assert apply_pending_exchange_rates(conn) == {"currencies": [], "jobs_updated": 0}
+
+        sync_exchange_rates(
+            conn,
+            [
+                {"currency": "USD", "valid_from": today, "rate_to_eur": 0.5},
+                {"currency": "PLN", "valid_from": today + timedelta(days=1), "rate_to_eur": 1.0},
+            ],
+        )
+        second = apply_pending_exchange_rates(conn)
+
+        assert second == {"currencies": ["USD"], "jobs_updated": 1}
+        assert tuple(_eur(conn, "usd-job")) == (50000, 60000)
+        assert tuple(_eur(conn, "pln-job")) == (3450, None)
+        assert tuple(_eur(conn, "eur-job")) == (50000, 60000)
+
+
+def test_exchange_rates_as_of_picks_latest_valid_rate():
+    assert exchange_rates_as_of(date(2025, 12, 31)) == {}
+    assert exchange_rates_as_of(date(2026, 6, 1))["USD"] == 0.92
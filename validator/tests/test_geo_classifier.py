@@ -333,3 +333,18 @@ def test_geo_v3_global_role_emea_and_apac_in_description_is_not_eu():
         source="employer_ing",
     )
     assert job["_compliance"]["compliance_score"] < 80
+
+
+def test_classify_remote_scope_is_memoized_and_returns_copies():
+    from app.domain.compliance.classifiers.geo import classify_remote_scope, remote_scope_cache_info
+
+    scope = "spain; portugal; brazil (memo test)"
+    before = remote_scope_cache_info()
+    first = classify_remote_scope(scope)
+    first["reason"] = "mutated"
+    second = classify_remote_scope(scope.upper())
+    after = remote_scope_cache_info()
+
+    assert second == {"geo_class": GeoClass.EU_REGION, "reason": "mixed_region", "eu_member_count": 2}
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
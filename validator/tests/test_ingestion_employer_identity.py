@@ -124,7 +124,7 @@ def test_ingest_company_computes_identity_before_policy_and_persist(monkeypatch)
 
     monkeypatch.setattr(process_loop, "process_ingested_job", _fake_process_ingested_job)
 
-    def _fake_upsert(jobs, conn, *, company_id=None, source=None):
+    def _fake_upsert(jobs, conn, *, company_id=None, source=None, write_counts=None):
         call_order.append("upsert")
         assert conn is not None
         assert company_id == "company-1"
@@ -268,7 +268,7 @@ def test_ingest_company_accepts_uuid_company_identifiers(monkeypatch):
     monkeypatch.setattr(
         process_loop,
         "bulk_upsert_jobs",
-        lambda jobs, conn, *, company_id=None, source=None: [
+        lambda jobs, conn, *, company_id=None, source=None, write_counts=None: [
             persisted_jobs.append(dict(j)) or j["job_id"] for j in jobs
         ],
     )
@@ -356,7 +356,7 @@ def test_ingest_company_rejected_job_does_not_insert_compliance_report_without_j
     monkeypatch.setattr(
         process_loop,
         "bulk_upsert_jobs",
-        lambda jobs, conn, *, company_id=None, source=None: [
+        lambda jobs, conn, *, company_id=None, source=None, write_counts=None: [
             upsert_calls.append(dict(j)) or j.get("job_id", "job-x") for j in jobs
         ],
     )
@@ -42,6 +42,9 @@ def test_run_employer_ingestion_reports_standardized_metrics(monkeypatch):
                     RemoteClass.UNKNOWN.value: 0,
                 },
                 "hard_geo_rejected_count": 0,
+                "jobs_inserted": 1,
+                "jobs_updated": 1,
+                "jobs_touched": 2,
             },
             {
                 "fetched": 0,
@@ -83,6 +86,7 @@ def test_run_employer_ingestion_reports_standardized_metrics(monkeypatch):
     assert metrics["synced_ats_count"] == 1
     assert metrics["accepted_jobs"] == 3
     assert metrics["hard_geo_rejected_count"] == 0
+    assert (metrics["jobs_inserted"], metrics["jobs_updated"], metrics["jobs_touched"]) == (1, 1, 2)
 
     fetch_calls = [call for call in log_calls if call.get("phase") == "fetch"]
     assert len(fetch_calls) == 1
@@ -106,6 +110,7 @@ def test_run_employer_ingestion_reports_standardized_metrics(monkeypatch):
     assert summary["companies_invalid_slug"] == 1
     assert summary["synced_ats_count"] == 1
     assert summary["hard_geo_rejected_count"] == 0
+    assert (summary["jobs_inserted"], summary["jobs_updated"], summary["jobs_touched"]) == (1, 1, 2)
     assert summary["companies_load_duration_ms"] >= 0
     assert summary["ingestion_loop_duration_ms"] >= 0
     assert summary["duration_ms"] >= 0
@@ -29,6 +29,8 @@ def test_ingestion_metrics_tracks_all_counters_and_returns_copies():
     metrics.observe_remote_model("unexpected")
     metrics.observe_salary(True)
     metrics.observe_salary(False)
+    metrics.observe_job_writes({"inserted": 2, "updated": 1, "touched": 3})
+    metrics.observe_job_writes({"touched": 1})
 
     result = metrics.to_result_dict()
 
@@ -51,6 +53,9 @@ def test_ingestion_metrics_tracks_all_counters_and_returns_copies():
         "hard_geo_rejected_count": 1,
         "salary_detected": 1,
         "salary_missing": 1,
+        "jobs_inserted": 2,
+        "jobs_updated": 1,
+        "jobs_touched": 4,
     }
 
     result["rejected_by_reason"][RemoteClass.NON_REMOTE.value] = 999
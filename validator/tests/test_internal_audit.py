@@ -290,3 +290,23 @@ def test_internal_discovery_run_returns_metrics(monkeypatch):
     assert payload.get("metrics", {})["pipeline"] == "discovery"
     assert payload.get("metrics", {})["careers"]["checked"] == 10
     assert payload.get("metrics", {})["ats_guessing"]["detected"] == 3
+
+
+def test_internal_audit_jobs_full_text_search(db_factory):
+    company = db_factory.create_company(legal_name="Audit Search Co")
+    db_factory.create_job(
+        company["company_id"],
+        job_id="audit-fts-hit",
+        title="Platform Engineer",
+        company_name=company["legal_name"],
+        description="You will own our Kubernetes clusters.",
+    )
+    db_factory.create_job(company["company_id"], job_id="audit-fts-miss", company_name=company["legal_name"])
+
+    response = client.get("/internal/audit/jobs", params={"q": "kubernetes", "include_counts": False})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [item["job_id"] for item in data["items"]] == ["audit-fts-hit"]
+    assert data["total"] == 1
+    assert data["total_is_estimate"] is False
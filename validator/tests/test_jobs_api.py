@@ -1,9 +1,14 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 
 from app.main import app
 import app.api.jobs as jobs_api
+import storage.common
+from storage.repositories.audit_repository import get_jobs_audit
 
 client = TestClient(app)
 
@@ -86,15 +91,101 @@ def test_list_jobs_with_q_and_other_filters(monkeypatch):
     assert items[0]["job_id"] == "job6"
 
 
-def test_list_jobs_with_q_parameter_ignores_description_text(monkeypatch):
-    monkeypatch.setattr(jobs_api, "get_jobs_paginated", lambda **kwargs: ([], 0))
+def test_list_jobs_with_q_parameter_searches_description_and_ranks_title_first(db_factory):
+    company = db_factory.create_company(legal_name="Search Labs")
+    db_factory.create_job(
+        company["company_id"],
+        job_id="fts-desc",
+        title="Backend Developer",
+        company_name=company["legal_name"],
+        description="Our services are written in Python and Go.",
+        status="active",
+    )
+    db_factory.create_job(
+        company["company_id"],
+        job_id="fts-title",
+        title="Python Developer",
+        company_name=company["legal_name"],
+        description="Build data pipelines.",
+        status="active",
+    )
+    db_factory.create_job(
+        company["company_id"],
+        job_id="fts-none",
+        title="Office Manager",
+        company_name=company["legal_name"],
+        description="Keep the office running.",
+        status="active",
+    )
 
-    response = client.get("/jobs?q=python")
-    assert response.status_code == 200
-    items = response.json()["items"]
+    items = client.get("/jobs?q=python").json()["items"]
+    assert [item["job_id"] for item in items] == ["fts-title", "fts-desc"]
+
+    # Składnia websearch: fraza w cudzysłowie
+    items = client.get('/jobs?q="backend developer"').json()["items"]
+    assert items[0]["job_id"] == "fts-desc"
+
+    # Literówka w tytule — łapie ją trigramowy fallback
+    items = client.get("/jobs?q=pyhton developer").json()["items"]
+    assert "fts-title" in [item["job_id"] for item in items]
+
+
+def test_list_jobs_search_ranks_bounded_candidates_but_counts_every_match(db_factory, monkeypatch):
+    monkeypatch.setattr(storage.common, "JOB_SEARCH_CANDIDATE_LIMIT", 2)
+    company = db_factory.create_company(legal_name="Search Labs")
+    now = datetime.now(timezone.utc)
+    db_factory.create_job(
+        company["company_id"],
+        job_id="cand-title",
+        title="Python Developer",
+        company_name=company["legal_name"],
+        description="Build data pipelines.",
+        status="active",
+        first_seen_at=now - timedelta(days=10),
+    )
+    for day in range(4):
+        db_factory.create_job(
+            company["company_id"],
+            job_id=f"cand-desc-{day}",
+            title="Backend Developer",
+            company_name=company["legal_name"],
+            description="Our services are written in Python.",
+            status="active",
+            first_seen_at=now - timedelta(days=day),
+        )
+
+    data = client.get("/jobs?q=python&limit=2").json()
 
-    # Ze względów wydajnościowych (brak pełnotekstowego indeksu FTS) celowo ignorujemy opis w zapytaniach "q"
-    assert len(items) == 0
+    # The freshest description matches plus the title match are ranked; older ones are only counted.
+    assert [item["job_id"] for item in data["items"]] == ["cand-title", "cand-desc-0"]
+    assert data["total"] == 5
+
+
+def test_list_jobs_search_pages_past_the_candidate_floor(db_factory):
+    company = db_factory.create_company(legal_name="Paging Labs")
+    with db_factory.engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO jobs (
+                    job_id, job_uid, job_fingerprint, company_id, source, source_job_id, source_url,
+                    title, company_name, remote_source_flag, remote_scope, status, first_seen_at
+                )
+                SELECT
+                    'page-' || lpad(n::text, 4, '0'), 'uid-page-' || n, 'fp-page-' || n, :company_id,
+                    'greenhouse:test', 'src-page-' || n, 'https://example.com/jobs/page-' || n,
+                    'Python Engineer', 'Paging Labs', TRUE, 'Europe', 'active', NOW() - n * INTERVAL '1 minute'
+                FROM generate_series(1, 1100) AS n
+            """),
+            {"company_id": company["company_id"]},
+        )
+
+    data = client.get("/jobs?q=python&limit=50&offset=1060").json()
+    audit = get_jobs_audit(q="python", limit=50, offset=1060, include_counts=False)
+
+    assert data["total"] == 1100
+    assert len(data["items"]) == 40
+    assert audit["total"] == 1100
+    assert len(audit["items"]) == 40
 
 
 def test_list_jobs_pagination_structure(monkeypatch):
@@ -180,15 +271,16 @@ def test_list_jobs_handles_large_volume_and_fuzzy_search(db_factory):
         conn.execute(
             text("""
                 INSERT INTO jobs (
-                    job_id, job_uid, job_fingerprint, source, source_job_id, source_url, title, company_name, 
-                    description, remote_source_flag, remote_scope, status, first_seen_at
+                    job_id, job_uid, job_fingerprint, source, source_job_id, source_url, title, company_name,
+                    remote_source_flag, remote_scope, status, first_seen_at
                 ) VALUES (
                     :job_id, :job_uid, :job_fingerprint, :source, :source_job_id, :source_url, :title, :company_name,
-                    :description, :remote_source_flag, :remote_scope, :status, :first_seen_at
+                    :remote_source_flag, :remote_scope, :status, :first_seen_at
                 )
             """),
             jobs_data,
         )
+        conn.execute(text("UPDATE job_texts SET description = :description WHERE job_id = :job_id"), jobs_data)
 
     # Test 1: Sprawdzenie samej paginacji na dużej paczce
     res_all = client.get("/jobs?limit=50")
@@ -228,3 +320,102 @@ def test_list_jobs_with_realistic_faker_data(seed_realistic_market_data):
     # Sprawdzamy, czy w obiekcie znalazły się uwiarygodnione dane
     first_job = data["items"][0]
     assert "http" in first_job["source_url"]
+
+
+def test_list_jobs_cursor_pages_through_ties_without_gaps(db_factory):
+    # Identyczny first_seen_at wymusza rozstrzyganie remisów po job_id
+    jobs_data = [
+        {
+            "job_id": f"cur_{i:02d}",
+            "job_uid": f"cur_uid_{i}",
+            "job_fingerprint": f"cur_fp_{i}",
+            "source": "bulk",
+            "source_job_id": str(i),
+            "source_url": f"https://example.com/cursor/{i}",
+            "title": f"Cursor Engineer {i}",
+            "company_name": "Cursor Corp",
+            "status": "active",
+            "first_seen_at": "2026-01-01T00:00:00+00:00" if i % 2 else "2026-01-02T00:00:00+00:00",
+        }
+        for i in range(23)
+    ]
+    with db_factory.engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO jobs (
+                    job_id, job_uid, job_fingerprint, source, source_job_id, source_url, title, company_name,
+                    status, first_seen_at
+                ) VALUES (
+                    :job_id, :job_uid, :job_fingerprint, :source, :source_job_id, :source_url, :title, :company_name,
+                    :status, :first_seen_at
+                )
+            """),
+            jobs_data,
+        )
+
+    offset_ids = [item["job_id"] for item in client.get("/jobs?limit=100").json()["items"]]
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        url = "/jobs?limit=5" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url).json()
+        assert data["total"] == 23
+        seen.extend(item["job_id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == offset_ids
+    assert len(set(seen)) == 23
+
+
+def test_jobs_first_seen_at_is_never_null_so_cursors_cover_every_row(db_factory):
+    with db_factory.engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO jobs (job_id, job_uid, job_fingerprint, source, source_url, title, company_name, status) "
+                "VALUES (:job_id, :job_id, :job_id, 'bulk', 'https://example.com', 'x', 'Acme', 'active')"
+            ),
+            [{"job_id": f"nofs_{i}"} for i in range(3)],
+        )
+    with pytest.raises(IntegrityError), db_factory.engine.begin() as conn:
+        conn.execute(text("UPDATE jobs SET first_seen_at = NULL WHERE job_id = 'nofs_0'"))
+
+    first = client.get("/jobs?limit=2").json()
+    second = client.get(f"/jobs?limit=2&cursor={first['next_cursor']}")
+
+    assert second.status_code == 200
+    assert {item["job_id"] for item in first["items"] + second.json()["items"]} == {"nofs_0", "nofs_1", "nofs_2"}
+
+
+def test_list_jobs_rejects_invalid_cursor_combinations():
+    assert client.get("/jobs?cursor=not-a-cursor").status_code == 400
+    assert client.get("/jobs?cursor=WyJ4Il0&offset=5").status_code == 400
+    assert client.get("/jobs?cursor=WyJ4Il0&q=engineer").status_code == 400
+
+
+def test_list_jobs_with_q_does_not_issue_cursor(monkeypatch):
+    item = {
+        "job_id": "job1",
+        "source": "s",
+        "source_url": "u",
+        "title": "Engineer",
+        "company_name": "Acme",
+        "status": "active",
+        "first_seen_at": "2026-01-01T00:00:00+00:00",
+    }
+    monkeypatch.setattr(jobs_api, "get_jobs_paginated", lambda **kwargs: ([item], 5))
+
+    assert client.get("/jobs?q=engineer&limit=1").json()["next_cursor"] is None
+    assert client.get("/jobs?limit=1").json()["next_cursor"] is not None
+
+
+def test_list_jobs_reports_estimated_total(monkeypatch):
+    from storage.count_strategy import RowCount
+
+    monkeypatch.setattr(jobs_api, "get_jobs_paginated", lambda **kwargs: ([], RowCount(250_000, is_estimate=True)))
+
+    data = client.get("/jobs?status=active").json()
+    assert data["total"] == 250_000
+    assert data["total_is_estimate"] is True
@@ -1,7 +1,16 @@
 import pytest
 import uuid
+from datetime import datetime, timedelta, timezone
 from sqlalchemy import text
-from storage.repositories.jobs_repository import get_jobs, get_jobs_paginated, upsert_job
+from storage.common import execute_unnest, unnest_rows
+from storage.repositories.jobs_repository import (
+    _count_prior_postings,
+    bulk_upsert_jobs,
+    fold_job_sightings,
+    get_jobs,
+    get_jobs_paginated,
+    upsert_job,
+)
 
 pytestmark = pytest.mark.integration_db
 
@@ -257,3 +266,304 @@ def test_get_jobs_and_paginated_support_core_filters(db_factory):
     assert [job["job_id"] for job in visible_jobs] == ["job-acme-1", "job-beta-1"]
     assert total == 1
     assert [job["job_id"] for job in search_jobs] == ["job-acme-1"]
+
+
+def test_paid_api_jobs_keyset_pagination_keeps_filtered_total(db_factory):
+    from datetime import datetime, timezone
+
+    from storage.repositories.paid_api_repository import get_paid_api_jobs
+
+    company = db_factory.create_company(legal_name="Keyset Labs")
+    for i in range(5):
+        db_factory.create_job(
+            company["company_id"],
+            job_id=f"keyset-{i}",
+            title=f"Keyset Engineer {i}",
+            company_name=company["legal_name"],
+            status="active",
+            first_seen_at="2026-01-01T10:00:00+00:00",
+        )
+
+    first_page, total = get_paid_api_jobs(limit=2)
+    after = (first_page[-1]["first_seen_at"], first_page[-1]["job_id"])
+    second_page, second_total = get_paid_api_jobs(limit=2, after=after)
+    tail, _ = get_paid_api_jobs(limit=10, after=(datetime(2026, 1, 1, 10, tzinfo=timezone.utc), "keyset-1"))
+
+    assert total == second_total == 5
+    assert [job["job_id"] for job in first_page] == ["keyset-4", "keyset-3"]
+    assert [job["job_id"] for job in second_page] == ["keyset-2", "keyset-1"]
+    assert [job["job_id"] for job in tail] == ["keyset-0"]
+
+
+def test_get_jobs_paginated_rejects_keyset_with_q():
+    from datetime import datetime, timezone
+
+    with pytest.raises(ValueError):
+        get_jobs_paginated(q="engineer", after=(datetime(2026, 1, 1, tzinfo=timezone.utc), "job"))
+
+
+def test_count_prior_postings_counts_key_matches_within_repost_window(db_factory):
+    company = db_factory.create_company(legal_name="Repost Co")
+    now = datetime.now(timezone.utc)
+    for job_id, last_seen_days_ago in (("prior-recent", 10), ("prior-old", 40)):
+        db_factory.create_job(
+            company["company_id"],
+            job_id=job_id,
+            job_fingerprint=f"fp-{job_id}",
+            company_name="Repost Co",
+            title="Data Engineer",
+            first_seen_at=now - timedelta(days=60),
+            last_seen_at=now - timedelta(days=last_seen_days_ago),
+        )
+
+    def candidate(job_id: str, fingerprint: str) -> dict:
+        return {
+            "job_id": job_id,
+            "job_fingerprint": fingerprint,
+            "company_name": "Repost Co",
+            "title": "Data Engineer",
+            "first_seen_at": now,
+        }
+
+    with db_factory.engine.begin() as conn:
+        counts = _count_prior_postings(
+            conn,
+            [
+                candidate("new-recent", "fp-prior-recent"),
+                candidate("new-old", "fp-prior-old"),
+                candidate("prior-recent", "fp-prior-recent"),
+            ],
+        )
+
+    assert counts == {"new-recent": 1, "new-old": 0, "prior-recent": 0}
+
+
+def test_bulk_upsert_jobs_sets_repost_flags_only_for_new_or_rekeyed_jobs(db_factory):
+    company = db_factory.create_company()
+    job = {
+        "job_id": "repost-ingest",
+        "source": "greenhouse:acme",
+        "source_job_id": "repost-ingest",
+        "source_url": "https://example.com/jobs/repost-ingest",
+        "company_id": company["company_id"],
+        "company_name": "Acme",
+        "title": "Platform Engineer",
+        "description": "Build the platform.",
+        "remote_source_flag": True,
+        "remote_scope": "Europe",
+        "status": "new",
+    }
+
+    with db_factory.engine.begin() as conn:
+        bulk_upsert_jobs([dict(job)], conn, company_id=company["company_id"])
+        inserted = conn.execute(text("SELECT is_repost, repost_count FROM jobs WHERE job_id = 'repost-ingest'")).one()
+
+        # Unchanged key: flags set earlier (e.g. by reconciliation) are left alone.
+        conn.execute(text("UPDATE jobs SET is_repost = TRUE, repost_count = 2 WHERE job_id = 'repost-ingest'"))
+        bulk_upsert_jobs([dict(job)], conn, company_id=company["company_id"])
+        kept = conn.execute(text("SELECT is_repost, repost_count FROM jobs WHERE job_id = 'repost-ingest'")).one()
+
+        # New title: the key changed, so the flags are recomputed.
+        bulk_upsert_jobs([{**job, "title": "Staff Platform Engineer"}], conn, company_id=company["company_id"])
+        rekeyed = conn.execute(text("SELECT is_repost, repost_count FROM jobs WHERE job_id = 'repost-ingest'")).one()
+
+    assert tuple(inserted) == (False, 0)
+    assert tuple(kept) == (True, 2)
+    assert tuple(rekeyed) == (False, 0)
+
+
+def test_bulk_upsert_jobs_keeps_description_and_search_vector_in_job_texts(db_factory):
+    company = db_factory.create_company()
+    job = {
+        "job_id": "texts-ingest",
+        "source": "greenhouse:acme",
+        "source_job_id": "texts-ingest",
+        "source_url": "https://example.com/jobs/texts-ingest",
+        "company_id": company["company_id"],
+        "company_name": "Acme",
+        "title": "Platform Engineer",
+        "description": "You will run our Kubernetes clusters.",
+        "remote_source_flag": True,
+        "remote_scope": "Europe",
+        "status": "new",
+    }
+
+    def _texts(conn):
+        return conn.execute(
+            text("""
+                SELECT t.description, t.xmin::text AS version,
+                       t.search_vector @@ to_tsquery('english', 'kubernetes') AS matches_description,
+                       t.search_vector @@ to_tsquery('english', 'staff') AS matches_title
+                FROM job_texts t
+                WHERE t.job_id = 'texts-ingest'
+            """)
+        ).one()
+
+    with db_factory.engine.begin() as conn:
+        bulk_upsert_jobs([dict(job)], conn, company_id=company["company_id"])
+        inserted = _texts(conn)
+    with db_factory.engine.begin() as conn:
+        # Same description: the job_texts row is not rewritten.
+        bulk_upsert_jobs([dict(job)], conn, company_id=company["company_id"])
+        unchanged = _texts(conn)
+    with db_factory.engine.begin() as conn:
+        # A title change on jobs reaches the search vector through the trigger.
+        conn.execute(text("UPDATE jobs SET title = 'Staff Platform Engineer' WHERE job_id = 'texts-ingest'"))
+        retitled = _texts(conn)
+
+    assert (inserted.description, inserted.matches_description, inserted.matches_title) == (
+        "You will run our Kubernetes clusters.",
+        True,
+        False,
+    )
+    assert unchanged.version == inserted.version
+    assert retitled.matches_title is True
+    assert get_jobs(q="kubernetes")[0]["description"] == "You will run our Kubernetes clusters."
+
+
+def test_bulk_upsert_jobs_records_unchanged_jobs_as_sightings_until_folded(db_factory):
+    company = db_factory.create_company()
+    job = {
+        "job_id": "sighted-ingest",
+        "source": "greenhouse:acme",
+        "source_job_id": "sighted-ingest",
+        "source_url": "https://example.com/jobs/sighted-ingest",
+        "company_id": company["company_id"],
+        "company_name": "Acme",
+        "title": "Platform Engineer",
+        "description": "Build the platform.",
+        "remote_source_flag": True,
+        "remote_scope": "Europe",
+        "status": "new",
+    }
+
+    def _state(conn):
+        return conn.execute(
+            text("""
+                SELECT j.xmin::text AS job_version, j.status, j.last_seen_at,
+                       js.xmin::text AS source_version, js.seen_count,
+                       s.seen_count AS pending, s.last_seen_at AS sighted_at
+                FROM jobs j
+                JOIN job_sources js ON js.job_id = j.job_id
+                LEFT JOIN job_sightings s ON s.source = js.source AND s.source_job_id = js.source_job_id
+                WHERE j.job_id = 'sighted-ingest'
+            """)
+        ).one()
+
+    with db_factory.engine.begin() as conn:
+        bulk_upsert_jobs([dict(job)], conn, company_id=company["company_id"])
+        # The lifecycle pass activated it; a re-sighting as 'new' is still unchanged.
+        conn.execute(text("UPDATE jobs SET status = 'active' WHERE job_id = 'sighted-ingest'"))
+        inserted = _state(conn)
+    for _ in range(2):
+        with db_factory.engine.begin() as conn:
+            bulk_upsert_jobs([dict(job)], conn, company_id=company["company_id"])
+    with db_factory.engine.begin() as conn:
+        sighted = _state(conn)
+    listed = get_jobs(company="Acme")[0]
+
+    with db_factory.engine.begin() as conn:
+        not_due = fold_job_sightings(conn, fold_after_hours=1)
+        folded = fold_job_sightings(conn, fold_after_hours=0)
+        after_fold = _state(conn)
+        bulk_upsert_jobs([{**job, "title": "Staff Platform Engineer"}], conn, company_id=company["company_id"])
+        changed = _state(conn)
+
+    assert (sighted.job_version, sighted.source_version, sighted.status) == (
+        inserted.job_version,
+        inserted.source_version,
+        "active",
+    )
+    assert (sighted.seen_count, sighted.pending) == (inserted.seen_count, 2)
+    assert sighted.sighted_at > sighted.last_seen_at
+    assert listed["last_seen_at"] == sighted.sighted_at
+
+    assert (not_due, folded) == (0, 1)
+    assert (after_fold.last_seen_at, after_fold.seen_count, after_fold.pending) == (
+        sighted.sighted_at,
+        inserted.seen_count + 2,
+        None,
+    )
+    # A material change rewrites the jobs row; the unchanged mapping still only records a sighting.
+    assert (changed.status, changed.seen_count, changed.pending) == ("new", inserted.seen_count + 2, 1)
+    assert changed.last_seen_at > after_fold.last_seen_at
+
+
+def test_bulk_upsert_jobs_counts_inserted_updated_and_touched_rows(db_factory):
+    company = db_factory.create_company()
+    jobs = [
+        {
+            "job_id": f"counted-{i}",
+            "source": "greenhouse:acme",
+            "source_job_id": f"counted-{i}",
+            "source_url": f"https://example.com/jobs/counted-{i}",
+            "company_id": company["company_id"],
+            "company_name": "Acme",
+            "title": f"Engineer {i}",
+            "description": f"Role number {i}.",
+            "job_fingerprint": f"fp-counted-{i}",
+            "remote_source_flag": True,
+            "remote_scope": "Europe",
+            "status": "new",
+        }
+        for i in range(3)
+    ]
+
+    def _upsert(batch):
+        counts: dict[str, int] = {}
+        with db_factory.engine.begin() as conn:
+            bulk_upsert_jobs(batch, conn, company_id=company["company_id"], write_counts=counts)
+            versions = dict(
+                conn.execute(text("SELECT job_id, xmin::text FROM jobs WHERE job_id LIKE 'counted-%'")).all()
+            )
+        return counts, versions
+
+    inserted, first = _upsert([dict(job) for job in jobs])
+    touched, second = _upsert([dict(job) for job in jobs])
+    # Salary change on one job; a description-only change (same fingerprint) on another
+    # rewrites job_texts but leaves the jobs row alone.
+    updated, third = _upsert(
+        [
+            {**jobs[0], "salary_min": 5000, "salary_max": 6000, "salary_currency": "EUR"},
+            {**jobs[1], "description": "Role number 1, now remote."},
+            dict(jobs[2]),
+        ]
+    )
+
+    assert inserted == {"inserted": 3, "updated": 0, "touched": 0}
+    assert touched == {"inserted": 0, "updated": 0, "touched": 3}
+    assert second == first
+    assert updated == {"inserted": 0, "updated": 1, "touched": 2}
+    assert third["counted-0"] != second["counted-0"]
+    assert (third["counted-1"], third["counted-2"]) == (second["counted-1"], second["counted-2"])
+    assert get_jobs(q="remote")[0]["job_id"] == "counted-1"
+
+
+def test_execute_unnest_writes_a_batch_and_replays_repeated_conflict_keys_in_order(db_factory):
+    columns = {"k": "TEXT", "n": "INTEGER", "score": "REAL", "owner": "UUID", "payload": "JSONB"}
+    owner = uuid.uuid4()
+    stmt = text(f"""
+        INSERT INTO unnest_probe (k, n, score, owner, payload)
+        SELECT * FROM {unnest_rows(columns)}
+        ON CONFLICT (k) DO UPDATE SET n = unnest_probe.n + excluded.n, score = excluded.score,
+            owner = excluded.owner, payload = excluded.payload
+    """)
+    rows = [
+        {"k": "a", "n": 1, "score": 1, "owner": owner, "payload": {"tags": ["x"]}},
+        {"k": "b", "n": 10, "score": 2.5, "owner": str(owner)},
+        {"k": "a", "n": 2, "score": 0.5, "owner": None, "payload": ["y"]},
+    ]
+
+    with db_factory.engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TEMP TABLE unnest_probe (k TEXT PRIMARY KEY, n INTEGER, score REAL, owner UUID, payload JSONB)"
+            )
+        )
+        written = execute_unnest(conn, stmt, rows, columns, key=("k",))
+        stored = conn.execute(text("SELECT k, n, score, owner, payload FROM unnest_probe ORDER BY k")).all()
+        assert execute_unnest(conn, stmt, [], columns) == 0
+
+    # The repeated key is applied by a second statement, after the first row.
+    assert written == 3
+    assert [tuple(row) for row in stored] == [("a", 3, 0.5, None, ["y"]), ("b", 10, 2.5, owner, None)]
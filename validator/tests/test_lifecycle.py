@@ -4,24 +4,39 @@ from app.workers import lifecycle
 def test_run_lifecycle_pipeline_execution_order(monkeypatch):
     calls = []
 
-    monkeypatch.setattr(lifecycle, "expire_jobs_due_to_lifecycle", lambda: calls.append("expire"))
-    monkeypatch.setattr(lifecycle, "stale_active_jobs_due_to_lifecycle", lambda: calls.append("stale"))
-    monkeypatch.setattr(
-        lifecycle,
-        "activate_new_jobs_due_to_lifecycle",
-        lambda: calls.append("activate"),
-    )
+    def _transitions():
+        calls.append("transitions")
+        return {"expire": 2, "stale": 1, "activate": 0, "reactivate": 3}
+
+    monkeypatch.setattr(lifecycle, "apply_lifecycle_transitions", _transitions)
+    monkeypatch.setattr(lifecycle, "mark_reposts_due_to_lifecycle", lambda: calls.append("reposts") or 4)
     monkeypatch.setattr(
         lifecycle,
-        "reactivate_stale_jobs_due_to_lifecycle",
-        lambda: calls.append("reactivate"),
+        "link_near_duplicates_due_to_lifecycle",
+        lambda threshold: calls.append("near_duplicates") or 0,
     )
-    monkeypatch.setattr(lifecycle, "mark_reposts_due_to_lifecycle", lambda: calls.append("reposts"))
 
-    lifecycle.run_lifecycle_pipeline()
+    result = lifecycle.run_lifecycle_pipeline()
+
+    # Status transitions (expire first, inside the state machine) run before reposts/near-duplicates.
+    assert calls == ["transitions", "reposts", "near_duplicates"]
+    assert result["metrics"] == {
+        "status": "ok",
+        "expired": 2,
+        "staled": 1,
+        "activated": 0,
+        "reactivated": 3,
+        "reposts_marked": 4,
+        "near_duplicates_linked": 0,
+    }
+
+
+def test_near_duplicate_threshold_env_override(monkeypatch):
+    monkeypatch.setenv("NEAR_DUPLICATE_THRESHOLD", "0.9")
+    assert lifecycle._near_duplicate_threshold() == 0.9
 
-    # Order matters: expire must run first to remove jobs from other transitions.
-    assert calls == ["expire", "stale", "activate", "reactivate", "reposts"]
+    monkeypatch.setenv("NEAR_DUPLICATE_THRESHOLD", "not-a-number")
+    assert lifecycle._near_duplicate_threshold() == lifecycle.DEFAULT_SIMILARITY_THRESHOLD
 
 
 def test_run_lifecycle_rules_wrapper_compatibility(monkeypatch):
@@ -4,6 +4,7 @@ from sqlalchemy import text
 
 from storage.repositories.lifecycle_repository import (
     activate_new_jobs_due_to_lifecycle,
+    apply_lifecycle_transitions,
     expire_jobs_due_to_lifecycle,
     mark_reposts_due_to_lifecycle,
     reactivate_stale_jobs_due_to_lifecycle,
@@ -78,6 +79,83 @@ def test_lifecycle_transitions_update_expected_jobs(db_factory):
     assert statuses["job-untouched"] == "active"
 
 
+def test_apply_lifecycle_transitions_single_pass_matches_sequential_rules(db_factory):
+    company = db_factory.create_company(legal_name="State Machine Co")
+    now = datetime.now(timezone.utc)
+
+    # Active and verified 31 days ago: qualifies for both expire and stale — expire wins.
+    db_factory.create_job(
+        company["company_id"], job_id="job-expire-not-stale", status="active", last_verified_at=now - timedelta(days=31)
+    )
+    db_factory.create_job(
+        company["company_id"], job_id="job-stale", status="active", last_verified_at=now - timedelta(days=8)
+    )
+    # New, old enough to activate, verified 8 days ago: activated but not staled in the same run.
+    db_factory.create_job(
+        company["company_id"],
+        job_id="job-activate",
+        status="new",
+        first_seen_at=now - timedelta(hours=30),
+        last_verified_at=now - timedelta(days=8),
+    )
+    db_factory.create_job(
+        company["company_id"],
+        job_id="job-reactivate",
+        status="stale",
+        availability_status="active",
+        last_verified_at=now - timedelta(days=1),
+    )
+    db_factory.create_job(company["company_id"], job_id="job-new-recent", status="new", first_seen_at=now)
+
+    counts = apply_lifecycle_transitions(batch_size=2)
+
+    assert counts == {"expire": 1, "stale": 1, "activate": 1, "reactivate": 1}
+    with db_factory.engine.begin() as conn:
+        statuses = dict(conn.execute(text("SELECT job_id, status FROM jobs")).fetchall())
+    assert statuses == {
+        "job-expire-not-stale": "expired",
+        "job-stale": "stale",
+        "job-activate": "active",
+        "job-reactivate": "active",
+        "job-new-recent": "new",
+    }
+    # The freshly activated job is staled by the next run, as with the sequential rules.
+    assert apply_lifecycle_transitions() == {"expire": 0, "stale": 1, "activate": 0, "reactivate": 0}
+
+
+def test_apply_lifecycle_transitions_skips_rows_changed_since_the_scan(db_factory, monkeypatch):
+    from storage.repositories import lifecycle_repository
+
+    company = db_factory.create_company(legal_name="Race Co")
+    now = datetime.now(timezone.utc)
+    db_factory.create_job(
+        company["company_id"], job_id="job-reverified", status="active", last_verified_at=now - timedelta(days=8)
+    )
+
+    original_connect = db_factory.engine.connect
+
+    class _ScanThenReverify:
+        # After the candidate scan, availability re-verifies the job concurrently.
+        def __enter__(self):
+            self.conn = original_connect()
+            return self.conn
+
+        def __exit__(self, *exc):
+            self.conn.close()
+            with db_factory.engine.begin() as conn:
+                conn.execute(text("UPDATE jobs SET last_verified_at = NOW() WHERE job_id = 'job-reverified'"))
+
+    class _Engine:
+        connect = staticmethod(lambda: _ScanThenReverify())
+        begin = staticmethod(db_factory.engine.begin)
+
+    monkeypatch.setattr(lifecycle_repository, "get_engine", lambda: _Engine)
+
+    assert apply_lifecycle_transitions()["stale"] == 0
+    with db_factory.engine.begin() as conn:
+        assert conn.execute(text("SELECT status FROM jobs WHERE job_id = 'job-reverified'")).scalar_one() == "active"
+
+
 def test_mark_reposts_due_to_lifecycle_clears_stale_repost_flags_and_is_idempotent(db_factory):
     company = db_factory.create_company(legal_name="Repost Co")
     now = datetime.now(timezone.utc)
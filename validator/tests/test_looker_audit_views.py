@@ -148,7 +148,6 @@ def _insert_job(
                 source_url,
                 title,
                 company_name,
-                description,
                 remote_source_flag,
                 remote_scope,
                 status,
@@ -170,7 +169,6 @@ def _insert_job(
                 :source_url,
                 :title,
                 :company_name,
-                'Role description',
                 TRUE,
                 'EU-wide',
                 'active',
@@ -194,11 +194,19 @@ def test_maintenance_pipeline_updates_company_stats(db_factory):
 
 def test_maintenance_logs_warning_on_performance_lag(monkeypatch):
     # Ensure predictable, fast in-memory execution for this behavioral test.
-    monkeypatch.setattr(maintenance_module, "_update_company_stats_and_posture", lambda: 2)
-    monkeypatch.setattr(maintenance_module, "_update_company_signal_scores", lambda: 1)
+    monkeypatch.setattr(maintenance_module, "_fold_job_sightings", lambda: 0)
+    monkeypatch.setattr(
+        maintenance_module,
+        "_refresh_company_stats",
+        lambda: {"companies": 3, "stats_updated": 2, "scores_updated": 1},
+    )
+    monkeypatch.setattr(maintenance_module, "_sync_exchange_rates", lambda: 0)
     monkeypatch.setattr(maintenance_module, "_run_backfill_salary", lambda: 0)
     monkeypatch.setattr(maintenance_module, "_run_backfill_department", lambda: 0)
+    monkeypatch.setattr(maintenance_module, "_run_backfill_taxonomy", lambda: 0)
     monkeypatch.setattr(maintenance_module, "_run_backfill_compliance", lambda: 0)
+    monkeypatch.setattr(maintenance_module, "_maintain_partitions", lambda: {"created": 0, "expired": 0})
+    monkeypatch.setattr(maintenance_module, "_maintain_system_counters", lambda: {"compacted": 0, "reconciled": 0})
 
     # Force duration above threshold deterministically.
     perf_values = iter([100.0, 100.25])
@@ -221,7 +229,7 @@ def test_maintenance_logs_warning_on_performance_lag(monkeypatch):
 
 def test_maintenance_logs_critical_on_failure(monkeypatch):
     monkeypatch.setattr(
-        maintenance_module, "_update_company_stats_and_posture", lambda: (_ for _ in ()).throw(RuntimeError("boom"))
+        maintenance_module, "_refresh_company_stats", lambda: (_ for _ in ()).throw(RuntimeError("boom"))
     )
 
     critical_calls: list[dict] = []
@@ -247,3 +255,18 @@ def test_lag_warning_threshold_parsing(monkeypatch):
 
     monkeypatch.setenv("MAINTENANCE_LAG_WARNING_MS", "-5")
     assert maintenance_module._lag_warning_threshold_ms() == 60000
+
+
+def test_system_counters_reconcile_once_per_day_after_the_reconcile_hour(db_factory, monkeypatch):
+    monkeypatch.setenv("SYSTEM_COUNTERS_RECONCILE_HOUR", "0")
+
+    assert maintenance_module._maintain_system_counters()["reconciled"] == 1
+    assert maintenance_module._maintain_system_counters()["reconciled"] == 0
+
+    # A recount from yesterday is due again, whichever hour this tick lands in.
+    with get_engine().begin() as conn:
+        conn.execute(
+            text("UPDATE system_counters SET bucket_hour = bucket_hour - INTERVAL '1 day' WHERE counter = 'reconciled'")
+        )
+    assert maintenance_module._maintain_system_counters()["reconciled"] == 1
+    assert maintenance_module._maintain_system_counters()["reconciled"] == 0
@@ -1,6 +1,8 @@
 from sqlalchemy import text
 
 from storage.repositories.maintenance_repository import (
+    mark_company_stats_reconciliation_slice,
+    refresh_dirty_company_stats,
     update_company_stats_and_posture_bulk,
     update_company_signal_scores_bulk,
 )
@@ -98,3 +100,48 @@ def test_maintenance_repository_updates_stats_posture_scores_and_is_idempotent(d
             "signal_score": 15,
         },
     ]
+
+
+def test_refresh_dirty_company_stats_only_touches_marked_companies(db_factory):
+    touched = db_factory.create_company(legal_name="Touched Co", hq_country="US", remote_posture="UNKNOWN")
+    untouched = db_factory.create_company(legal_name="Untouched Co", hq_country="US", remote_posture="UNKNOWN")
+    for company in (touched, untouched):
+        db_factory.create_job(
+            company["company_id"],
+            job_id=f"dirty-{company['legal_name'][:3]}",
+            company_name=company["legal_name"],
+            status="active",
+            compliance_status="approved",
+        )
+
+    # New companies and their jobs are marked by the triggers.
+    assert refresh_dirty_company_stats() == {"companies": 2, "stats_updated": 2, "scores_updated": 2}
+    assert refresh_dirty_company_stats() == {"companies": 0, "stats_updated": 0, "scores_updated": 0}
+
+    with db_factory.engine.begin() as conn:
+        # Only last_seen_at changes: no stats input moved, nothing is marked.
+        conn.execute(text("UPDATE jobs SET last_seen_at = NOW()"))
+        assert conn.execute(text("SELECT COUNT(*) FROM company_stats_dirty")).scalar_one() == 0
+
+        conn.execute(text("UPDATE jobs SET compliance_status = 'rejected' WHERE job_id = 'dirty-Tou'"))
+        # Bypass the stats of the untouched company to show it is not recomputed.
+        conn.execute(
+            text("UPDATE companies SET total_jobs_count = 99 WHERE company_id = :id"), {"id": untouched["company_id"]}
+        )
+
+    assert refresh_dirty_company_stats() == {"companies": 1, "stats_updated": 1, "scores_updated": 1}
+
+    with db_factory.engine.begin() as conn:
+        counts = dict(
+            conn.execute(text("SELECT legal_name, total_jobs_count FROM companies ORDER BY legal_name")).all()
+        )
+        rejected = conn.execute(
+            text("SELECT rejected_jobs_count FROM companies WHERE company_id = :id"), {"id": touched["company_id"]}
+        ).scalar_one()
+        marked = mark_company_stats_reconciliation_slice(conn, slices=1, slot=0)
+
+    assert counts == {"Touched Co": 1, "Untouched Co": 99}
+    assert rejected == 1
+    # A single reconciliation slice covers every company and repairs the drift.
+    assert marked == 2
+    assert refresh_dirty_company_stats()["stats_updated"] == 1
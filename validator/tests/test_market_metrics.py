@@ -6,9 +6,10 @@ from app.workers.market_metrics import run_market_metrics_worker
 def test_run_market_metrics_worker_success():
     """Test poprawnego działania workera market_metrics."""
     with (
-        patch("app.workers.market_metrics.compute_market_stats") as mock_compute_stats,
+        patch("app.workers.market_metrics.fold_market_rollup_deltas", return_value=3),
+        patch("app.workers.market_metrics.compute_market_stats_from_rollup") as mock_compute_stats,
         patch("app.workers.market_metrics.insert_market_daily_stats") as mock_insert_stats,
-        patch("app.workers.market_metrics.compute_market_segments") as mock_compute_segments,
+        patch("app.workers.market_metrics.compute_market_segments_from_rollup") as mock_compute_segments,
         patch("app.workers.market_metrics.insert_market_segments") as mock_insert_segments,
     ):
         mock_compute_stats.return_value = {
@@ -29,6 +30,8 @@ def test_run_market_metrics_worker_success():
         assert result["metrics"]["jobs_active"] == 2
         assert result["metrics"]["jobs_reposted"] == 0
         assert result["metrics"]["segments_count"] == 1
+        assert result["metrics"]["source"] == "rollup"
+        assert result["metrics"]["rollup_deltas_folded"] == 3
         mock_compute_stats.assert_called_once()
         mock_insert_stats.assert_called_once()
         mock_compute_segments.assert_called_once()
@@ -37,7 +40,10 @@ def test_run_market_metrics_worker_success():
 
 def test_run_market_metrics_worker_error():
     """Test obsługi błędu w workerze market_metrics."""
-    with patch("app.workers.market_metrics.compute_market_stats") as mock_compute_stats:
+    with (
+        patch("app.workers.market_metrics.fold_market_rollup_deltas", return_value=0),
+        patch("app.workers.market_metrics.compute_market_stats_from_rollup") as mock_compute_stats,
+    ):
         mock_compute_stats.side_effect = Exception("Database error")
 
         result = run_market_metrics_worker()
@@ -51,9 +57,10 @@ def test_run_market_metrics_worker_error():
 def test_run_market_metrics_worker_empty_data():
     """Test workera market_metrics z pustymi danymi."""
     with (
-        patch("app.workers.market_metrics.compute_market_stats") as mock_compute_stats,
+        patch("app.workers.market_metrics.fold_market_rollup_deltas", return_value=3),
+        patch("app.workers.market_metrics.compute_market_stats_from_rollup") as mock_compute_stats,
         patch("app.workers.market_metrics.insert_market_daily_stats") as mock_insert_stats,
-        patch("app.workers.market_metrics.compute_market_segments") as mock_compute_segments,
+        patch("app.workers.market_metrics.compute_market_segments_from_rollup") as mock_compute_segments,
         patch("app.workers.market_metrics.insert_market_segments") as mock_insert_segments,
     ):
         mock_compute_stats.return_value = {
@@ -81,9 +88,10 @@ def test_run_market_metrics_worker_empty_data():
 def test_run_market_metrics_worker_multiple_segments():
     """Test workera market_metrics z wieloma segmentami."""
     with (
-        patch("app.workers.market_metrics.compute_market_stats") as mock_compute_stats,
+        patch("app.workers.market_metrics.fold_market_rollup_deltas", return_value=3),
+        patch("app.workers.market_metrics.compute_market_stats_from_rollup") as mock_compute_stats,
         patch("app.workers.market_metrics.insert_market_daily_stats") as mock_insert_stats,
-        patch("app.workers.market_metrics.compute_market_segments") as mock_compute_segments,
+        patch("app.workers.market_metrics.compute_market_segments_from_rollup") as mock_compute_segments,
         patch("app.workers.market_metrics.insert_market_segments") as mock_insert_segments,
     ):
         mock_compute_stats.return_value = {
@@ -109,3 +117,31 @@ def test_run_market_metrics_worker_multiple_segments():
         assert result["metrics"]["segments_count"] == 2
         mock_insert_stats.assert_called_once()
         mock_insert_segments.assert_called_once()
+
+
+def test_run_market_metrics_worker_full_scan(monkeypatch):
+    """MARKET_METRICS_SOURCE=scan bypasses the rollup and recomputes from jobs."""
+    monkeypatch.setenv("MARKET_METRICS_SOURCE", "scan")
+    with (
+        patch("app.workers.market_metrics.fold_market_rollup_deltas") as mock_fold,
+        patch("app.workers.market_metrics.compute_market_stats") as mock_compute_stats,
+        patch("app.workers.market_metrics.insert_market_daily_stats"),
+        patch("app.workers.market_metrics.compute_market_segments") as mock_compute_segments,
+        patch("app.workers.market_metrics.insert_market_segments"),
+    ):
+        mock_compute_stats.return_value = {
+            "jobs_created": 1,
+            "jobs_expired": 0,
+            "jobs_active": 1,
+            "jobs_reposted": 0,
+        }
+        mock_compute_segments.return_value = []
+
+        result = run_market_metrics_worker()
+
+    assert result["metrics"]["status"] == "ok"
+    assert result["metrics"]["source"] == "scan"
+    assert result["metrics"]["rollup_deltas_folded"] == 0
+    mock_fold.assert_not_called()
+    mock_compute_stats.assert_called_once()
+    mock_compute_segments.assert_called_once()
@@ -0,0 +1,140 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from storage.repositories.market_repository import compute_market_stats, compute_market_stats_from_rollup
+from storage.repositories.market_rollup_repository import (
+    approximate_median,
+    fold_market_rollup_deltas,
+    rebuild_market_rollup,
+)
+from storage.repositories.market_segments_repository import (
+    compute_market_segments,
+    compute_market_segments_from_rollup,
+)
+
+pytestmark = pytest.mark.integration_db
+
+
+def _create_market_jobs(db_factory) -> None:
+    company = db_factory.create_company()
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    jobs = [
+        ("Spain", "eu_member_state", "engineering", "senior", 60000, "remote_only"),
+        ("Spain", "eu_member_state", "engineering", "mid", 45500, "remote_only"),
+        ("Remote - Ireland", "eu_member_state", "data", "senior", 72000, "remote_region_locked"),
+        ("Home Based - Ireland", "eu_member_state", "data", None, 8000, "hybrid"),
+        ("USA", "non_eu", "engineering", "junior", None, "remote_only"),
+        ("EMEA / APAC", "eu_region", "product", "senior", 90000, "remote_only"),
+    ]
+    for idx, (scope, geo_class, family, seniority, salary, remote_class) in enumerate(jobs):
+        db_factory.create_job(
+            company["company_id"],
+            job_id=f"mkt-{idx}",
+            remote_scope=scope,
+            geo_class=geo_class,
+            job_family=family,
+            seniority=seniority,
+            salary_min_eur=salary,
+            remote_class=remote_class,
+            compliance_status="approved",
+            compliance_score=90,
+            availability_status="active",
+            first_seen_at=yesterday,
+        )
+    # Created today, active, but not approved: counts for the whole market only.
+    db_factory.create_job(
+        company["company_id"],
+        job_id="mkt-unapproved",
+        geo_class="eu_member_state",
+        job_family="engineering",
+        salary_min_eur=30000,
+        compliance_status="rejected",
+        compliance_score=20,
+        availability_status="active",
+    )
+
+
+def test_rollup_deltas_follow_inserts_updates_and_deletes(db_factory):
+    _create_market_jobs(db_factory)
+
+    with db_factory.engine.begin() as conn:
+        conn.execute(text("UPDATE jobs SET availability_status = 'expired' WHERE job_id = 'mkt-1'"))
+        conn.execute(text("UPDATE jobs SET salary_min_eur = 65000 WHERE job_id = 'mkt-0'"))
+        conn.execute(text("UPDATE jobs SET compliance_status = 'rejected' WHERE job_id = 'mkt-2'"))
+        conn.execute(text("UPDATE jobs SET last_seen_at = NOW()"))
+        conn.execute(text("DELETE FROM jobs WHERE job_id = 'mkt-4'"))
+
+        assert fold_market_rollup_deltas(conn) > 0
+        assert fold_market_rollup_deltas(conn) == 0
+        folded = conn.execute(text("SELECT * FROM market_rollup ORDER BY 1, 2, 3")).all()
+
+        rebuild_market_rollup(conn)
+        rebuilt = conn.execute(text("SELECT * FROM market_rollup ORDER BY 1, 2, 3")).all()
+        pending = conn.execute(text("SELECT COUNT(*) FROM market_rollup_deltas")).scalar_one()
+
+    assert folded == rebuilt
+    assert pending == 0
+
+
+def test_market_stats_from_rollup_match_full_scan(db_factory):
+    _create_market_jobs(db_factory)
+    today = datetime.now(timezone.utc).date()
+
+    with db_factory.engine.begin() as conn:
+        fold_market_rollup_deltas(conn)
+        exact = compute_market_stats(conn, today)
+        rolled = compute_market_stats_from_rollup(conn, today)
+
+    for key in ("jobs_created", "jobs_expired", "jobs_active", "jobs_reposted", "avg_job_lifetime"):
+        assert rolled[key] == exact[key], key
+    assert float(rolled["avg_salary_eur"]) == pytest.approx(float(exact["avg_salary_eur"]))
+    assert float(rolled["remote_ratio"]) == pytest.approx(float(exact["remote_ratio"]))
+    assert abs(rolled["median_salary_eur"] - exact["median_salary_eur"]) <= 1000
+
+
+def test_market_segments_from_rollup_match_full_scan(db_factory):
+    _create_market_jobs(db_factory)
+    today = datetime.now(timezone.utc).date()
+
+    def _by_key(rows):
+        return {(row["segment_type"], row["segment_value"]): row for row in rows}
+
+    with db_factory.engine.begin() as conn:
+        fold_market_rollup_deltas(conn)
+        exact = _by_key(compute_market_segments(conn, today, use_scope_lookup=True))
+        rolled = _by_key(compute_market_segments_from_rollup(conn, today))
+
+    assert rolled.keys() == exact.keys()
+    assert rolled[("country", "Remote - Ireland")]["jobs_active"] == 2
+    assert ("country", "EMEA / APAC") not in rolled
+    for key, row in exact.items():
+        for column in ("jobs_active", "jobs_created", "salary_count"):
+            assert rolled[key][column] == row[column], (key, column)
+        if row["median_salary_eur"] is not None:
+            assert abs(rolled[key]["median_salary_eur"] - row["median_salary_eur"]) <= 1000, key
+
+
+def test_compute_market_segments_groups_all_segment_types_in_one_pass(db_factory):
+    _create_market_jobs(db_factory)
+
+    with db_factory.engine.begin() as conn:
+        rows = compute_market_segments(conn, date.today())
+
+    assert [row["segment_type"] for row in rows] == sorted(
+        (row["segment_type"] for row in rows), key=("country", "job_family", "seniority").index
+    )
+    engineering = next(
+        row for row in rows if row["segment_type"] == "job_family" and row["segment_value"] == "engineering"
+    )
+    assert engineering["jobs_active"] == 3
+    assert engineering["salary_count"] == 2
+    assert [row["segment_value"] for row in rows if row["segment_type"] == "seniority"] == ["junior", "mid", "senior"]
+
+
+def test_approximate_median_interpolates_within_bucket_width():
+    assert approximate_median({}) is None
+    assert approximate_median({50: 1}) == 50500
+    assert approximate_median({50: 1, 60: 1}) == 55500
+    assert approximate_median({40: 1, 500: 2}) == 500000
@@ -43,7 +43,7 @@ def _make_mock_engine(rows):
 # ── _export_market_stats ─────────────────────────────────────────────────────
 
 
-@patch("app.workers.frontend_exporter.get_engine")
+@patch("app.workers.frontend_exporter.get_read_engine")
 def test_export_market_stats_structure(mock_get_engine):
     stats = _make_stats(30)
     mock_engine, _ = _make_mock_engine([s.model_dump() for s in stats])
@@ -61,7 +61,7 @@ def test_export_market_stats_structure(mock_get_engine):
     assert len(response.stats) == 30
 
 
-@patch("app.workers.frontend_exporter.get_engine")
+@patch("app.workers.frontend_exporter.get_read_engine")
 def test_export_market_stats_empty_table(mock_get_engine):
     mock_engine, _ = _make_mock_engine([])
     mock_get_engine.return_value = mock_engine
@@ -17,8 +17,15 @@ from storage.db_engine import get_engine
         "idx_jobs_repost_lookup",
         # List API — status + last_seen_at
         "idx_jobs_status_last_seen",
-        # Companies list — active + score
-        "idx_companies_active_score",
+        # Keyset (cursor) pagination; the keyset index also serves the active + score companies list
+        "idx_jobs_first_seen_job_id",
+        "idx_companies_active_score_keyset",
+        # Full-text search
+        "idx_job_texts_search_vector",
+        # Single-pass lifecycle candidates
+        "idx_jobs_lifecycle_expire_candidates",
+        # Repost reconciliation
+        "idx_jobs_repost_flagged",
         # Pre-existing indexes that must not have been dropped
         "idx_jobs_feed_optimal",
         "idx_jobs_availability_queue",
@@ -33,3 +40,12 @@ def test_index_exists(indexname):
             {"name": indexname},
         ).scalar()
     assert result == 1, f"Expected index '{indexname}' to exist in pg_indexes"
+
+
+def test_superseded_companies_index_is_dropped():
+    engine = get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(
+            text("SELECT 1 FROM pg_indexes WHERE indexname = 'idx_companies_active_score'"),
+        ).scalar()
+    assert result is None
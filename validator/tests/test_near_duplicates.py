@@ -0,0 +1,62 @@
+from app.domain.jobs.near_duplicates import (
+    LSH_BANDS,
+    NUM_PERMUTATIONS,
+    compute_band_hashes,
+    compute_minhash_signature,
+    estimate_similarity,
+)
+
+BASE_DESCRIPTION = (
+    "We are looking for a backend engineer to join our platform team. You will design and operate "
+    "Python services on Kubernetes, own our PostgreSQL data model, and collaborate with product "
+    "managers across Europe. We offer a fully remote setup, flexible hours, a learning budget and "
+    "twenty six days of paid holiday. Experience with FastAPI, SQLAlchemy and event driven systems "
+    "is a strong plus, as is a pragmatic attitude towards testing and observability."
+)
+
+
+def test_signature_has_fixed_length_and_is_deterministic():
+    signature = compute_minhash_signature(BASE_DESCRIPTION, title="Backend Engineer")
+
+    assert signature is not None
+    assert len(signature) == NUM_PERMUTATIONS
+    assert signature == compute_minhash_signature(BASE_DESCRIPTION, title="Backend Engineer")
+
+
+def test_short_text_is_not_signed():
+    assert compute_minhash_signature("Standard job description.") is None
+    assert compute_minhash_signature(None) is None
+
+
+def test_one_edited_sentence_keeps_high_similarity():
+    edited = BASE_DESCRIPTION.replace("twenty six days of paid holiday", "thirty days of paid vacation")
+    sig_a = compute_minhash_signature(BASE_DESCRIPTION, title="Backend Engineer")
+    sig_b = compute_minhash_signature(edited, title="Backend Engineer")
+
+    assert estimate_similarity(sig_a, sig_b) >= 0.7
+    # Near-duplicates should collide in at least one LSH band.
+    assert set(enumerate(compute_band_hashes(sig_a))) & set(enumerate(compute_band_hashes(sig_b)))
+
+
+def test_unrelated_descriptions_have_low_similarity():
+    other = (
+        "Our finance department is hiring an accountant responsible for monthly closing, VAT filings "
+        "and supplier invoices. You report to the CFO, work on site in Munich three days a week and "
+        "coordinate with external auditors during the annual review of our statutory accounts."
+    )
+    sig_a = compute_minhash_signature(BASE_DESCRIPTION)
+    sig_b = compute_minhash_signature(other)
+
+    assert estimate_similarity(sig_a, sig_b) < 0.2
+
+
+def test_band_hashes_fit_signed_bigint():
+    band_hashes = compute_band_hashes(compute_minhash_signature(BASE_DESCRIPTION))
+
+    assert len(band_hashes) == LSH_BANDS
+    assert all(-(2**63) <= value < 2**63 for value in band_hashes)
+
+
+def test_estimate_similarity_handles_mismatched_input():
+    assert estimate_similarity([], [1, 2]) == 0.0
+    assert estimate_similarity([1, 2], [1, 2, 3]) == 0.0
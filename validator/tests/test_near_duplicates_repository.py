@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from storage.repositories.jobs_repository import bulk_upsert_jobs
+from storage.repositories.near_duplicates_repository import (
+    find_near_duplicates,
+    find_near_duplicates_for_text,
+    get_jobs_missing_signatures,
+    link_near_duplicates_due_to_lifecycle,
+    sync_job_signatures,
+)
+
+pytestmark = pytest.mark.integration_db
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to join our platform team. You will design and operate "
+    "Python services on Kubernetes, own our PostgreSQL data model, and collaborate with product "
+    "managers across Europe. We offer a fully remote setup, flexible hours, a learning budget and "
+    "twenty six days of paid holiday. Experience with FastAPI, SQLAlchemy and event driven systems "
+    "is a strong plus, as is a pragmatic attitude towards testing and observability."
+)
+EDITED_DESCRIPTION = DESCRIPTION.replace("twenty six days of paid holiday", "thirty days of paid vacation")
+OTHER_DESCRIPTION = (
+    "Our finance department is hiring an accountant responsible for monthly closing, VAT filings "
+    "and supplier invoices. You report to the CFO, work on site in Munich three days a week and "
+    "coordinate with external auditors during the annual review of our statutory accounts."
+)
+
+
+def _job(company_id: str, job_id: str, description: str, **overrides) -> dict:
+    job = {
+        "job_id": job_id,
+        "source": "greenhouse:acme",
+        "source_job_id": job_id,
+        "source_url": f"https://example.com/jobs/{job_id}",
+        "company_id": company_id,
+        "company_name": "Acme",
+        "title": "Backend Engineer",
+        "description": description,
+        "remote_source_flag": True,
+        "remote_scope": "Europe",
+        "status": "new",
+    }
+    job.update(overrides)
+    return job
+
+
+def test_bulk_upsert_indexes_signatures_only_for_new_or_changed_content(db_factory):
+    company = db_factory.create_company()
+    company_id = company["company_id"]
+    jobs = [_job(company_id, "nd-1", DESCRIPTION), _job(company_id, "nd-2", OTHER_DESCRIPTION)]
+
+    with db_factory.engine.begin() as conn:
+        bulk_upsert_jobs(jobs, conn, company_id=company_id)
+        conn.execute(text("UPDATE job_signatures SET checked_at = NOW()"))
+
+        # Same content again: signatures are left untouched.
+        bulk_upsert_jobs(jobs, conn, company_id=company_id)
+        unchecked = conn.execute(text("SELECT COUNT(*) FROM job_signatures WHERE checked_at IS NULL")).scalar()
+        bands = conn.execute(text("SELECT COUNT(*) FROM job_signature_bands")).scalar()
+
+    assert unchecked == 0
+    assert bands == 2 * 16
+
+
+def test_find_near_duplicates_batch_and_incremental(db_factory):
+    company = db_factory.create_company()
+    company_id = company["company_id"]
+
+    with db_factory.engine.begin() as conn:
+        bulk_upsert_jobs(
+            [
+                _job(company_id, "nd-orig", DESCRIPTION),
+                _job(company_id, "nd-edit", EDITED_DESCRIPTION, source="lever:acme"),
+                _job(company_id, "nd-other", OTHER_DESCRIPTION),
+            ],
+            conn,
+            company_id=company_id,
+        )
+
+        matches = find_near_duplicates(conn, ["nd-orig", "nd-other"], threshold=0.6)
+        incremental = find_near_duplicates_for_text(conn, EDITED_DESCRIPTION, title="Backend Engineer", threshold=0.6)
+        strict = find_near_duplicates(conn, ["nd-orig"], threshold=1.0)
+
+    assert [m["job_id"] for m in matches["nd-orig"]] == ["nd-edit"]
+    assert "nd-other" not in matches
+    assert [m["job_id"] for m in incremental][0] == "nd-edit"
+    assert "nd-orig" in [m["job_id"] for m in incremental]
+    assert strict == {}
+
+
+def test_link_near_duplicates_points_to_earliest_job_and_is_incremental(db_factory):
+    company = db_factory.create_company()
+    company_id = company["company_id"]
+    now = datetime.now(timezone.utc)
+
+    db_factory.create_job(company_id, job_id="nd-old", description=DESCRIPTION, first_seen_at=now - timedelta(days=20))
+    db_factory.create_job(company_id, job_id="nd-new", description=EDITED_DESCRIPTION, first_seen_at=now)
+
+    with db_factory.engine.begin() as conn:
+        rows = get_jobs_missing_signatures(conn)
+        assert {row["job_id"] for row in rows} == {"nd-old", "nd-new"}
+        sync_job_signatures(conn, rows)
+
+    assert link_near_duplicates_due_to_lifecycle(threshold=0.6) == 1
+    assert link_near_duplicates_due_to_lifecycle(threshold=0.6) == 0
+
+    with db_factory.engine.connect() as conn:
+        links = dict(conn.execute(text("SELECT job_id, near_duplicate_of FROM job_signatures")).fetchall())
+
+    assert links == {"nd-old": None, "nd-new": "nd-old"}
+
+
+def test_link_near_duplicates_prefers_earliest_seen_over_most_similar(db_factory):
+    company = db_factory.create_company()
+    company_id = company["company_id"]
+    now = datetime.now(timezone.utc)
+
+    db_factory.create_job(company_id, job_id="nd-old", description=DESCRIPTION, first_seen_at=now - timedelta(days=20))
+    # An exact copy of nd-new, seen later than nd-old: more similar, but not the original.
+    db_factory.create_job(
+        company_id, job_id="nd-mid", description=EDITED_DESCRIPTION, first_seen_at=now - timedelta(days=10)
+    )
+    db_factory.create_job(company_id, job_id="nd-new", description=EDITED_DESCRIPTION, first_seen_at=now)
+
+    with db_factory.engine.begin() as conn:
+        sync_job_signatures(conn, get_jobs_missing_signatures(conn))
+
+    assert link_near_duplicates_due_to_lifecycle(threshold=0.6) == 2
+
+    with db_factory.engine.connect() as conn:
+        links = dict(conn.execute(text("SELECT job_id, near_duplicate_of FROM job_signatures")).fetchall())
+
+    assert links == {"nd-old": None, "nd-mid": "nd-old", "nd-new": "nd-old"}
@@ -0,0 +1,110 @@
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from storage.repositories.audit_repository import get_rejection_reasons_by_source
+from storage.repositories.partitions_repository import (
+    apply_partition_retention,
+    ensure_monthly_partitions,
+    list_monthly_partitions,
+)
+
+
+def _partition_of(conn, table: str, **where) -> str:
+    clause = " AND ".join(f"{column} = :{column}" for column in where)
+    return conn.execute(text(f"SELECT tableoid::regclass::text FROM {table} WHERE {clause}"), where).scalar_one()
+
+
+def test_migration_creates_current_and_future_partitions(db_factory):
+    today = datetime.now(timezone.utc).date()
+    with db_factory.engine.connect() as conn:
+        for table in ("job_snapshots", "compliance_reports"):
+            months = list_monthly_partitions(conn, table)
+            assert date(today.year, today.month, 1) in months
+            assert ensure_monthly_partitions(conn, table, months_ahead=3) == []
+
+
+def test_new_partition_takes_over_rows_from_default_and_retention_drops_it(db_factory):
+    company = db_factory.create_company()
+    db_factory.create_job(company["company_id"], job_id="job-old")
+    db_factory.create_job_snapshot("job-old", captured_at=datetime(2020, 2, 10, tzinfo=timezone.utc))
+
+    with db_factory.engine.begin() as conn:
+        assert _partition_of(conn, "job_snapshots", job_id="job-old") == "job_snapshots_default"
+
+        created = ensure_monthly_partitions(conn, "job_snapshots", months_ahead=1, today=date(2020, 2, 1))
+        assert created == ["job_snapshots_p2020_02", "job_snapshots_p2020_03"]
+        assert _partition_of(conn, "job_snapshots", job_id="job-old") == "job_snapshots_p2020_02"
+
+        expired = apply_partition_retention(conn, "job_snapshots", retention_months=24)
+        assert expired == ["job_snapshots_p2020_02", "job_snapshots_p2020_03"]
+        assert conn.execute(text("SELECT COUNT(*) FROM job_snapshots WHERE job_id = 'job-old'")).scalar_one() == 0
+        assert conn.execute(text("SELECT to_regclass('job_snapshots_p2020_02')")).scalar_one() is None
+
+
+def test_retention_can_detach_instead_of_drop(db_factory):
+    with db_factory.engine.begin() as conn:
+        ensure_monthly_partitions(conn, "compliance_reports", months_ahead=0, today=date(2020, 5, 1))
+        expired = apply_partition_retention(conn, "compliance_reports", retention_months=12, detach_only=True)
+
+        assert expired == ["compliance_reports_p2020_05"]
+        assert date(2020, 5, 1) not in list_monthly_partitions(conn, "compliance_reports")
+        assert conn.execute(text("SELECT to_regclass('compliance_reports_p2020_05')")).scalar_one() is not None
+        conn.execute(text("DROP TABLE compliance_reports_p2020_05"))
+
+
+def test_rejection_reasons_view_prunes_old_report_partitions(db_factory):
+    with db_factory.engine.begin() as conn:
+        ensure_monthly_partitions(conn, "compliance_reports", months_ahead=0, today=date(2020, 5, 1))
+        plan = conn.execute(
+            text("""
+                EXPLAIN (FORMAT TEXT)
+                SELECT * FROM vw_looker_audit_rejection_reasons
+            """)
+        ).scalars()
+        plan_text = "\n".join(plan)
+        apply_partition_retention(conn, "compliance_reports", retention_months=12)
+
+    assert "compliance_reports_p" in plan_text
+    assert "compliance_reports_p2020_05" not in plan_text
+
+
+def test_rejection_reasons_count_a_job_once_under_its_latest_report(db_factory):
+    company = db_factory.create_company()
+    job = db_factory.create_job(
+        company["company_id"],
+        job_id="job-rr",
+        source="lever:rr",
+        compliance_status="rejected",
+        remote_class="NON_REMOTE",
+    )
+    db_factory.create_job_source("job-rr", source="lever:rr")
+    now = datetime.now(timezone.utc)
+    with db_factory.engine.begin() as conn:
+        # An older report flagged hard geo; the latest one no longer does.
+        for policy_version, created_at, hard_geo_flag in (("v1", now - timedelta(days=29), True), ("v2", now, False)):
+            conn.execute(
+                text("""
+                    INSERT INTO compliance_reports (
+                        job_id, job_uid, policy_version, hard_geo_flag, created_at, report_month
+                    ) VALUES (
+                        :job_id, :job_uid, :policy_version, :hard_geo_flag, :created_at,
+                        date_trunc('month', CAST(:created_at AS TIMESTAMPTZ) AT TIME ZONE 'UTC')::date
+                    )
+                """),
+                {
+                    "job_id": "job-rr",
+                    "job_uid": job["job_uid"],
+                    "policy_version": policy_version,
+                    "hard_geo_flag": hard_geo_flag,
+                    "created_at": created_at,
+                },
+            )
+        view_rows = conn.execute(
+            text("SELECT reason, count FROM vw_looker_audit_rejection_reasons WHERE source = 'lever:rr'")
+        ).all()
+
+    assert [tuple(row) for row in view_rows] == [("non_remote", 1)]
+    assert [row for row in get_rejection_reasons_by_source() if row["source"] == "lever:rr"] == [
+        {"source": "lever:rr", "reason": "non_remote", "count": 1}
+    ]
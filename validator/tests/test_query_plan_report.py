@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scripts.query_plan_report import PlanCase, build_report, check_case, compare_reports, summarize_plan
+from storage.db_engine import get_engine
+
+
+def _result(plan: list[str], ms: float, buffers: int) -> dict:
+    return {"ms": ms, "buffers": buffers, "statements": [{"plan": plan}]}
+
+
+@pytest.mark.no_db
+def test_summarize_plan_names_partition_parents_and_collapses_identical_siblings():
+    explained = [
+        {
+            "Plan": {
+                "Node Type": "Limit",
+                "Shared Hit Blocks": 10,
+                "Shared Read Blocks": 2,
+                "Plans": [
+                    {
+                        "Node Type": "Append",
+                        "Plans": [
+                            {
+                                "Node Type": "Index Scan",
+                                "Index Name": "job_snapshots_2026_01_job_id_idx",
+                                "Relation Name": "job_snapshots_2026_01",
+                            },
+                            {
+                                "Node Type": "Index Scan",
+                                "Index Name": "job_snapshots_2026_02_job_id_idx",
+                                "Relation Name": "job_snapshots_2026_02",
+                            },
+                            {"Node Type": "Seq Scan", "Relation Name": "jobs"},
+                        ],
+                    }
+                ],
+            },
+            "Execution Time": 1.25,
+        }
+    ]
+    parents = {
+        "job_snapshots_2026_01": "job_snapshots",
+        "job_snapshots_2026_02": "job_snapshots",
+        "job_snapshots_2026_01_job_id_idx": "idx_job_snapshots_job_id",
+        "job_snapshots_2026_02_job_id_idx": "idx_job_snapshots_job_id",
+    }
+
+    summary = summarize_plan(explained, parents)
+
+    assert summary == {
+        "plan": [
+            "Limit",
+            "  Append",
+            "    Index Scan using idx_job_snapshots_job_id on job_snapshots (x2)",
+            "    Seq Scan on jobs",
+        ],
+        "indexes": ["idx_job_snapshots_job_id"],
+        "seq_scans": ["jobs"],
+        "ms": 1.25,
+        "buffers": 12,
+    }
+
+
+@pytest.mark.no_db
+def test_check_case_reports_missing_indexes_large_seq_scans_and_budgets():
+    case = PlanCase(
+        name="example",
+        run=lambda p: None,
+        indexes=("idx_a|idx_b", "idx_c"),
+        seq_scans=("companies",),
+        max_ms=10.0,
+        max_buffers=100,
+    )
+    result = {
+        "statements": [{}],
+        "indexes": ["idx_b"],
+        "seq_scans": ["companies", "jobs", "market_rollup"],
+        "ms": 12.0,
+        "buffers": 50,
+    }
+
+    assert check_case(case, result) == [
+        "index not used: idx_c",
+        "sequential scan on jobs",
+        "12.0 ms over the 10 ms budget",
+    ]
+    assert check_case(case, result, budgets=False) == ["index not used: idx_c", "sequential scan on jobs"]
+    assert check_case(case, {**result, "statements": []}, budgets=False)[0] == "no statements captured"
+
+
+@pytest.mark.no_db
+def test_compare_reports_flags_plan_changes_and_regressions_above_noise():
+    baseline = {
+        "cases": {
+            "jobs.list": _result(["Limit", "  Index Scan using idx_jobs_first_seen_job_id on jobs"], 10.0, 100),
+            "jobs.feed": _result(["Limit"], 0.2, 10),
+            "removed": _result(["Result"], 0.1, 1),
+        }
+    }
+    report = {
+        "cases": {
+            "jobs.list": _result(["Limit", "  Sort", "    Seq Scan on jobs"], 20.0, 150),
+            # 10x slower, but below the absolute noise floor
+            "jobs.feed": _result(["Limit"], 2.0, 100),
+            "added": _result(["Result"], 0.1, 1),
+        }
+    }
+
+    changes, regressions = compare_reports(report, baseline, max_regression=1.5)
+
+    assert [change.splitlines()[0] for change in changes] == [
+        "jobs.list: plan changed",
+        "added: new case",
+        "removed: case removed",
+    ]
+    assert "+    Seq Scan on jobs" in changes[0]
+    assert regressions == ["jobs.list: 10.0 -> 20.0 ms"]
+
+
+@pytest.mark.integration_db
+def test_every_case_is_explained_and_write_paths_are_rolled_back(db_factory):
+    company = db_factory.create_company()
+    job = db_factory.create_job(
+        company["company_id"],
+        status="new",
+        first_seen_at=datetime.now(timezone.utc) - timedelta(days=2),
+    )
+
+    # The test database is tiny: with sequential scans off the planner shows which
+    # indexes are applicable, budgets are meaningless.
+    report = build_report(get_engine(), budgets=False, seqscan=False)
+
+    cases = report["cases"]
+    assert all(result["statements"] for result in cases.values())
+    assert "idx_jobs_availability_queue" in cases["availability.verification_queue"]["indexes"]
+    assert {"idx_jobs_lifecycle_expire_candidates", "idx_jobs_lifecycle_new_activation"} <= set(
+        cases["lifecycle.transitions"]["indexes"]
+    )
+    assert "idx_jobs_repost_flagged" in cases["lifecycle.reposts"]["indexes"]
+    assert "idx_jobs_pending_compliance" in cases["compliance.resolution_queue"]["indexes"]
+    assert "idx_companies_active_score_keyset" in cases["companies.list_keyset"]["indexes"]
+    # The activation UPDATE was captured and explained, never applied.
+    assert cases["lifecycle.transitions"]["statements"][-1]["plan"][0] == "ModifyTable on jobs"
+    assert db_factory.get_job(job["job_id"])["status"] == "new"
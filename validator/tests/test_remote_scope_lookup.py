@@ -0,0 +1,74 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from storage.repositories.market_segments_repository import compute_market_segments, sync_remote_scope_lookup
+
+pytestmark = pytest.mark.integration_db
+
+
+def _create_segment_jobs(db_factory):
+    company = db_factory.create_company()
+    scopes = [
+        ("Remote - Ireland", "eu_member_state"),
+        ("Home Based - Ireland", "eu_member_state"),
+        ("Republic Of Ireland", "eu_member_state"),
+        ("Spain", "eu_member_state"),
+        ("Spain (Remote)", "eu_region"),
+        ("EMEA / APAC", "eu_region"),
+        ("USA", "non_eu"),
+        (None, "eu_region"),
+    ]
+    for idx, (scope, geo_class) in enumerate(scopes):
+        db_factory.create_job(
+            company["company_id"],
+            job_id=f"seg-{idx}",
+            remote_scope=scope,
+            geo_class=geo_class,
+            compliance_status="approved",
+            compliance_score=90,
+            availability_status="active",
+            salary_min_eur=50000 + idx * 1000,
+            first_seen_at=datetime(2026, 5, 1, 8, tzinfo=timezone.utc),
+        )
+
+
+def test_sync_remote_scope_lookup_classifies_each_scope_once(db_factory):
+    _create_segment_jobs(db_factory)
+
+    with db_factory.engine.begin() as conn:
+        written = sync_remote_scope_lookup(conn)
+        rewritten = sync_remote_scope_lookup(conn)
+        rows = {
+            row["remote_scope"]: row for row in conn.execute(text("SELECT * FROM remote_scope_lookup")).mappings().all()
+        }
+
+    assert written == 7
+    assert rewritten == 0
+    assert rows["Home Based - Ireland"]["segment_label"] == "Remote - Ireland"
+    assert rows["Spain"]["geo_class"] == "eu_member_state"
+    assert rows["USA"]["geo_class"] == "non_eu"
+    assert rows["EMEA / APAC"]["is_excluded"] is True
+    assert rows["EMEA / APAC"]["segment_label"] is None
+
+
+def test_compute_market_segments_lookup_join_matches_python_normalization(db_factory):
+    _create_segment_jobs(db_factory)
+
+    def _country(rows):
+        return sorted((r["segment_value"], r["jobs_active"]) for r in rows if r["segment_type"] == "country")
+
+    with db_factory.engine.begin() as conn:
+        legacy = compute_market_segments(conn, date(2026, 5, 1))
+        via_lookup = compute_market_segments(conn, date(2026, 5, 1), use_scope_lookup=True)
+
+    # "Home Based - Ireland" and "Remote - Ireland" share a label: the lookup path
+    # aggregates them into one group, the legacy path keeps the last duplicate row.
+    assert _country(via_lookup) == [
+        ("Non EU", 1),
+        ("Remote - Ireland", 2),
+        ("Spain (Remote)", 1),
+        ("eu_region", 1),
+    ]
+    assert {value for value, _ in _country(legacy)} == {value for value, _ in _country(via_lookup)}
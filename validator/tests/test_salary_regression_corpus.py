@@ -0,0 +1,31 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.domain.money.salary_parser import CURRENCY_CONTEXT_PATTERN, SALARY_KEYWORDS_PATTERN, extract_salary
+from app.domain.money.salary_parser import find_salary_signal_offsets
+
+CORPUS_PATH = Path(__file__).parent / "data" / "salary_regression_corpus.json"
+
+
+def load_corpus():
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("case", load_corpus())
+def test_extract_salary_matches_recorded_output(case):
+    # Expected outputs were recorded with the pre-filter parser; any diff is a behaviour change.
+    assert extract_salary(case["description"], title=case["title"]) == case["expected"]
+
+
+@pytest.mark.parametrize("case", load_corpus())
+def test_signal_offsets_match_separate_keyword_and_currency_scans(case):
+    text = f"{case['title'] or ''} {case['description'] or ''}".lower()
+    expected = sorted(
+        [m.start() for m in SALARY_KEYWORDS_PATTERN.finditer(text)]
+        + [m.start() for m in CURRENCY_CONTEXT_PATTERN.finditer(text)]
+    )
+
+    assert find_salary_signal_offsets(text) == expected
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from storage.repositories.snapshots_repository import (
+    SNAPSHOT_FIELDS,
+    SNAPSHOT_KEYFRAME_INTERVAL,
+    _decode_snapshots,
+    _delta_row,
+    get_job_history,
+    get_job_state_at,
+    insert_job_snapshots,
+)
+
+
+def _state(n: int) -> dict:
+    return {
+        "job_fingerprint": f"fp-{n}",
+        "title": f"Engineer v{(n + 1) // 2}",
+        "company_name": "Acme",
+        "salary_min": 50000 + n * 1000 if n % 3 else None,
+        "salary_max": 70000,
+        "salary_currency": "EUR",
+        "remote_class": "REMOTE_ONLY",
+        "geo_class": "EU_REGION",
+    }
+
+
+@pytest.mark.no_db
+def test_delta_rows_store_changed_fields_only_and_decode_back():
+    chain, rows = [], []
+    for n in range(SNAPSHOT_KEYFRAME_INTERVAL + 2):
+        rows.append({"snapshot_id": n, "captured_at": None, **_delta_row(_state(n), chain)})
+        chain.append(_state(n))
+
+    assert [row["delta_mask"] is None for row in rows] == [True] + [False] * 7 + [True, False]
+    # fp-1 -> fp-2, title unchanged ("v1"), salary_min 51000 -> 52000
+    assert rows[2]["delta_mask"] == 0b1001
+    assert (rows[2]["job_fingerprint"], rows[2]["title"], rows[2]["salary_min"]) == ("fp-2", None, 52000)
+    # salary_min 52000 -> NULL is a change to NULL
+    assert rows[3]["delta_mask"] & 0b1000 and rows[3]["salary_min"] is None
+    assert [{f: s[f] for f in SNAPSHOT_FIELDS} for s in _decode_snapshots(rows)] == chain
+
+
+@pytest.mark.integration_db
+def test_insert_job_snapshots_chains_deltas_within_the_month(db_factory):
+    company = db_factory.create_company()
+    job = db_factory.create_job(company["company_id"])
+    # Last month's snapshot is in another partition: this month's chain starts with a keyframe.
+    db_factory.create_job_snapshot(job["job_id"], captured_at=datetime.now(timezone.utc) - timedelta(days=40))
+    states = [{"job_id": job["job_id"], **_state(n)} for n in range(SNAPSHOT_KEYFRAME_INTERVAL + 2)]
+
+    with db_factory.engine.begin() as conn:
+        assert insert_job_snapshots(conn, states[:3]) == 3
+        assert insert_job_snapshots(conn, states[3:]) == len(states) - 3
+        stored = conn.execute(
+            text(
+                "SELECT delta_mask, company_name FROM job_snapshots "
+                "WHERE job_id = :job_id AND captured_at > NOW() - INTERVAL '1 day' ORDER BY snapshot_id"
+            ),
+            {"job_id": job["job_id"]},
+        ).all()
+        history = get_job_history(conn, job["job_id"])
+
+    assert [mask is None for mask, _ in stored] == [True] + [False] * 7 + [True, False]
+    assert [company_name for mask, company_name in stored if mask is not None] == [None] * 8
+    assert len(history) == len(states) + 1
+    assert [{f: s[f] for f in SNAPSHOT_FIELDS} for s in history[1:]] == [_state(n) for n in range(len(states))]
+
+
+@pytest.mark.integration_db
+def test_insert_job_snapshots_waits_for_a_concurrent_writer_of_the_same_job(db_factory):
+    company = db_factory.create_company()
+    job = db_factory.create_job(company["company_id"])
+    states = [{"job_id": job["job_id"], **_state(n)} for n in range(3)]
+
+    with db_factory.engine.connect() as late:
+        # Started first, so its NOW() is older than the other writer's rows.
+        late.begin()
+        late.execute(text("SELECT 1"))
+        with db_factory.engine.begin() as early:
+            insert_job_snapshots(early, states[:2])
+            writer = threading.Thread(target=lambda: (insert_job_snapshots(late, states[2:]), late.commit()))
+            writer.start()
+            time.sleep(0.3)
+            blocked = writer.is_alive()
+        writer.join(timeout=10)
+
+    with db_factory.engine.connect() as conn:
+        history = get_job_history(conn, job["job_id"])
+
+    assert blocked
+    assert [{f: s[f] for f in SNAPSHOT_FIELDS} for s in history] == [_state(n) for n in range(3)]
+
+
+@pytest.mark.integration_db
+def test_get_job_state_at_reads_the_next_snapshot_or_the_current_row(db_factory):
+    company = db_factory.create_company()
+    first_seen = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    job = db_factory.create_job(
+        company["company_id"], first_seen_at=first_seen, title="Staff Engineer", job_fingerprint="fp-now"
+    )
+    db_factory.create_job_snapshot(
+        job["job_id"], title="Engineer", job_fingerprint="fp-a", captured_at=datetime(2026, 1, 10, tzinfo=timezone.utc)
+    )
+    db_factory.create_job_snapshot(
+        job["job_id"],
+        title="Senior Engineer",
+        job_fingerprint=None,
+        remote_class=None,
+        geo_class=None,
+        delta_mask=0b10,
+        captured_at=datetime(2026, 1, 20, tzinfo=timezone.utc),
+    )
+
+    with db_factory.engine.connect() as conn:
+        before = get_job_state_at(conn, job["job_id"], first_seen - timedelta(days=1))
+        first = get_job_state_at(conn, job["job_id"], datetime(2026, 1, 7, tzinfo=timezone.utc))
+        second = get_job_state_at(conn, job["job_id"], datetime(2026, 1, 10, tzinfo=timezone.utc))
+        current = get_job_state_at(conn, job["job_id"], datetime(2026, 1, 25, tzinfo=timezone.utc))
+
+    assert before is None
+    assert (first["title"], first["job_fingerprint"]) == ("Engineer", "fp-a")
+    # The delta only stores the title; the rest is decoded from the keyframe.
+    assert (second["title"], second["job_fingerprint"], second["remote_class"]) == (
+        "Senior Engineer",
+        "fp-a",
+        "UNKNOWN",
+    )
+    assert (current["title"], current["job_fingerprint"]) == ("Staff Engineer", "fp-now")
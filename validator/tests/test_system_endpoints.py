@@ -29,11 +29,12 @@ def _make_request(path: str = "/internal/tick", headers: list[tuple[bytes, bytes
 
 def test_system_metrics_endpoint(monkeypatch):
     monkeypatch.setattr(system_api, "get_system_metrics", lambda: {"jobs_total": 100})
+    monkeypatch.setattr(system_api, "pool_metrics", lambda: {"api": {"in_use": 1, "checkout_wait_ms_max": 0.4}})
 
     response = client.get("/internal/metrics")
 
     assert response.status_code == 200
-    assert response.json() == {"jobs_total": 100}
+    assert response.json() == {"jobs_total": 100, "db_pools": {"api": {"in_use": 1, "checkout_wait_ms_max": 0.4}}}
 
 
 @pytest.mark.parametrize(
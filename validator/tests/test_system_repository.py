@@ -1,7 +1,13 @@
 from datetime import datetime, timedelta, timezone
 import uuid
 
-from storage.repositories.system_repository import get_system_metrics
+from sqlalchemy import text
+
+from storage.repositories.system_repository import (
+    compact_system_counters,
+    get_system_metrics,
+    reconcile_system_counters,
+)
 
 
 def test_get_system_metrics_returns_zero_defaults_for_empty_database():
@@ -50,3 +56,56 @@ def test_get_system_metrics_counts_recent_records_and_formats_timestamp(db_facto
     assert metrics["company_ats_24h"] == 1
     assert metrics["last_tick_at"] is not None
     assert metrics["last_tick_at"].startswith(now.date().isoformat())
+
+
+def test_system_counters_follow_updates_deletes_and_survive_compaction(db_factory):
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=5)
+    company = db_factory.create_company(legal_name="Counted Co", created_at=now, updated_at=now)
+    for idx in range(3):
+        db_factory.create_job(company["company_id"], job_id=f"counted-{idx}", first_seen_at=now)
+
+    with db_factory.engine.begin() as conn:
+        # Re-touching a row that keeps its bucket adds no delta.
+        conn.execute(text("UPDATE jobs SET last_seen_at = NOW()"))
+        # Moving a job out of the 24h window keeps the total.
+        conn.execute(text("UPDATE jobs SET first_seen_at = :old WHERE job_id = 'counted-0'"), {"old": old})
+        conn.execute(text("DELETE FROM jobs WHERE job_id = 'counted-1'"))
+
+    before = get_system_metrics()
+    assert (before["jobs_total"], before["jobs_24h"]) == (2, 1)
+    assert (before["companies_total"], before["companies_24h"]) == (1, 1)
+
+    with db_factory.engine.begin() as conn:
+        assert compact_system_counters(conn) > 0
+        rows = conn.execute(text("SELECT COUNT(*) FROM system_counters")).scalar_one()
+        # jobs: the old job folded into '-infinity' plus the current hour; companies: one bucket.
+        assert rows <= 4
+        assert compact_system_counters(conn) == rows
+
+    assert get_system_metrics() == before
+
+    with db_factory.engine.begin() as conn:
+        # Drift (e.g. a bypassed trigger) is repaired by the exact recount.
+        conn.execute(text("INSERT INTO system_counters (counter, bucket_hour, delta) VALUES ('jobs', NOW(), 7)"))
+        assert reconcile_system_counters(conn) == {"jobs": 2, "companies": 1, "company_ats": 0}
+
+    assert get_system_metrics() == before
+
+
+def test_get_system_metrics_last_tick_includes_pending_sightings(db_factory):
+    now = datetime.now(timezone.utc)
+    company = db_factory.create_company(legal_name="Sighted Co")
+    db_factory.create_job(company["company_id"], job_id="job-sighted", last_seen_at=now - timedelta(hours=5))
+    with db_factory.engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO job_sightings (source, source_job_id, job_id, last_seen_at)
+                VALUES ('greenhouse', 'sighted-1', 'job-sighted', :now)
+            """),
+            {"now": now},
+        )
+        overview_tick = conn.execute(text("SELECT last_tick_at FROM vw_looker_audit_overview")).scalar_one()
+
+    assert get_system_metrics()["last_tick_at"] == now.isoformat()
+    assert overview_tick == now
@@ -1,4 +1,4 @@
-from app.domain.taxonomy.taxonomy import classify_taxonomy
+from app.domain.taxonomy.taxonomy import classify_taxonomy, clear_taxonomy_cache, taxonomy_cache_info
 from app.domain.taxonomy.enums import JobFamily, JobRole, Seniority, Specialization
 
 
@@ -77,3 +77,27 @@ def test_normalization_edge_cases():
 
     # NIE POWINNO uszkodzić słowa 'platforming', choć 'platform' jest na liście mapowań
     assert _normalize_title("platforming engineer") == "platforming engineer"
+
+
+def test_classify_taxonomy_memoizes_repeated_titles():
+    clear_taxonomy_cache()
+
+    first = classify_taxonomy("Senior Software Engineer", department="Engineering")
+    second = classify_taxonomy("Senior Software Engineer", department="Engineering")
+
+    info = taxonomy_cache_info()
+    assert first == second
+    assert info["misses"] == 1
+    assert info["hits"] == 1
+    assert info["size"] == 1
+
+
+def test_classify_taxonomy_cached_result_respects_family_override():
+    clear_taxonomy_cache()
+
+    assert classify_taxonomy("Data Engineer")["job_role"] == JobRole.ENGINEER.value
+    overridden = classify_taxonomy("Data Engineer", job_family=JobFamily.DATA_SCIENCE.value)
+
+    assert overridden["job_family"] == JobFamily.DATA_SCIENCE.value
+    assert overridden["job_role"] == JobRole.UNKNOWN.value
+    assert taxonomy_cache_info()["hits"] == 1